@@ -0,0 +1,39 @@
+"""Add history indexes
+
+Revision ID: 3f2a9c1d7b64
+Revises: 8d4893e2879d
+Create Date: 2026-10-17 18:45:12.381904
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '3f2a9c1d7b64'
+down_revision: Union[str, None] = '8d4893e2879d'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 대용량 테이블 잠금을 피하기 위해 트랜잭션 밖에서 CONCURRENTLY로 생성
+    with op.get_context().autocommit_block():
+        # Create composite indexes for orders table
+        op.create_index('ix_orders_user_id_status_created_at', 'orders', ['user_id', 'status', 'created_at'], unique=False, postgresql_concurrently=True)
+        op.create_index('ix_orders_symbol_status_created_at', 'orders', ['symbol', 'status', 'created_at'], unique=False, postgresql_concurrently=True)
+
+        # Create indexes for trades table
+        op.create_index('ix_trades_symbol_executed_at_id', 'trades', ['symbol', sa.text('executed_at DESC'), 'id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_trades_buy_order_id'), 'trades', ['buy_order_id'], unique=False, postgresql_concurrently=True)
+        op.create_index(op.f('ix_trades_sell_order_id'), 'trades', ['sell_order_id'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(op.f('ix_trades_sell_order_id'), table_name='trades', postgresql_concurrently=True)
+        op.drop_index(op.f('ix_trades_buy_order_id'), table_name='trades', postgresql_concurrently=True)
+        op.drop_index('ix_trades_symbol_executed_at_id', table_name='trades', postgresql_concurrently=True)
+        op.drop_index('ix_orders_symbol_status_created_at', table_name='orders', postgresql_concurrently=True)
+        op.drop_index('ix_orders_user_id_status_created_at', table_name='orders', postgresql_concurrently=True)
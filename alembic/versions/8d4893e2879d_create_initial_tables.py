@@ -19,10 +19,10 @@ depends_on: Union[str, Sequence[str], None] = None
 
 
 def upgrade() -> None:
-    # Create ENUM types
-    orderside_enum = postgresql.ENUM('buy', 'sell', name='orderside')
-    ordertype_enum = postgresql.ENUM('limit', 'market', 'ioc', name='ordertype')
-    orderstatus_enum = postgresql.ENUM('open', 'partially_filled', 'filled', 'cancelled', 'rejected', name='orderstatus')
+    # Create ENUM types (create_table이 다시 만들지 않도록 create_type=False)
+    orderside_enum = postgresql.ENUM('buy', 'sell', name='orderside', create_type=False)
+    ordertype_enum = postgresql.ENUM('limit', 'market', 'ioc', name='ordertype', create_type=False)
+    orderstatus_enum = postgresql.ENUM('open', 'partially_filled', 'filled', 'cancelled', 'rejected', name='orderstatus', create_type=False)
     
     orderside_enum.create(op.get_bind())
     ordertype_enum.create(op.get_bind())
@@ -0,0 +1,37 @@
+"""Create klines table
+
+Revision ID: a7c41e05d2b8
+Revises: 3f2a9c1d7b64
+Create Date: 2026-10-17 19:02:37.514220
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c41e05d2b8'
+down_revision: Union[str, None] = '3f2a9c1d7b64'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Create klines table
+    op.create_table('klines',
+        sa.Column('symbol', sa.String(length=20), nullable=False),
+        sa.Column('interval', sa.String(length=3), nullable=False),
+        sa.Column('open_time', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('open', sa.Numeric(precision=20, scale=8), nullable=False),
+        sa.Column('high', sa.Numeric(precision=20, scale=8), nullable=False),
+        sa.Column('low', sa.Numeric(precision=20, scale=8), nullable=False),
+        sa.Column('close', sa.Numeric(precision=20, scale=8), nullable=False),
+        sa.Column('volume', sa.Numeric(precision=30, scale=8), nullable=False),
+        sa.Column('trade_count', sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint('symbol', 'interval', 'open_time')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('klines')
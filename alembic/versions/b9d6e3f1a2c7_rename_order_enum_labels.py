@@ -0,0 +1,52 @@
+"""Rename order enum labels to member names
+
+Revision ID: b9d6e3f1a2c7
+Revises: f4c2a8e6b1d3
+Create Date: 2026-10-17 23:12:40.517306
+
+"""
+from typing import Dict, List, Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'b9d6e3f1a2c7'
+down_revision: Union[str, None] = 'f4c2a8e6b1d3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# ORM(Enum(OrderSide) 등)과 COPY 저장은 enum 멤버 이름을 레이블로 쓰므로 초기 마이그레이션의 소문자 값을 맞춘다
+ENUM_LABELS: Dict[str, List[str]] = {
+    'orderside': ['BUY', 'SELL'],
+    'ordertype': ['LIMIT', 'MARKET', 'IOC'],
+    'orderstatus': ['OPEN', 'PARTIALLY_FILLED', 'FILLED', 'CANCELLED', 'REJECTED'],
+}
+
+
+def _existing_labels(type_name: str) -> List[str]:
+    return list(op.get_bind().execute(
+        sa.text("SELECT enumlabel FROM pg_enum WHERE enumtypid = CAST(:name AS regtype)"), {"name": type_name}
+    ).scalars())
+
+
+def _rename(source, target) -> None:
+    for type_name, labels in ENUM_LABELS.items():
+        # create_all로 만든 뒤 stamp한 DB는 이미 이름 레이블이므로 있는 레이블만 바꾼다
+        if context.is_offline_mode():
+            existing = [source(label) for label in labels]
+        else:
+            existing = _existing_labels(type_name)
+        for label in labels:
+            old, new = source(label), target(label)
+            if old in existing and new not in existing:
+                # 부분 인덱스 조건/기본값은 레이블이 아니라 enum 값 OID를 참조하므로 그대로 유지됨
+                op.execute(f"ALTER TYPE {type_name} RENAME VALUE '{old}' TO '{new}'")
+
+
+def upgrade() -> None:
+    _rename(str.lower, str)
+
+
+def downgrade() -> None:
+    _rename(str, str.lower)
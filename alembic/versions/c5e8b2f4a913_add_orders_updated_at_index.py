@@ -0,0 +1,28 @@
+"""Add orders updated_at index
+
+Revision ID: c5e8b2f4a913
+Revises: a7c41e05d2b8
+Create Date: 2026-10-17 19:02:37.514228
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'c5e8b2f4a913'
+down_revision: Union[str, None] = 'a7c41e05d2b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 스냅샷 이후 변경분 조회용 (대용량 테이블 잠금을 피하기 위해 CONCURRENTLY로 생성)
+    with op.get_context().autocommit_block():
+        op.create_index('ix_orders_updated_at', 'orders', ['updated_at'], unique=False, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_orders_updated_at', table_name='orders', postgresql_concurrently=True)
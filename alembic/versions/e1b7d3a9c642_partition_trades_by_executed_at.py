@@ -0,0 +1,98 @@
+"""Partition trades by executed_at
+
+Revision ID: e1b7d3a9c642
+Revises: c5e8b2f4a913
+Create Date: 2026-10-17 20:14:08.227615
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = 'e1b7d3a9c642'
+down_revision: Union[str, None] = 'c5e8b2f4a913'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TRADE_INDEXES = (
+    'ix_trades_symbol',
+    'ix_trades_buy_order_id',
+    'ix_trades_sell_order_id',
+    'ix_trades_symbol_executed_at_id',
+)
+
+
+def _trade_columns() -> list:
+    return [
+        sa.Column('id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('buy_order_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('sell_order_id', postgresql.UUID(as_uuid=True), nullable=False),
+        sa.Column('symbol', sa.String(length=20), nullable=False),
+        sa.Column('price', sa.Numeric(precision=20, scale=8), nullable=False),
+        sa.Column('quantity', sa.Numeric(precision=20, scale=8), nullable=False),
+        sa.Column('executed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+        sa.ForeignKeyConstraint(['buy_order_id'], ['orders.id'], ),
+        sa.ForeignKeyConstraint(['sell_order_id'], ['orders.id'], ),
+    ]
+
+
+def _create_trade_indexes() -> None:
+    op.create_index(op.f('ix_trades_symbol'), 'trades', ['symbol'], unique=False)
+    op.create_index(op.f('ix_trades_buy_order_id'), 'trades', ['buy_order_id'], unique=False)
+    op.create_index(op.f('ix_trades_sell_order_id'), 'trades', ['sell_order_id'], unique=False)
+    op.create_index('ix_trades_symbol_executed_at_id', 'trades', ['symbol', sa.text('executed_at DESC'), 'id'], unique=False)
+
+
+def upgrade() -> None:
+    # 기존 테이블은 이름만 바꿔 첫 파티션(과거 ~ 내일 0시 UTC)으로 붙인다 (데이터 복사 없음)
+    # 테이블 잠금이 필요하므로 서버를 내린 상태에서 실행
+    # 기존 id 기본 키는 버리고 부모 테이블 기본 키 (id, executed_at)의 파티션 인덱스를 새로 만든다
+    op.drop_constraint('trades_pkey', 'trades', type_='primary')
+    op.rename_table('trades', 'trades_legacy')
+    for name in TRADE_INDEXES:
+        op.execute(f'ALTER INDEX {name} RENAME TO {name.replace("trades", "trades_legacy", 1)}')
+    for column in ('buy_order_id', 'sell_order_id'):
+        op.execute(f'ALTER TABLE trades_legacy RENAME CONSTRAINT trades_{column}_fkey TO trades_legacy_{column}_fkey')
+
+    # 파티션 키가 포함되어야 하므로 기본 키는 (id, executed_at)
+    op.create_table('trades',
+        *_trade_columns(),
+        sa.PrimaryKeyConstraint('id', 'executed_at'),
+        postgresql_partition_by='RANGE (executed_at)'
+    )
+    _create_trade_indexes()
+
+    # 같은 정의의 기존 인덱스/외래 키는 그대로 파티션 쪽으로 연결된다
+    op.execute("""
+        DO $$
+        DECLARE
+            upper_bound timestamptz;
+        BEGIN
+            SELECT (date_trunc('day', greatest(now(), max(executed_at)) AT TIME ZONE 'UTC') + interval '1 day') AT TIME ZONE 'UTC'
+            INTO upper_bound
+            FROM trades_legacy;
+            EXECUTE format('ALTER TABLE trades ATTACH PARTITION trades_legacy FOR VALUES FROM (MINVALUE) TO (%L)', upper_bound);
+        END
+        $$
+    """)
+
+    # 범위 파티션이 없는 시각의 체결을 받는 기본 파티션 (일별 파티션은 애플리케이션이 미리 생성)
+    op.execute('CREATE TABLE trades_default PARTITION OF trades DEFAULT')
+
+
+def downgrade() -> None:
+    # 파티션 행을 일반 테이블로 옮긴다 (이미 Parquet로 아카이브된 체결은 복원되지 않음)
+    op.create_table('trades_unpartitioned',
+        *_trade_columns(),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.execute('INSERT INTO trades_unpartitioned SELECT * FROM trades')
+    op.drop_table('trades')
+    op.rename_table('trades_unpartitioned', 'trades')
+    op.execute('ALTER INDEX trades_unpartitioned_pkey RENAME TO trades_pkey')
+    for column in ('buy_order_id', 'sell_order_id'):
+        op.execute(f'ALTER TABLE trades RENAME CONSTRAINT trades_unpartitioned_{column}_fkey TO trades_{column}_fkey')
+    _create_trade_indexes()
@@ -0,0 +1,49 @@
+"""Add orders client_order_id unique index
+
+Revision ID: f4c2a8e6b1d3
+Revises: e1b7d3a9c642
+Create Date: 2026-10-17 21:36:52.904117
+
+"""
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c2a8e6b1d3'
+down_revision: Union[str, None] = 'e1b7d3a9c642'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+LIVE_STATUSES = ('OPEN', 'PARTIALLY_FILLED')
+
+
+def _live_status_labels() -> list:
+    # 초기 마이그레이션은 소문자 값, create_all은 enum 이름으로 orderstatus 타입을 만들므로 실제 레이블을 따른다
+    if context.is_offline_mode():
+        return list(LIVE_STATUSES)
+    labels = op.get_bind().execute(
+        sa.text("SELECT enumlabel FROM pg_enum WHERE enumtypid = 'orderstatus'::regtype")
+    ).scalars()
+    return [label for label in labels if label.upper() in LIVE_STATUSES]
+
+
+def upgrade() -> None:
+    # 대기 주문만 (user_id, client_order_id) 유일 (종료된 주문의 ID는 재사용 가능)
+    # 중복 제출은 엔진 인메모리 색인에서 걸러지고, 이 인덱스는 그 뒤의 안전장치
+    statuses = ", ".join(f"'{label}'" for label in _live_status_labels())
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_orders_user_id_client_order_id',
+            'orders',
+            ['user_id', 'client_order_id'],
+            unique=True,
+            postgresql_where=sa.text(f"client_order_id IS NOT NULL AND status IN ({statuses})"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index('ix_orders_user_id_client_order_id', table_name='orders', postgresql_concurrently=True)
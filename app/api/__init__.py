@@ -1,3 +1,3 @@
-from . import orders, trades
+from . import orders, trades, orderbook, klines, metrics
 
-__all__ = ["orders", "trades"]
+__all__ = ["orders", "trades", "orderbook", "klines", "metrics"]
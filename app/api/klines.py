@@ -0,0 +1,64 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Optional
+from datetime import datetime, timedelta, timezone
+
+from app.db.database import get_read_db
+from app.core.klines import INTERVALS, INTERVAL_LEVELS, kline_aggregator, from_epoch, to_epoch
+from app.core.symbols import symbol_registry
+from app.models.kline import KlineInterval
+from app.services.kline_service import KlineService
+from app.schemas.kline import KlineResponse, KlineListResponse
+
+router = APIRouter(prefix="/klines", tags=["klines"])
+
+
+@router.get("/{symbol}", response_model=KlineListResponse)
+async def get_klines(
+    symbol: str,
+    interval: KlineInterval = Query(KlineInterval.ONE_MINUTE, description="캔들 주기 (1m/5m/1h/1d)"),
+    start_time: Optional[datetime] = Query(None, description="시작 시간 (캔들 시작 시각 기준)"),
+    end_time: Optional[datetime] = Query(None, description="종료 시간 (캔들 시작 시각 기준)"),
+    limit: int = Query(500, ge=1, le=1000, description="조회 개수"),
+    db: AsyncSession = Depends(get_read_db)
+):
+    """캔들 조회 (마감 캔들은 롤업 테이블, 진행 중 캔들은 메모리에서 조회)"""
+    seconds = INTERVALS[INTERVAL_LEVELS[interval]][1]
+    spec = symbol_registry.get(symbol)
+    
+    klines: Dict[datetime, KlineResponse] = {}
+    rows = await KlineService(db).get_klines(symbol, interval, start_time, end_time, limit)
+    for row in rows:
+        klines[row.open_time] = KlineResponse(
+            open_time=row.open_time,
+            close_time=row.open_time + timedelta(seconds=seconds),
+            open=row.open,
+            high=row.high,
+            low=row.low,
+            close=row.close,
+            volume=row.volume,
+            trade_count=row.trade_count
+        )
+    
+    # 아직 저장되지 않은 마감 캔들과 진행 중 캔들로 덮어씀
+    now = to_epoch(datetime.now(timezone.utc))
+    for candle in kline_aggregator.recent(symbol, interval, now):
+        open_time = from_epoch(candle.open_time)
+        if (start_time and open_time < start_time) or (end_time and open_time > end_time):
+            continue
+        klines[open_time] = KlineResponse(
+            open_time=open_time,
+            close_time=from_epoch(candle.open_time + seconds),
+            open=spec.from_ticks(candle.open),
+            high=spec.from_ticks(candle.high),
+            low=spec.from_ticks(candle.low),
+            close=spec.from_ticks(candle.close),
+            volume=spec.from_lots(candle.volume),
+            trade_count=candle.trade_count
+        )
+    
+    return KlineListResponse(
+        symbol=symbol,
+        interval=interval,
+        klines=[klines[open_time] for open_time in sorted(klines)][-limit:]
+    )
@@ -0,0 +1,107 @@
+import time
+from typing import Any, Dict
+
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+from app.core.matching_engine import matching_engine
+from app.core.metrics import Histogram, http_request_latency, metrics_registry
+from app.core.orderbook import order_book_manager
+from app.db.database import engine, replica_engine, replica_router
+from app.services.write_behind import write_behind_pipeline
+
+router = APIRouter(tags=["metrics"])
+
+# Prometheus 텍스트 노출 형식 (charset은 응답 클래스가 붙임)
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4"
+# 레이블로 그대로 쓰는 HTTP 메서드 (그 밖의 임의 메서드는 하나로 묶어 시계열이 늘지 않게 함)
+HTTP_METHODS = frozenset(("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"))
+OTHER_METHOD = "OTHER"
+
+
+def _book_stats(attribute: str) -> Dict[str, float]:
+    books = order_book_manager.books
+    if attribute == "orders":
+        return {symbol: len(book) for symbol, book in books.items()}
+    return {symbol: len(getattr(book, attribute)) for symbol, book in books.items()}
+
+
+def _pool_stat(name: str, db_engine: Any = engine) -> float:
+    pool = db_engine.sync_engine.pool
+    stat = getattr(pool, name, None)
+    return stat() if stat is not None else 0
+
+
+# 조회 시점에 읽는 게이지
+metrics_registry.gauge(
+    "vx_engine_queue_depth", "심볼별 시퀀서 대기열 길이", matching_engine.queue_depths, labels=("symbol",),
+)
+metrics_registry.gauge(
+    "vx_book_orders", "심볼별 오더북 대기 주문 수", lambda: _book_stats("orders"), labels=("symbol",),
+)
+metrics_registry.gauge(
+    "vx_book_bid_levels", "심볼별 매수 호가 레벨 수", lambda: _book_stats("bids"), labels=("symbol",),
+)
+metrics_registry.gauge(
+    "vx_book_ask_levels", "심볼별 매도 호가 레벨 수", lambda: _book_stats("asks"), labels=("symbol",),
+)
+metrics_registry.gauge(
+    "vx_persist_backlog", "저장 대기 중인 처리 결과 수", lambda: write_behind_pipeline.backlog,
+)
+metrics_registry.gauge(
+    "vx_engine_halted", "영속화 장애로 엔진이 명령 접수를 멈춘 상태면 1", lambda: int(matching_engine.halted is not None),
+)
+metrics_registry.gauge("vx_db_pool_size", "DB 커넥션 풀 크기", lambda: _pool_stat("size"))
+metrics_registry.gauge("vx_db_pool_checked_out", "사용 중인 DB 커넥션 수", lambda: _pool_stat("checkedout"))
+metrics_registry.gauge(
+    "vx_db_pool_overflow", "풀 크기를 넘어 연 DB 커넥션 수", lambda: max(_pool_stat("overflow"), 0),
+)
+if replica_router is not None:
+    metrics_registry.gauge(
+        "vx_db_replica_pool_checked_out", "사용 중인 읽기 복제본 커넥션 수",
+        lambda: _pool_stat("checkedout", replica_engine),
+    )
+    metrics_registry.gauge(
+        "vx_db_replica_lag_seconds", "읽기 복제본 복제 지연 (측정 실패 시 -1)",
+        lambda: -1 if replica_router.lag is None else replica_router.lag,
+    )
+    metrics_registry.gauge(
+        "vx_db_replica_active", "조회를 읽기 복제본으로 보내는 중이면 1", lambda: int(replica_router.available),
+    )
+
+
+class RequestMetricsMiddleware:
+    """라우트 템플릿별 HTTP 요청 처리 시간 기록 (순수 ASGI 미들웨어)"""
+
+    def __init__(self, app: Any):
+        self.app = app
+        # 메서드 → 라우트 경로 → Histogram (요청마다 레이블 문자열을 만들지 않도록)
+        self._histograms: Dict[str, Dict[str, Histogram]] = {}
+
+    async def __call__(self, scope: Dict[str, Any], receive: Any, send: Any) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        started = time.perf_counter_ns()
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            method = scope["method"]
+            if method not in HTTP_METHODS:
+                method = OTHER_METHOD
+            route = scope.get("route")
+            # 매칭된 라우트가 없으면(404 등) unmatched로 기록
+            path = route.path if route is not None else "unmatched"
+            by_path = self._histograms.get(method)
+            if by_path is None:
+                by_path = self._histograms[method] = {}
+            histogram = by_path.get(path)
+            if histogram is None:
+                histogram = by_path[path] = http_request_latency.child(method, path)
+            histogram.record_since(started)
+
+
+@router.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """Prometheus 지표"""
+    return Response(content=metrics_registry.render(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -0,0 +1,25 @@
+from fastapi import APIRouter, Query
+from fastapi.responses import Response
+
+from app.core.depth_cache import depth_cache
+from app.schemas.orderbook import OrderBookResponse, OrderBookDepthResponse
+
+router = APIRouter(prefix="/orderbook", tags=["orderbook"])
+
+
+@router.get("/{symbol}", response_model=OrderBookResponse)
+async def get_orderbook(
+    symbol: str,
+    depth: int = Query(20, ge=1, le=100, description="오더북 깊이")
+):
+    """오더북 조회 (인메모리 레벨 집계, 캐시된 스냅샷)"""
+    return Response(content=depth_cache.orderbook(symbol, depth), media_type="application/json")
+
+
+@router.get("/{symbol}/depth", response_model=OrderBookDepthResponse)
+async def get_orderbook_depth(
+    symbol: str,
+    depth: int = Query(20, ge=1, le=100, description="오더북 깊이")
+):
+    """오더북 깊이 조회"""
+    return Response(content=depth_cache.depth(symbol, depth), media_type="application/json")
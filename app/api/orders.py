@@ -1,45 +1,108 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
-from typing import List, Optional, cast
+from typing import List, Optional
 from uuid import UUID
-from datetime import datetime
+from datetime import datetime, timezone
 
-from app.db.database import get_db
+from app.db.database import get_read_db, get_write_db, read_sessions
+from app.core.matching_engine import EngineHaltedError, matching_engine
 from app.services.order_service import OrderService
 from app.schemas.order import (
     OrderCreate,
     OrderResponse,
     OrderListResponse,
     OrderCancelRequest,
-    OrderCancelResponse
+    OrderCancelResponse,
+    OrderAmendRequest,
+    OrderBatchCreate,
+    OrderBatchResult,
+    OrderBatchResponse,
+    OrderMassCancelRequest,
+    OrderMassCancelResponse
 )
+from app.schemas.pagination import decode_cursor, encode_cursor
+from app.schemas.encoding import EXPORT_MEDIA_TYPES, export_header, export_rows, list_response
 from app.models.order import OrderStatus
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
 
 @router.post("/", response_model=OrderResponse, status_code=201)
-async def create_order(
-    order_data: OrderCreate,
-    db: AsyncSession = Depends(get_db)
-):
-    """주문 생성"""
+async def create_order(order_data: OrderCreate):
+    """주문 생성 (심볼 시퀀서에서 매칭 후 응답)"""
     try:
-        order_service = OrderService(db)
-        order = await order_service.create_order(order_data)
-        return OrderResponse.model_validate(order)
+        report = await matching_engine.submit_order(order_data)
+        return OrderResponse.model_validate(report.order)
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except EngineHaltedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail="주문 생성 중 오류가 발생했습니다.")
 
 
+@router.post("/batch", response_model=OrderBatchResponse, status_code=201)
+async def create_orders_batch(batch: OrderBatchCreate):
+    """주문 일괄 생성 (심볼별 단일 명령, 단일 영속화 배치)"""
+    try:
+        outcomes = await matching_engine.submit_batch(batch.orders)
+    except EngineHaltedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="주문 일괄 생성 중 오류가 발생했습니다.")
+    
+    results = []
+    for index, outcome in enumerate(outcomes):
+        if isinstance(outcome, Exception):
+            results.append(OrderBatchResult(index=index, success=False, error=str(outcome)))
+        else:
+            results.append(OrderBatchResult(
+                index=index,
+                success=True,
+                order=OrderResponse.model_validate(outcome.order)
+            ))
+    
+    accepted = sum(1 for result in results if result.success)
+    return OrderBatchResponse(
+        results=results,
+        accepted=accepted,
+        rejected=len(results) - accepted
+    )
+
+
+@router.get("/export")
+async def export_orders(
+    symbol: Optional[str] = Query(None, description="거래 심볼"),
+    user_id: Optional[str] = Query(None, description="사용자 ID"),
+    status: Optional[OrderStatus] = Query(None, description="주문 상태"),
+    start_time: Optional[datetime] = Query(None, description="생성 시작 시간"),
+    end_time: Optional[datetime] = Query(None, description="생성 종료 시간"),
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="출력 형식 (ndjson, csv)")
+):
+    """조건에 맞는 주문 전체를 NDJSON/CSV로 스트리밍 (서버 측 커서로 묶음마다 바로 전송, 순서 보장 없음)"""
+    async def body():
+        header = export_header(OrderResponse.model_fields, export_format)
+        if header:
+            yield header
+        # 응답이 끝날 때까지 커서를 유지해야 하므로 요청 의존성 대신 전용 세션 사용
+        async with read_sessions()() as db:
+            async for rows in OrderService(db).stream_order_rows(symbol, user_id, status, start_time, end_time):
+                yield export_rows(rows, export_format)
+    
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="orders.{export_format}"'}
+    )
+
+
 @router.get("/{order_id}", response_model=OrderResponse)
 async def get_order(
     order_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
-    """주문 조회"""
+    """주문 조회 (방금 처리한 주문도 보이도록 주 DB에서)"""
     order_service = OrderService(db)
     order = await order_service.get_order(order_id)
     
@@ -55,56 +118,131 @@ async def get_orders(
     user_id: Optional[str] = Query(None, description="사용자 ID"),
     status: Optional[OrderStatus] = Query(None, description="주문 상태"),
     limit: int = Query(100, ge=1, le=1000, description="조회 개수"),
-    offset: int = Query(0, ge=0, description="오프셋"),
-    db: AsyncSession = Depends(get_db)
+    offset: int = Query(0, ge=0, description="오프셋 (cursor가 없을 때만 사용)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """주문 목록 조회"""
+    """주문 목록 조회 (ORM/스키마 변환 없이 컬럼 튜플을 바로 JSON으로)"""
+    try:
+        after = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     order_service = OrderService(db)
-    orders = await order_service.get_orders(
+    orders = await order_service.get_order_rows(
         symbol=symbol,
         user_id=user_id,
         status=status,
         limit=limit,
-        offset=offset
+        offset=offset,
+        cursor=after
     )
     
-    # 모델을 스키마로 변환
-    order_responses = [OrderResponse.model_validate(order) for order in orders]
+    next_cursor = None
+    if len(orders) == limit:
+        next_cursor = encode_cursor(orders[-1].created_at, orders[-1].id)
     
-    return OrderListResponse(
-        orders=order_responses,
-        total=len(orders),  # 실제로는 전체 개수를 별도로 조회해야 함
-        page=offset // limit + 1,
-        size=limit
-    )
+    # total은 이번 페이지 건수 (전체 개수는 별도 조회 필요)
+    content = list_response("orders", orders, page=offset // limit + 1, size=limit, next_cursor=next_cursor)
+    return Response(content=content, media_type="application/json")
 
 
 @router.delete("/{order_id}", response_model=OrderCancelResponse)
 async def cancel_order(
     order_id: UUID,
     cancel_request: OrderCancelRequest,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_write_db)
 ):
     """주문 취소"""
     order_service = OrderService(db)
     
     try:
-        order = await order_service.cancel_order(
+        report = await matching_engine.cancel_order(
             order_id=order_id,
             user_id=cancel_request.user_id
         )
         
-        if not order:
-            raise HTTPException(status_code=404, detail="주문을 찾을 수 없습니다.")
+        if not report:
+            # 오더북에 없는 주문: 존재 여부와 상태를 DB에서 확인
+            order = await order_service.get_order(order_id)
+            if not order or (cancel_request.user_id and order.user_id != cancel_request.user_id):
+                raise HTTPException(status_code=404, detail="주문을 찾을 수 없습니다.")
+            raise ValueError(f"주문 상태가 취소 가능하지 않습니다: {order.status}")
         
         return OrderCancelResponse(
-            order_id=cast(UUID, order.id),
-            status=cast(OrderStatus, order.status),
-            cancelled_at=cast(datetime, order.updated_at),
+            order_id=report.order.id,
+            status=report.order.status,
+            cancelled_at=report.order.updated_at,
             message="주문이 성공적으로 취소되었습니다."
         )
         
+    except HTTPException:
+        raise
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
+    except EngineHaltedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
-        raise HTTPException(status_code=500, detail="주문 취소 중 오류가 발생했습니다.") 
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="주문 취소 중 오류가 발생했습니다.")
+
+
+@router.patch("/{order_id}", response_model=OrderResponse)
+async def amend_order(
+    order_id: UUID,
+    amend_request: OrderAmendRequest,
+    db: AsyncSession = Depends(get_write_db)
+):
+    """대기 주문 정정 (같은 가격에서 수량을 줄이면 대기열 위치 유지)"""
+    order_service = OrderService(db)
+    
+    try:
+        report = await matching_engine.amend_order(
+            order_id=order_id,
+            user_id=amend_request.user_id,
+            price=amend_request.price,
+            quantity=amend_request.quantity
+        )
+        
+        if not report:
+            # 오더북에 없는 주문: 존재 여부와 상태를 DB에서 확인
+            order = await order_service.get_order(order_id)
+            if not order or (amend_request.user_id and order.user_id != amend_request.user_id):
+                raise HTTPException(status_code=404, detail="주문을 찾을 수 없습니다.")
+            raise ValueError(f"주문 상태가 정정 가능하지 않습니다: {order.status}")
+        
+        return OrderResponse.model_validate(report.order)
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except EngineHaltedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="주문 정정 중 오류가 발생했습니다.")
+
+
+@router.post("/mass-cancel", response_model=OrderMassCancelResponse)
+async def mass_cancel_orders(cancel_request: OrderMassCancelRequest):
+    """조건(심볼/사용자/방향/가격 범위)에 맞는 대기 주문 일괄 취소"""
+    try:
+        cancelled = await matching_engine.mass_cancel(
+            symbol=cancel_request.symbol,
+            user_id=cancel_request.user_id,
+            side=cancel_request.side,
+            min_price=cancel_request.min_price,
+            max_price=cancel_request.max_price
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except EngineHaltedError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail="주문 일괄 취소 중 오류가 발생했습니다.")
+    
+    return OrderMassCancelResponse(
+        cancelled_order_ids=[order.id for order in cancelled],
+        count=len(cancelled),
+        cancelled_at=max((order.updated_at for order in cancelled), default=datetime.now(timezone.utc)),
+        message=f"{len(cancelled)}건의 주문이 취소되었습니다."
+    )
@@ -1,20 +1,48 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 from uuid import UUID
 from datetime import datetime
 
-from app.db.database import get_db
+from app.db.database import get_read_db, read_sessions
+from app.core.recent_trades import recent_trades
 from app.services.trade_service import TradeService
 from app.schemas.trade import TradeResponse, TradeListResponse
+from app.schemas.pagination import decode_cursor, encode_cursor
+from app.schemas.encoding import EXPORT_MEDIA_TYPES, export_header, export_rows, list_response
 
 router = APIRouter(prefix="/trades", tags=["trades"])
 
 
+@router.get("/export")
+async def export_trades(
+    symbol: Optional[str] = Query(None, description="거래 심볼"),
+    start_time: Optional[datetime] = Query(None, description="시작 시간"),
+    end_time: Optional[datetime] = Query(None, description="종료 시간"),
+    export_format: str = Query("ndjson", alias="format", pattern="^(ndjson|csv)$", description="출력 형식 (ndjson, csv)")
+):
+    """조건에 맞는 체결 전체를 NDJSON/CSV로 스트리밍 (서버 측 커서로 묶음마다 바로 전송, 순서 보장 없음)"""
+    async def body():
+        header = export_header(TradeResponse.model_fields, export_format)
+        if header:
+            yield header
+        # 응답이 끝날 때까지 커서를 유지해야 하므로 요청 의존성 대신 전용 세션 사용
+        async with read_sessions()() as db:
+            async for rows in TradeService(db).stream_trade_rows(symbol, start_time, end_time):
+                yield export_rows(rows, export_format)
+    
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="trades.{export_format}"'}
+    )
+
+
 @router.get("/{trade_id}", response_model=TradeResponse)
 async def get_trade(
     trade_id: UUID,
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
     """체결 조회"""
     trade_service = TradeService(db)
@@ -32,46 +60,45 @@ async def get_trades(
     start_time: Optional[datetime] = Query(None, description="시작 시간"),
     end_time: Optional[datetime] = Query(None, description="종료 시간"),
     limit: int = Query(100, ge=1, le=1000, description="조회 개수"),
-    offset: int = Query(0, ge=0, description="오프셋"),
-    db: AsyncSession = Depends(get_db)
+    offset: int = Query(0, ge=0, description="오프셋 (cursor가 없을 때만 사용)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """체결 목록 조회"""
+    """체결 목록 조회 (ORM/스키마 변환 없이 컬럼 튜플을 바로 JSON으로)"""
+    try:
+        after = decode_cursor(cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
     trade_service = TradeService(db)
-    trades = await trade_service.get_trades(
+    trades = await trade_service.get_trade_rows(
         symbol=symbol,
         start_time=start_time,
         end_time=end_time,
         limit=limit,
-        offset=offset
+        offset=offset,
+        cursor=after
     )
     
-    # 모델을 스키마로 변환
-    trade_responses = [TradeResponse.model_validate(trade) for trade in trades]
+    next_cursor = None
+    if len(trades) == limit:
+        next_cursor = encode_cursor(trades[-1].executed_at, trades[-1].id)
     
-    return TradeListResponse(
-        trades=trade_responses,
-        total=len(trades),  # 실제로는 전체 개수를 별도로 조회해야 함
-        page=offset // limit + 1,
-        size=limit
-    )
+    # total은 이번 페이지 건수 (전체 개수는 별도 조회 필요)
+    content = list_response("trades", trades, page=offset // limit + 1, size=limit, next_cursor=next_cursor)
+    return Response(content=content, media_type="application/json")
 
 
 @router.get("/symbol/{symbol}", response_model=TradeListResponse)
 async def get_trades_by_symbol(
     symbol: str,
     limit: int = Query(100, ge=1, le=1000, description="조회 개수"),
-    db: AsyncSession = Depends(get_db)
+    db: AsyncSession = Depends(get_read_db)
 ):
-    """특정 심볼의 체결 내역 조회"""
-    trade_service = TradeService(db)
-    trades = await trade_service.get_trades_by_symbol(symbol, limit)
-    
-    # 모델을 스키마로 변환
-    trade_responses = [TradeResponse.model_validate(trade) for trade in trades]
+    """특정 심볼의 최근 체결 내역 조회 (버퍼 크기 이내는 메모리에서 응답)"""
+    if recent_trades.covers(limit):
+        return Response(content=recent_trades.latest(symbol, limit), media_type="application/json")
     
-    return TradeListResponse(
-        trades=trade_responses,
-        total=len(trades),
-        page=1,
-        size=limit
-    ) 
\ No newline at end of file
+    trade_service = TradeService(db)
+    trades = await trade_service.get_trade_rows_by_symbol(symbol, limit)
+    return Response(content=list_response("trades", trades, page=1, size=limit), media_type="application/json") 
\ No newline at end of file
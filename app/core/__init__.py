@@ -0,0 +1,83 @@
+from .symbols import SymbolSpec, SymbolRegistry, UnknownSymbolError, symbol_registry
+from .orderbook import BookOrder, PriceLevel, OrderBook, OrderBookManager, order_book_manager
+from .client_orders import ClientOrderIndex
+from .matching_engine import (
+    OrderState,
+    TradeEvent,
+    ExecutionReport,
+    MassCancelReport,
+    EngineHaltedError,
+    SymbolEngine,
+    SymbolSequencer,
+    MatchingEngine,
+    matching_engine
+)
+from .depth_cache import DepthCache, depth_cache
+from .klines import Candle, SymbolKlines, KlineAggregator, kline_aggregator
+from .journal import JournalRecord, SymbolJournal, EngineJournal, engine_journal
+from .snapshot import SnapshotInfo, SnapshotStore, SnapshotWriter, snapshot_store, snapshot_writer
+from .metrics import Histogram, MetricsRegistry, metrics_registry
+from .ring import SharedRing
+from .sharding import ClusterLayout, RemoteSequencer, ShardClient, ShardServer
+
+__all__ = [
+    # Symbol specs
+    "SymbolSpec",
+    "SymbolRegistry",
+    "UnknownSymbolError",
+    "symbol_registry",
+    
+    # Order book
+    "BookOrder",
+    "PriceLevel",
+    "OrderBook",
+    "OrderBookManager",
+    "order_book_manager",
+    
+    # Matching engine
+    "OrderState",
+    "TradeEvent",
+    "ExecutionReport",
+    "MassCancelReport",
+    "EngineHaltedError",
+    "SymbolEngine",
+    "SymbolSequencer",
+    "MatchingEngine",
+    "matching_engine",
+    "ClientOrderIndex",
+    
+    # Depth cache
+    "DepthCache",
+    "depth_cache",
+    
+    # Klines
+    "Candle",
+    "SymbolKlines",
+    "KlineAggregator",
+    "kline_aggregator",
+    
+    # Command journal
+    "JournalRecord",
+    "SymbolJournal",
+    "EngineJournal",
+    "engine_journal",
+    
+    # Order book snapshots
+    "SnapshotInfo",
+    "SnapshotStore",
+    "SnapshotWriter",
+    "snapshot_store",
+    "snapshot_writer",
+    
+    # Metrics
+    "Histogram",
+    "MetricsRegistry",
+    "metrics_registry",
+    
+    # Engine sharding
+    "SharedRing",
+    "ClusterLayout",
+    "RemoteSequencer",
+    "ShardClient",
+    "ShardServer"
+]
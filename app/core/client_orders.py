@@ -0,0 +1,102 @@
+import os
+from collections import deque
+from datetime import datetime, timedelta
+from typing import TYPE_CHECKING, Deque, Dict, Iterable, Optional, Tuple
+
+from app.models.order import OrderStatus
+
+if TYPE_CHECKING:
+    from app.core.matching_engine import OrderState
+
+# 종료된 주문의 클라이언트 주문 ID를 중복 제출 판정에 유지하는 시간 (대기 주문은 종료될 때까지 유지)
+CLIENT_ORDER_TTL_S = float(os.getenv("CLIENT_ORDER_TTL_S", "600"))
+
+ClientOrderKey = Tuple[Optional[str], str]
+
+_LIVE_STATUSES = (OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED)
+
+
+class ClientOrderIndex:
+    """(user_id, client_order_id) → 주문 최신 상태 색인 (중복 제출 판정용)
+
+    시퀀서 태스크에서만 호출하므로 락을 사용하지 않는다. 종료된 주문은
+    만료 대기열에 넣고 조회 시점에 만료분을 앞에서부터 정리한다.
+    """
+
+    def __init__(self, ttl: float = CLIENT_ORDER_TTL_S):
+        self.ttl = timedelta(seconds=ttl)
+        self._orders: Dict[ClientOrderKey, "OrderState"] = {}
+        # (만료 시각, 키, 종료 상태) - 종료 처리 순서 = 만료 순서
+        self._expiry: Deque[Tuple[datetime, ClientOrderKey, "OrderState"]] = deque()
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    @staticmethod
+    def key(order: "OrderState") -> Optional[ClientOrderKey]:
+        if order.client_order_id is None:
+            return None
+        return order.user_id, order.client_order_id
+
+    def claim(self, order: "OrderState", now: datetime) -> Optional["OrderState"]:
+        """이미 제출된 주문이면 그 최신 상태를, 아니면 새 주문을 등록하고 None 반환"""
+        key = self.key(order)
+        if key is None:
+            return None
+        self._expire(now)
+        existing = self._orders.get(key)
+        if existing is not None:
+            return existing
+        # 처리 중 주문 객체가 그대로 갱신되므로 매칭 결과도 따로 반영할 필요 없음
+        self._orders[key] = order
+        return None
+
+    def release(self, order: "OrderState") -> None:
+        """처리에 실패한 주문 등록 취소"""
+        key = self.key(order)
+        if key is not None and self._orders.get(key) is order:
+            del self._orders[key]
+
+    def update(self, orders: Iterable["OrderState"], now: datetime) -> None:
+        """처리 결과의 주문 상태 반영 (종료된 주문은 만료 예약)"""
+        for state in orders:
+            key = self.key(state)
+            if key is None:
+                continue
+            current = self._orders.get(key)
+            # 색인에 없거나 같은 키를 재사용한 다른 주문이면 무시
+            if current is None or current.id != state.id:
+                continue
+            self._orders[key] = state
+            if state.status not in _LIVE_STATUSES:
+                self._expiry.append((now + self.ttl, key, state))
+
+    def restore(self, orders: Iterable["OrderState"], now: datetime) -> None:
+        """재시작 후 주문 상태 등록 (대기 주문은 종료될 때까지, 종료된 주문은 종료 시각부터 ttl 동안)
+
+        만료 대기열 순서를 지키도록 종료된 주문은 시작 시점(대기열이 빈 상태)에만 넘긴다.
+        """
+        finished: Dict[ClientOrderKey, "OrderState"] = {}
+        for state in orders:
+            key = self.key(state)
+            if key is None:
+                continue
+            if state.status in _LIVE_STATUSES:
+                self._orders[key] = state
+            elif state.updated_at + self.ttl > now:
+                # 같은 키를 재사용해 여러 번 종료됐으면 마지막 주문만
+                previous = finished.get(key)
+                if previous is None or previous.updated_at < state.updated_at:
+                    finished[key] = state
+        # 같은 키를 재사용한 대기 주문이 있으면 그 주문이 우선
+        for key, state in sorted(finished.items(), key=lambda item: item[1].updated_at):
+            if key not in self._orders:
+                self._orders[key] = state
+                self._expiry.append((state.updated_at + self.ttl, key, state))
+
+    def _expire(self, now: datetime) -> None:
+        expiry = self._expiry
+        while expiry and expiry[0][0] <= now:
+            _, key, state = expiry.popleft()
+            if self._orders.get(key) is state:
+                del self._orders[key]
@@ -0,0 +1,260 @@
+import argparse
+import asyncio
+import contextlib
+import functools
+import logging
+import multiprocessing
+import os
+import shutil
+import signal
+import sys
+import tempfile
+from multiprocessing.connection import Connection, wait
+from typing import Iterator, List, Optional, Tuple
+
+# 기본 HTTP 워커 수 / 엔진 샤드 수 / 워커-샤드 링 버퍼 크기
+HTTP_WORKERS = int(os.getenv("HTTP_WORKERS", "2"))
+ENGINE_SHARDS = int(os.getenv("ENGINE_SHARDS", "2"))
+ENGINE_RING_BYTES = int(os.getenv("ENGINE_RING_BYTES", str(1 << 20)))
+# 종료 신호 후 자식 프로세스를 기다리는 시간
+SHUTDOWN_TIMEOUT_S = 30.0
+
+logger = logging.getLogger("app.core.cluster")
+
+
+def _run_shard(
+    index: int,
+    layout: Tuple[str, int, int],
+    doorbell: Connection,
+    worker_bells: List[Connection],
+    ready: Connection,
+) -> None:
+    """엔진 샤드 프로세스 진입점"""
+    # 종료 순서(워커 → 샤드)는 런처가 정하므로 터미널 Ctrl+C는 무시
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    logging.basicConfig(level=logging.INFO, format=f"%(asctime)s shard-{index} %(levelname)s %(name)s: %(message)s")
+    asyncio.run(_serve_shard(index, layout, doorbell, worker_bells, ready))
+
+
+@contextlib.contextmanager
+def _shard_environment(index: int, shards: int, journal_dir: str, snapshot_dir: str) -> Iterator[None]:
+    """샤드 프로세스를 띄우는 동안 샤드별 저널/스냅샷 경로를 환경 변수로 설정
+
+    저널/스냅샷은 샤드마다 따로 둔다 (샤드 수가 바뀌면 새 디렉터리 → DB에서 복원).
+    spawn 자식은 이 모듈을 import하면서 app.core 패키지(저널/스냅샷 설정)를 먼저 읽으므로
+    진입점에서가 아니라 시작 전에 부모 환경에 넣어 둔다.
+    """
+    suffix = f"shard-{index}-of-{shards}"
+    values = {"ENGINE_JOURNAL_DIR": journal_dir, "ENGINE_SNAPSHOT_DIR": snapshot_dir}
+    for name, directory in values.items():
+        if directory:
+            os.environ[name] = os.path.join(directory, suffix)
+    try:
+        yield
+    finally:
+        for name in values:
+            os.environ.pop(name, None)
+
+
+async def _serve_shard(index: int, layout: Tuple[str, int, int], doorbell: Connection, worker_bells: List[Connection], ready: Connection) -> None:
+    from app.core.journal import engine_journal
+    from app.core.klines import kline_aggregator
+    from app.core.matching_engine import matching_engine
+    from app.core.sharding import ClusterLayout, ShardServer
+    from app.core.snapshot import snapshot_writer
+    from app.db.database import AsyncSessionLocal
+    from app.main import restore_order_books
+    from app.services.kline_service import KlineService, kline_flusher
+    from app.services.trade_archive import trade_archiver
+    from app.services.write_behind import write_behind_pipeline
+
+    layout = ClusterLayout(*layout)
+    owns = functools.partial(layout.owns, index)
+    await restore_order_books(owns)
+    async with AsyncSessionLocal() as db:
+        await KlineService(db).restore(kline_aggregator)
+    # 캔들 복원은 전체 심볼 대상이므로 다른 샤드 심볼은 버림 (저장 시 덮어쓰지 않도록)
+    kline_aggregator.retain(owns)
+
+    server = ShardServer(
+        matching_engine,
+        layout.shard_links(index, [bell.fileno() for bell in worker_bells]),
+        doorbell.fileno(),
+    )
+    write_behind_pipeline.start(matching_engine)
+    matching_engine.add_listener(kline_aggregator.on_engine_event)
+    matching_engine.start(persist=write_behind_pipeline.submit, journal=engine_journal, replicate=server.replicate)
+    server.start()
+    kline_flusher.start()
+    if snapshot_writer is not None:
+        snapshot_writer.start()
+    # 체결 파티션 관리/아카이브는 샤드 0 한 곳에서만
+    if index == 0:
+        trade_archiver.start()
+
+    stopping = asyncio.Event()
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, stopping.set)
+    restored = sum(len(book.orders()) for book in matching_engine.books.books.values())
+    print(f"⚙️ 엔진 샤드 {index} 시작: {len(matching_engine.books.books)}개 심볼, {restored}개 주문")
+    ready.send(index)
+    await stopping.wait()
+
+    await server.stop()
+    await matching_engine.stop()
+    await write_behind_pipeline.stop()
+    await kline_flusher.stop()
+    await trade_archiver.stop()
+    if snapshot_writer is not None:
+        await snapshot_writer.stop()
+    if engine_journal is not None:
+        engine_journal.close()
+    server.close()
+    print(f"🛑 엔진 샤드 {index} 종료")
+
+
+def _run_worker(index: int, layout: Tuple[str, int, int], doorbell: Connection, shard_bells: List[Connection], sock, options: dict) -> None:
+    """HTTP 워커 프로세스 진입점 (uvicorn 서버 + 엔진 샤드 연결)"""
+    import uvicorn
+
+    from app.core import sharding
+    from app.core.matching_engine import matching_engine
+    from app.core.orderbook import order_book_manager
+
+    sharding.cluster_worker = sharding.ShardClient(
+        sharding.ClusterLayout(*layout).worker_links(index, [bell.fileno() for bell in shard_bells]),
+        doorbell.fileno(),
+        order_book_manager,
+        matching_engine,
+    )
+    config = uvicorn.Config("app.main:app", **options)
+    uvicorn.Server(config).run(sockets=[sock])
+
+
+async def _create_tables() -> None:
+    from app.db.database import Base, engine
+    from app.services.trade_archive import trade_archiver
+
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    # 샤드가 체결을 저장하기 전에 파티션 생성 (이후 관리는 샤드 0)
+    await trade_archiver.ensure()
+    await engine.dispose()
+
+
+def _stop(processes: List[multiprocessing.Process], timeout: float) -> None:
+    for process in processes:
+        if process.is_alive():
+            process.terminate()
+    for process in processes:
+        process.join(timeout)
+        if process.is_alive():
+            logger.warning("%s가 종료되지 않아 강제 종료합니다.", process.name)
+            process.kill()
+            process.join()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.core.cluster",
+        description="HTTP 워커 N개 + 심볼 해시 기반 엔진 샤드 M개로 실행 (공유 메모리 링으로 통신)",
+    )
+    parser.add_argument("--host", default="0.0.0.0")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--workers", type=int, default=HTTP_WORKERS, help="HTTP 워커 프로세스 수")
+    parser.add_argument("--shards", type=int, default=ENGINE_SHARDS, help="엔진 샤드 프로세스 수")
+    parser.add_argument("--ring-bytes", type=int, default=ENGINE_RING_BYTES, help="워커-샤드 방향별 링 버퍼 크기")
+    parser.add_argument("--log-level", default="info")
+    args = parser.parse_args(argv)
+    if args.workers < 1 or args.shards < 1:
+        parser.error("--workers와 --shards는 1 이상이어야 합니다.")
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s cluster %(levelname)s: %(message)s")
+
+    # 저널/스냅샷 경로는 샤드에만 (샤드별 하위 디렉터리로) 넘기고, 런처와 워커는 사용하지 않음
+    journal_dir = os.environ.pop("ENGINE_JOURNAL_DIR", "")
+    snapshot_dir = os.environ.pop("ENGINE_SNAPSHOT_DIR", "")
+
+    import uvicorn
+
+    from app.core.ring import SharedRing
+    from app.core.sharding import ClusterLayout
+
+    asyncio.run(_create_tables())
+
+    directory = tempfile.mkdtemp(prefix="vx-ring-", dir="/dev/shm" if os.path.isdir("/dev/shm") else None)
+    layout_args = (directory, args.shards, args.workers)
+    layout = ClusterLayout(*layout_args)
+    for worker in range(args.workers):
+        for shard in range(args.shards):
+            for kind in ("req", "resp"):
+                SharedRing.create(layout.ring_path(worker, shard, kind), args.ring_bytes).close()
+
+    context = multiprocessing.get_context("spawn")
+    shard_bells = [context.Pipe(duplex=False) for _ in range(args.shards)]
+    worker_bells = [context.Pipe(duplex=False) for _ in range(args.workers)]
+    ready_reader, ready_writer = context.Pipe(duplex=False)
+    shards = [
+        context.Process(
+            target=_run_shard,
+            args=(i, layout_args, shard_bells[i][0], [w for _, w in worker_bells], ready_writer),
+            name=f"vx-shard-{i}",
+        )
+        for i in range(args.shards)
+    ]
+    workers: List[multiprocessing.Process] = []
+
+    stopping = False
+
+    def request_stop(signum, frame) -> None:
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGINT, request_stop)
+    signal.signal(signal.SIGTERM, request_stop)
+
+    exit_code = 0
+    try:
+        for i, process in enumerate(shards):
+            with _shard_environment(i, args.shards, journal_dir, snapshot_dir):
+                process.start()
+        # 모든 샤드가 오더북 복원을 마친 뒤 워커 시작 (워커는 시작 시 복제본을 받음)
+        waiting = set(range(args.shards))
+        while waiting and not stopping:
+            if any(not process.is_alive() for process in shards):
+                logger.error("엔진 샤드가 시작 중 종료되었습니다.")
+                exit_code = 1
+                break
+            if ready_reader.poll(0.2):
+                waiting.discard(ready_reader.recv())
+
+        if not waiting and not stopping:
+            options = {"log_level": args.log_level}
+            sock = uvicorn.Config("app.main:app", host=args.host, port=args.port).bind_socket()
+            workers = [
+                context.Process(
+                    target=_run_worker,
+                    args=(i, layout_args, worker_bells[i][0], [w for _, w in shard_bells], sock, options),
+                    name=f"vx-http-{i}",
+                )
+                for i in range(args.workers)
+            ]
+            for process in workers:
+                process.start()
+            sock.close()
+            logger.info("http://%s:%d 에서 HTTP 워커 %d개, 엔진 샤드 %d개 실행 중", args.host, args.port, args.workers, args.shards)
+            # 하나라도 종료되면 전체 종료 (워커 재시작은 지원하지 않음)
+            while not stopping:
+                exited = wait([p.sentinel for p in shards + workers], timeout=0.5)
+                if exited:
+                    logger.error("자식 프로세스가 종료되어 클러스터를 내립니다.")
+                    exit_code = 1
+                    break
+    finally:
+        # 워커가 처리 중인 요청을 마친 뒤 샤드가 대기열을 비우고 영속화하도록 순서대로 종료
+        _stop(workers, SHUTDOWN_TIMEOUT_S)
+        _stop(shards, SHUTDOWN_TIMEOUT_S)
+        shutil.rmtree(directory, ignore_errors=True)
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
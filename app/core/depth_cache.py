@@ -0,0 +1,71 @@
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+from app.core.orderbook import BookSide, OrderBook, OrderBookManager, order_book_manager
+from app.schemas.orderbook import OrderBookDepthResponse, OrderBookLevel, OrderBookResponse
+
+# 캐시할 조회 깊이 (그 밖의 깊이는 매번 직렬화)
+CACHED_DEPTHS = frozenset((5, 10, 20, 50, 100))
+
+
+def book_levels(book: OrderBook, book_side: BookSide, depth: int) -> List[OrderBookLevel]:
+    """레벨 집계값(총 수량, 주문 수)을 최우선 호가부터 depth개 변환"""
+    spec = book.spec
+    return [
+        OrderBookLevel(
+            price=spec.from_ticks(level.price),
+            quantity=spec.from_lots(level.total_quantity),
+            order_count=level.order_count,
+        )
+        for level in book_side.levels(depth)
+    ]
+
+
+class DepthCache:
+    """직렬화된 호가 스냅샷 캐시
+
+    (심볼, 깊이, 응답 형태)별로 JSON 바이트를 보관하고 오더북 sequence가
+    바뀐 경우에만 다시 만든다. 조회 비용은 O(depth)이며 DB를 사용하지 않는다.
+    항목 수가 요청 값에 따라 늘지 않도록 오더북이 있는 심볼과 CACHED_DEPTHS만 보관한다.
+    """
+
+    def __init__(self, books: OrderBookManager):
+        self.books = books
+        self._entries: Dict[Tuple[str, int, bool], Tuple[int, bytes]] = {}
+
+    def orderbook(self, symbol: str, depth: int) -> bytes:
+        """OrderBookResponse JSON"""
+        return self._get(symbol, depth, False)
+
+    def depth(self, symbol: str, depth: int) -> bytes:
+        """OrderBookDepthResponse JSON"""
+        return self._get(symbol, depth, True)
+
+    def _get(self, symbol: str, depth: int, with_depth: bool) -> bytes:
+        book = self.books.get(symbol)
+        if book is None or depth not in CACHED_DEPTHS:
+            return self._render(symbol, book, depth, with_depth)
+        sequence = book.sequence
+        key = (symbol, depth, with_depth)
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] == sequence:
+            return entry[1]
+
+        body = self._render(symbol, book, depth, with_depth)
+        self._entries[key] = (sequence, body)
+        return body
+
+    @staticmethod
+    def _render(symbol: str, book, depth: int, with_depth: bool) -> bytes:
+        now = datetime.now(timezone.utc)
+        bids = book_levels(book, book.bids, depth) if book is not None else []
+        asks = book_levels(book, book.asks, depth) if book is not None else []
+        if with_depth:
+            response = OrderBookDepthResponse(symbol=symbol, timestamp=now, depth=depth, bids=bids, asks=asks)
+        else:
+            response = OrderBookResponse(symbol=symbol, timestamp=now, bids=bids, asks=asks)
+        return response.model_dump_json().encode()
+
+
+# 애플리케이션 전역 호가 캐시
+depth_cache = DepthCache(order_book_manager)
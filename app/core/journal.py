@@ -0,0 +1,556 @@
+import asyncio
+import logging
+import os
+import struct
+import time
+import zlib
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Deque, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, unquote
+from uuid import UUID
+
+from app.core.matching_engine import (
+    AmendOrderCommand,
+    BatchOrderCommand,
+    CancelOrderCommand,
+    Command,
+    MassCancelCommand,
+    NewOrderCommand,
+    OrderState,
+    Report,
+    SymbolEngine,
+)
+from app.core.metrics import order_stage_latency
+from app.core.orderbook import BookOrder, OrderBook, OrderBookManager
+from app.models.order import OrderSide, OrderStatus, OrderType
+from app.schemas.order import CLIENT_ORDER_ID_MAX_BYTES, USER_ID_MAX_BYTES
+
+logger = logging.getLogger(__name__)
+
+# 저널 디렉터리 (비어 있으면 저널 미사용)
+ENGINE_JOURNAL_DIR = os.getenv("ENGINE_JOURNAL_DIR", "")
+# fsync 사용 여부와 그룹 fsync 대기 시간 (이 시간 동안 들어온 기록을 fsync 한 번으로 처리)
+ENGINE_JOURNAL_FSYNC = os.getenv("ENGINE_JOURNAL_FSYNC", "1") == "1"
+ENGINE_JOURNAL_FSYNC_MS = float(os.getenv("ENGINE_JOURNAL_FSYNC_MS", "2"))
+# 세그먼트 파일 하나에 담을 기록 수
+ENGINE_JOURNAL_SEGMENT_RECORDS = int(os.getenv("ENGINE_JOURNAL_SEGMENT_RECORDS", "262144"))
+
+_fsync_latency = order_stage_latency.child("journal_fsync")
+
+# 기록 종류
+RECORD_NEW = 1
+RECORD_CANCEL = 2
+RECORD_AMEND = 3
+RECORD_MASS_CANCEL = 4
+RECORD_RESTORE = 5  # DB에서 복원한 대기 주문 (저널 최초 생성 시)
+RECORD_CHECKPOINT = 6  # quantity = DB 저장이 끝난 마지막 기록 번호
+
+# 선택 필드 존재 여부
+FLAG_PRICE = 0x01
+FLAG_QUANTITY = 0x02
+FLAG_PRICE_MAX = 0x04
+FLAG_USER_ID = 0x08
+FLAG_CLIENT_ORDER_ID = 0x10
+
+# 고정 길이 기록: 종류, 방향, 주문 타입, 플래그, 기록 번호, 시각(µs), 주문 ID,
+# 가격, 수량, 체결 수량, 최고 가격, 사용자 ID, 클라이언트 주문 ID + CRC32
+_BODY = struct.Struct(f"<BBBBQq16sqqqq{USER_ID_MAX_BYTES}s{CLIENT_ORDER_ID_MAX_BYTES}s")
+_CRC = struct.Struct("<I")
+RECORD_SIZE = _BODY.size + _CRC.size
+
+SEGMENT_SUFFIX = ".journal"
+
+_SIDES = {None: 0, OrderSide.BUY: 1, OrderSide.SELL: 2}
+_SIDE_CODES = {code: side for side, code in _SIDES.items()}
+_ORDER_TYPES = {None: 0, OrderType.LIMIT: 1, OrderType.MARKET: 2, OrderType.IOC: 3}
+_ORDER_TYPE_CODES = {code: order_type for order_type, code in _ORDER_TYPES.items()}
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def _to_micros(moment: datetime) -> int:
+    delta = moment - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def _from_micros(micros: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=micros)
+
+
+@dataclass(slots=True)
+class JournalRecord:
+    """저널 기록 (가격: tick 수, 수량: lot 수)"""
+    kind: int
+    timestamp: datetime
+    order_id: Optional[UUID] = None
+    side: Optional[OrderSide] = None
+    order_type: Optional[OrderType] = None
+    price: Optional[int] = None
+    quantity: Optional[int] = None
+    filled: int = 0
+    price_max: Optional[int] = None
+    user_id: Optional[str] = None
+    client_order_id: Optional[str] = None
+    sequence: int = 0
+
+    def encode(self) -> bytes:
+        flags = 0
+        if self.price is not None:
+            flags |= FLAG_PRICE
+        if self.quantity is not None:
+            flags |= FLAG_QUANTITY
+        if self.price_max is not None:
+            flags |= FLAG_PRICE_MAX
+        if self.user_id is not None:
+            flags |= FLAG_USER_ID
+        if self.client_order_id is not None:
+            flags |= FLAG_CLIENT_ORDER_ID
+        body = _BODY.pack(
+            self.kind,
+            _SIDES[self.side],
+            _ORDER_TYPES[self.order_type],
+            flags,
+            self.sequence,
+            _to_micros(self.timestamp),
+            self.order_id.bytes if self.order_id is not None else bytes(16),
+            self.price or 0,
+            self.quantity or 0,
+            self.filled,
+            self.price_max or 0,
+            _encode_text(self.user_id, USER_ID_MAX_BYTES, "사용자 ID"),
+            _encode_text(self.client_order_id, CLIENT_ORDER_ID_MAX_BYTES, "클라이언트 주문 ID"),
+        )
+        return body + _CRC.pack(zlib.crc32(body))
+
+    @classmethod
+    def decode(cls, data: bytes) -> Optional["JournalRecord"]:
+        """기록 복원 (CRC 불일치 = 기록 중단된 꼬리이면 None)"""
+        body = data[:_BODY.size]
+        if _CRC.unpack_from(data, _BODY.size)[0] != zlib.crc32(body):
+            return None
+        (kind, side, order_type, flags, sequence, micros, order_id,
+         price, quantity, filled, price_max, user_id, client_order_id) = _BODY.unpack(body)
+        return cls(
+            kind=kind,
+            timestamp=_from_micros(micros),
+            order_id=UUID(bytes=order_id) if any(order_id) else None,
+            side=_SIDE_CODES[side],
+            order_type=_ORDER_TYPE_CODES[order_type],
+            price=price if flags & FLAG_PRICE else None,
+            quantity=quantity if flags & FLAG_QUANTITY else None,
+            filled=filled,
+            price_max=price_max if flags & FLAG_PRICE_MAX else None,
+            user_id=user_id.rstrip(b"\0").decode() if flags & FLAG_USER_ID else None,
+            client_order_id=client_order_id.rstrip(b"\0").decode() if flags & FLAG_CLIENT_ORDER_ID else None,
+            sequence=sequence,
+        )
+
+
+def _encode_text(value: Optional[str], size: int, name: str) -> bytes:
+    if value is None:
+        return b""
+    data = value.encode()
+    if len(data) > size:
+        raise ValueError(f"{name}가 너무 깁니다 (최대 {size}바이트).")
+    return data
+
+
+def command_records(command: Command, now: datetime) -> List[JournalRecord]:
+    """시퀀서 명령 → 저널 기록 (일괄 주문은 주문별 기록)"""
+    if isinstance(command, NewOrderCommand):
+        order = command.order
+        return [JournalRecord(
+            kind=RECORD_NEW,
+            timestamp=now,
+            order_id=order.id,
+            side=order.side,
+            order_type=order.order_type,
+            price=order.price_ticks,
+            quantity=order.quantity_lots,
+            user_id=order.user_id,
+            client_order_id=order.client_order_id,
+        )]
+    if isinstance(command, BatchOrderCommand):
+        return [record for item in command.commands for record in command_records(item, now)]
+    if isinstance(command, CancelOrderCommand):
+        return [JournalRecord(kind=RECORD_CANCEL, timestamp=now, order_id=command.order_id, user_id=command.user_id)]
+    if isinstance(command, AmendOrderCommand):
+        return [JournalRecord(
+            kind=RECORD_AMEND,
+            timestamp=now,
+            order_id=command.order_id,
+            price=command.price,
+            quantity=command.quantity,
+            user_id=command.user_id,
+        )]
+    if isinstance(command, MassCancelCommand):
+        return [JournalRecord(
+            kind=RECORD_MASS_CANCEL,
+            timestamp=now,
+            side=command.side,
+            price=command.min_price,
+            price_max=command.max_price,
+            user_id=command.user_id,
+        )]
+    raise TypeError(f"알 수 없는 명령입니다: {command!r}")
+
+
+def record_command(record: JournalRecord, book: OrderBook) -> Command:
+    """저널 기록 → 시퀀서 명령 (재생용)"""
+    if record.kind == RECORD_NEW:
+        return NewOrderCommand(OrderState(
+            id=record.order_id,  # type: ignore
+            symbol=book.symbol,
+            side=record.side,  # type: ignore
+            order_type=record.order_type,  # type: ignore
+            price_ticks=record.price,
+            quantity_lots=record.quantity,  # type: ignore
+            filled_lots=0,
+            remaining_lots=record.quantity,  # type: ignore
+            status=OrderStatus.OPEN,
+            created_at=record.timestamp,
+            updated_at=record.timestamp,
+            spec=book.spec,
+            user_id=record.user_id,
+            client_order_id=record.client_order_id,
+        ))
+    if record.kind == RECORD_CANCEL:
+        return CancelOrderCommand(record.order_id, record.user_id)  # type: ignore
+    if record.kind == RECORD_AMEND:
+        return AmendOrderCommand(record.order_id, record.user_id, record.price, record.quantity)  # type: ignore
+    if record.kind == RECORD_MASS_CANCEL:
+        return MassCancelCommand(record.user_id, record.side, record.price, record.price_max)
+    raise ValueError(f"명령으로 바꿀 수 없는 저널 기록입니다: {record.kind}")
+
+
+def restore_record(order: BookOrder, now: datetime) -> JournalRecord:
+    """대기 주문 → RESTORE 기록"""
+    return JournalRecord(
+        kind=RECORD_RESTORE,
+        timestamp=order.created_at or now,
+        order_id=order.order_id,
+        side=order.side,
+        order_type=OrderType.LIMIT,
+        price=order.price,
+        quantity=order.quantity,
+        filled=order.filled_quantity,
+        user_id=order.user_id,
+        client_order_id=order.client_order_id,
+    )
+
+
+class SymbolJournal:
+    """심볼 하나의 세그먼트 저널
+
+    기록은 시퀀서가 명령을 처리하기 전에 파일에 쓰고, fsync는 대기 시간 동안
+    모인 기록을 한 번에 처리한다. append()가 돌려준 Future가 완료되면 해당 기록은
+    디스크에 기록된 것이다 (fsync 미사용 시 None).
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        symbol: str,
+        fsync: bool = ENGINE_JOURNAL_FSYNC,
+        fsync_delay: float = ENGINE_JOURNAL_FSYNC_MS / 1000,
+        segment_records: int = ENGINE_JOURNAL_SEGMENT_RECORDS,
+    ):
+        self.symbol = symbol
+        self.directory = directory / quote(symbol, safe="")
+        self.fsync = fsync
+        self.fsync_delay = fsync_delay
+        self.segment_records = segment_records
+        # 마지막으로 쓴 기록 번호 / DB 저장이 끝난 마지막 기록 번호
+        self.sequence = 0
+        self.persisted = 0
+        self._checkpointed = 0
+        self._fd: Optional[int] = None
+        self._segment_count = 0
+        self._sync_future: Optional["asyncio.Future[None]"] = None
+        self._sync_handle: Optional[asyncio.TimerHandle] = None
+        self._syncing = 0
+        self._retired: List[int] = []
+
+    def segments(self) -> List[Path]:
+        if not self.directory.exists():
+            return []
+        return sorted(self.directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+    def read(self) -> Iterator[JournalRecord]:
+        """세그먼트 순서대로 기록 읽기
+
+        CRC가 맞지 않거나 잘린 기록을 만나면 그 위치에서 파일을 잘라내고
+        이후 세그먼트를 삭제한다 (쓰던 도중 중단된 꼬리).
+        """
+        segments = self.segments()
+        if segments:
+            # 스냅샷 이전 세그먼트가 정리된 경우 첫 세그먼트 번호부터 이어짐
+            self.sequence = self.first_sequence(segments[0]) - 1
+        for index, path in enumerate(segments):
+            with open(path, "rb") as f:
+                data = f.read()
+            valid = 0
+            for offset in range(0, len(data) - RECORD_SIZE + 1, RECORD_SIZE):
+                record = JournalRecord.decode(data[offset:offset + RECORD_SIZE])
+                if record is None or record.sequence != self.sequence + 1:
+                    break
+                self.sequence = record.sequence
+                if record.kind == RECORD_CHECKPOINT:
+                    self.persisted = self._checkpointed = record.quantity or 0
+                valid = offset + RECORD_SIZE
+                yield record
+            if valid != len(data):
+                logger.warning("저널 꼬리 잘라냄: %s (%d → %d 바이트)", path, len(data), valid)
+                os.truncate(path, valid)
+                for later in segments[index + 1:]:
+                    later.unlink()
+                return
+
+    @staticmethod
+    def first_sequence(path: Path) -> int:
+        """세그먼트 파일 이름 = 첫 기록 번호"""
+        return int(path.name[:-len(SEGMENT_SUFFIX)])
+
+    def prune(self, sequence: int) -> int:
+        """sequence 이하 기록만 담긴 세그먼트 삭제 (스냅샷으로 대체된 구간, 마지막 세그먼트는 유지)"""
+        segments = self.segments()
+        removed = 0
+        for path, following in zip(segments, segments[1:]):
+            if self.first_sequence(following) - 1 > sequence:
+                break
+            path.unlink()
+            removed += 1
+        return removed
+
+    def append(self, records: List[JournalRecord]) -> Optional["asyncio.Future[None]"]:
+        """기록 번호를 매겨 파일에 쓰고 fsync 완료 Future 반환"""
+        if self.persisted > self._checkpointed:
+            records = [JournalRecord(
+                kind=RECORD_CHECKPOINT,
+                timestamp=records[0].timestamp,
+                quantity=self.persisted,
+            )] + records
+            self._checkpointed = self.persisted
+        chunks = []
+        for record in records:
+            if self._fd is None or self._segment_count >= self.segment_records:
+                if chunks:
+                    self._write(b"".join(chunks))
+                    chunks = []
+                self._rotate()
+            self.sequence += 1
+            record.sequence = self.sequence
+            chunks.append(record.encode())
+            self._segment_count += 1
+        self._write(b"".join(chunks))
+
+        if not self.fsync:
+            return None
+        if self._sync_future is None:
+            loop = asyncio.get_running_loop()
+            self._sync_future = loop.create_future()
+            self._sync_handle = loop.call_later(self.fsync_delay, self._start_sync)
+        return self._sync_future
+
+    def append_command(self, command: Command, now: datetime) -> Optional["asyncio.Future[None]"]:
+        """명령을 처리하기 전에 기록"""
+        return self.append(command_records(command, now))
+
+    def mark_persisted(self, sequence: int) -> Callable[["asyncio.Future[object]"], None]:
+        """DB 저장 Future 완료 콜백 (다음 기록 시 체크포인트로 남김)"""
+        def done(future: "asyncio.Future[object]") -> None:
+            if not future.cancelled() and future.exception() is None and sequence > self.persisted:
+                self.persisted = sequence
+        return done
+
+    def close(self) -> None:
+        """체크포인트를 남기고 fsync 후 파일 닫기"""
+        if self.persisted > self._checkpointed:
+            if self._fd is None:
+                self._rotate()
+            self._write(JournalRecord(
+                kind=RECORD_CHECKPOINT,
+                timestamp=datetime.now(timezone.utc),
+                quantity=self.persisted,
+                sequence=self.sequence + 1,
+            ).encode())
+            self.sequence += 1
+            self._segment_count += 1
+            self._checkpointed = self.persisted
+        if self._sync_handle is not None:
+            self._sync_handle.cancel()
+            self._sync_handle = None
+        if self._fd is not None:
+            if self.fsync:
+                os.fsync(self._fd)
+            os.close(self._fd)
+            self._fd = None
+        if self._sync_future is not None:
+            if not self._sync_future.done():
+                self._sync_future.set_result(None)
+            self._sync_future = None
+        for fd in self._retired:
+            os.close(fd)
+        self._retired.clear()
+
+    def _write(self, data: bytes) -> None:
+        view = memoryview(data)
+        while view:
+            written = os.write(self._fd, view)  # type: ignore
+            view = view[written:]
+
+    def _rotate(self) -> None:
+        """새 세그먼트 열기 (이전 세그먼트는 fsync 후 닫음)"""
+        old = self._fd
+        if old is not None:
+            if self.fsync:
+                os.fsync(old)
+            if self._syncing:
+                self._retired.append(old)
+            else:
+                os.close(old)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        segments = self.segments()
+        if old is None and segments:
+            # 재시작 후 마지막 세그먼트 이어 쓰기
+            path = segments[-1]
+            self._segment_count = path.stat().st_size // RECORD_SIZE
+        else:
+            path = self.directory / f"{self.sequence + 1:020d}{SEGMENT_SUFFIX}"
+            self._segment_count = 0
+        self._fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        if old is None and self._segment_count >= self.segment_records:
+            self._rotate()
+
+    def _start_sync(self) -> None:
+        future, self._sync_future = self._sync_future, None
+        self._sync_handle = None
+        if future is None or self._fd is None:
+            return
+        self._syncing += 1
+        asyncio.ensure_future(self._sync(self._fd, future))
+
+    async def _sync(self, fd: int, future: "asyncio.Future[None]") -> None:
+        started = time.perf_counter_ns()
+        try:
+            await asyncio.get_running_loop().run_in_executor(None, os.fsync, fd)
+            _fsync_latency.record_since(started)
+        except OSError as e:
+            logger.exception("저널 fsync 실패 (%s)", self.symbol)
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(None)
+        finally:
+            self._syncing -= 1
+            if not self._syncing:
+                for retired in self._retired:
+                    os.close(retired)
+                self._retired.clear()
+
+
+class EngineJournal:
+    """심볼별 명령 저널 모음 (ENGINE_JOURNAL_DIR/<심볼>/<첫 기록 번호>.journal)"""
+
+    def __init__(self, directory: str, **options):
+        self.directory = Path(directory)
+        self.options = options
+        self.journals: Dict[str, SymbolJournal] = {}
+
+    def open(self, symbol: str) -> SymbolJournal:
+        journal = self.journals.get(symbol)
+        if journal is None:
+            journal = self.journals[symbol] = SymbolJournal(self.directory, symbol, **self.options)
+        return journal
+
+    def symbols(self) -> List[str]:
+        if not self.directory.exists():
+            return []
+        return sorted(unquote(path.name) for path in self.directory.iterdir() if path.is_dir())
+
+    def is_empty(self) -> bool:
+        return not any(self.open(symbol).segments() for symbol in self.symbols())
+
+    def recover(self, books: OrderBookManager, after: Optional[Dict[str, int]] = None) -> Tuple[int, List[Report]]:
+        """저널을 재생해 오더북 복원
+
+        after에 심볼별 스냅샷 기록 번호가 있으면 스냅샷을 적재한 오더북에
+        그 이후 기록만 재생한다. DB 저장이 확인되지 않은 체크포인트 이후 기록의
+        처리 결과를 함께 돌려주며, 호출 측이 이를 다시 영속화해 DB를 저널에 맞춘다.
+        """
+        after = after or {}
+        replayed = 0
+        tail: List[Report] = []
+        for symbol in self.symbols():
+            count, reports = self._replay(self.open(symbol), books.get_or_create(symbol), after.get(symbol, 0))
+            replayed += count
+            tail.extend(reports)
+        for book in books.books.values():
+            book.drain_changes()
+        return replayed, tail
+
+    def _replay(self, journal: SymbolJournal, book: OrderBook, after: int) -> Tuple[int, List[Report]]:
+        segments = journal.segments()
+        if segments and journal.first_sequence(segments[0]) > after + 1:
+            raise RuntimeError(f"저널이 스냅샷 이후부터 이어지지 않습니다 ({journal.symbol}, 기록 {after})")
+        engine = SymbolEngine(book)
+        pending: Deque[Tuple[int, Report]] = deque()
+        count = 0
+        for record in journal.read():
+            if record.sequence <= after:
+                continue
+            count += 1
+            if record.kind == RECORD_CHECKPOINT:
+                while pending and pending[0][0] <= journal.persisted:
+                    pending.popleft()
+                continue
+            if record.kind == RECORD_RESTORE:
+                book.add(BookOrder(
+                    order_id=record.order_id,  # type: ignore
+                    side=record.side,  # type: ignore
+                    price=record.price,  # type: ignore
+                    quantity=record.quantity,  # type: ignore
+                    remaining_quantity=record.quantity - record.filled,  # type: ignore
+                    user_id=record.user_id,
+                    client_order_id=record.client_order_id,
+                    created_at=record.timestamp,
+                ))
+                continue
+            try:
+                report = engine.process(record_command(record, book), record.timestamp)
+            except ValueError:
+                # 최초 처리 때도 같은 이유로 거부된 명령
+                continue
+            if report is not None and record.sequence > journal.persisted:
+                pending.append((record.sequence, report))
+        return count, [report for _, report in pending]
+
+    def bootstrap(self, books: OrderBookManager) -> int:
+        """DB에서 복원한 오더북을 RESTORE 기록으로 저널에 남김 (저널 최초 생성 시)"""
+        now = datetime.now(timezone.utc)
+        count = 0
+        for symbol, book in books.books.items():
+            records = [restore_record(order, now) for order in book.orders()]
+            if not records:
+                continue
+            journal = self.open(symbol)
+            journal.append(records)
+            journal.persisted = journal.sequence
+            count += len(records)
+        return count
+
+    def mark_all_persisted(self) -> None:
+        """복원 후 남은 기록을 다시 영속화했음을 표시"""
+        for journal in self.journals.values():
+            journal.persisted = journal.sequence
+
+    def close(self) -> None:
+        for journal in self.journals.values():
+            journal.close()
+
+
+# 애플리케이션 전역 명령 저널 (ENGINE_JOURNAL_DIR 미설정 시 None)
+engine_journal: Optional[EngineJournal] = EngineJournal(ENGINE_JOURNAL_DIR) if ENGINE_JOURNAL_DIR else None
@@ -0,0 +1,191 @@
+from dataclasses import dataclass, replace
+from datetime import datetime, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.core.matching_engine import ExecutionReport, Report
+from app.core.orderbook import BookUpdate
+from app.core.symbols import SymbolRegistry, symbol_registry
+from app.models.kline import KlineInterval
+
+# 롤업 순서: 하위 주기 캔들이 마감되면 바로 위 주기 캔들에 합쳐진다
+INTERVALS: Tuple[Tuple[KlineInterval, int], ...] = (
+    (KlineInterval.ONE_MINUTE, 60),
+    (KlineInterval.FIVE_MINUTES, 300),
+    (KlineInterval.ONE_HOUR, 3600),
+    (KlineInterval.ONE_DAY, 86400),
+)
+INTERVAL_LEVELS: Dict[KlineInterval, int] = {interval: level for level, (interval, _) in enumerate(INTERVALS)}
+
+
+def window_start(timestamp: int, seconds: int) -> int:
+    return timestamp - timestamp % seconds
+
+
+def to_epoch(moment: datetime) -> int:
+    return int(moment.timestamp())
+
+
+def from_epoch(timestamp: int) -> datetime:
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc)
+
+
+@dataclass(slots=True)
+class Candle:
+    """캔들 (가격: tick 수, 거래량: lot 수, 시각: epoch 초)"""
+    open_time: int
+    open: int
+    high: int
+    low: int
+    close: int
+    volume: int
+    trade_count: int
+
+    def add_trade(self, price: int, quantity: int) -> None:
+        if price > self.high:
+            self.high = price
+        if price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += quantity
+        self.trade_count += 1
+
+    def merge(self, later: "Candle") -> None:
+        """시간상 뒤에 오는 캔들을 합침"""
+        if later.high > self.high:
+            self.high = later.high
+        if later.low < self.low:
+            self.low = later.low
+        self.close = later.close
+        self.volume += later.volume
+        self.trade_count += later.trade_count
+
+
+ClosedCandle = Tuple[str, KlineInterval, Candle]
+
+
+class SymbolKlines:
+    """심볼 하나의 진행 중 캔들
+
+    1m 캔들만 체결로 갱신하고, 상위 주기의 진행 중 캔들에는 마감된 하위 주기
+    캔들만 합친다. 조회 시점의 상위 캔들은 진행 중인 하위 캔들을 더해 만든다.
+    """
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.open: List[Optional[Candle]] = [None] * len(INTERVALS)
+
+    def add_trade(self, timestamp: int, price: int, quantity: int, closed: List[ClosedCandle]) -> None:
+        self.roll(timestamp, closed)
+        candle = self.open[0]
+        if candle is None:
+            self.open[0] = Candle(window_start(timestamp, INTERVALS[0][1]), price, price, price, price, quantity, 1)
+        else:
+            candle.add_trade(price, quantity)
+
+    def roll(self, now: int, closed: List[ClosedCandle]) -> None:
+        """now 시점에 끝난 캔들을 하위 주기부터 마감"""
+        for level, (_, seconds) in enumerate(INTERVALS):
+            candle = self.open[level]
+            if candle is not None and candle.open_time + seconds <= now:
+                self.open[level] = None
+                self._close(level, candle, closed)
+
+    def seed(self, level: int, candle: Candle) -> None:
+        """재시작 시 마감된 하위 캔들로 상위 진행 중 캔들 복원"""
+        self._merge_up(level, candle, [])
+
+    def current(self, level: int) -> Optional[Candle]:
+        """진행 중 캔들 (하위 주기의 진행 중 캔들 포함)"""
+        candle = self.open[level]
+        if level == 0:
+            return replace(candle) if candle is not None else None
+        lower = self.current(level - 1)
+        if lower is None:
+            return replace(candle) if candle is not None else None
+        start = window_start(lower.open_time, INTERVALS[level][1])
+        if candle is None:
+            return replace(lower, open_time=start)
+        merged = replace(candle)
+        merged.merge(lower)
+        return merged
+
+    def _close(self, level: int, candle: Candle, closed: List[ClosedCandle]) -> None:
+        closed.append((self.symbol, INTERVALS[level][0], candle))
+        if level + 1 < len(INTERVALS):
+            self._merge_up(level + 1, candle, closed)
+
+    def _merge_up(self, level: int, candle: Candle, closed: List[ClosedCandle]) -> None:
+        start = window_start(candle.open_time, INTERVALS[level][1])
+        current = self.open[level]
+        if current is not None and current.open_time != start:
+            self.open[level] = None
+            self._close(level, current, closed)
+            current = None
+        if current is None:
+            self.open[level] = replace(candle, open_time=start)
+        else:
+            current.merge(candle)
+
+
+class KlineAggregator:
+    """체결 이벤트 기반 증분 캔들 집계기
+
+    매칭 엔진 리스너로 등록되어 시퀀서 안에서 정수 연산만 수행한다.
+    마감된 캔들은 pending에 쌓였다가 주기적으로 klines 테이블에 저장된다.
+    """
+
+    def __init__(self, symbols: SymbolRegistry = symbol_registry):
+        self.symbols = symbols
+        self.klines: Dict[str, SymbolKlines] = {}
+        self.pending: List[ClosedCandle] = []
+
+    def get_or_create(self, symbol: str) -> SymbolKlines:
+        klines = self.klines.get(symbol)
+        if klines is None:
+            klines = self.klines[symbol] = SymbolKlines(symbol)
+        return klines
+
+    def on_engine_event(self, symbol: str, reports: List[Report], update: Optional[BookUpdate]) -> None:
+        """매칭 엔진 리스너: 체결을 1m 캔들에 반영"""
+        for report in reports:
+            if not isinstance(report, ExecutionReport):
+                continue
+            for trade in report.trades:
+                self.add_trade(symbol, to_epoch(trade.executed_at), trade.price_ticks, trade.quantity_lots)
+
+    def add_trade(self, symbol: str, timestamp: int, price: int, quantity: int) -> None:
+        self.get_or_create(symbol).add_trade(timestamp, price, quantity, self.pending)
+
+    def roll(self, now: int) -> None:
+        for klines in self.klines.values():
+            klines.roll(now, self.pending)
+
+    def take_closed(self, now: int) -> List[ClosedCandle]:
+        """now 기준으로 마감한 뒤 저장 대기 캔들을 넘김"""
+        self.roll(now)
+        closed, self.pending = self.pending, []
+        return closed
+
+    def retain(self, keep: Callable[[str], bool]) -> None:
+        """keep(symbol)이 거짓인 심볼의 진행 중/마감 캔들 제거"""
+        self.klines = {symbol: klines for symbol, klines in self.klines.items() if keep(symbol)}
+        self.pending = [closed for closed in self.pending if keep(closed[0])]
+
+    def requeue(self, closed: List[ClosedCandle]) -> None:
+        """저장 실패한 캔들을 다시 대기열 앞에 넣음"""
+        self.pending[:0] = closed
+
+    def recent(self, symbol: str, interval: KlineInterval, now: int) -> List[Candle]:
+        """아직 저장되지 않은 마감 캔들 + 진행 중 캔들 (시각 오름차순)"""
+        self.roll(now)
+        candles = [candle for name, kind, candle in self.pending if name == symbol and kind == interval]
+        klines = self.klines.get(symbol)
+        if klines is not None:
+            current = klines.current(INTERVAL_LEVELS[interval])
+            if current is not None:
+                candles.append(current)
+        return candles
+
+
+# 애플리케이션 전역 캔들 집계기
+kline_aggregator = KlineAggregator()
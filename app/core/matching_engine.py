@@ -0,0 +1,914 @@
+import asyncio
+import logging
+import math
+import os
+import time
+import uuid
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from uuid import UUID
+
+from app.core.client_orders import ClientOrderIndex
+from app.core.metrics import engine_commands, order_stage_latency, trades_executed
+from app.core.orderbook import BookOrder, BookUpdate, OrderBook, OrderBookManager, order_book_manager
+from app.core.symbols import SymbolSpec, UnknownSymbolError
+from app.models.order import Order, OrderSide, OrderType, OrderStatus
+from app.schemas.order import OrderCreate
+
+if TYPE_CHECKING:
+    from app.core.journal import EngineJournal, SymbolJournal
+    from app.core.sharding import ShardClient
+
+logger = logging.getLogger(__name__)
+
+# 심볼별 시퀀서 대기열 크기 (가득 차면 제출 측이 대기)
+ENGINE_QUEUE_SIZE = int(os.getenv("ENGINE_QUEUE_SIZE", "10000"))
+
+
+@dataclass(slots=True)
+class OrderState:
+    """주문 상태 스냅샷 (API 응답 / 영속화용)
+
+    가격/수량은 tick/lot 정수로 보관하고 Decimal 속성은 경계에서만 계산한다.
+    """
+    id: UUID
+    symbol: str
+    side: OrderSide
+    order_type: OrderType
+    price_ticks: Optional[int]
+    quantity_lots: int
+    filled_lots: int
+    remaining_lots: int
+    status: OrderStatus
+    created_at: datetime
+    updated_at: datetime
+    spec: SymbolSpec
+    user_id: Optional[str] = None
+    client_order_id: Optional[str] = None
+
+    @property
+    def price(self) -> Optional[Decimal]:
+        return None if self.price_ticks is None else self.spec.from_ticks(self.price_ticks)
+
+    @property
+    def quantity(self) -> Decimal:
+        return self.spec.from_lots(self.quantity_lots)
+
+    @property
+    def filled_quantity(self) -> Decimal:
+        return self.spec.from_lots(self.filled_lots)
+
+    @property
+    def remaining_quantity(self) -> Decimal:
+        return self.spec.from_lots(self.remaining_lots)
+
+
+@dataclass(slots=True)
+class TradeEvent:
+    """체결 이벤트 (가격: tick 수, 수량: lot 수)"""
+    id: UUID
+    symbol: str
+    buy_order_id: UUID
+    sell_order_id: UUID
+    price_ticks: int
+    quantity_lots: int
+    executed_at: datetime
+    taker_side: OrderSide
+    spec: SymbolSpec
+
+    @property
+    def price(self) -> Decimal:
+        return self.spec.from_ticks(self.price_ticks)
+
+    @property
+    def quantity(self) -> Decimal:
+        return self.spec.from_lots(self.quantity_lots)
+
+
+@dataclass(slots=True)
+class ExecutionReport:
+    """명령 처리 결과
+
+    is_new가 True이면 order는 신규 주문(INSERT 대상), False이면 기존 주문의
+    상태 변경(UPDATE 대상)이다. maker_updates는 체결된 대기 주문의 최신 상태.
+    """
+    order: OrderState
+    trades: List[TradeEvent] = field(default_factory=list)
+    maker_updates: List[OrderState] = field(default_factory=list)
+    is_new: bool = True
+
+
+@dataclass(slots=True)
+class MassCancelReport:
+    """일괄 취소 결과 (취소된 주문의 최종 상태)"""
+    symbol: str
+    orders: List[OrderState]
+    cancelled_at: datetime
+
+    @property
+    def order_ids(self) -> List[UUID]:
+        return [order.id for order in self.orders]
+
+
+@dataclass(slots=True)
+class NewOrderCommand:
+    """신규 주문 명령"""
+    order: OrderState
+
+
+@dataclass(slots=True)
+class CancelOrderCommand:
+    """주문 취소 명령"""
+    order_id: UUID
+    user_id: Optional[str] = None
+
+
+@dataclass(slots=True)
+class AmendOrderCommand:
+    """대기 주문 정정 명령 (가격: tick 수, 수량: 체결분을 포함한 새 주문 수량 lot 수)"""
+    order_id: UUID
+    user_id: Optional[str] = None
+    price: Optional[int] = None
+    quantity: Optional[int] = None
+
+
+@dataclass(slots=True)
+class MassCancelCommand:
+    """조건에 맞는 대기 주문 일괄 취소 명령 (가격: tick 수, 양 끝 포함)"""
+    user_id: Optional[str] = None
+    side: Optional[OrderSide] = None
+    min_price: Optional[int] = None
+    max_price: Optional[int] = None
+
+
+@dataclass(slots=True)
+class BatchOrderCommand:
+    """일괄 주문 명령 (같은 심볼, 한 번에 연속 처리)"""
+    commands: List[NewOrderCommand]
+
+
+Command = Union[NewOrderCommand, CancelOrderCommand, AmendOrderCommand, MassCancelCommand, BatchOrderCommand]
+Report = Union[ExecutionReport, MassCancelReport]
+# 처리 결과 묶음을 영속화 대기열에 넣고 저장 완료 시점을 알리는 Future 반환
+PersistCallback = Callable[[Sequence[Report]], Optional["asyncio.Future[Any]"]]
+BatchOutcome = Union[ExecutionReport, Exception]
+# 명령 처리 직후 시퀀서에서 동기 호출되는 이벤트 리스너 (블로킹 금지)
+EventListener = Callable[[str, List[Report], Optional[BookUpdate]], None]
+# 오더북을 바꾼 명령과 처리 시각을 영속화 요청 직후 동기로 전달 (복제용, 블로킹 금지)
+ReplicateCallback = Callable[[str, Command, datetime], None]
+
+
+class EngineHaltedError(RuntimeError):
+    """영속화 장애로 매칭 엔진이 명령 접수를 멈춘 상태"""
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def new_order_state(order_data: OrderCreate, spec: SymbolSpec, order_id: Optional[UUID] = None) -> OrderState:
+    """주문 요청 → 엔진 주문 상태 (Decimal → tick/lot 변환, 주문 ID 미지정 시 새로 발급)"""
+    now = _utcnow()
+    quantity = spec.to_lots(order_data.quantity)
+    return OrderState(
+        id=order_id or uuid.uuid4(),
+        symbol=order_data.symbol,
+        side=order_data.side,
+        order_type=order_data.order_type,
+        price_ticks=None if order_data.price is None else spec.to_ticks(order_data.price),
+        quantity_lots=quantity,
+        filled_lots=0,
+        remaining_lots=quantity,
+        status=OrderStatus.OPEN,
+        created_at=now,
+        updated_at=now,
+        spec=spec,
+        user_id=order_data.user_id,
+        client_order_id=order_data.client_order_id,
+    )
+
+
+def order_state_from_model(order: Order, spec: SymbolSpec) -> OrderState:
+    """ORM 주문 → 엔진 주문 상태 (Decimal → tick/lot, 재시작 후 복원용)"""
+    return OrderState(
+        id=order.id,  # type: ignore
+        symbol=order.symbol,  # type: ignore
+        side=order.side,  # type: ignore
+        order_type=order.order_type,  # type: ignore
+        price_ticks=None if order.price is None else int(order.price / spec.tick_size),
+        quantity_lots=int(order.quantity / spec.lot_size),
+        filled_lots=int(order.filled_quantity / spec.lot_size),
+        remaining_lots=int(order.remaining_quantity / spec.lot_size),
+        status=order.status,  # type: ignore
+        created_at=order.created_at,  # type: ignore
+        updated_at=order.updated_at,  # type: ignore
+        spec=spec,
+        user_id=order.user_id,  # type: ignore
+        client_order_id=order.client_order_id,  # type: ignore
+    )
+
+
+# 같은 심볼의 체결 시각 최소 간격 (PostgreSQL timestamp 해상도)
+_TRADE_TIME_STEP = timedelta(microseconds=1)
+
+
+class SymbolEngine:
+    """심볼 단위 매칭 로직
+
+    시퀀서 태스크 하나만 호출하므로 내부에서 락을 사용하지 않는다.
+    """
+
+    def __init__(self, book: OrderBook):
+        self.book = book
+
+    def _trade_time(self, now: datetime) -> datetime:
+        """체결 시각 (심볼 내에서 엄격히 증가하므로 executed_at 순서 = 체결 순서)
+
+        기준 시각을 오더북에 두므로 저널 재생이나 재시작 후에도 같은 체결 시각이 나온다.
+        """
+        last = self.book.last_trade_time
+        if last is not None and now <= last:
+            now = last + _TRADE_TIME_STEP
+        self.book.last_trade_time = now
+        return now
+
+    def process(self, command: Command, now: Optional[datetime] = None) -> Optional[Report]:
+        """명령 처리 (now는 시퀀서가 정한 처리 시각, 저널 재생 시 기록된 시각)"""
+        if now is None:
+            now = _utcnow()
+        if isinstance(command, NewOrderCommand):
+            return self.new_order(command.order, now)
+        if isinstance(command, CancelOrderCommand):
+            return self.cancel_order(command.order_id, command.user_id, now)
+        if isinstance(command, AmendOrderCommand):
+            return self.amend_order(command, now)
+        if isinstance(command, MassCancelCommand):
+            return self.mass_cancel(command, now)
+        raise TypeError(f"알 수 없는 명령입니다: {command!r}")
+
+    def new_order(self, order: OrderState, now: datetime) -> ExecutionReport:
+        """가격-시간 우선순위 매칭 후 잔량 처리 (LIMIT: 대기, MARKET/IOC: 취소)"""
+        order.created_at = order.updated_at = now
+        report = ExecutionReport(order)
+        self._match(order, report, now)
+        return report
+
+    def _match(self, order: OrderState, report: ExecutionReport, now: datetime) -> None:
+        """order의 잔량을 반대편 호가와 매칭하고 남은 잔량 처리"""
+        book = self.book
+        opposite = book.opposite(order.side)
+        is_buy = order.side == OrderSide.BUY
+        limit = None if order.order_type == OrderType.MARKET else order.price_ticks
+        remaining = order.remaining_lots
+
+        while remaining > 0:
+            level = opposite.best()
+            if level is None:
+                break
+            if limit is not None and (level.price > limit if is_buy else level.price < limit):
+                break
+            while remaining > 0 and level:
+                maker = level.head()
+                quantity = min(remaining, maker.remaining_quantity)
+                remaining -= quantity
+                book.fill(maker, quantity)
+                report.trades.append(TradeEvent(
+                    # 재생 시에도 같은 체결 ID가 나오도록 (taker, maker, 체결 전 누적 수량)에서 결정
+                    id=uuid.uuid5(order.id, f"{maker.order_id}:{order.quantity_lots - remaining - quantity}"),
+                    symbol=order.symbol,
+                    buy_order_id=order.id if is_buy else maker.order_id,
+                    sell_order_id=maker.order_id if is_buy else order.id,
+                    price_ticks=level.price,
+                    quantity_lots=quantity,
+                    executed_at=self._trade_time(now),
+                    taker_side=order.side,
+                    spec=book.spec,
+                ))
+                report.maker_updates.append(self._resting_state(
+                    maker,
+                    OrderStatus.FILLED if maker.remaining_quantity <= 0 else OrderStatus.PARTIALLY_FILLED,
+                    now,
+                ))
+
+        order.filled_lots = order.quantity_lots - remaining
+        order.remaining_lots = remaining
+        order.updated_at = now
+        if remaining <= 0:
+            order.status = OrderStatus.FILLED
+        elif order.order_type == OrderType.LIMIT:
+            order.status = OrderStatus.PARTIALLY_FILLED if order.filled_lots > 0 else OrderStatus.OPEN
+            book.add(BookOrder(
+                order_id=order.id,
+                side=order.side,
+                price=order.price_ticks,  # type: ignore
+                quantity=order.quantity_lots,
+                remaining_quantity=remaining,
+                user_id=order.user_id,
+                client_order_id=order.client_order_id,
+                created_at=order.created_at,
+            ))
+        else:
+            # MARKET/IOC 잔량은 즉시 취소
+            order.status = OrderStatus.CANCELLED
+
+    def cancel_order(self, order_id: UUID, user_id: Optional[str], now: datetime) -> Optional[ExecutionReport]:
+        """대기 주문 취소 (오더북에 없거나 사용자가 다르면 None)"""
+        resting = self.book.get(order_id)
+        if resting is None or (user_id and resting.user_id != user_id):
+            return None
+        self.book.cancel(order_id)
+        return ExecutionReport(
+            self._resting_state(resting, OrderStatus.CANCELLED, now),
+            is_new=False,
+        )
+
+    def amend_order(self, command: AmendOrderCommand, now: datetime) -> Optional[ExecutionReport]:
+        """대기 주문 정정 (오더북에 없거나 사용자가 다르면 None)
+
+        같은 가격에서 수량만 줄이면 대기열 위치를 유지하고, 가격을 바꾸거나
+        수량을 늘리면 취소 후 재접수와 같이 우선순위를 잃고 다시 매칭한다.
+        """
+        book = self.book
+        resting = book.get(command.order_id)
+        if resting is None or (command.user_id and resting.user_id != command.user_id):
+            return None
+        price = resting.price if command.price is None else command.price
+        quantity = resting.quantity if command.quantity is None else command.quantity
+        if price <= 0:
+            raise ValueError("정정 가격은 0보다 커야 합니다.")
+        if quantity <= resting.filled_quantity:
+            raise ValueError("정정 수량은 체결된 수량보다 커야 합니다.")
+
+        if price == resting.price and quantity <= resting.quantity:
+            book.reduce(resting, resting.quantity - quantity)
+            status = OrderStatus.PARTIALLY_FILLED if resting.filled_quantity > 0 else OrderStatus.OPEN
+            return ExecutionReport(self._resting_state(resting, status, now), is_new=False)
+
+        book.cancel(resting.order_id)
+        order = self._resting_state(resting, OrderStatus.OPEN, now)
+        order.price_ticks = price
+        order.quantity_lots = quantity
+        order.remaining_lots = quantity - resting.filled_quantity
+        report = ExecutionReport(order, is_new=False)
+        self._match(order, report, now)
+        return report
+
+    def mass_cancel(self, command: MassCancelCommand, now: datetime) -> Optional[MassCancelReport]:
+        """조건에 맞는 대기 주문을 한 번에 취소 (해당 없으면 None)"""
+        book = self.book
+        sides = [book.side(command.side)] if command.side else [book.bids, book.asks]
+        min_price, max_price = command.min_price, command.max_price
+        targets: List[BookOrder] = []
+        for book_side in sides:
+            is_bid = book_side is book.bids
+            # 레벨은 최우선 호가부터 순회하므로 가격 범위를 벗어나면 조기 종료
+            for level in book_side.levels():
+                if max_price is not None and level.price > max_price:
+                    if is_bid:
+                        continue
+                    break
+                if min_price is not None and level.price < min_price:
+                    if is_bid:
+                        break
+                    continue
+                if command.user_id:
+                    targets.extend(o for o in level.orders.values() if o.user_id == command.user_id)
+                else:
+                    targets.extend(level.orders.values())
+
+        if not targets:
+            return None
+        for order in targets:
+            book.cancel(order.order_id)
+        return MassCancelReport(
+            symbol=book.symbol,
+            orders=[self._resting_state(order, OrderStatus.CANCELLED, now) for order in targets],
+            cancelled_at=now,
+        )
+
+    def resting_orders(self) -> List[OrderState]:
+        """오더북 대기 주문의 현재 상태"""
+        now = _utcnow()
+        return [
+            self._resting_state(order, OrderStatus.PARTIALLY_FILLED if order.filled_quantity > 0 else OrderStatus.OPEN, now)
+            for order in self.book.orders()
+        ]
+
+    def _resting_state(self, order: BookOrder, status: OrderStatus, now: datetime) -> OrderState:
+        return OrderState(
+            id=order.order_id,
+            symbol=self.book.symbol,
+            side=order.side,
+            order_type=OrderType.LIMIT,
+            price_ticks=order.price,
+            quantity_lots=order.quantity,
+            filled_lots=order.filled_quantity,
+            remaining_lots=order.remaining_quantity,
+            status=status,
+            created_at=order.created_at or now,
+            updated_at=now,
+            spec=self.book.spec,
+            user_id=order.user_id,
+            client_order_id=order.client_order_id,
+        )
+
+
+# 주문 처리 단계별 지연 (검증 → 대기열 → 저널 → 매칭 → 전파, 제출부터 영속화 완료까지)
+_validate_latency = order_stage_latency.child("validate")
+_queue_latency = order_stage_latency.child("queue_wait")
+_journal_latency = order_stage_latency.child("journal")
+_match_latency = order_stage_latency.child("match")
+_broadcast_latency = order_stage_latency.child("broadcast")
+_end_to_end_latency = order_stage_latency.child("end_to_end")
+_command_counters = {
+    NewOrderCommand: engine_commands.child("new_order"),
+    CancelOrderCommand: engine_commands.child("cancel"),
+    AmendOrderCommand: engine_commands.child("amend"),
+    MassCancelCommand: engine_commands.child("mass_cancel"),
+    BatchOrderCommand: engine_commands.child("batch"),
+}
+_duplicate_counter = engine_commands.child("duplicate_order")
+
+
+class SymbolSequencer:
+    """심볼별 단일 작성자 시퀀서
+
+    대기열에 들어온 순서대로 명령을 하나씩 처리하므로 같은 심볼의 주문은
+    DB 락 없이 결정적인 순서로 체결된다.
+
+    대기열 항목의 결과 Future 자리에는 done()/set_result()/set_exception()을 가진
+    객체라면 무엇이든 올 수 있다. 결과는 시퀀서 태스크 안에서 동기로 전달된다.
+    """
+
+    def __init__(
+        self,
+        engine: SymbolEngine,
+        persist: Optional[PersistCallback],
+        queue_size: int,
+        listeners: Optional[List[EventListener]] = None,
+        journal: Optional["SymbolJournal"] = None,
+        replicate: Optional[ReplicateCallback] = None,
+        client_orders: Optional[ClientOrderIndex] = None,
+        resumed: Optional[asyncio.Event] = None,
+    ):
+        self.engine = engine
+        # (명령, 결과 Future, 제출 시각 perf_counter_ns)
+        self.queue: "asyncio.Queue[tuple[Command, asyncio.Future, int]]" = asyncio.Queue(maxsize=queue_size)
+        self._persist = persist
+        self._listeners = listeners if listeners is not None else []
+        self._journal = journal
+        self._replicate = replicate
+        # 클라이언트 주문 ID 중복 제출 판정 색인 (엔진의 모든 시퀀서가 공유)
+        self._client_orders = client_orders
+        # 엔진이 멈춘 동안(clear) 다음 명령을 처리하지 않고 대기
+        self._resumed = resumed
+        self._task: Optional[asyncio.Task] = None
+        # 마지막으로 넘긴 영속화 Future (배치는 순서대로 커밋되므로 이전 결과도 저장된 것)
+        self.durable: Optional["asyncio.Future[object]"] = None
+        # 마지막 명령의 저널 fsync Future (fsync 미사용 시 None)
+        self.journaled: Optional["asyncio.Future[None]"] = None
+
+    @property
+    def symbol(self) -> str:
+        return self.engine.book.symbol
+
+    @property
+    def pending(self) -> int:
+        """대기열에 쌓인 명령 수"""
+        return self.queue.qsize()
+
+    def durability(self) -> Optional["asyncio.Future[Any]"]:
+        """마지막으로 처리한 명령이 복구 가능해지는 시점의 Future
+
+        저널을 쓰면 저널 fsync(재시작 시 재생으로 복구), 아니면 DB 배치 커밋.
+        None이면 기다릴 것이 없다.
+        """
+        return self.journaled if self._journal is not None else self.durable
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name=f"sequencer-{self.symbol}")
+
+    async def drain(self) -> None:
+        """대기열에 남은 명령을 모두 처리할 때까지 대기"""
+        await self.queue.join()
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def enqueue(self, command: Command, future: Any) -> None:
+        """명령을 대기열에 넣기만 함 (결과는 future로 (결과, 영속화 Future, 저널 Future) 전달)"""
+        await self.queue.put((command, future, time.perf_counter_ns()))
+
+    async def submit(self, command: Command) -> Any:
+        """명령을 대기열에 넣고 저널 기록과 처리 결과가 영속화될 때까지 대기"""
+        submitted = time.perf_counter_ns()
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((command, future, submitted))
+        result, durable, journaled = await future
+        # 배치 Future는 여러 요청이 공유하므로 취소가 전파되지 않도록 보호
+        if journaled is not None:
+            await asyncio.shield(journaled)
+        if durable is not None:
+            await asyncio.shield(durable)
+        _end_to_end_latency.record_since(submitted)
+        return result
+
+    def _process(self, command: Command, now: datetime) -> Tuple[Any, List[Report]]:
+        if isinstance(command, BatchOrderCommand):
+            # 개별 주문 실패가 같은 묶음의 다른 주문에 영향을 주지 않도록 처리
+            outcomes: List[BatchOutcome] = []
+            for item in command.commands:
+                try:
+                    outcomes.append(self.engine.process(item, now))  # type: ignore
+                except Exception as e:
+                    outcomes.append(e)
+            return outcomes, [o for o in outcomes if isinstance(o, ExecutionReport)]
+        report = self.engine.process(command, now)
+        return report, [report] if report is not None else []
+
+    def _deduplicate(self, command: Command, now: datetime) -> Tuple[Optional[Command], Any]:
+        """이미 제출된 클라이언트 주문 ID의 신규 주문을 명령에서 제외
+
+        (남은 명령 - 전부 중복이면 None, 중복 주문의 기존 상태 보고 - 배치는 항목 위치별) 반환.
+        """
+        index = self._client_orders
+        if index is None:
+            return command, None
+        if isinstance(command, NewOrderCommand):
+            existing = index.claim(command.order, now)
+            if existing is None:
+                return command, None
+            _duplicate_counter.inc()
+            return None, ExecutionReport(existing, is_new=False)
+        if isinstance(command, BatchOrderCommand):
+            duplicates: List[Optional[ExecutionReport]] = []
+            fresh: List[NewOrderCommand] = []
+            for item in command.commands:
+                existing = index.claim(item.order, now)
+                if existing is None:
+                    fresh.append(item)
+                    duplicates.append(None)
+                else:
+                    _duplicate_counter.inc()
+                    duplicates.append(ExecutionReport(existing, is_new=False))
+            if len(fresh) == len(command.commands):
+                return command, None
+            return (BatchOrderCommand(fresh) if fresh else None), duplicates
+        return command, None
+
+    def _index_results(self, command: Command, result: Any, reports: List[Report], now: datetime) -> None:
+        """처리 결과의 주문 상태를 클라이언트 주문 ID 색인에 반영 (실패한 신규 주문은 등록 취소)"""
+        index = self._client_orders
+        if index is None:
+            return
+        if isinstance(command, BatchOrderCommand):
+            for item, outcome in zip(command.commands, result):
+                if isinstance(outcome, Exception):
+                    index.release(item.order)
+        for report in reports:
+            if isinstance(report, ExecutionReport):
+                index.update((report.order,), now)
+                if report.maker_updates:
+                    index.update(report.maker_updates, now)
+            else:
+                index.update(report.orders, now)
+
+    def _release(self, command: Optional[Command]) -> None:
+        """처리에 실패한 명령의 신규 주문 등록 취소"""
+        if self._client_orders is None:
+            return
+        if isinstance(command, NewOrderCommand):
+            self._client_orders.release(command.order)
+        elif isinstance(command, BatchOrderCommand):
+            for item in command.commands:
+                self._client_orders.release(item.order)
+
+    async def _run(self) -> None:
+        # 명령은 처리 전에 저널에 기록하고, 시퀀서는 fsync/저장 완료를 기다리지 않고
+        # 다음 명령을 처리한다 (write-behind)
+        journal = self._journal
+        resumed = self._resumed
+        clock = time.perf_counter_ns
+        while True:
+            command, future, submitted = await self.queue.get()
+            if resumed is not None and not resumed.is_set():
+                await resumed.wait()
+            started = clock()
+            _queue_latency.record(started - submitted)
+            try:
+                now = _utcnow()
+                # 중복 제출은 저널/매칭/영속화 없이 기존 주문 상태로 응답
+                command, duplicates = self._deduplicate(command, now)
+                if command is None:
+                    # 원 주문이 아직 영속화 중일 수 있으므로 마지막 명령의 완료 시점을 함께 전달
+                    if not future.done():
+                        future.set_result((duplicates, self.durable, self.journaled))
+                    continue
+                journaled = None
+                if journal is not None:
+                    journaled = self.journaled = journal.append_command(command, now)
+                    _journal_latency.record_since(started)
+                    started = clock()
+                result, reports = self._process(command, now)
+                _match_latency.record_since(started)
+                _command_counters[type(command)].inc()
+                self._index_results(command, result, reports, now)
+                if duplicates is not None:
+                    # 배치 일부가 중복이면 처리 결과를 원래 항목 위치에 채움
+                    processed = iter(result)
+                    result = [outcome if outcome is not None else next(processed) for outcome in duplicates]
+                for report in reports:
+                    if isinstance(report, ExecutionReport) and report.trades:
+                        trades_executed.inc(len(report.trades))
+                durable = None
+                if reports and self._persist is not None:
+                    durable = self._persist(reports)
+                    if durable is not None:
+                        self.durable = durable
+                        if journal is not None:
+                            durable.add_done_callback(journal.mark_persisted(journal.sequence))
+                if reports and self._replicate is not None:
+                    self._replicate(self.symbol, command, now)
+            except Exception as e:
+                self._release(command)
+                if not future.done():
+                    future.set_exception(e)
+            else:
+                if not future.done():
+                    future.set_result((result, durable, journaled))
+                started = clock()
+                self._publish(reports)
+                _broadcast_latency.record_since(started)
+            finally:
+                self.queue.task_done()
+
+    def _publish(self, reports: List[Report]) -> None:
+        update = self.engine.book.drain_changes()
+        if not self._listeners or (not reports and update is None):
+            return
+        for listener in self._listeners:
+            try:
+                listener(self.symbol, reports, update)
+            except Exception:
+                logger.exception("엔진 이벤트 리스너 오류 (%s)", self.symbol)
+
+
+class MatchingEngine:
+    """심볼별 시퀀서를 관리하는 매칭 엔진"""
+
+    def __init__(self, books: OrderBookManager, queue_size: int = ENGINE_QUEUE_SIZE):
+        self.books = books
+        self.queue_size = queue_size
+        self._sequencers: Dict[str, SymbolSequencer] = {}
+        self._persist: Optional[PersistCallback] = None
+        self._journal: Optional["EngineJournal"] = None
+        self._listeners: List[EventListener] = []
+        self._replicate: Optional[ReplicateCallback] = None
+        self._remote: Optional["ShardClient"] = None
+        self._running = False
+        # (user_id, client_order_id) 중복 제출 판정 색인 (심볼 구분 없이 프로세스 단위)
+        self.client_orders = ClientOrderIndex()
+        # 영속화 장애로 멈춘 사유 (None이면 정상)
+        self._halted: Optional[str] = None
+        self._resumed = asyncio.Event()
+        self._resumed.set()
+
+    @property
+    def running(self) -> bool:
+        return self._running
+
+    @property
+    def halted(self) -> Optional[str]:
+        return self._halted
+
+    def halt(self, reason: str) -> None:
+        """새 명령 접수를 거부하고 시퀀서 처리를 멈춤 (이미 처리한 결과가 저장될 때까지)"""
+        if self._halted is None:
+            logger.error("매칭 엔진 정지: %s", reason)
+        self._halted = reason
+        self._resumed.clear()
+
+    def resume(self) -> None:
+        """halt() 이후 명령 접수와 시퀀서 처리 재개"""
+        if self._halted is not None:
+            logger.warning("매칭 엔진 재개 (정지 사유: %s)", self._halted)
+        self._halted = None
+        self._resumed.set()
+
+    def add_listener(self, listener: EventListener) -> None:
+        """명령 처리 결과/오더북 변경 구독 (모든 시퀀서가 같은 목록을 공유)"""
+        self._listeners.append(listener)
+
+    def start(
+        self,
+        persist: Optional[PersistCallback] = None,
+        journal: Optional["EngineJournal"] = None,
+        replicate: Optional[ReplicateCallback] = None,
+        remote: Optional["ShardClient"] = None,
+    ) -> None:
+        """복원된 오더북마다 시퀀서 시작
+
+        remote를 주면 시퀀서 대신 엔진 샤드 프로세스로 명령을 보내는 대리 시퀀서를 쓴다
+        (이 경우 books는 샤드 오더북의 읽기 전용 복제본).
+        """
+        self._persist = persist
+        self._journal = journal
+        self._replicate = replicate
+        self._remote = remote
+        self._running = True
+        for symbol in list(self.books.books):
+            self._sequencer(symbol)
+
+    async def stop(self) -> None:
+        """대기열에 남은 명령을 처리한 뒤 시퀀서 종료"""
+        self._running = False
+        for sequencer in self._sequencers.values():
+            await sequencer.drain()
+            await sequencer.stop()
+        self._sequencers.clear()
+
+    def _sequencer(self, symbol: str) -> SymbolSequencer:
+        if self._halted is not None:
+            raise EngineHaltedError(f"매칭 엔진이 정지되었습니다: {self._halted}")
+        sequencer = self._sequencers.get(symbol)
+        if sequencer is None:
+            if not self._running:
+                raise RuntimeError("매칭 엔진이 실행 중이 아닙니다.")
+            # 시퀀서/오더북/저널은 거래 심볼과 복원된 오더북이 있는 심볼에만 만든다
+            if symbol not in self.books.symbols and self.books.get(symbol) is None:
+                raise UnknownSymbolError(f"거래할 수 없는 심볼입니다: {symbol}")
+            if self._remote is not None:
+                sequencer = self._remote.sequencer(symbol)  # type: ignore
+            else:
+                engine = SymbolEngine(self.books.get_or_create(symbol))
+                # 복원된 대기 주문은 재시작 후에도 중복 제출로 판정
+                self.client_orders.restore(engine.resting_orders(), _utcnow())
+                sequencer = SymbolSequencer(
+                    engine,
+                    self._persist,
+                    self.queue_size,
+                    self._listeners,
+                    self._journal.open(symbol) if self._journal is not None else None,
+                    self._replicate,
+                    self.client_orders,
+                    self._resumed,
+                )
+            self._sequencers[symbol] = sequencer
+            sequencer.start()
+        return sequencer
+
+    def restore_client_orders(self, orders: Iterable[Order]) -> int:
+        """DB의 대기 주문과 ttl 안에 종료된 주문을 중복 제출 색인에 등록 (시작 시, 시퀀서 시작 전)"""
+        symbols = self.books.symbols
+        states = [order_state_from_model(order, symbols.get(order.symbol)) for order in orders]  # type: ignore
+        self.client_orders.restore(states, _utcnow())
+        return len(states)
+
+    def publish(self, symbol: str, reports: List[Report], update: Optional[BookUpdate]) -> None:
+        """시퀀서 밖에서 적용한 처리 결과를 리스너에 전달 (샤드 오더북 복제본용)"""
+        if not reports and update is None:
+            return
+        for listener in self._listeners:
+            try:
+                listener(symbol, reports, update)
+            except Exception:
+                logger.exception("엔진 이벤트 리스너 오류 (%s)", symbol)
+
+    def durability(self, symbol: str) -> Optional["asyncio.Future[Any]"]:
+        """심볼에서 마지막으로 처리한 명령이 복구 가능해지는 시점의 Future (None = 대기 불필요)"""
+        sequencer = self._sequencers.get(symbol)
+        return sequencer.durability() if sequencer is not None else None
+
+    async def submit(self, symbol: str, command: Command) -> Any:
+        """명령을 심볼 시퀀서에 전달하고 처리 결과가 영속화될 때까지 대기"""
+        return await self._sequencer(symbol).submit(command)
+
+    async def enqueue(self, symbol: str, command: Command, future: Any) -> None:
+        """영속화를 기다리지 않는 제출 (결과는 future로 시퀀서 태스크에서 동기 전달)"""
+        await self._sequencer(symbol).enqueue(command, future)
+
+    def queue_depths(self) -> Dict[str, int]:
+        """심볼별 시퀀서 대기열에 쌓인 명령 수"""
+        return {symbol: sequencer.pending for symbol, sequencer in self._sequencers.items()}
+
+    def checkpoint(self, symbol: str) -> Tuple[int, Optional["asyncio.Future[object]"]]:
+        """지금까지 처리한 명령의 저널 기록 번호와 마지막 영속화 Future
+
+        시퀀서 밖에서 동기로 호출하면 명령 사이의 일관된 시점이 된다.
+        """
+        sequencer = self._sequencers.get(symbol)
+        if sequencer is None:
+            return (self._journal.open(symbol).sequence if self._journal is not None else 0), None
+        journal = sequencer._journal
+        return (journal.sequence if journal is not None else 0), sequencer.durable
+
+    async def submit_order(self, order_data: OrderCreate) -> ExecutionReport:
+        """주문을 심볼 시퀀서에 전달하고 처리 결과 대기"""
+        started = time.perf_counter_ns()
+        order = self._new_order_state(order_data)
+        _validate_latency.record_since(started)
+        return await self._sequencer(order.symbol).submit(NewOrderCommand(order))
+
+    async def submit_batch(self, orders: Sequence[OrderCreate]) -> List[BatchOutcome]:
+        """주문 일괄 제출
+
+        심볼별로 묶어 시퀀서마다 명령 하나로 전달하고, 입력 순서대로 주문별
+        처리 결과(또는 예외)를 반환한다.
+        """
+        outcomes: List[Any] = [None] * len(orders)
+        groups: Dict[str, List[Tuple[int, NewOrderCommand]]] = {}
+        for index, order_data in enumerate(orders):
+            try:
+                order = self._new_order_state(order_data)
+            except ValueError as e:
+                outcomes[index] = e
+                continue
+            groups.setdefault(order.symbol, []).append((index, NewOrderCommand(order)))
+
+        async def run(symbol: str, items: List[Tuple[int, NewOrderCommand]]) -> None:
+            command = BatchOrderCommand([item for _, item in items])
+            results = await self._sequencer(symbol).submit(command)
+            for (index, _), result in zip(items, results):
+                outcomes[index] = result
+
+        await asyncio.gather(*(run(symbol, items) for symbol, items in groups.items()))
+        return outcomes
+
+    def _new_order_state(self, order_data: OrderCreate) -> OrderState:
+        return new_order_state(order_data, self.books.symbols.require(order_data.symbol))
+
+    async def cancel_order(self, order_id: UUID, user_id: Optional[str] = None) -> Optional[ExecutionReport]:
+        """대기 주문 취소 (오더북에 없으면 None)"""
+        book = self.books.locate(order_id)
+        if book is None:
+            return None
+        return await self._sequencer(book.symbol).submit(CancelOrderCommand(order_id, user_id))
+
+    async def amend_order(
+        self,
+        order_id: UUID,
+        user_id: Optional[str] = None,
+        price: Optional[Decimal] = None,
+        quantity: Optional[Decimal] = None,
+    ) -> Optional[ExecutionReport]:
+        """대기 주문 정정 (오더북에 없으면 None)"""
+        book = self.books.locate(order_id)
+        if book is None:
+            return None
+        spec = book.spec
+        command = AmendOrderCommand(
+            order_id=order_id,
+            user_id=user_id,
+            price=None if price is None else spec.to_ticks(price),
+            quantity=None if quantity is None else spec.to_lots(quantity),
+        )
+        return await self._sequencer(book.symbol).submit(command)
+
+    async def mass_cancel(
+        self,
+        symbol: Optional[str] = None,
+        user_id: Optional[str] = None,
+        side: Optional[OrderSide] = None,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+    ) -> List[OrderState]:
+        """조건에 맞는 대기 주문 일괄 취소
+
+        심볼을 지정하지 않으면 모든 심볼 시퀀서에 명령을 하나씩 보낸다.
+        """
+        if not symbol and not user_id:
+            raise ValueError("일괄 취소에는 symbol 또는 user_id 조건이 필요합니다.")
+        if min_price is not None and max_price is not None and min_price > max_price:
+            raise ValueError("min_price는 max_price보다 클 수 없습니다.")
+
+        symbols = [symbol] if symbol else list(self.books.books)
+        commands = []
+        for name in symbols:
+            book = self.books.get(name)
+            if book is None:
+                continue
+            tick = book.spec.tick_size
+            commands.append((name, MassCancelCommand(
+                user_id=user_id,
+                side=side,
+                # 범위 경계는 호가 단위 안쪽으로 맞춤
+                min_price=None if min_price is None else math.ceil(min_price / tick),
+                max_price=None if max_price is None else math.floor(max_price / tick),
+            )))
+
+        reports = await asyncio.gather(*(self._sequencer(name).submit(command) for name, command in commands))
+        return [order for report in reports if report is not None for order in report.orders]
+
+
+# 애플리케이션 전역 매칭 엔진
+matching_engine = MatchingEngine(order_book_manager)
@@ -0,0 +1,255 @@
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, List, Tuple, Union
+
+# HDR 방식 버킷: 2의 거듭제곱 구간마다 16개 선형 하위 버킷 (상대 오차 ≤ 1/16)
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+# 기록 가능한 최대 값의 비트 수 (나노초 기준 약 4.9시간, 넘으면 마지막 버킷)
+MAX_VALUE_BITS = 44
+BUCKET_COUNT = (MAX_VALUE_BITS - SUB_BUCKET_BITS + 1) * SUB_BUCKETS
+
+# Prometheus로 내보낼 버킷 경계 (1-2-5 계열)
+LATENCY_BOUNDS_SECONDS = tuple(float(f"{m}e{e}") for e in range(-6, 2) for m in (1, 2, 5))
+SIZE_BOUNDS = tuple(float(m * 10 ** e) for e in range(0, 5) for m in (1, 2, 5))
+
+GaugeValue = Union[float, Dict[str, float]]
+
+
+def bucket_index(value: int) -> int:
+    """값 → 버킷 번호 (하위 버킷 수 미만은 정확히, 그 이상은 상위 비트 기준)"""
+    if value < SUB_BUCKETS * 2:
+        return value if value > 0 else 0
+    shift = value.bit_length() - SUB_BUCKET_BITS - 1
+    index = ((shift + 1) << SUB_BUCKET_BITS) + (value >> shift) - SUB_BUCKETS
+    return index if index < BUCKET_COUNT else BUCKET_COUNT - 1
+
+
+def bucket_upper(index: int) -> int:
+    """버킷에 들어가는 가장 큰 값"""
+    if index < SUB_BUCKETS * 2:
+        return index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    mantissa = (index & (SUB_BUCKETS - 1)) + SUB_BUCKETS
+    return ((mantissa + 1) << shift) - 1
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _number(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, int) or value.is_integer():
+        return str(int(value))
+    return format(value, ".12g")
+
+
+class Histogram:
+    """HDR 방식 로그-선형 히스토그램
+
+    버킷 배열을 미리 만들어 두고 기록 시에는 정수 연산과 카운트 증가만 하므로
+    핫 패스에서 객체를 만들지 않는다.
+    """
+
+    __slots__ = ("counts", "count", "total")
+
+    def __init__(self):
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0
+
+    def record(self, value: int) -> None:
+        # bucket_index()를 풀어 쓴 것 (호출 한 번 절약)
+        if value < SUB_BUCKETS * 2:
+            index = value if value > 0 else 0
+        else:
+            shift = value.bit_length() - SUB_BUCKET_BITS - 1
+            index = ((shift + 1) << SUB_BUCKET_BITS) + (value >> shift) - SUB_BUCKETS
+            if index >= BUCKET_COUNT:
+                index = BUCKET_COUNT - 1
+        self.counts[index] += 1
+        self.count += 1
+        self.total += value
+
+    def record_since(self, started_ns: int) -> None:
+        """perf_counter_ns() 기준 시작 시각부터의 경과 시간 기록"""
+        self.record(time.perf_counter_ns() - started_ns)
+
+
+class Counter:
+    __slots__ = ("value",)
+
+    def __init__(self):
+        self.value = 0
+
+    def inc(self, amount: int = 1) -> None:
+        self.value += amount
+
+
+class _Family(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.labels = labels
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+
+    @abstractmethod
+    def render(self) -> List[str]:
+        """HELP/TYPE 줄을 포함한 노출 형식 줄 목록"""
+
+
+class HistogramFamily(_Family):
+    """레이블 값별 Histogram 묶음
+
+    기록 측은 child()로 받은 Histogram을 모듈 상수 등으로 들고 있다가 record()만 호출한다.
+    내보낼 때는 내부 버킷을 bounds 경계로 모으며, 경계에 걸친 버킷은 위쪽 경계로 센다.
+    """
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = (),
+                 bounds: Tuple[float, ...] = LATENCY_BOUNDS_SECONDS, scale: float = 1e-9):
+        super().__init__(name, help, labels)
+        self.bounds = bounds
+        self.scale = scale
+        self.children: Dict[Tuple[str, ...], Histogram] = {}
+        # 내부 버킷 번호 → 내보낼 경계 번호 (마지막은 +Inf)
+        self._slots = [self._slot(bucket_upper(index) * scale) for index in range(BUCKET_COUNT)]
+
+    def _slot(self, value: float) -> int:
+        for slot, bound in enumerate(self.bounds):
+            if value <= bound:
+                return slot
+        return len(self.bounds)
+
+    def child(self, *values: str) -> Histogram:
+        histogram = self.children.get(values)
+        if histogram is None:
+            histogram = self.children[values] = Histogram()
+        return histogram
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for values, histogram in sorted(self.children.items()):
+            slots = [0] * (len(self.bounds) + 1)
+            for index, count in enumerate(histogram.counts):
+                if count:
+                    slots[self._slots[index]] += count
+            cumulative = 0
+            for bound, count in zip(self.bounds + (math.inf,), slots):
+                cumulative += count
+                le = 'le="%s"' % _number(bound)
+                lines.append(f"{self.name}_bucket{_labels(self.labels, values, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labels, values)} {_number(histogram.total * self.scale)}")
+            lines.append(f"{self.name}_count{_labels(self.labels, values)} {histogram.count}")
+        return lines
+
+
+class CounterFamily(_Family):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: Tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self.children: Dict[Tuple[str, ...], Counter] = {}
+
+    def child(self, *values: str) -> Counter:
+        counter = self.children.get(values)
+        if counter is None:
+            counter = self.children[values] = Counter()
+        return counter
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        for values, counter in sorted(self.children.items()):
+            lines.append(f"{self.name}{_labels(self.labels, values)} {counter.value}")
+        return lines
+
+
+class GaugeFamily(_Family):
+    """조회 시점에 콜백으로 값을 읽는 게이지 (레이블이 있으면 {레이블 값: 값})"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, callback: Callable[[], GaugeValue], labels: Tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self.callback = callback
+
+    def render(self) -> List[str]:
+        lines = self.header()
+        value = self.callback()
+        if isinstance(value, dict):
+            for label, item in sorted(value.items()):
+                lines.append(f"{self.name}{_labels(self.labels, (label,))} {_number(item)}")
+        else:
+            lines.append(f"{self.name} {_number(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    """지표 등록 및 Prometheus 텍스트 형식 출력"""
+
+    def __init__(self):
+        self.families: Dict[str, _Family] = {}
+
+    def _register(self, family: _Family) -> _Family:
+        if family.name in self.families:
+            raise ValueError(f"이미 등록된 지표입니다: {family.name}")
+        self.families[family.name] = family
+        return family
+
+    def histogram(self, name: str, help: str, labels: Tuple[str, ...] = (),
+                  bounds: Tuple[float, ...] = LATENCY_BOUNDS_SECONDS, scale: float = 1e-9) -> HistogramFamily:
+        return self._register(HistogramFamily(name, help, labels, bounds, scale))  # type: ignore
+
+    def counter(self, name: str, help: str, labels: Tuple[str, ...] = ()) -> CounterFamily:
+        return self._register(CounterFamily(name, help, labels))  # type: ignore
+
+    def gauge(self, name: str, help: str, callback: Callable[[], GaugeValue],
+              labels: Tuple[str, ...] = ()) -> GaugeFamily:
+        return self._register(GaugeFamily(name, help, callback, labels))  # type: ignore
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for family in self.families.values():
+            lines.extend(family.render())
+        return "\n".join(lines) + "\n"
+
+
+# 애플리케이션 전역 지표
+metrics_registry = MetricsRegistry()
+
+# 주문 처리 단계별 지연
+order_stage_latency = metrics_registry.histogram(
+    "vx_order_stage_seconds", "주문 처리 단계별 소요 시간", labels=("stage",),
+)
+# 엔진 명령 처리 건수
+engine_commands = metrics_registry.counter(
+    "vx_engine_commands_total", "시퀀서가 처리한 명령 수", labels=("command",),
+)
+trades_executed = metrics_registry.counter("vx_trades_total", "체결 수").child()
+# 영속화 배치
+persist_batch_size = metrics_registry.histogram(
+    "vx_persist_batch_size", "영속화 배치당 처리 결과 수", bounds=SIZE_BOUNDS, scale=1,
+).child()
+persist_failures = metrics_registry.counter("vx_persist_failures_total", "영속화 배치 저장 실패 수").child()
+persist_quarantined = metrics_registry.counter(
+    "vx_persist_quarantined_total", "저장할 수 없어 격리한 처리 결과 수",
+).child()
+# HTTP 요청 (라우트 템플릿별)
+http_request_latency = metrics_registry.histogram(
+    "vx_http_request_seconds", "HTTP 요청 처리 시간", labels=("method", "route"),
+)
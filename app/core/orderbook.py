@@ -0,0 +1,367 @@
+from heapq import heapify, heappop, heappush, nsmallest
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime
+from decimal import Decimal
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from uuid import UUID
+
+from app.core.symbols import SymbolRegistry, SymbolSpec, symbol_registry
+from app.models.order import Order, OrderSide, OrderStatus
+
+
+@dataclass(slots=True)
+class BookOrder:
+    """오더북에 대기 중인 주문 (가격: tick 수, 수량: lot 수)"""
+    order_id: UUID
+    side: OrderSide
+    price: int
+    quantity: int
+    remaining_quantity: int
+    user_id: Optional[str] = None
+    client_order_id: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    @property
+    def filled_quantity(self) -> int:
+        return self.quantity - self.remaining_quantity
+
+
+@dataclass(slots=True)
+class BookUpdate:
+    """명령 처리로 바뀐 가격 레벨 (가격, 총 수량, 주문 수; 수량 0 = 레벨 삭제)"""
+    symbol: str
+    sequence: int
+    bids: List[Tuple[int, int, int]]
+    asks: List[Tuple[int, int, int]]
+
+
+class PriceLevel:
+    """가격 레벨 (동일 가격 주문의 FIFO 대기열)"""
+
+    __slots__ = ("price", "orders", "total_quantity")
+
+    def __init__(self, price: int):
+        self.price = price
+        # 삽입 순서 = 시간 우선순위, 주문 ID로 O(1) 삭제
+        self.orders: "OrderedDict[UUID, BookOrder]" = OrderedDict()
+        self.total_quantity = 0
+
+    @property
+    def order_count(self) -> int:
+        return len(self.orders)
+
+    def __bool__(self) -> bool:
+        return bool(self.orders)
+
+    def head(self) -> BookOrder:
+        """가장 먼저 들어온 주문"""
+        return next(iter(self.orders.values()))
+
+    def append(self, order: BookOrder) -> None:
+        self.orders[order.order_id] = order
+        self.total_quantity += order.remaining_quantity
+
+    def remove(self, order: BookOrder) -> None:
+        del self.orders[order.order_id]
+        self.total_quantity -= order.remaining_quantity
+
+    def reduce(self, order: BookOrder, quantity: int) -> None:
+        """대기 주문의 잔량 감소 (대기열 위치 유지)"""
+        order.remaining_quantity -= quantity
+        self.total_quantity -= quantity
+
+
+class BookSide:
+    """한쪽 호가 (매수 또는 매도)
+
+    최우선 호가가 가장 작은 키가 되도록 매수는 음수 가격, 매도는 가격을 키로 쓰는
+    최소 힙으로 레벨을 관리한다. 레벨 삭제는 딕셔너리에서만 지우고 힙 항목은
+    최상단에 올라왔을 때 정리하는 지연 삭제를 사용한다.
+    최우선 호가 조회는 O(1)(지연 삭제분 정리는 분할 상환 O(log levels)),
+    신규 레벨 삽입은 O(log levels), 레벨 삭제는 O(1)이다.
+    """
+
+    def __init__(self, side: OrderSide):
+        self.side = side
+        self._sign = -1 if side == OrderSide.BUY else 1
+        # 힙에 들어 있는 키 (살아 있는 레벨 + 아직 정리되지 않은 삭제 레벨, 중복 없음)
+        self._heap: List[int] = []
+        self._in_heap: Set[int] = set()
+        self._levels: Dict[int, PriceLevel] = {}
+
+    def __len__(self) -> int:
+        return len(self._levels)
+
+    def __bool__(self) -> bool:
+        return bool(self._levels)
+
+    def best(self) -> Optional[PriceLevel]:
+        """최우선 호가 레벨"""
+        heap, levels = self._heap, self._levels
+        while heap:
+            level = levels.get(heap[0])
+            if level is not None:
+                return level
+            self._in_heap.discard(heappop(heap))
+        return None
+
+    def get(self, price: int) -> Optional[PriceLevel]:
+        return self._levels.get(price * self._sign)
+
+    def get_or_create(self, price: int) -> PriceLevel:
+        key = price * self._sign
+        level = self._levels.get(key)
+        if level is None:
+            level = PriceLevel(price)
+            self._levels[key] = level
+            # 삭제 후 아직 힙에 남아 있는 키면 그대로 재사용
+            if key not in self._in_heap:
+                self._in_heap.add(key)
+                heappush(self._heap, key)
+        return level
+
+    def discard(self, level: PriceLevel) -> None:
+        """빈 레벨 제거 (힙 항목은 지연 삭제)"""
+        del self._levels[level.price * self._sign]
+        # 정리되지 않은 항목이 살아 있는 레벨보다 많아지면 힙을 다시 만들어 크기를 제한
+        if len(self._heap) > 2 * len(self._levels) + 64:
+            self._rebuild()
+
+    def restore(self, levels: Iterable[PriceLevel]) -> None:
+        """스냅샷의 가격 레벨을 한 번에 적재 (빈 호가 전용)"""
+        for level in levels:
+            self._levels[level.price * self._sign] = level
+        self._rebuild()
+
+    def levels(self, depth: Optional[int] = None) -> Iterator[PriceLevel]:
+        """최우선 호가부터 순서대로 레벨 순회"""
+        keys = sorted(self._levels) if depth is None else nsmallest(depth, self._levels)
+        levels = self._levels
+        for key in keys:
+            yield levels[key]
+
+    def _rebuild(self) -> None:
+        self._heap = list(self._levels)
+        heapify(self._heap)
+        self._in_heap = set(self._heap)
+
+
+class OrderBook:
+    """심볼별 인메모리 오더북 (가격 우선, 시간 우선)
+
+    sequence는 오더북이 바뀔 때마다 1씩 증가하며, 호가 캐시 무효화와
+    실시간 스트림의 순서 번호로 사용된다.
+    """
+
+    def __init__(self, symbol: str, spec: Optional[SymbolSpec] = None):
+        self.symbol = symbol
+        self.spec = spec or SymbolSpec(symbol)
+        self.bids = BookSide(OrderSide.BUY)
+        self.asks = BookSide(OrderSide.SELL)
+        self._orders: Dict[UUID, BookOrder] = {}
+        self.sequence = 0
+        # 마지막 체결 시각 (체결 시각을 심볼 내에서 엄격히 증가시키는 기준, 재생/복원 후에도 이어짐)
+        self.last_trade_time: Optional[datetime] = None
+        # 마지막 drain_changes() 이후 바뀐 가격 레벨
+        self._changed_bids: Set[int] = set()
+        self._changed_asks: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def __contains__(self, order_id: UUID) -> bool:
+        return order_id in self._orders
+
+    def side(self, side: OrderSide) -> BookSide:
+        return self.bids if side == OrderSide.BUY else self.asks
+
+    def opposite(self, side: OrderSide) -> BookSide:
+        return self.asks if side == OrderSide.BUY else self.bids
+
+    def best_bid(self) -> Optional[PriceLevel]:
+        return self.bids.best()
+
+    def best_ask(self) -> Optional[PriceLevel]:
+        return self.asks.best()
+
+    def get(self, order_id: UUID) -> Optional[BookOrder]:
+        return self._orders.get(order_id)
+
+    def orders(self) -> Iterable[BookOrder]:
+        return self._orders.values()
+
+    def add(self, order: BookOrder) -> None:
+        """주문을 해당 가격 레벨 대기열 끝에 추가"""
+        if order.order_id in self._orders:
+            raise ValueError(f"이미 오더북에 존재하는 주문입니다: {order.order_id}")
+        self.side(order.side).get_or_create(order.price).append(order)
+        self._orders[order.order_id] = order
+        self._mark_changed(order)
+
+    def cancel(self, order_id: UUID) -> Optional[BookOrder]:
+        """주문 ID 인덱스로 O(1) 취소"""
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return None
+        book_side = self.side(order.side)
+        level = book_side.get(order.price)
+        level.remove(order)
+        if not level:
+            book_side.discard(level)
+        self._mark_changed(order)
+        return order
+
+    def reduce(self, order: BookOrder, quantity: int) -> None:
+        """대기 주문 수량 감소 (정정, 대기열 위치 유지)"""
+        if quantity <= 0:
+            return
+        self.side(order.side).get(order.price).reduce(order, quantity)
+        order.quantity -= quantity
+        self._mark_changed(order)
+
+    def fill(self, order: BookOrder, quantity: int) -> None:
+        """대기 주문 체결 처리 (잔량이 0이 되면 오더북에서 제거)"""
+        book_side = self.side(order.side)
+        level = book_side.get(order.price)
+        level.reduce(order, quantity)
+        if order.remaining_quantity <= 0:
+            level.remove(order)
+            del self._orders[order.order_id]
+            if not level:
+                book_side.discard(level)
+        self._mark_changed(order)
+
+    def restore(self, bids: List[PriceLevel], asks: List[PriceLevel], sequence: int) -> None:
+        """스냅샷으로 빈 오더북 채우기 (레벨 대기열을 그대로 사용, 변경 추적 없음)"""
+        self.bids.restore(bids)
+        self.asks.restore(asks)
+        for level in bids + asks:
+            self._orders.update(level.orders)
+        self.sequence = sequence
+
+    def sync(self, order: Order) -> None:
+        """DB 주문 행의 현재 상태를 오더북에 반영 (스냅샷 이후 변경분 적용)
+
+        잔량만 줄어든 주문은 대기열 위치를 유지하고, 가격이 바뀌거나 잔량이
+        늘어난 주문(정정 재접수)은 레벨 끝으로 옮긴다.
+        """
+        resting = self._orders.get(order.id)  # type: ignore
+        if order.status not in (OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED) or order.price is None:
+            if resting is not None:
+                self.cancel(resting.order_id)
+            return
+        current = self.from_model(order)
+        if resting is None:
+            self.add(current)
+        elif resting.price != current.price or resting.remaining_quantity < current.remaining_quantity:
+            self.cancel(resting.order_id)
+            self.add(current)
+        else:
+            self.side(resting.side).get(resting.price).reduce(
+                resting, resting.remaining_quantity - current.remaining_quantity
+            )
+            resting.quantity = current.quantity
+            self._mark_changed(resting)
+
+    def _mark_changed(self, order: BookOrder) -> None:
+        self.sequence += 1
+        if order.side == OrderSide.BUY:
+            self._changed_bids.add(order.price)
+        else:
+            self._changed_asks.add(order.price)
+
+    def drain_changes(self) -> Optional[BookUpdate]:
+        """마지막 호출 이후 바뀐 레벨의 현재 집계값 (변경 없으면 None)"""
+        if not self._changed_bids and not self._changed_asks:
+            return None
+        update = BookUpdate(
+            symbol=self.symbol,
+            sequence=self.sequence,
+            bids=self._level_states(self.bids, self._changed_bids),
+            asks=self._level_states(self.asks, self._changed_asks),
+        )
+        self._changed_bids = set()
+        self._changed_asks = set()
+        return update
+
+    @staticmethod
+    def _level_states(book_side: BookSide, prices: Set[int]) -> List[Tuple[int, int, int]]:
+        states = []
+        for price in prices:
+            level = book_side.get(price)
+            if level is None:
+                states.append((price, 0, 0))
+            else:
+                states.append((price, level.total_quantity, level.order_count))
+        return states
+
+    def from_model(self, order: Order) -> BookOrder:
+        """ORM 주문을 오더북 주문으로 변환 (Decimal → tick/lot)"""
+        spec = self.spec
+        return BookOrder(
+            order_id=order.id,  # type: ignore
+            side=order.side,  # type: ignore
+            price=spec.to_ticks(Decimal(order.price)),  # type: ignore
+            quantity=spec.to_lots(Decimal(order.quantity)),  # type: ignore
+            remaining_quantity=spec.to_lots(Decimal(order.remaining_quantity)),  # type: ignore
+            user_id=order.user_id,  # type: ignore
+            client_order_id=order.client_order_id,  # type: ignore
+            created_at=order.created_at,  # type: ignore
+        )
+
+
+class OrderBookManager:
+    """심볼별 오더북 관리"""
+
+    def __init__(self, symbols: SymbolRegistry = symbol_registry):
+        self.symbols = symbols
+        self.books: Dict[str, OrderBook] = {}
+
+    def get(self, symbol: str) -> Optional[OrderBook]:
+        return self.books.get(symbol)
+
+    def get_or_create(self, symbol: str) -> OrderBook:
+        book = self.books.get(symbol)
+        if book is None:
+            book = OrderBook(symbol, self.symbols.get(symbol))
+            self.books[symbol] = book
+        return book
+
+    def locate(self, order_id: UUID) -> Optional[OrderBook]:
+        """주문이 대기 중인 오더북 조회"""
+        for book in self.books.values():
+            if order_id in book:
+                return book
+        return None
+
+    def rebuild(self, orders: Iterable[Order]) -> int:
+        """미체결 주문(생성 시각 오름차순)으로 오더북 재구성"""
+        self.books.clear()
+        count = 0
+        for order in orders:
+            if order.price is None:
+                continue
+            book = self.get_or_create(order.symbol)  # type: ignore
+            book.add(book.from_model(order))
+            count += 1
+        for book in self.books.values():
+            book.drain_changes()
+        return count
+
+    def catch_up(self, orders: Iterable[Order], since: Dict[str, datetime]) -> int:
+        """스냅샷을 적재한 오더북에 스냅샷 시각 이후 바뀐 주문(생성 시각 오름차순) 반영"""
+        count = 0
+        for order in orders:
+            taken_at = since.get(order.symbol)  # type: ignore
+            if taken_at is not None and order.updated_at < taken_at:
+                continue
+            self.get_or_create(order.symbol).sync(order)  # type: ignore
+            count += 1
+        for book in self.books.values():
+            book.drain_changes()
+        return count
+
+
+# 애플리케이션 전역 오더북
+order_book_manager = OrderBookManager()
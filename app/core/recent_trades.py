@@ -0,0 +1,71 @@
+import os
+from collections import deque
+from itertools import islice
+from typing import Deque, Dict, Iterable, List, Optional
+
+from app.core.matching_engine import ExecutionReport, Report, TradeEvent
+from app.core.orderbook import BookUpdate
+from app.models.trade import Trade
+from app.schemas.trade import TradeResponse
+
+# 심볼별로 메모리에 보관할 최근 체결 수
+RECENT_TRADES_CAPACITY = int(os.getenv("RECENT_TRADES_CAPACITY", "1000"))
+
+
+def serialize_trade(trade: TradeEvent) -> bytes:
+    """체결 이벤트 → TradeResponse JSON"""
+    return TradeResponse.model_construct(
+        id=trade.id,
+        buy_order_id=trade.buy_order_id,
+        sell_order_id=trade.sell_order_id,
+        symbol=trade.symbol,
+        price=trade.price,
+        quantity=trade.quantity,
+        executed_at=trade.executed_at,
+    ).model_dump_json().encode()
+
+
+class RecentTradesBuffer:
+    """심볼별 최근 체결 링 버퍼
+
+    체결마다 TradeResponse JSON을 한 번만 만들어 고정 크기 deque에 넣고,
+    조회 시에는 최신 limit개를 이어 붙여 TradeListResponse 본문을 만든다.
+    """
+
+    def __init__(self, capacity: int = RECENT_TRADES_CAPACITY):
+        self.capacity = capacity
+        self.buffers: Dict[str, Deque[bytes]] = {}
+
+    def _buffer(self, symbol: str) -> Deque[bytes]:
+        buffer = self.buffers.get(symbol)
+        if buffer is None:
+            buffer = self.buffers[symbol] = deque(maxlen=self.capacity)
+        return buffer
+
+    def on_engine_event(self, symbol: str, reports: List[Report], update: Optional[BookUpdate]) -> None:
+        """매칭 엔진 리스너: 체결을 버퍼에 추가"""
+        for report in reports:
+            if not isinstance(report, ExecutionReport) or not report.trades:
+                continue
+            buffer = self._buffer(symbol)
+            for trade in report.trades:
+                buffer.append(serialize_trade(trade))
+
+    def seed(self, trades: Iterable[Trade]) -> None:
+        """시간 오름차순 체결 행으로 버퍼 채우기 (시작 시 DB에서 복원)"""
+        for trade in trades:
+            self._buffer(trade.symbol).append(TradeResponse.model_validate(trade).model_dump_json().encode())
+
+    def covers(self, limit: int) -> bool:
+        return limit <= self.capacity
+
+    def latest(self, symbol: str, limit: int) -> bytes:
+        """최신순 limit개로 TradeListResponse JSON 생성"""
+        buffer = self.buffers.get(symbol)
+        trades = b",".join(islice(reversed(buffer), limit)) if buffer else b""
+        count = min(limit, len(buffer)) if buffer else 0
+        return b'{"trades":[%s],"total":%d,"page":1,"size":%d,"next_cursor":null}' % (trades, count, limit)
+
+
+# 애플리케이션 전역 최근 체결 버퍼
+recent_trades = RecentTradesBuffer()
@@ -0,0 +1,292 @@
+import argparse
+import json
+import resource
+import sys
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, Iterable, List, Optional, TextIO
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from app.core.matching_engine import (
+    AmendOrderCommand,
+    CancelOrderCommand,
+    Command,
+    ExecutionReport,
+    MassCancelCommand,
+    NewOrderCommand,
+    Report,
+    SymbolEngine,
+    TradeEvent,
+    new_order_state,
+)
+from app.core.orderbook import BookSide, OrderBook, OrderBookManager
+from app.core.symbols import SymbolRegistry, symbol_registry
+from app.models.order import OrderSide
+from app.schemas.order import OrderCreate
+
+# 입력 형식 (한 줄에 이벤트 하나, type이 없으면 신규 주문)
+INPUT_FORMAT = """\
+입력 형식 (한 줄에 이벤트 하나, type이 없으면 OrderCreate 형식의 신규 주문):
+  {"symbol": "BTCUSDT", "side": "buy", "order_type": "limit", "quantity": "1", "price": "100"}
+  {"type": "cancel", "order_id": "..."}   또는   {"type": "cancel", "client_order_id": "..."}
+  {"type": "amend", "order_id": "...", "price": "101", "quantity": "2"}
+  {"type": "mass_cancel", "symbol": "BTCUSDT", "user_id": "...", "side": "buy"}
+
+신규 주문의 id와 모든 이벤트의 timestamp(ISO 8601)는 선택이다. id가 없으면 줄 번호로
+결정적인 ID를, timestamp가 없으면 직전 이벤트보다 1µs 뒤의 시각을 쓰므로 같은 입력은
+항상 같은 체결 ID와 결과를 만든다.
+"""
+
+# 줄 번호 → 주문 ID 변환용 네임스페이스 (입력에 id가 없을 때)
+REPLAY_NAMESPACE = uuid.UUID("6f1c2b1e-7a4d-4c55-9d1e-2f7b8c0a9e31")
+# timestamp가 없는 입력의 시작 시각
+REPLAY_EPOCH = datetime(2000, 1, 1, tzinfo=timezone.utc)
+_TICK = timedelta(microseconds=1)
+
+# 보고할 지연 백분위
+LATENCY_PERCENTILES = (50.0, 90.0, 99.0, 99.9, 99.99)
+
+
+def percentile(values: List[int], q: float) -> int:
+    """정렬된 목록의 백분위 값 (nearest-rank)"""
+    if not values:
+        return 0
+    rank = max(int(len(values) * q / 100 + 0.999999) - 1, 0)
+    return values[min(rank, len(values) - 1)]
+
+
+def peak_memory_mb() -> float:
+    """프로세스 최대 RSS (Linux는 KB, macOS는 바이트 단위로 보고됨)"""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def trade_line(trade: TradeEvent) -> str:
+    return json.dumps({
+        "id": str(trade.id),
+        "symbol": trade.symbol,
+        "buy_order_id": str(trade.buy_order_id),
+        "sell_order_id": str(trade.sell_order_id),
+        "price": str(trade.price),
+        "quantity": str(trade.quantity),
+        "side": trade.taker_side.value,
+        "executed_at": trade.executed_at.isoformat(),
+    })
+
+
+class ReplayRunner:
+    """심볼별 SymbolEngine을 동기로 직접 호출하는 재생기 (시퀀서/이벤트 루프 없음)"""
+
+    def __init__(self, symbols: SymbolRegistry = symbol_registry):
+        self.books = OrderBookManager(symbols)
+        self.engines: Dict[str, SymbolEngine] = {}
+        # 클라이언트 주문 ID → 주문 ID (취소/정정 입력이 client_order_id만 가질 때)
+        self.client_orders: Dict[str, UUID] = {}
+        self.latencies: List[int] = []
+        self.events: Counter = Counter()
+        self.rejected: Counter = Counter()
+        self.trades = 0
+        self.elapsed = 0.0
+        self._now = REPLAY_EPOCH
+
+    def engine(self, symbol: str) -> SymbolEngine:
+        engine = self.engines.get(symbol)
+        if engine is None:
+            engine = self.engines[symbol] = SymbolEngine(self.books.get_or_create(symbol))
+        return engine
+
+    def run(self, lines: Iterable[str], trades_out: Optional[TextIO] = None) -> None:
+        started = time.perf_counter()
+        for line_no, line in enumerate(lines, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                event = json.loads(line)
+                reports = self.apply(event, line_no)
+            except (ValueError, ValidationError, KeyError, InvalidOperation) as e:
+                # 실제 서비스에서도 거부되는 주문 (검증 실패, 호가 단위 위반 등)
+                self.rejected[type(e).__name__ if isinstance(e, ValidationError) else str(e).split(":")[0]] += 1
+                continue
+            for report in reports:
+                if isinstance(report, ExecutionReport) and report.trades:
+                    self.trades += len(report.trades)
+                    if trades_out is not None:
+                        for trade in report.trades:
+                            trades_out.write(trade_line(trade))
+                            trades_out.write("\n")
+        self.elapsed = time.perf_counter() - started
+
+    def apply(self, event: Dict[str, Any], line_no: int) -> List[Report]:
+        """이벤트 하나 처리 (매칭 지연은 엔진 호출 구간만 측정)"""
+        kind = event.get("type", "new")
+        self._advance(event.get("timestamp"))
+        if kind == "new":
+            order_data = OrderCreate.model_validate(event)
+            order_id = UUID(event["id"]) if event.get("id") else uuid.uuid5(REPLAY_NAMESPACE, str(line_no))
+            order = new_order_state(order_data, self.books.symbols.get(order_data.symbol), order_id)
+            if order_data.client_order_id:
+                self.client_orders[order_data.client_order_id] = order_id
+            reports = [self._process(order_data.symbol, NewOrderCommand(order))]
+        elif kind == "cancel":
+            book = self._locate(event)
+            if book is None:
+                raise ValueError("오더북에 없는 주문 취소")
+            reports = [self._process(book.symbol, CancelOrderCommand(self._order_id(event), event.get("user_id")))]
+        elif kind == "amend":
+            book = self._locate(event)
+            if book is None:
+                raise ValueError("오더북에 없는 주문 정정")
+            spec = book.spec
+            command = AmendOrderCommand(
+                order_id=self._order_id(event),
+                user_id=event.get("user_id"),
+                price=spec.to_ticks(Decimal(event["price"])) if event.get("price") is not None else None,
+                quantity=spec.to_lots(Decimal(event["quantity"])) if event.get("quantity") is not None else None,
+            )
+            reports = [self._process(book.symbol, command)]
+        elif kind == "mass_cancel":
+            symbols = [event["symbol"]] if event.get("symbol") else list(self.books.books)
+            reports = []
+            for symbol in symbols:
+                spec = self.books.symbols.get(symbol)
+                command = MassCancelCommand(
+                    user_id=event.get("user_id"),
+                    side=OrderSide(event["side"]) if event.get("side") else None,
+                    min_price=spec.to_ticks(Decimal(event["min_price"])) if event.get("min_price") else None,
+                    max_price=spec.to_ticks(Decimal(event["max_price"])) if event.get("max_price") else None,
+                )
+                reports.append(self._process(symbol, command))
+        else:
+            raise ValueError(f"알 수 없는 이벤트 종류: {kind}")
+        self.events[kind] += 1
+        return [report for report in reports if report is not None]
+
+    def _process(self, symbol: str, command: Command) -> Optional[Report]:
+        engine = self.engine(symbol)
+        started = time.perf_counter_ns()
+        report = engine.process(command, self._now)
+        self.latencies.append(time.perf_counter_ns() - started)
+        # 스트림 구독자가 없으므로 변경 레벨 추적만 비움
+        engine.book.drain_changes()
+        return report
+
+    def _advance(self, timestamp: Optional[str]) -> None:
+        if timestamp:
+            moment = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+            if moment.tzinfo is None:
+                moment = moment.replace(tzinfo=timezone.utc)
+            self._now = max(moment, self._now)
+        else:
+            self._now += _TICK
+
+    def _order_id(self, event: Dict[str, Any]) -> UUID:
+        if event.get("order_id"):
+            return UUID(event["order_id"])
+        return self.client_orders[event["client_order_id"]]
+
+    def _locate(self, event: Dict[str, Any]) -> Optional[OrderBook]:
+        try:
+            order_id = self._order_id(event)
+        except KeyError:
+            return None
+        book = self.books.get(event["symbol"]) if event.get("symbol") else None
+        if book is not None and order_id in book:
+            return book
+        return self.books.locate(order_id)
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies)
+        commands = len(latencies)
+        engine_seconds = sum(latencies) / 1e9
+        return {
+            "events": dict(self.events),
+            "rejected": sum(self.rejected.values()),
+            "rejected_reasons": dict(self.rejected.most_common(10)),
+            "trades": self.trades,
+            "elapsed_seconds": round(self.elapsed, 6),
+            # 입력 파싱/검증 포함 처리량과 엔진 호출만의 처리량
+            "events_per_second": round(sum(self.events.values()) / self.elapsed, 1) if self.elapsed else 0.0,
+            "engine_commands_per_second": round(commands / engine_seconds, 1) if engine_seconds else 0.0,
+            "match_latency_us": {
+                **{f"p{q:g}": percentile(latencies, q) / 1000 for q in LATENCY_PERCENTILES},
+                "mean": round(engine_seconds * 1e6 / commands, 3) if commands else 0.0,
+                "max": latencies[-1] / 1000 if latencies else 0.0,
+            },
+            "peak_memory_mb": round(peak_memory_mb(), 1),
+            "resting_orders": sum(len(book) for book in self.books.books.values()),
+        }
+
+    def book_state(self) -> Dict[str, Any]:
+        """최종 오더북 (레벨별 FIFO 대기열 포함)"""
+        return {
+            symbol: {
+                "sequence": book.sequence,
+                "bids": self._side_state(book, book.bids),
+                "asks": self._side_state(book, book.asks),
+            }
+            for symbol, book in sorted(self.books.books.items())
+        }
+
+    @staticmethod
+    def _side_state(book: OrderBook, book_side: BookSide) -> List[Dict[str, Any]]:
+        spec = book.spec
+        return [
+            {
+                "price": str(spec.from_ticks(level.price)),
+                "quantity": str(spec.from_lots(level.total_quantity)),
+                "orders": [
+                    {
+                        "id": str(order.order_id),
+                        "quantity": str(spec.from_lots(order.quantity)),
+                        "remaining_quantity": str(spec.from_lots(order.remaining_quantity)),
+                        "user_id": order.user_id,
+                        "client_order_id": order.client_order_id,
+                    }
+                    for order in level.orders.values()
+                ],
+            }
+            for level in book_side.levels()
+        ]
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m app.core.replay",
+        description="기록된 JSONL 주문 스트림을 FastAPI/DB 없이 매칭 엔진으로 재생",
+        epilog=INPUT_FORMAT,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("input", help="입력 JSONL 파일 (- 이면 표준 입력)")
+    parser.add_argument("--trades", default="replay_trades.jsonl", help="체결 내역 출력 파일 (JSONL)")
+    parser.add_argument("--book", default="replay_book.json", help="최종 오더북 출력 파일 (JSON)")
+    parser.add_argument("--report", help="요약 보고서 출력 파일 (JSON, 생략 시 표준 출력만)")
+    args = parser.parse_args(argv)
+
+    runner = ReplayRunner()
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8")
+    try:
+        with open(args.trades, "w", encoding="utf-8") as trades_out:
+            runner.run(source, trades_out)
+    finally:
+        if source is not sys.stdin:
+            source.close()
+
+    with open(args.book, "w", encoding="utf-8") as f:
+        json.dump(runner.book_state(), f, ensure_ascii=False, indent=2)
+    summary = runner.summary()
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+    json.dump(summary, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,120 @@
+import mmap
+import os
+import struct
+from typing import List
+
+# 헤더: 매직, 데이터 영역 크기 / 쓰기 위치(생산자) / 읽기 위치(소비자)
+# 두 위치는 서로 다른 프로세스가 갱신하므로 캐시 라인을 나눠 둔다
+RING_MAGIC = b"VXRING01"
+_HEADER = struct.Struct("<8sQ")
+_POSITION = struct.Struct("<Q")
+_TAIL_OFFSET = 64
+_HEAD_OFFSET = 128
+_DATA_OFFSET = 192
+
+# 메시지: 길이(4바이트) + 본문, 8바이트 정렬
+_LENGTH = struct.Struct("<I")
+_ALIGN = 8
+# 남은 공간이 모자라 데이터 영역 처음으로 돌아감을 표시하는 길이 값
+_WRAP = 0xFFFFFFFF
+
+
+class SharedRing:
+    """파일을 mmap한 단일 생산자/단일 소비자 링 버퍼 (프로세스 간 메시지 전달)
+
+    쓰기/읽기 위치는 계속 증가하는 64비트 값이고 데이터 영역 크기(2의 거듭제곱)로
+    나눈 나머지가 실제 위치다. 생산자는 본문과 길이를 쓴 뒤 쓰기 위치를 갱신하고,
+    소비자는 읽기 위치를 갱신해 공간을 돌려준다. 잠금이 없으므로 저장 순서가 보장되는
+    CPU(x86-64)를 전제로 하며, 양쪽 모두 한 스레드에서만 사용해야 한다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "r+b") as f:
+            self._map = mmap.mmap(f.fileno(), 0)
+        magic, capacity = _HEADER.unpack_from(self._map, 0)
+        if magic != RING_MAGIC:
+            raise ValueError(f"링 버퍼 파일이 아닙니다: {path}")
+        self.capacity = capacity
+        self._mask = capacity - 1
+        # 자기 쪽 위치는 로컬 값을 기준으로 쓰고, 상대 쪽 위치만 공유 메모리에서 읽는다
+        self._tail = _POSITION.unpack_from(self._map, _TAIL_OFFSET)[0]
+        self._head = _POSITION.unpack_from(self._map, _HEAD_OFFSET)[0]
+
+    @staticmethod
+    def create(path: str, capacity: int) -> "SharedRing":
+        """링 버퍼 파일 생성 (capacity는 2의 거듭제곱으로 올림)"""
+        capacity = 1 << max(capacity - 1, _ALIGN).bit_length()
+        with open(path, "wb") as f:
+            f.truncate(_DATA_OFFSET + capacity)
+            f.write(_HEADER.pack(RING_MAGIC, capacity))
+        return SharedRing(path)
+
+    @property
+    def max_message(self) -> int:
+        """한 번에 보낼 수 있는 최대 본문 크기"""
+        return self.capacity // 2 - _LENGTH.size
+
+    def write(self, payload: bytes) -> bool:
+        """메시지 추가 (공간이 모자라면 False)"""
+        size = len(payload)
+        if size > self.max_message:
+            raise ValueError(f"메시지가 너무 큽니다: {size}바이트 (최대 {self.max_message})")
+        need = (_LENGTH.size + size + _ALIGN - 1) & -_ALIGN
+        buffer = self._map
+        tail = self._tail
+        offset = tail & self._mask
+        skip = self.capacity - offset if offset + need > self.capacity else 0
+        head = _POSITION.unpack_from(buffer, _HEAD_OFFSET)[0]
+        if tail + skip + need - head > self.capacity:
+            return False
+        if skip:
+            _LENGTH.pack_into(buffer, _DATA_OFFSET + offset, _WRAP)
+            tail += skip
+            offset = 0
+        start = _DATA_OFFSET + offset + _LENGTH.size
+        buffer[start:start + size] = payload
+        _LENGTH.pack_into(buffer, _DATA_OFFSET + offset, size)
+        self._tail = tail + need
+        _POSITION.pack_into(buffer, _TAIL_OFFSET, self._tail)
+        return True
+
+    def read(self, limit: int = 256) -> List[bytes]:
+        """쌓인 메시지를 최대 limit개 꺼냄 (읽기 위치는 마지막에 한 번만 갱신)"""
+        buffer = self._map
+        tail = _POSITION.unpack_from(buffer, _TAIL_OFFSET)[0]
+        head = self._head
+        messages = []
+        while head < tail and len(messages) < limit:
+            offset = head & self._mask
+            size = _LENGTH.unpack_from(buffer, _DATA_OFFSET + offset)[0]
+            if size == _WRAP:
+                head += self.capacity - offset
+                continue
+            start = _DATA_OFFSET + offset + _LENGTH.size
+            messages.append(buffer[start:start + size])
+            head += (_LENGTH.size + size + _ALIGN - 1) & -_ALIGN
+        if head != self._head:
+            self._head = head
+            _POSITION.pack_into(buffer, _HEAD_OFFSET, head)
+        return messages
+
+    def close(self) -> None:
+        self._map.close()
+
+
+def doorbell_write(fd: int) -> None:
+    """소비자 깨우기 (파이프가 가득 차 있으면 이미 깨울 신호가 쌓여 있는 것)"""
+    try:
+        os.write(fd, b"\0")
+    except BlockingIOError:
+        pass
+
+
+def doorbell_drain(fd: int) -> None:
+    """쌓인 깨우기 신호 비우기"""
+    try:
+        while len(os.read(fd, 4096)) == 4096:
+            pass
+    except BlockingIOError:
+        pass
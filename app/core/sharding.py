@@ -0,0 +1,529 @@
+import asyncio
+import itertools
+import logging
+import os
+import pickle
+import zlib
+from abc import ABC, abstractmethod
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+from app.core.journal import JournalRecord, command_records, record_command
+from app.core.matching_engine import Command, MatchingEngine, SymbolEngine
+from app.core.orderbook import OrderBook, OrderBookManager
+from app.core.ring import SharedRing, doorbell_drain, doorbell_write
+from app.core.snapshot import decode_snapshot, encode_snapshot
+
+logger = logging.getLogger(__name__)
+
+# 한 번에 링에서 꺼낼 메시지 수 (넘으면 다른 작업에 양보 후 계속)
+RING_READ_BATCH = 256
+# 링이 가득 찼을 때 다시 쓰기를 시도하는 간격
+RING_RETRY_S = 0.0005
+
+# 워커 → 샤드
+MSG_CALL = 1        # (종류, 호출 ID, 심볼, 명령, 영속화 대기 여부)
+MSG_SYNC = 2        # (종류, 호출 ID) 오더북 복제본 요청, 이후 복제 기록 구독
+# 샤드 → 워커
+MSG_RESULT = 3      # (종류, 호출 ID, 실패 여부, 결과 또는 예외, 복제 번호)
+MSG_REPLICATE = 4   # (종류, 심볼, 복제 번호, 저널 기록 목록, 영속화 완료 여부)
+MSG_DURABLE = 5     # (종류, 심볼, 이 번호까지 영속화됨, 실패 사유)
+MSG_MIRROR = 6      # (종류, 심볼, 복제 번호, 오더북 스냅샷)
+
+# 링 메시지 첫 바이트: 이어지는 조각 있음 / 마지막 조각
+_MORE = b"\x01"
+_LAST = b"\x00"
+
+
+def shard_of(symbol: str, shards: int) -> int:
+    """심볼 → 엔진 샤드 번호 (프로세스와 무관하게 같은 값이 나오는 해시)"""
+    return zlib.crc32(symbol.encode()) % shards
+
+
+@dataclass(frozen=True)
+class ClusterLayout:
+    """클러스터 구성: 샤드/워커 수와 링 버퍼 파일 위치
+
+    워커 w와 샤드 s 사이에는 요청 링(w → s)과 응답 링(s → w)이 하나씩 있다.
+    """
+    directory: str
+    shards: int
+    workers: int
+
+    def ring_path(self, worker: int, shard: int, kind: str) -> str:
+        return os.path.join(self.directory, f"w{worker}-s{shard}.{kind}")
+
+    def owns(self, shard: int, symbol: str) -> bool:
+        return shard_of(symbol, self.shards) == shard
+
+    def shard_links(self, shard: int, doorbells: Sequence[int]) -> Dict[int, "RingLink"]:
+        """샤드 쪽 워커별 링 (doorbells: 워커별 깨우기 파이프 쓰기 fd)"""
+        return {
+            worker: RingLink(
+                SharedRing(self.ring_path(worker, shard, "resp")),
+                SharedRing(self.ring_path(worker, shard, "req")),
+                doorbells[worker],
+            )
+            for worker in range(self.workers)
+        }
+
+    def worker_links(self, worker: int, doorbells: Sequence[int]) -> Dict[int, "RingLink"]:
+        """워커 쪽 샤드별 링 (doorbells: 샤드별 깨우기 파이프 쓰기 fd)"""
+        return {
+            shard: RingLink(
+                SharedRing(self.ring_path(worker, shard, "req")),
+                SharedRing(self.ring_path(worker, shard, "resp")),
+                doorbells[shard],
+            )
+            for shard in range(self.shards)
+        }
+
+
+class RingLink:
+    """상대 프로세스 하나와 주고받는 링 한 쌍
+
+    메시지는 pickle로 직렬화하고, 링 최대 크기를 넘으면 조각으로 나눠 보낸다.
+    링이 가득 차면 순서를 유지한 채 모아 두었다가 다시 쓰며, 보낸 뒤에는
+    이벤트 루프 한 바퀴에 한 번만 상대를 깨운다.
+    """
+
+    def __init__(self, outbound: SharedRing, inbound: SharedRing, doorbell: int):
+        self.outbound = outbound
+        self.inbound = inbound
+        self.doorbell = doorbell
+        self._backlog: Deque[bytes] = deque()
+        self._partial: List[bytes] = []
+        self._notify_scheduled = False
+        self._retry: Optional[asyncio.TimerHandle] = None
+
+    def send(self, message: tuple) -> None:
+        self.send_payload(encode_message(message))
+
+    def send_payload(self, payload: bytes) -> None:
+        size = self.outbound.max_message - 1
+        if len(payload) <= size:
+            frames = [_LAST + payload]
+        else:
+            frames = [
+                (_MORE if start + size < len(payload) else _LAST) + payload[start:start + size]
+                for start in range(0, len(payload), size)
+            ]
+        backlog = self._backlog
+        for frame in frames:
+            if backlog or not self.outbound.write(frame):
+                backlog.append(frame)
+        if backlog and self._retry is None:
+            self._retry = asyncio.get_running_loop().call_later(RING_RETRY_S, self._flush)
+        if not self._notify_scheduled:
+            self._notify_scheduled = True
+            asyncio.get_running_loop().call_soon(self._notify)
+
+    def receive(self, limit: int = RING_READ_BATCH) -> Tuple[List[Any], bool]:
+        """받은 메시지 목록과 링에 더 남아 있을 수 있는지 여부"""
+        frames = self.inbound.read(limit)
+        messages = []
+        for frame in frames:
+            if frame[:1] == _MORE:
+                self._partial.append(frame[1:])
+                continue
+            if self._partial:
+                self._partial.append(frame[1:])
+                payload = b"".join(self._partial)
+                self._partial = []
+                messages.append(pickle.loads(payload))
+            else:
+                messages.append(pickle.loads(memoryview(frame)[1:]))
+        return messages, len(frames) == limit
+
+    def close(self) -> None:
+        if self._retry is not None:
+            self._retry.cancel()
+            self._retry = None
+        self.outbound.close()
+        self.inbound.close()
+
+    def _notify(self) -> None:
+        self._notify_scheduled = False
+        doorbell_write(self.doorbell)
+
+    def _flush(self) -> None:
+        self._retry = None
+        backlog = self._backlog
+        while backlog and self.outbound.write(backlog[0]):
+            backlog.popleft()
+        doorbell_write(self.doorbell)
+        if backlog:
+            self._retry = asyncio.get_running_loop().call_later(RING_RETRY_S, self._flush)
+
+
+def encode_message(message: tuple) -> bytes:
+    return pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+class _RingEndpoint(ABC):
+    """자기 깨우기 파이프와 상대별 링을 가진 프로세스 쪽 수신 루프"""
+
+    def __init__(self, links: Dict[int, RingLink], doorbell: int):
+        self.links = links
+        self.doorbell = doorbell
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is not None:
+            return
+        os.set_blocking(self.doorbell, False)
+        for link in self.links.values():
+            os.set_blocking(link.doorbell, False)
+        self._wakeup = asyncio.Event()
+        asyncio.get_running_loop().add_reader(self.doorbell, self._on_doorbell)
+        self._task = asyncio.create_task(self._run(), name=type(self).__name__)
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        asyncio.get_running_loop().remove_reader(self.doorbell)
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    def close(self) -> None:
+        for link in self.links.values():
+            link.close()
+
+    def _on_doorbell(self) -> None:
+        doorbell_drain(self.doorbell)
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        while True:
+            # 비우기 전에 신호를 지워야 도중에 들어온 메시지를 놓치지 않는다
+            self._wakeup.clear()
+            more = False
+            for peer, link in self.links.items():
+                messages, remaining = link.receive()
+                more = more or remaining
+                for message in messages:
+                    try:
+                        await self.handle(peer, link, message)
+                    except Exception:
+                        logger.exception("링 메시지 처리 실패 (%s)", message[0])
+            if more:
+                await asyncio.sleep(0)
+            else:
+                await self._wakeup.wait()
+
+    @abstractmethod
+    async def handle(self, peer: int, link: RingLink, message: tuple) -> None:
+        """상대 peer에게서 받은 메시지 하나 처리"""
+
+
+class _ShardCall:
+    """샤드 시퀀서에 넣는 Future 대용: 처리 결과를 요청한 워커로 회신"""
+
+    __slots__ = ("server", "link", "call_id", "symbol", "wait", "_done")
+
+    def __init__(self, server: "ShardServer", link: RingLink, call_id: int, symbol: str, wait: bool):
+        self.server = server
+        self.link = link
+        self.call_id = call_id
+        self.symbol = symbol
+        self.wait = wait
+        self._done = False
+
+    def done(self) -> bool:
+        return self._done
+
+    def set_result(self, value: Tuple[Any, Any, Any]) -> None:
+        self._done = True
+        result, durable, journaled = value
+        sequence = self.server.sequences.get(self.symbol, 0)
+        pending = [f for f in (journaled, durable) if f is not None] if self.wait else []
+        if pending:
+            asyncio.ensure_future(self._reply_when_durable(result, pending, sequence))
+        else:
+            self.link.send((MSG_RESULT, self.call_id, False, result, sequence))
+
+    def set_exception(self, error: BaseException) -> None:
+        self._done = True
+        self.link.send((MSG_RESULT, self.call_id, True, error, 0))
+
+    async def _reply_when_durable(self, result: Any, pending: List["asyncio.Future[Any]"], sequence: int) -> None:
+        try:
+            for future in pending:
+                await asyncio.shield(future)
+        except Exception as e:
+            self.link.send((MSG_RESULT, self.call_id, True, e, sequence))
+        else:
+            self.link.send((MSG_RESULT, self.call_id, False, result, sequence))
+
+
+class ShardServer(_RingEndpoint):
+    """엔진 샤드 프로세스 쪽: 워커들이 보낸 명령을 로컬 시퀀서로 처리하고 결과를 회신
+
+    오더북을 바꾼 명령은 저널 기록 형태로 복제를 요청한 모든 워커에 보내고,
+    영속화(저널 fsync 또는 DB 커밋)가 끝나면 복제 번호로 알린다.
+    """
+
+    def __init__(self, engine: MatchingEngine, links: Dict[int, RingLink], doorbell: int):
+        super().__init__(links, doorbell)
+        self.engine = engine
+        self.followers: Set[int] = set()
+        # 심볼별 마지막 복제 번호
+        self.sequences: Dict[str, int] = {}
+        # 심볼별 [영속화 대기 Future, 그 Future로 끝나는 마지막 복제 번호]
+        self._durability: Dict[str, list] = {}
+
+    async def handle(self, peer: int, link: RingLink, message: tuple) -> None:
+        kind = message[0]
+        if kind == MSG_CALL:
+            _, call_id, symbol, command, wait = message
+            call = _ShardCall(self, link, call_id, symbol, wait)
+            try:
+                await self.engine.enqueue(symbol, command, call)
+            except Exception as e:
+                call.set_exception(e)
+        elif kind == MSG_SYNC:
+            self._sync(peer, link, message[1])
+        else:
+            logger.warning("알 수 없는 링 메시지입니다: %s", kind)
+
+    def _sync(self, peer: int, link: RingLink, call_id: int) -> None:
+        """현재 오더북을 보내고 이후 복제 기록 구독 등록 (시퀀서 명령 사이의 일관된 시점)"""
+        now = datetime.now(timezone.utc)
+        for symbol, book in self.engine.books.books.items():
+            link.send((
+                MSG_MIRROR,
+                symbol,
+                self.sequences.get(symbol, 0),
+                encode_snapshot(book, 0, now, now),
+            ))
+        self.followers.add(peer)
+        link.send((MSG_RESULT, call_id, False, None, 0))
+
+    def replicate(self, symbol: str, command: Command, now: datetime) -> None:
+        """매칭 엔진 복제 콜백 (시퀀서 안에서 동기 호출, 예외를 밖으로 내보내지 않음)"""
+        try:
+            sequence = self.sequences[symbol] = self.sequences.get(symbol, 0) + 1
+            future = self.engine.durability(symbol)
+            pending = future is not None and not future.done()
+            if self.followers:
+                payload = encode_message((MSG_REPLICATE, symbol, sequence, command_records(command, now), not pending))
+                for peer in self.followers:
+                    self.links[peer].send_payload(payload)
+            if pending:
+                self._watch(symbol, sequence, future)  # type: ignore
+        except Exception:
+            logger.exception("명령 복제 실패 (%s)", symbol)
+
+    def _watch(self, symbol: str, sequence: int, future: "asyncio.Future[Any]") -> None:
+        # 같은 배치/fsync Future를 기다리는 명령은 마지막 번호만 갱신
+        state = self._durability.get(symbol)
+        if state is not None and state[0] is future:
+            state[1] = sequence
+            return
+        state = self._durability[symbol] = [future, sequence]
+        future.add_done_callback(lambda done: self._durable(symbol, state, done))
+
+    def _durable(self, symbol: str, state: list, future: "asyncio.Future[Any]") -> None:
+        if self._durability.get(symbol) is state:
+            del self._durability[symbol]
+        error = None
+        if future.cancelled():
+            error = "cancelled"
+        elif future.exception() is not None:
+            error = str(future.exception())
+        payload = encode_message((MSG_DURABLE, symbol, state[1], error))
+        for peer in self.followers:
+            self.links[peer].send_payload(payload)
+
+
+class RemoteSequencer:
+    """엔진 샤드 프로세스에 있는 심볼 시퀀서의 대리 객체 (SymbolSequencer와 같은 제출 인터페이스)"""
+
+    def __init__(self, client: "ShardClient", shard: int, symbol: str):
+        self.client = client
+        self.shard = shard
+        self.symbol = symbol
+        # 응답을 기다리는 호출 수
+        self.calls = 0
+        self._idle: Optional[asyncio.Event] = None
+        # 마지막으로 받은 복제 번호 / 영속화가 확인된 마지막 복제 번호
+        self.sequence = 0
+        self.durable_sequence = 0
+        self._waiters: Deque[Tuple[int, "asyncio.Future[None]"]] = deque()
+
+    @property
+    def pending(self) -> int:
+        return self.calls
+
+    def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def drain(self) -> None:
+        """보낸 명령의 응답을 모두 받을 때까지 대기"""
+        if self.calls:
+            self._idle = asyncio.Event()
+            await self._idle.wait()
+
+    async def submit(self, command: Command) -> Any:
+        future = asyncio.get_running_loop().create_future()
+        self.client.call(self, command, future, wait=True)
+        return await future
+
+    async def enqueue(self, command: Command, future: Any) -> None:
+        self.client.call(self, command, future, wait=False)
+
+    def durability(self) -> Optional["asyncio.Future[None]"]:
+        if self.sequence <= self.durable_sequence:
+            return None
+        if self._waiters and self._waiters[-1][0] == self.sequence:
+            return self._waiters[-1][1]
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((self.sequence, future))
+        return future
+
+    def finished(self) -> None:
+        self.calls -= 1
+        if not self.calls and self._idle is not None:
+            self._idle.set()
+            self._idle = None
+
+    def advance(self, sequence: int, durable: bool = False) -> None:
+        if sequence > self.sequence:
+            self.sequence = sequence
+        if durable:
+            self.mark_durable(sequence)
+
+    def mark_durable(self, sequence: int, error: Optional[str] = None) -> None:
+        if sequence > self.durable_sequence:
+            self.durable_sequence = sequence
+        waiters = self._waiters
+        while waiters and waiters[0][0] <= sequence:
+            _, future = waiters.popleft()
+            if future.done():
+                continue
+            if error is None:
+                future.set_result(None)
+            else:
+                future.set_exception(RuntimeError(f"엔진 샤드 영속화 실패: {error}"))
+
+
+class ShardClient(_RingEndpoint):
+    """HTTP 워커 프로세스 쪽: 심볼을 해시로 샤드에 보내고 결과/복제 기록을 받음
+
+    books는 샤드 오더북의 읽기 전용 복제본이다. 샤드가 보낸 저널 기록을 저널 재생과
+    같은 방식으로 적용하고, 그 결과를 매칭 엔진 리스너(실시간 스트림, 캔들 등)에 전달한다.
+    같은 링에서 복제 기록이 결과보다 먼저 오므로, 명령 응답을 받은 시점에는 복제본에도
+    반영되어 있다.
+    """
+
+    def __init__(self, links: Dict[int, RingLink], doorbell: int, books: OrderBookManager, engine: MatchingEngine):
+        super().__init__(links, doorbell)
+        self.books = books
+        self.engine = engine
+        self.sequencers: Dict[str, RemoteSequencer] = {}
+        self.mirrors: Dict[str, SymbolEngine] = {}
+        self._calls: Dict[int, Tuple[Optional[RemoteSequencer], Any, bool]] = {}
+        self._ids = itertools.count(1)
+
+    async def connect(self) -> None:
+        """수신 루프 시작 후 모든 샤드에서 오더북 복제본을 받음"""
+        self.start()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for shard, link in self.links.items():
+            future = loop.create_future()
+            call_id = next(self._ids)
+            self._calls[call_id] = (None, future, True)
+            link.send((MSG_SYNC, call_id))
+            futures.append(future)
+        await asyncio.gather(*futures)
+
+    async def stop(self) -> None:
+        await super().stop()
+        error = RuntimeError("엔진 샤드 연결이 종료되었습니다.")
+        calls, self._calls = self._calls, {}
+        for sequencer, future, wait in calls.values():
+            if sequencer is not None:
+                sequencer.finished()
+            if not future.done():
+                future.set_exception(error)
+
+    def sequencer(self, symbol: str) -> RemoteSequencer:
+        sequencer = self.sequencers.get(symbol)
+        if sequencer is None:
+            sequencer = self.sequencers[symbol] = RemoteSequencer(self, shard_of(symbol, len(self.links)), symbol)
+        return sequencer
+
+    def call(self, sequencer: RemoteSequencer, command: Command, future: Any, wait: bool) -> None:
+        call_id = next(self._ids)
+        self._calls[call_id] = (sequencer, future, wait)
+        sequencer.calls += 1
+        self.links[sequencer.shard].send((MSG_CALL, call_id, sequencer.symbol, command, wait))
+
+    async def handle(self, peer: int, link: RingLink, message: tuple) -> None:
+        kind = message[0]
+        if kind == MSG_REPLICATE:
+            self._replicate(*message[1:])
+        elif kind == MSG_RESULT:
+            self._result(*message[1:])
+        elif kind == MSG_DURABLE:
+            _, symbol, sequence, error = message
+            self.sequencer(symbol).mark_durable(sequence, error)
+        elif kind == MSG_MIRROR:
+            self._mirror(*message[1:])
+        else:
+            logger.warning("알 수 없는 링 메시지입니다: %s", kind)
+
+    def _result(self, call_id: int, failed: bool, value: Any, sequence: int) -> None:
+        entry = self._calls.pop(call_id, None)
+        if entry is None:
+            return
+        sequencer, future, wait = entry
+        if sequencer is not None:
+            sequencer.advance(sequence)
+            sequencer.finished()
+        if future.done():
+            return
+        if failed:
+            future.set_exception(value)
+        else:
+            future.set_result(value if wait else (value, None, None))
+
+    def _mirror(self, symbol: str, sequence: int, snapshot: bytes) -> None:
+        # 스냅샷에 마지막 체결 시각도 들어 있어 복제 재생의 체결 시각이 샤드와 같다
+        book = OrderBook(symbol, self.books.symbols.get(symbol))
+        decode_snapshot(snapshot, book)
+        self.books.books[symbol] = book
+        self.mirrors[symbol] = SymbolEngine(book)
+        self.sequencer(symbol).advance(sequence, durable=True)
+
+    def _replicate(self, symbol: str, sequence: int, records: List[JournalRecord], durable: bool) -> None:
+        engine = self.mirrors.get(symbol)
+        if engine is None:
+            engine = self.mirrors[symbol] = SymbolEngine(self.books.get_or_create(symbol))
+        book = engine.book
+        reports = []
+        for record in records:
+            try:
+                report = engine.process(record_command(record, book), record.timestamp)
+            except ValueError:
+                # 샤드에서도 같은 이유로 거부된 일괄 주문 항목
+                continue
+            if report is not None:
+                reports.append(report)
+        self.sequencer(symbol).advance(sequence, durable)
+        self.engine.publish(symbol, reports, book.drain_changes())
+
+
+# HTTP 워커 프로세스로 실행될 때 연결 (클러스터 모드가 아니면 None)
+cluster_worker: Optional[ShardClient] = None
@@ -0,0 +1,365 @@
+import asyncio
+import logging
+import mmap
+import os
+import struct
+import zlib
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import quote, unquote
+from uuid import UUID, SafeUUID
+
+from app.core.journal import EngineJournal, _from_micros, _to_micros, engine_journal
+from app.core.matching_engine import MatchingEngine, matching_engine
+from app.core.orderbook import BookOrder, OrderBook, OrderBookManager, PriceLevel, order_book_manager
+from app.models.order import OrderSide
+
+logger = logging.getLogger(__name__)
+
+# 스냅샷 디렉터리 (비어 있으면 스냅샷 미사용)
+ENGINE_SNAPSHOT_DIR = os.getenv("ENGINE_SNAPSHOT_DIR", "")
+# 스냅샷 주기와 심볼별로 남겨 둘 스냅샷 수
+ENGINE_SNAPSHOT_INTERVAL_S = float(os.getenv("ENGINE_SNAPSHOT_INTERVAL_S", "300"))
+ENGINE_SNAPSHOT_KEEP = int(os.getenv("ENGINE_SNAPSHOT_KEEP", "2"))
+
+SNAPSHOT_MAGIC = b"VXSNAP02"
+SNAPSHOT_SUFFIX = ".snapshot"
+
+# 헤더: 매직, 저널 기록 번호, 스냅샷 시각(µs), 심볼 목록 시각(µs), 마지막 체결 시각(µs),
+# 오더북 sequence, 매수/매도 레벨 수, 주문 수, 문자열 영역 크기
+_HEADER = struct.Struct("<8sqqqqqIIIQ")
+# 가격 레벨 (최우선 호가부터): 가격, 총 잔량, 주문 수
+_LEVEL = struct.Struct("<qqI")
+# 주문 (레벨 순서, 레벨 안에서는 FIFO 순서): 주문 ID, 수량, 잔량, 생성 시각(µs),
+# 사용자 ID/클라이언트 주문 ID 바이트 길이 (문자열은 뒤쪽 영역에 이어 붙임)
+_ORDER = struct.Struct("<16sqqqHH")
+_CRC = struct.Struct("<I")
+_NO_TIME = -(2 ** 63)
+
+
+_new_object = object.__new__
+_set_attribute = object.__setattr__
+
+
+def _uuid_from_bytes(data: bytes) -> UUID:
+    """검증 없이 UUID 생성 (스냅샷 적재 전용, UUID(bytes=...)의 약 절반 비용)"""
+    value = _new_object(UUID)
+    _set_attribute(value, "int", int.from_bytes(data, "big"))
+    _set_attribute(value, "is_safe", SafeUUID.unknown)
+    return value
+
+
+@dataclass(slots=True)
+class SnapshotInfo:
+    """적재한 스냅샷 정보"""
+    symbol: str
+    journal_sequence: int
+    taken_at: datetime
+    # 이 스냅샷을 쓴 주기가 심볼 목록을 정한 시각 (이후 생긴 심볼은 목록에 없음)
+    listed_at: datetime
+    book_sequence: int
+    orders: int
+    last_trade_time: Optional[datetime] = None
+    path: Optional[Path] = None
+
+
+def encode_snapshot(book: OrderBook, journal_sequence: int, taken_at: datetime, listed_at: datetime) -> bytes:
+    """오더북 → 스냅샷 바이트 (시퀀서 명령 사이에서 동기로 호출)"""
+    levels: List[bytes] = []
+    orders: List[bytes] = []
+    texts: List[bytes] = []
+    counts = []
+    pack_level = _LEVEL.pack
+    pack_order = _ORDER.pack
+    for book_side in (book.bids, book.asks):
+        count = 0
+        for level in book_side.levels():
+            levels.append(pack_level(level.price, level.total_quantity, len(level.orders)))
+            for order in level.orders.values():
+                user_id = order.user_id.encode() if order.user_id else b""
+                client_order_id = order.client_order_id.encode() if order.client_order_id else b""
+                orders.append(pack_order(
+                    order.order_id.bytes,
+                    order.quantity,
+                    order.remaining_quantity,
+                    _to_micros(order.created_at) if order.created_at is not None else _NO_TIME,
+                    len(user_id),
+                    len(client_order_id),
+                ))
+                if user_id:
+                    texts.append(user_id)
+                if client_order_id:
+                    texts.append(client_order_id)
+            count += 1
+        counts.append(count)
+
+    text = b"".join(texts)
+    body = b"".join([
+        _HEADER.pack(
+            SNAPSHOT_MAGIC,
+            journal_sequence,
+            _to_micros(taken_at),
+            _to_micros(listed_at),
+            _to_micros(book.last_trade_time) if book.last_trade_time is not None else _NO_TIME,
+            book.sequence,
+            counts[0],
+            counts[1],
+            len(orders),
+            len(text),
+        ),
+        *levels,
+        *orders,
+        text,
+    ])
+    return body + _CRC.pack(zlib.crc32(body))
+
+
+def decode_snapshot(data, book: OrderBook) -> SnapshotInfo:
+    """스냅샷 바이트(mmap 가능) → 빈 오더북에 적재
+
+    레벨과 FIFO 대기열을 파일 순서대로 직접 만들어 주문별 삽입/정렬 비용이 없다.
+    """
+    # mmap을 닫을 수 있도록 모든 memoryview는 with 블록 안에서만 사용
+    with memoryview(data) as view:
+        if len(view) < _HEADER.size + _CRC.size:
+            raise ValueError("스냅샷이 잘렸습니다.")
+        (crc,) = _CRC.unpack_from(view, len(view) - _CRC.size)
+        with view[:-_CRC.size] as body:
+            if zlib.crc32(body) != crc:
+                raise ValueError("스냅샷 CRC가 맞지 않습니다.")
+        (
+            magic, journal_sequence, taken_at, listed_at, last_trade_time,
+            book_sequence, bid_count, ask_count, order_count, text_size,
+        ) = _HEADER.unpack_from(view, 0)
+        if magic != SNAPSHOT_MAGIC:
+            raise ValueError("스냅샷 형식이 아닙니다.")
+
+        level_offset = _HEADER.size
+        order_offset = level_offset + (bid_count + ask_count) * _LEVEL.size
+        text_offset = order_offset + order_count * _ORDER.size
+        if text_offset + text_size + _CRC.size != len(view):
+            raise ValueError("스냅샷 크기가 맞지 않습니다.")
+
+        text = bytes(view[text_offset:text_offset + text_size])
+        with view[level_offset:order_offset] as level_view, view[order_offset:text_offset] as order_view:
+            sides = _decode_levels(
+                _LEVEL.iter_unpack(level_view), _ORDER.iter_unpack(order_view), text, bid_count, ask_count
+            )
+
+    book.restore(sides[0], sides[1], book_sequence)
+    # 재생/이후 체결이 스냅샷 이전 체결 시각에서 이어지도록
+    book.last_trade_time = _from_micros(last_trade_time) if last_trade_time != _NO_TIME else None
+    return SnapshotInfo(
+        symbol=book.symbol,
+        journal_sequence=journal_sequence,
+        taken_at=_from_micros(taken_at),
+        listed_at=_from_micros(listed_at),
+        book_sequence=book_sequence,
+        orders=order_count,
+        last_trade_time=book.last_trade_time,
+    )
+
+
+def _decode_levels(
+    level_rows: Iterator[tuple],
+    order_rows: Iterator[tuple],
+    text: bytes,
+    bid_count: int,
+    ask_count: int,
+) -> Tuple[List[PriceLevel], List[PriceLevel]]:
+    position = 0
+    sides: Tuple[List[PriceLevel], List[PriceLevel]] = ([], [])
+    for side, levels, count in ((OrderSide.BUY, sides[0], bid_count), (OrderSide.SELL, sides[1], ask_count)):
+        for _ in range(count):
+            price, total_quantity, level_orders = next(level_rows)
+            level = PriceLevel(price)
+            queue = level.orders
+            for _ in range(level_orders):
+                order_id, quantity, remaining, created_at, user_length, client_length = next(order_rows)
+                user_id = text[position:position + user_length].decode() if user_length else None
+                position += user_length
+                client_order_id = text[position:position + client_length].decode() if client_length else None
+                position += client_length
+                key = _uuid_from_bytes(order_id)
+                queue[key] = BookOrder(
+                    key, side, price, quantity, remaining, user_id, client_order_id,
+                    _from_micros(created_at) if created_at != _NO_TIME else None,
+                )
+            level.total_quantity = total_quantity
+            levels.append(level)
+    return sides
+
+
+class SnapshotStore:
+    """심볼별 오더북 스냅샷 파일 (ENGINE_SNAPSHOT_DIR/<심볼>/<스냅샷 시각 µs>.snapshot)"""
+
+    def __init__(self, directory: str, keep: int = ENGINE_SNAPSHOT_KEEP):
+        self.directory = Path(directory)
+        self.keep = max(keep, 1)
+
+    def symbol_directory(self, symbol: str) -> Path:
+        return self.directory / quote(symbol, safe="")
+
+    def paths(self, symbol: str) -> List[Path]:
+        directory = self.symbol_directory(symbol)
+        if not directory.exists():
+            return []
+        return sorted(directory.glob(f"*{SNAPSHOT_SUFFIX}"))
+
+    def symbols(self) -> List[str]:
+        if not self.directory.exists():
+            return []
+        return sorted(unquote(path.name) for path in self.directory.iterdir() if path.is_dir())
+
+    def load(self, books: OrderBookManager) -> Dict[str, SnapshotInfo]:
+        """심볼별 최신 스냅샷을 빈 오더북에 적재 (손상된 파일은 건너뛰고 이전 스냅샷 사용)
+
+        디렉터리만 있고 적재할 스냅샷이 없는 심볼은 결과에서 빠지며, 호출 측이
+        해당 심볼의 미체결 주문을 따로 불러와야 한다.
+        """
+        loaded: Dict[str, SnapshotInfo] = {}
+        for symbol in self.symbols():
+            for path in reversed(self.paths(symbol)):
+                book = OrderBook(symbol, books.symbols.get(symbol))
+                try:
+                    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                        info = decode_snapshot(data, book)
+                except (OSError, ValueError, StopIteration) as e:
+                    logger.warning("스냅샷 적재 실패, 이전 스냅샷 사용: %s (%s)", path, e)
+                    continue
+                info.path = path
+                books.books[symbol] = book
+                loaded[symbol] = info
+                break
+        return loaded
+
+    def save(self, symbol: str, data: bytes, taken_at: datetime) -> Path:
+        """임시 파일에 쓰고 fsync 후 이름 변경 (오래된 스냅샷은 keep개만 남김)"""
+        directory = self.symbol_directory(symbol)
+        directory.mkdir(parents=True, exist_ok=True)
+        path = directory / f"{_to_micros(taken_at):020d}{SNAPSHOT_SUFFIX}"
+        temporary = path.with_suffix(".tmp")
+        with open(temporary, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+        fd = os.open(directory, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        for old in self.paths(symbol)[:-self.keep]:
+            old.unlink()
+        return path
+
+    def clear(self) -> None:
+        """모든 스냅샷 삭제 (저널을 새로 만들어 기록 번호가 이어지지 않을 때)"""
+        for symbol in self.symbols():
+            for path in self.paths(symbol):
+                path.unlink()
+
+    def oldest_sequence(self, symbol: str) -> Optional[int]:
+        """남아 있는 가장 오래된 스냅샷의 저널 기록 번호 (이전 저널 세그먼트 정리 기준)
+
+        최신 스냅샷이 손상돼도 이전 스냅샷부터 재생할 수 있도록 keep개가 쌓이기
+        전에는 None을 돌려준다.
+        """
+        paths = self.paths(symbol)
+        if len(paths) < self.keep:
+            return None
+        with open(paths[0], "rb") as f:
+            header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            return None
+        return _HEADER.unpack(header)[1]
+
+
+class SnapshotWriter:
+    """주기적으로 모든 심볼의 오더북 스냅샷을 쓰는 백그라운드 작업
+
+    오더북은 시퀀서 명령 사이에 동기로 직렬화하고, 그 시점까지의 처리 결과가
+    DB에 저장된 뒤에 파일로 쓴다. 따라서 스냅샷 이전 기록은 다시 영속화할
+    필요가 없고, 가장 오래된 스냅샷 이전의 저널 세그먼트는 삭제할 수 있다.
+    """
+
+    def __init__(
+        self,
+        store: SnapshotStore,
+        books: OrderBookManager = order_book_manager,
+        engine: MatchingEngine = matching_engine,
+        journal: Optional[EngineJournal] = engine_journal,
+        interval: float = ENGINE_SNAPSHOT_INTERVAL_S,
+    ):
+        self.store = store
+        self.books = books
+        self.engine = engine
+        self.journal = journal
+        self.interval = interval
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="snapshot-writer")
+
+    async def stop(self) -> None:
+        """매칭 엔진 종료 후 마지막 스냅샷을 쓰고 종료"""
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+        await self.snapshot_all()
+
+    async def snapshot_all(self) -> int:
+        # 심볼 목록을 정한 시각과 디렉터리를 먼저 남겨, 도중에 중단돼도 목록 이후에
+        # 생긴 심볼은 listed_at 이후 변경분으로, 목록에 있던 심볼은 디렉터리로 찾을 수 있게 함
+        listed_at = datetime.now(timezone.utc)
+        symbols = list(self.books.books)
+        for symbol in symbols:
+            self.store.symbol_directory(symbol).mkdir(parents=True, exist_ok=True)
+        written = 0
+        for symbol in symbols:
+            try:
+                if await self.snapshot(symbol, listed_at):
+                    written += 1
+            except Exception:
+                logger.exception("스냅샷 저장 실패 (%s)", symbol)
+        return written
+
+    async def snapshot(self, symbol: str, listed_at: datetime) -> bool:
+        book = self.books.get(symbol)
+        if book is None:
+            return False
+
+        # 동기 구간: 시퀀서가 다음 명령을 처리하기 전의 일관된 시점
+        journal_sequence, durable = self.engine.checkpoint(symbol)
+        taken_at = datetime.now(timezone.utc)
+        data = encode_snapshot(book, journal_sequence, taken_at, listed_at)
+
+        if durable is not None:
+            await asyncio.shield(durable)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.store.save, symbol, data, taken_at)
+
+        if self.journal is not None:
+            oldest = self.store.oldest_sequence(symbol)
+            if oldest:
+                self.journal.open(symbol).prune(oldest)
+        return True
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                await self.snapshot_all()
+
+
+# 애플리케이션 전역 스냅샷 저장소/작업 (ENGINE_SNAPSHOT_DIR 미설정 시 None)
+snapshot_store: Optional[SnapshotStore] = SnapshotStore(ENGINE_SNAPSHOT_DIR) if ENGINE_SNAPSHOT_DIR else None
+snapshot_writer: Optional[SnapshotWriter] = SnapshotWriter(snapshot_store) if snapshot_store is not None else None
@@ -0,0 +1,93 @@
+import json
+import os
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterable, Optional
+
+# 기본 호가/수량 단위 (orders/trades 컬럼의 Numeric(20, 8) 스케일)
+DEFAULT_TICK_SIZE = Decimal("0.00000001")
+DEFAULT_LOT_SIZE = Decimal("0.00000001")
+
+# 심볼별 단위 설정 (예: {"BTCUSDT": {"tick_size": "0.01", "lot_size": "0.00001"}})
+SYMBOL_SPECS = os.getenv("SYMBOL_SPECS", "")
+# 기본 단위로 거래할 심볼 목록 (쉼표 구분, 예: "BTCUSDT,ETHUSDT")
+# SYMBOL_SPECS와 SYMBOLS 어디에도 없는 심볼의 주문은 거부한다
+SYMBOLS = os.getenv("SYMBOLS", "")
+
+
+class UnknownSymbolError(ValueError):
+    """거래 대상으로 등록되지 않은 심볼"""
+
+
+@dataclass(frozen=True, slots=True)
+class SymbolSpec:
+    """심볼별 호가 단위(tick)와 수량 단위(lot)
+
+    엔진과 오더북은 가격을 tick 수, 수량을 lot 수(정수)로 다루고
+    API/영속화 경계에서만 Decimal로 변환한다.
+    """
+    symbol: str
+    tick_size: Decimal = DEFAULT_TICK_SIZE
+    lot_size: Decimal = DEFAULT_LOT_SIZE
+
+    def to_ticks(self, price: Decimal) -> int:
+        ticks, remainder = divmod(price, self.tick_size)
+        if remainder:
+            raise ValueError(f"가격은 호가 단위({self.tick_size})의 배수여야 합니다: {price}")
+        return int(ticks)
+
+    def from_ticks(self, ticks: int) -> Decimal:
+        return ticks * self.tick_size
+
+    def to_lots(self, quantity: Decimal) -> int:
+        lots, remainder = divmod(quantity, self.lot_size)
+        if remainder or lots <= 0:
+            raise ValueError(f"수량은 수량 단위({self.lot_size})의 배수여야 합니다: {quantity}")
+        return int(lots)
+
+    def from_lots(self, lots: int) -> Decimal:
+        return lots * self.lot_size
+
+
+class SymbolRegistry:
+    """거래 심볼 목록과 심볼별 단위 설정
+
+    주문은 등록된 심볼만 받고(require), 조회/복원 경로는 등록되지 않은 심볼도
+    기본 단위로 다룬다(get).
+    """
+
+    def __init__(self, specs: Optional[Dict[str, SymbolSpec]] = None):
+        self._specs: Dict[str, SymbolSpec] = dict(specs or {})
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._specs
+
+    @classmethod
+    def from_json(cls, raw: str, symbols: Iterable[str] = ()) -> "SymbolRegistry":
+        specs = {symbol: SymbolSpec(symbol) for symbol in symbols}
+        for symbol, conf in (json.loads(raw) if raw else {}).items():
+            specs[symbol] = SymbolSpec(
+                symbol=symbol,
+                tick_size=Decimal(str(conf.get("tick_size", DEFAULT_TICK_SIZE))),
+                lot_size=Decimal(str(conf.get("lot_size", DEFAULT_LOT_SIZE))),
+            )
+        return cls(specs)
+
+    def get(self, symbol: str) -> SymbolSpec:
+        """심볼 단위 설정 (등록되지 않은 심볼은 기본 단위, 목록에 추가하지 않음)"""
+        spec = self._specs.get(symbol)
+        return spec if spec is not None else SymbolSpec(symbol)
+
+    def require(self, symbol: str) -> SymbolSpec:
+        """주문 가능한 심볼의 단위 설정"""
+        spec = self._specs.get(symbol)
+        if spec is None:
+            raise UnknownSymbolError(f"거래할 수 없는 심볼입니다: {symbol}")
+        return spec
+
+    def register(self, spec: SymbolSpec) -> None:
+        self._specs[spec.symbol] = spec
+
+
+# 애플리케이션 전역 심볼 설정
+symbol_registry = SymbolRegistry.from_json(SYMBOL_SPECS, [s.strip() for s in SYMBOLS.split(",") if s.strip()])
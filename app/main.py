@@ -1,9 +1,80 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from typing import Callable, Optional
 
-from app.api import orders, trades
-from app.db.database import engine, Base
+from app.api import orders, trades, orderbook, klines, metrics
+from app.ws import depth as ws_depth, order_entry as ws_order_entry, trades as ws_trades
+from app.db.database import engine, Base, AsyncSessionLocal, replica_router
+from app.core import sharding
+from app.core.orderbook import order_book_manager
+from app.core.matching_engine import matching_engine
+from app.core.klines import kline_aggregator
+from app.core.recent_trades import recent_trades
+from app.core.journal import engine_journal
+from app.core.snapshot import snapshot_store, snapshot_writer
+from app.services.order_service import OrderService
+from app.services.trade_service import TradeService
+from app.services.execution_service import ExecutionService
+from app.services.write_behind import write_behind_pipeline
+from app.services.kline_service import KlineService, kline_flusher
+from app.services.trade_archive import trade_archiver
+
+
+async def restore_order_books(owns: Optional[Callable[[str], bool]] = None) -> None:
+    """스냅샷/저널/DB로 인메모리 오더북 복원 (owns를 주면 해당 심볼만, 엔진 샤드용)"""
+    # 최신 스냅샷 적재 후 그 이후 변경분만 저널 또는 DB에서 반영
+    loaded = snapshot_store.load(order_book_manager) if snapshot_store is not None else {}
+    if loaded:
+        print(f"📸 스냅샷 적재 완료: {len(loaded)}개 심볼, {sum(info.orders for info in loaded.values())}개 주문")
+    
+    if engine_journal is not None and not engine_journal.is_empty():
+        # 명령 저널 재생으로 오더북 복원, DB에 반영되지 않은 꼬리는 다시 저장
+        after = {symbol: info.journal_sequence for symbol, info in loaded.items()}
+        replayed, tail = engine_journal.recover(order_book_manager, after)
+        if tail:
+            async with AsyncSessionLocal() as db:
+                await ExecutionService(db).save_batch(tail)
+            engine_journal.mark_all_persisted()
+        print(f"📼 저널 재생 완료: {replayed}개 기록, 미반영 {len(tail)}건 재저장")
+    elif loaded:
+        # 스냅샷 이후 바뀐 주문만 DB에서 반영 (스냅샷이 없는 심볼은 미체결 주문 전체)
+        async with AsyncSessionLocal() as db:
+            order_service = OrderService(db)
+            changed = []
+            for symbol in snapshot_store.symbols():
+                if symbol not in loaded:
+                    changed.extend(await order_service.get_open_orders_by_symbol(symbol))
+            changed.extend(await order_service.get_orders_updated_since(
+                min(info.listed_at for info in loaded.values())
+            ))
+        if owns is not None:
+            changed = [order for order in changed if owns(order.symbol)]
+        order_book_manager.catch_up(changed, {symbol: info.taken_at for symbol, info in loaded.items()})
+        print(f"🗂️ 스냅샷 이후 변경 반영: {len(changed)}개 주문")
+    else:
+        # 미체결 주문으로 인메모리 오더북 재구성
+        async with AsyncSessionLocal() as db:
+            open_orders = await OrderService(db).get_open_orders()
+        if owns is not None:
+            open_orders = [order for order in open_orders if owns(order.symbol)]
+        order_book_manager.rebuild(open_orders)
+    if engine_journal is not None and engine_journal.is_empty():
+        # 저널 최초 생성: 이전 저널 기준의 스냅샷은 기록 번호가 맞지 않으므로 삭제
+        if snapshot_store is not None:
+            snapshot_store.clear()
+        engine_journal.bootstrap(order_book_manager)
+    
+    # 중복 제출 색인 복원 (오더북에 없는 대기 주문과 보관 기간 안에 종료된 주문까지 DB 기준)
+    async with AsyncSessionLocal() as db:
+        client_orders = await OrderService(db).get_client_orders(
+            datetime.now(timezone.utc) - matching_engine.client_orders.ttl
+        )
+    if owns is not None:
+        client_orders = [order for order in client_orders if owns(order.symbol)]
+    restored = matching_engine.restore_client_orders(client_orders)
+    print(f"🔁 클라이언트 주문 ID 색인 복원 완료: {restored}개 주문")
 
 
 @asynccontextmanager
@@ -11,14 +82,71 @@ async def lifespan(app: FastAPI):
     """애플리케이션 생명주기 관리"""
     # 시작 시 실행
     print("🚀 V-Exchange 매칭 엔진 서버 시작")
+    # 클러스터 HTTP 워커로 실행되면 매칭/영속화는 엔진 샤드 프로세스가 담당
+    worker = sharding.cluster_worker
     
-    # 데이터베이스 테이블 생성 (개발 환경용)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    if worker is None:
+        # 데이터베이스 테이블 생성 (개발 환경용)
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        # 체결 기본/일별 파티션 생성 (영속화 시작 전에 있어야 함)
+        created = await trade_archiver.ensure()
+        print(f"🗓️ 체결 파티션 확인 완료: {len(created)}개 생성")
+        await restore_order_books()
+    else:
+        # 샤드 오더북 복제본 수신
+        await worker.connect()
+        print(f"🔗 엔진 샤드 연결 완료: {len(worker.links)}개")
+    restored = sum(len(book.orders()) for book in order_book_manager.books.values())
+    print(f"📚 오더북 복원 완료: {len(order_book_manager.books)}개 심볼, {restored}개 주문")
+    
+    # 진행 중 캔들 복원 (마지막 1m 롤업 이후 체결만 재집계)
+    async with AsyncSessionLocal() as db:
+        replayed = await KlineService(db).restore(kline_aggregator)
+    print(f"🕯️ 캔들 복원 완료: {replayed}개 체결 재집계")
+    
+    # 심볼별 최근 체결 버퍼 채우기
+    async with AsyncSessionLocal() as db:
+        seeded = await TradeService(db).get_recent_trades(recent_trades.capacity)
+    recent_trades.seed(seeded)
+    print(f"🧾 최근 체결 복원 완료: {len(recent_trades.buffers)}개 심볼, {len(seeded)}개 체결")
+    
+    # 그룹 커밋 영속화 파이프라인 및 심볼별 매칭 시퀀서 시작
+    matching_engine.add_listener(ws_depth.depth_stream.on_engine_event)
+    matching_engine.add_listener(ws_trades.trade_tape.on_engine_event)
+    matching_engine.add_listener(ws_order_entry.order_entry_gateway.on_engine_event)
+    matching_engine.add_listener(kline_aggregator.on_engine_event)
+    matching_engine.add_listener(recent_trades.on_engine_event)
+    if worker is None:
+        write_behind_pipeline.start(matching_engine)
+        matching_engine.start(persist=write_behind_pipeline.submit, journal=engine_journal)
+        if snapshot_writer is not None:
+            snapshot_writer.start()
+        trade_archiver.start()
+    else:
+        matching_engine.start(remote=worker)
+        kline_flusher.persist = False
+    kline_flusher.start()
+    if replica_router is not None:
+        replica_router.start()
     
     yield
     
     # 종료 시 실행
+    await matching_engine.stop()
+    if worker is None:
+        await write_behind_pipeline.stop()
+        await trade_archiver.stop()
+    else:
+        await worker.stop()
+        worker.close()
+    await kline_flusher.stop()
+    if replica_router is not None:
+        await replica_router.stop()
+    if snapshot_writer is not None:
+        await snapshot_writer.stop()
+    if engine_journal is not None:
+        engine_journal.close()
     print("🛑 V-Exchange 매칭 엔진 서버 종료")
 
 
@@ -40,10 +168,19 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(metrics.RequestMetricsMiddleware)
 
 # API 라우터 등록
 app.include_router(orders.router, prefix="/api/v1")
 app.include_router(trades.router, prefix="/api/v1")
+app.include_router(orderbook.router, prefix="/api/v1")
+app.include_router(klines.router, prefix="/api/v1")
+app.include_router(metrics.router)
+
+# WebSocket 라우터 등록
+app.include_router(ws_depth.router)
+app.include_router(ws_trades.router)
+app.include_router(ws_order_entry.router)
 
 
 @app.get("/")
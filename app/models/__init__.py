@@ -1,10 +1,13 @@
 from .order import Order, OrderSide, OrderType, OrderStatus
 from .trade import Trade
+from .kline import Kline, KlineInterval
 
 __all__ = [
     "Order",
     "OrderSide", 
     "OrderType",
     "OrderStatus",
-    "Trade"
+    "Trade",
+    "Kline",
+    "KlineInterval"
 ]
@@ -0,0 +1,35 @@
+from sqlalchemy import Column, String, Numeric, DateTime, Integer
+import enum
+
+from app.db.database import Base
+
+
+class KlineInterval(str, enum.Enum):
+    """캔들 주기"""
+    ONE_MINUTE = "1m"
+    FIVE_MINUTES = "5m"
+    ONE_HOUR = "1h"
+    ONE_DAY = "1d"
+
+
+class Kline(Base):
+    """마감된 캔들(OHLCV) 롤업 테이블"""
+    __tablename__ = "klines"
+
+    # 기본 키: 심볼 + 주기 + 시작 시각
+    symbol = Column(String(20), primary_key=True)  # 예: BTCUSDT
+    interval = Column(String(3), primary_key=True)  # 1m/5m/1h/1d
+    open_time = Column(DateTime(timezone=True), primary_key=True)
+    
+    # 가격 (시가/고가/저가/종가)
+    open = Column(Numeric(20, 8), nullable=False)
+    high = Column(Numeric(20, 8), nullable=False)
+    low = Column(Numeric(20, 8), nullable=False)
+    close = Column(Numeric(20, 8), nullable=False)
+    
+    # 거래량 및 체결 수
+    volume = Column(Numeric(30, 8), nullable=False)
+    trade_count = Column(Integer, nullable=False)
+    
+    def __repr__(self):
+        return f"<Kline(symbol={self.symbol}, interval={self.interval}, open_time={self.open_time}, close={self.close})>"
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Numeric, DateTime, Enum, Text
+from sqlalchemy import Column, String, Numeric, DateTime, Enum, Text, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 import enum
@@ -54,5 +54,20 @@ class Order(Base):
     user_id = Column(String(50), nullable=True, index=True)  # 추후 사용자 시스템 연동
     client_order_id = Column(String(100), nullable=True)  # 클라이언트가 지정한 주문 ID
     
+    # 목록 조회용 복합 인덱스 (필터 + created_at 키셋 페이징)
+    __table_args__ = (
+        Index("ix_orders_user_id_status_created_at", "user_id", "status", "created_at"),
+        Index("ix_orders_symbol_status_created_at", "symbol", "status", "created_at"),
+        Index("ix_orders_updated_at", "updated_at"),
+        # 대기 주문의 클라이언트 주문 ID 중복 방지 (종료된 주문의 ID는 재사용 가능)
+        Index(
+            "ix_orders_user_id_client_order_id",
+            "user_id",
+            "client_order_id",
+            unique=True,
+            postgresql_where=text("client_order_id IS NOT NULL AND status IN ('OPEN', 'PARTIALLY_FILLED')"),
+        ),
+    )
+    
     def __repr__(self):
         return f"<Order(id={self.id}, symbol={self.symbol}, side={self.side}, type={self.order_type}, price={self.price}, quantity={self.quantity}, status={self.status})>" 
\ No newline at end of file
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey
+from sqlalchemy import Column, String, Numeric, DateTime, ForeignKey, Index
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
@@ -11,12 +11,12 @@ class Trade(Base):
     """체결 테이블"""
     __tablename__ = "trades"
 
-    # 기본 정보
+    # 기본 정보 (파티션 키가 기본 키에 포함되어야 하므로 (id, executed_at) 복합 키)
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
     
     # 주문 참조
-    buy_order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id"), nullable=False)
-    sell_order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id"), nullable=False)
+    buy_order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id"), nullable=False, index=True)
+    sell_order_id = Column(UUID(as_uuid=True), ForeignKey("orders.id"), nullable=False, index=True)
     
     # 체결 정보
     symbol = Column(String(20), nullable=False, index=True)  # 예: BTCUSDT
@@ -24,7 +24,13 @@ class Trade(Base):
     quantity = Column(Numeric(20, 8), nullable=False)
     
     # 시간 정보
-    executed_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    executed_at = Column(DateTime(timezone=True), server_default=func.now(), primary_key=True)
+    
+    # 심볼별 최근 체결 / 키셋 페이징용 인덱스, executed_at 기준 일별 범위 파티션
+    __table_args__ = (
+        Index("ix_trades_symbol_executed_at_id", "symbol", executed_at.desc(), "id"),
+        {"postgresql_partition_by": "RANGE (executed_at)"},
+    )
     
     # 관계 설정
     buy_order = relationship("Order", foreign_keys=[buy_order_id])
@@ -5,10 +5,17 @@ from .order import (
     OrderUpdate,
     OrderListResponse,
     OrderCancelRequest,
-    OrderCancelResponse
+    OrderCancelResponse,
+    OrderAmendRequest,
+    OrderBatchCreate,
+    OrderBatchResult,
+    OrderBatchResponse,
+    OrderMassCancelRequest,
+    OrderMassCancelResponse
 )
 from .trade import TradeResponse, TradeListResponse, TradeFilter
 from .orderbook import OrderBookResponse, OrderBookDepthResponse, OrderBookFilter, OrderBookLevel
+from .kline import KlineResponse, KlineListResponse
 
 __all__ = [
     # Order schemas
@@ -19,6 +26,12 @@ __all__ = [
     "OrderListResponse",
     "OrderCancelRequest",
     "OrderCancelResponse",
+    "OrderAmendRequest",
+    "OrderBatchCreate",
+    "OrderBatchResult",
+    "OrderBatchResponse",
+    "OrderMassCancelRequest",
+    "OrderMassCancelResponse",
     
     # Trade schemas
     "TradeResponse",
@@ -29,5 +42,9 @@ __all__ = [
     "OrderBookResponse",
     "OrderBookDepthResponse",
     "OrderBookFilter",
-    "OrderBookLevel"
+    "OrderBookLevel",
+    
+    # Kline schemas
+    "KlineResponse",
+    "KlineListResponse"
 ]
@@ -0,0 +1,73 @@
+import csv
+import enum
+import io
+import uuid
+from datetime import datetime
+from decimal import Decimal
+from typing import Any, Iterable, Optional, Sequence
+
+import orjson
+from sqlalchemy.engine import Row
+
+
+def _default(value: Any) -> Any:
+    """orjson이 직접 처리하지 않는 타입 (pydantic JSON과 같은 문자열 표기)"""
+    # asyncpg가 돌려주는 UUID는 uuid.UUID 하위 클래스라 orjson이 직접 처리하지 않는다
+    if isinstance(value, (Decimal, uuid.UUID)):
+        return str(value)
+    raise TypeError(f"JSON으로 직렬화할 수 없는 타입입니다: {type(value).__name__}")
+
+
+def dumps(value: Any) -> bytes:
+    """JSON 바이트 직렬화 (UTC 시각은 pydantic과 같이 Z 표기)"""
+    return orjson.dumps(value, default=_default, option=orjson.OPT_UTC_Z)
+
+
+def list_response(
+    key: str,
+    rows: Sequence[Row],
+    page: int,
+    size: int,
+    next_cursor: Optional[str] = None,
+) -> bytes:
+    """컬럼 행 목록 → 목록 응답 JSON (OrderListResponse/TradeListResponse와 같은 형태)"""
+    return dumps({
+        key: [row._asdict() for row in rows],
+        "total": len(rows),
+        "page": page,
+        "size": size,
+        "next_cursor": next_cursor,
+    })
+
+
+# 내보내기 형식별 응답 미디어 타입
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _csv_value(value: Any) -> Any:
+    """CSV 셀 값 (JSON 응답과 같은 문자열 표기)"""
+    if value is None:
+        return ""
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat().replace("+00:00", "Z")
+    return value
+
+
+def export_header(fields: Iterable[str], export_format: str) -> bytes:
+    """내보내기 첫머리 (CSV는 컬럼 이름 행, NDJSON은 없음)"""
+    if export_format != "csv":
+        return b""
+    return (",".join(fields) + "\r\n").encode()
+
+
+def export_rows(rows: Sequence[Row], export_format: str) -> bytes:
+    """컬럼 행 묶음 → NDJSON 줄 또는 CSV 행"""
+    if export_format == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        return buffer.getvalue().encode()
+    option = orjson.OPT_UTC_Z | orjson.OPT_APPEND_NEWLINE
+    return b"".join(orjson.dumps(row._asdict(), default=_default, option=option) for row in rows)
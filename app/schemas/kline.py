@@ -0,0 +1,25 @@
+from pydantic import BaseModel
+from decimal import Decimal
+from datetime import datetime
+from typing import List
+
+from app.models.kline import KlineInterval
+
+
+class KlineResponse(BaseModel):
+    """캔들 응답 스키마"""
+    open_time: datetime
+    close_time: datetime  # 다음 캔들 시작 시각 (미포함)
+    open: Decimal
+    high: Decimal
+    low: Decimal
+    close: Decimal
+    volume: Decimal
+    trade_count: int
+
+
+class KlineListResponse(BaseModel):
+    """캔들 목록 응답 스키마"""
+    symbol: str
+    interval: KlineInterval
+    klines: List[KlineResponse]  # 시각 오름차순, 마지막 항목은 진행 중 캔들일 수 있음
@@ -1,11 +1,22 @@
 from pydantic import BaseModel, Field, validator
 from decimal import Decimal
-from typing import Optional
+from typing import List, Optional
 from datetime import datetime
 from uuid import UUID
 
 from app.models.order import OrderSide, OrderType, OrderStatus
 
+# 저널 기록의 고정 길이 필드 크기 (UTF-8 바이트, DB 컬럼 길이와 같음)
+USER_ID_MAX_BYTES = 50
+CLIENT_ORDER_ID_MAX_BYTES = 100
+
+
+def _check_bytes(value: Optional[str], size: int, name: str) -> Optional[str]:
+    """UTF-8 인코딩 길이 검사 (글자 수가 아니라 저널에 기록되는 바이트 수 기준)"""
+    if value is not None and len(value.encode()) > size:
+        raise ValueError(f'{name}가 너무 깁니다 (최대 {size}바이트).')
+    return value
+
 
 class OrderBase(BaseModel):
     """주문 기본 스키마"""
@@ -14,10 +25,10 @@ class OrderBase(BaseModel):
     order_type: OrderType = Field(..., description="주문 타입 (limit/market/ioc)")
     quantity: Decimal = Field(..., gt=0, decimal_places=8, description="주문 수량")
     price: Optional[Decimal] = Field(None, gt=0, decimal_places=8, description="주문 가격 (Market 주문은 생략)")
-    user_id: Optional[str] = Field(None, max_length=50, description="사용자 ID")
-    client_order_id: Optional[str] = Field(None, max_length=100, description="클라이언트 주문 ID")
+    user_id: Optional[str] = Field(None, max_length=USER_ID_MAX_BYTES, description="사용자 ID")
+    client_order_id: Optional[str] = Field(None, max_length=CLIENT_ORDER_ID_MAX_BYTES, description="클라이언트 주문 ID")
 
-    @validator('price')
+    @validator('price', always=True)
     def validate_price(cls, v, values):
         """Market 주문이 아닌 경우 가격은 필수"""
         if values.get('order_type') != OrderType.MARKET and v is None:
@@ -31,6 +42,16 @@ class OrderBase(BaseModel):
             raise ValueError('수량은 0보다 커야 합니다.')
         return v
 
+    @validator('user_id')
+    def validate_user_id(cls, v):
+        """사용자 ID는 저널 필드 크기 이내"""
+        return _check_bytes(v, USER_ID_MAX_BYTES, '사용자 ID')
+
+    @validator('client_order_id')
+    def validate_client_order_id(cls, v):
+        """클라이언트 주문 ID는 저널 필드 크기 이내"""
+        return _check_bytes(v, CLIENT_ORDER_ID_MAX_BYTES, '클라이언트 주문 ID')
+
 
 class OrderCreate(OrderBase):
     """주문 생성 요청 스키마"""
@@ -61,12 +82,18 @@ class OrderListResponse(BaseModel):
     total: int
     page: int
     size: int
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
 
 
 class OrderCancelRequest(BaseModel):
     """주문 취소 요청 스키마"""
     order_id: UUID = Field(..., description="취소할 주문 ID")
-    user_id: Optional[str] = Field(None, description="사용자 ID (선택사항)")
+    user_id: Optional[str] = Field(None, max_length=USER_ID_MAX_BYTES, description="사용자 ID (선택사항)")
+
+    @validator('user_id')
+    def validate_user_id(cls, v):
+        """사용자 ID는 저널 필드 크기 이내"""
+        return _check_bytes(v, USER_ID_MAX_BYTES, '사용자 ID')
 
 
 class OrderCancelResponse(BaseModel):
@@ -74,4 +101,69 @@ class OrderCancelResponse(BaseModel):
     order_id: UUID
     status: OrderStatus
     cancelled_at: datetime
-    message: str 
\ No newline at end of file
+    message: str
+
+
+class OrderAmendRequest(BaseModel):
+    """주문 정정 요청 스키마 (price 또는 quantity 중 하나는 필수)"""
+    user_id: Optional[str] = Field(None, max_length=USER_ID_MAX_BYTES, description="사용자 ID (선택사항)")
+    price: Optional[Decimal] = Field(None, gt=0, decimal_places=8, description="새 가격")
+    quantity: Optional[Decimal] = Field(None, gt=0, decimal_places=8, description="새 전체 수량 (체결 수량 포함)")
+
+    @validator('quantity', always=True)
+    def validate_fields(cls, v, values):
+        """가격과 수량이 모두 없으면 정정할 내용이 없음"""
+        if v is None and values.get('price') is None:
+            raise ValueError('price 또는 quantity 중 하나는 필수입니다.')
+        return v
+
+    @validator('user_id')
+    def validate_user_id(cls, v):
+        """사용자 ID는 저널 필드 크기 이내"""
+        return _check_bytes(v, USER_ID_MAX_BYTES, '사용자 ID')
+
+
+# 일괄 주문 최대 건수
+MAX_BATCH_ORDERS = 200
+
+
+class OrderBatchCreate(BaseModel):
+    """주문 일괄 생성 요청 스키마"""
+    orders: List[OrderCreate] = Field(..., min_length=1, max_length=MAX_BATCH_ORDERS, description="주문 목록")
+
+
+class OrderBatchResult(BaseModel):
+    """주문 일괄 생성 결과 (요청 순서와 동일)"""
+    index: int
+    success: bool
+    order: Optional[OrderResponse] = None
+    error: Optional[str] = None
+
+
+class OrderBatchResponse(BaseModel):
+    """주문 일괄 생성 응답 스키마"""
+    results: list[OrderBatchResult]
+    accepted: int
+    rejected: int
+
+
+class OrderMassCancelRequest(BaseModel):
+    """주문 일괄 취소 요청 스키마 (symbol 또는 user_id 중 하나는 필수)"""
+    symbol: Optional[str] = Field(None, max_length=20, description="거래 심볼 (생략 시 전체 심볼)")
+    user_id: Optional[str] = Field(None, max_length=USER_ID_MAX_BYTES, description="사용자 ID")
+    side: Optional[OrderSide] = Field(None, description="주문 방향 (생략 시 양쪽)")
+    min_price: Optional[Decimal] = Field(None, gt=0, description="최저 가격 (포함)")
+    max_price: Optional[Decimal] = Field(None, gt=0, description="최고 가격 (포함)")
+
+    @validator('user_id')
+    def validate_user_id(cls, v):
+        """사용자 ID는 저널 필드 크기 이내"""
+        return _check_bytes(v, USER_ID_MAX_BYTES, '사용자 ID')
+
+
+class OrderMassCancelResponse(BaseModel):
+    """주문 일괄 취소 응답 스키마"""
+    cancelled_order_ids: list[UUID]
+    count: int
+    cancelled_at: datetime
+    message: str
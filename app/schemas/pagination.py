@@ -0,0 +1,26 @@
+import base64
+import json
+from datetime import datetime
+from typing import Optional, Tuple
+from uuid import UUID
+
+# 커서 = (정렬 시각, id): 마지막으로 받은 행 바로 다음부터 조회
+Cursor = Tuple[datetime, UUID]
+
+
+def encode_cursor(timestamp: datetime, row_id: UUID) -> str:
+    """(시각, id) → 불투명 커서 문자열"""
+    raw = json.dumps([timestamp.isoformat(), str(row_id)], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Cursor]:
+    """커서 문자열 → (시각, id)"""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, row_id = json.loads(raw)
+        return datetime.fromisoformat(timestamp), UUID(row_id)
+    except (ValueError, TypeError) as e:
+        raise ValueError("잘못된 커서입니다.") from e
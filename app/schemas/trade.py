@@ -25,6 +25,7 @@ class TradeListResponse(BaseModel):
     total: int
     page: int
     size: int
+    next_cursor: Optional[str] = None  # 다음 페이지 커서 (마지막 페이지면 None)
 
 
 class TradeFilter(BaseModel):
@@ -1,4 +1,7 @@
 from .order_service import OrderService
 from .trade_service import TradeService
+from .execution_service import ExecutionService
+from .kline_service import KlineService
+from .trade_archive import TradeArchive, TradePartitionService
 
-__all__ = ["OrderService", "TradeService"]
+__all__ = ["OrderService", "TradeService", "ExecutionService", "KlineService", "TradeArchive", "TradePartitionService"]
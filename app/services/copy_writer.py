@@ -0,0 +1,152 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Any, Dict, Optional, Sequence, Tuple
+import enum
+import os
+
+from app.core.matching_engine import OrderState, TradeEvent
+from app.models.order import Order
+
+# 0이면 COPY 대신 다중 행 INSERT/UPDATE 문장으로 저장
+PERSIST_COPY = os.getenv("PERSIST_COPY", "1") == "1"
+
+ORDER_COLUMNS = (
+    "id", "symbol", "side", "order_type", "price", "quantity", "filled_quantity",
+    "remaining_quantity", "status", "created_at", "updated_at", "user_id", "client_order_id",
+)
+ORDER_UPDATE_COLUMNS = ("id", "price", "quantity", "filled_quantity", "remaining_quantity", "status", "updated_at")
+TRADE_COLUMNS = ("id", "buy_order_id", "sell_order_id", "symbol", "price", "quantity", "executed_at")
+
+
+def _enum_labels(column: Any) -> Dict[enum.Enum, str]:
+    """ORM Enum 컬럼이 저장하는 PostgreSQL enum 레이블 (멤버 → 레이블)"""
+    return dict(zip(column.type.enum_class, column.type.enums))
+
+
+# COPY는 ORM을 거치지 않으므로 ORM 경로와 같은 레이블을 직접 넣는다
+SIDE_LABELS = _enum_labels(Order.__table__.c.side)
+ORDER_TYPE_LABELS = _enum_labels(Order.__table__.c.order_type)
+STATUS_LABELS = _enum_labels(Order.__table__.c.status)
+
+# 세션 임시 스테이징 테이블 (커넥션마다 한 번 생성, 커밋 시 비워짐)
+# 트랜잭션이 롤백되면 생성도 취소되므로 매번 존재 여부를 확인한다
+_ENSURE_STAGING = """
+DO $$
+BEGIN
+    IF to_regclass('pg_temp.vx_order_stage') IS NULL THEN
+        CREATE TEMP TABLE vx_order_stage (LIKE orders INCLUDING DEFAULTS) ON COMMIT DELETE ROWS;
+        CREATE TEMP TABLE vx_order_update_stage ON COMMIT DELETE ROWS AS
+            SELECT id, price, quantity, filled_quantity, remaining_quantity, status, updated_at
+            FROM orders WITH NO DATA;
+        CREATE TEMP TABLE vx_trade_stage (LIKE trades INCLUDING DEFAULTS) ON COMMIT DELETE ROWS;
+    END IF;
+END
+$$
+"""
+
+_MERGE_ORDERS = f"""
+INSERT INTO orders ({", ".join(ORDER_COLUMNS)})
+SELECT {", ".join(ORDER_COLUMNS)} FROM vx_order_stage
+ON CONFLICT (id) DO UPDATE SET {", ".join(f"{name} = EXCLUDED.{name}" for name in ORDER_UPDATE_COLUMNS[1:])}
+"""
+
+_MERGE_TRADES = f"""
+INSERT INTO trades ({", ".join(TRADE_COLUMNS)})
+SELECT {", ".join(TRADE_COLUMNS)} FROM vx_trade_stage
+ON CONFLICT (id, executed_at) DO NOTHING
+"""
+
+_APPLY_ORDER_UPDATES = f"""
+UPDATE orders SET {", ".join(f"{name} = s.{name}" for name in ORDER_UPDATE_COLUMNS[1:])}
+FROM vx_order_update_stage s
+WHERE orders.id = s.id
+"""
+
+
+class CopyWriter:
+    """asyncpg 바이너리 COPY 기반 주문/체결 일괄 저장
+
+    행을 세션 임시 테이블에 COPY로 적재한 뒤 집합 연산 한 문장으로 반영한다.
+    세션의 현재 트랜잭션 안에서 실행되므로 커밋/롤백은 호출 측이 결정한다.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._connection: Optional[Any] = None
+
+    async def insert_orders(self, states: Sequence[OrderState]) -> None:
+        """COPY 후 INSERT ... SELECT (이미 있는 주문은 최신 상태로 덮어씀)"""
+        driver = await self._driver()
+        await driver.copy_records_to_table(
+            "vx_order_stage", records=[self.order_record(state) for state in states], columns=ORDER_COLUMNS,
+        )
+        await driver.execute(_MERGE_ORDERS)
+
+    async def insert_trades(self, trades: Sequence[TradeEvent]) -> None:
+        """COPY 후 INSERT ... SELECT (체결 ID가 결정적이므로 이미 있는 체결은 건너뜀)"""
+        driver = await self._driver()
+        await driver.copy_records_to_table(
+            "vx_trade_stage", records=[self.trade_record(trade) for trade in trades], columns=TRADE_COLUMNS,
+        )
+        await driver.execute(_MERGE_TRADES)
+
+    async def update_orders(self, states: Sequence[OrderState]) -> None:
+        """COPY 후 UPDATE ... FROM 한 문장으로 주문 상태 일괄 갱신"""
+        driver = await self._driver()
+        records = [
+            (
+                state.id,
+                state.price,
+                state.quantity,
+                state.filled_quantity,
+                state.remaining_quantity,
+                STATUS_LABELS[state.status],
+                state.updated_at,
+            )
+            for state in states
+        ]
+        await driver.copy_records_to_table("vx_order_update_stage", records=records, columns=ORDER_UPDATE_COLUMNS)
+        # 임시 테이블은 통계가 없어 orders 전체를 훑는 조인이 선택되므로 행 수를 먼저 알려 줌
+        await driver.execute("ANALYZE vx_order_update_stage")
+        await driver.execute(_APPLY_ORDER_UPDATES)
+
+    async def _driver(self) -> Any:
+        """세션 트랜잭션을 시작(스테이징 테이블 확인)하고 asyncpg 커넥션 반환"""
+        if self._connection is None:
+            connection = await self.db.connection()
+            # SQLAlchemy를 거친 첫 문장이 트랜잭션을 열어야 이후 COPY가 같은 트랜잭션에 묶인다
+            await connection.exec_driver_sql(_ENSURE_STAGING)
+            raw = await connection.get_raw_connection()
+            self._connection = raw.driver_connection
+        return self._connection
+
+    @staticmethod
+    def order_record(state: OrderState) -> Tuple[Any, ...]:
+        """주문 상태 → orders COPY 행 (enum은 ORM과 같은 레이블)"""
+        return (
+            state.id,
+            state.symbol,
+            SIDE_LABELS[state.side],
+            ORDER_TYPE_LABELS[state.order_type],
+            state.price,
+            state.quantity,
+            state.filled_quantity,
+            state.remaining_quantity,
+            STATUS_LABELS[state.status],
+            state.created_at,
+            state.updated_at,
+            state.user_id,
+            state.client_order_id,
+        )
+
+    @staticmethod
+    def trade_record(trade: TradeEvent) -> Tuple[Any, ...]:
+        """체결 이벤트 → trades COPY 행"""
+        return (
+            trade.id,
+            trade.buy_order_id,
+            trade.sell_order_id,
+            trade.symbol,
+            trade.price,
+            trade.quantity,
+            trade.executed_at,
+        )
@@ -0,0 +1,218 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import column, select, tuple_, update, values
+from sqlalchemy.dialects.postgresql import insert
+from dataclasses import replace
+from typing import Any, Dict, Iterator, List, Sequence, Set
+from uuid import UUID
+import logging
+
+from app.core.matching_engine import ExecutionReport, MassCancelReport, OrderState, Report, TradeEvent
+from app.models.order import Order, OrderStatus
+from app.models.trade import Trade
+from app.services.copy_writer import PERSIST_COPY, CopyWriter
+from app.services.order_service import OrderService
+
+logger = logging.getLogger(__name__)
+
+# 다중 행 INSERT/UPDATE 한 문장에 담을 최대 행 수 (바인드 파라미터 한도 고려)
+MAX_ROWS_PER_STATEMENT = 1000
+
+# 대기 주문 상태 (client_order_id 유일 인덱스 대상)
+LIVE_STATUSES = (OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED)
+
+# 주문 정정/체결/취소로 바뀔 수 있는 컬럼
+ORDER_MUTABLE_COLUMNS = ("price", "quantity", "filled_quantity", "remaining_quantity", "status", "updated_at")
+
+orders_table = Order.__table__
+trades_table = Trade.__table__
+
+
+def _chunks(rows: List[Dict[str, Any]], size: int = MAX_ROWS_PER_STATEMENT) -> Iterator[List[Dict[str, Any]]]:
+    for i in range(0, len(rows), size):
+        yield rows[i:i + size]
+
+
+class ExecutionService:
+    """매칭 결과 영속화 서비스"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self.copy_writer = CopyWriter(db)
+
+    async def save_report(self, report: ExecutionReport) -> None:
+        """명령 하나의 처리 결과 저장"""
+        await self.save_batch([report])
+
+    async def save_batch(self, reports: Sequence[Report]) -> None:
+        """여러 처리 결과를 단일 트랜잭션으로 저장
+
+        같은 배치 안에서 여러 번 바뀐 주문은 마지막 상태만 남기고, 배치 안에서
+        생성된 주문의 이후 변경은 INSERT 행에 합쳐 UPDATE를 생략한다.
+        일괄 취소는 다른 변경을 모두 반영한 뒤 UPDATE 한 문장으로 처리한다.
+        """
+        inserts: Dict[UUID, OrderState] = {}
+        updates: Dict[UUID, OrderState] = {}
+        trades: List[TradeEvent] = []
+        mass_cancels: List[MassCancelReport] = []
+
+        for report in reports:
+            if isinstance(report, MassCancelReport):
+                mass_cancels.append(report)
+                continue
+            if report.is_new:
+                inserts[report.order.id] = report.order
+            else:
+                self._stage_update(report.order, inserts, updates)
+            for maker in report.maker_updates:
+                self._stage_update(maker, inserts, updates)
+            trades.extend(report.trades)
+
+        if inserts:
+            await self.insert_orders(list(inserts.values()))
+        if trades:
+            await self.insert_trades(trades)
+        if updates:
+            await self.update_orders(list(updates.values()))
+        if mass_cancels:
+            await self.cancel_orders(mass_cancels)
+
+        await self.db.commit()
+
+    async def cancel_orders(self, reports: List[MassCancelReport]) -> None:
+        """배치 내 일괄 취소를 UPDATE ... RETURNING 한 문장으로 반영"""
+        order_ids = [order_id for report in reports for order_id in report.order_ids]
+        cancelled_at = max(report.cancelled_at for report in reports)
+        cancelled = await OrderService(self.db).cancel_orders(order_ids, cancelled_at)
+        if len(cancelled) != len(order_ids):
+            # 오더북과 DB 상태가 어긋난 경우 (이미 취소/체결된 행)
+            logger.warning("일괄 취소 불일치: 요청 %d건, 반영 %d건", len(order_ids), len(cancelled))
+
+    @staticmethod
+    def _stage_update(state: OrderState, inserts: Dict[UUID, OrderState], updates: Dict[UUID, OrderState]) -> None:
+        if state.id in inserts:
+            inserts[state.id] = state
+        else:
+            updates[state.id] = state
+
+    async def insert_orders(self, states: List[OrderState]) -> None:
+        """주문 INSERT (저널 재생으로 다시 저장되는 주문은 최신 상태로 덮어씀, 기본은 COPY 경유)"""
+        duplicates = await self.duplicate_client_orders(states)
+        if duplicates:
+            # 엔진 색인이 놓친 중복 (다른 샤드/프로세스가 같은 키로 먼저 저장한 대기 주문)
+            # 주문은 이미 오더북에 반영됐으므로 버리지 않고 client_order_id만 비워 유일 인덱스를 지킨다
+            logger.warning("client_order_id 중복 주문 %d건의 client_order_id를 비워 저장: %s", len(duplicates), duplicates)
+            states = [replace(state, client_order_id=None) if state.id in duplicates else state for state in states]
+        if PERSIST_COPY:
+            await self.copy_writer.insert_orders(states)
+            return
+        rows = [self.order_values(state) for state in states]
+        for chunk in _chunks(rows):
+            query = insert(orders_table).values(chunk)
+            query = query.on_conflict_do_update(
+                index_elements=["id"],
+                set_={name: query.excluded[name] for name in ORDER_MUTABLE_COLUMNS}
+            )
+            await self.db.execute(query)
+
+    async def duplicate_client_orders(self, states: List[OrderState]) -> Set[UUID]:
+        """DB의 다른 대기 주문과 (user_id, client_order_id)가 겹치는 대기 주문 ID
+
+        ix_orders_user_id_client_order_id 유일 인덱스에 걸릴 행을 INSERT 전에 찾는다.
+        """
+        keys = {
+            (state.user_id, state.client_order_id): state.id
+            for state in states
+            if state.client_order_id is not None and state.user_id is not None and state.status in LIVE_STATUSES
+        }
+        duplicates: Set[UUID] = set()
+        items = list(keys.items())
+        for i in range(0, len(items), MAX_ROWS_PER_STATEMENT):
+            chunk = items[i:i + MAX_ROWS_PER_STATEMENT]
+            query = select(orders_table.c.id, orders_table.c.user_id, orders_table.c.client_order_id).where(
+                tuple_(orders_table.c.user_id, orders_table.c.client_order_id).in_([key for key, _ in chunk]),
+                orders_table.c.status.in_(LIVE_STATUSES),
+            )
+            for order_id, user_id, client_order_id in (await self.db.execute(query)).all():
+                state_id = keys[(user_id, client_order_id)]
+                if state_id != order_id:
+                    duplicates.add(state_id)
+        return duplicates
+
+    async def insert_trades(self, trades: List[TradeEvent]) -> None:
+        """체결 INSERT (체결 ID가 결정적이므로 이미 있는 체결은 건너뜀, 기본은 COPY 경유)"""
+        if PERSIST_COPY:
+            await self.copy_writer.insert_trades(trades)
+            return
+        rows = [self.trade_values(trade) for trade in trades]
+        for chunk in _chunks(rows):
+            await self.db.execute(insert(trades_table).values(chunk).on_conflict_do_nothing(index_elements=["id", "executed_at"]))
+
+    async def update_orders(self, states: List[OrderState]) -> None:
+        """UPDATE ... FROM 한 문장으로 주문 상태 일괄 갱신 (기본은 COPY 스테이징, 아니면 VALUES)"""
+        if PERSIST_COPY:
+            await self.copy_writer.update_orders(states)
+            return
+        rows = [
+            (
+                state.id,
+                state.price,
+                state.quantity,
+                state.filled_quantity,
+                state.remaining_quantity,
+                state.status,
+                state.updated_at,
+            )
+            for state in states
+        ]
+        for i in range(0, len(rows), MAX_ROWS_PER_STATEMENT):
+            data = values(
+                column("id", orders_table.c.id.type),
+                column("price", orders_table.c.price.type),
+                column("quantity", orders_table.c.quantity.type),
+                column("filled_quantity", orders_table.c.filled_quantity.type),
+                column("remaining_quantity", orders_table.c.remaining_quantity.type),
+                column("status", orders_table.c.status.type),
+                column("updated_at", orders_table.c.updated_at.type),
+                name="order_updates",
+            ).data(rows[i:i + MAX_ROWS_PER_STATEMENT])
+            query = update(orders_table).where(orders_table.c.id == data.c.id).values(
+                price=data.c.price,
+                quantity=data.c.quantity,
+                filled_quantity=data.c.filled_quantity,
+                remaining_quantity=data.c.remaining_quantity,
+                status=data.c.status,
+                updated_at=data.c.updated_at
+            )
+            await self.db.execute(query)
+
+    @staticmethod
+    def order_values(state: OrderState) -> Dict[str, Any]:
+        """주문 상태 → orders 행"""
+        return {
+            "id": state.id,
+            "symbol": state.symbol,
+            "side": state.side,
+            "order_type": state.order_type,
+            "price": state.price,
+            "quantity": state.quantity,
+            "filled_quantity": state.filled_quantity,
+            "remaining_quantity": state.remaining_quantity,
+            "status": state.status,
+            "created_at": state.created_at,
+            "updated_at": state.updated_at,
+            "user_id": state.user_id,
+            "client_order_id": state.client_order_id,
+        }
+
+    @staticmethod
+    def trade_values(trade: TradeEvent) -> Dict[str, Any]:
+        """체결 이벤트 → trades 행"""
+        return {
+            "id": trade.id,
+            "buy_order_id": trade.buy_order_id,
+            "sell_order_id": trade.sell_order_id,
+            "symbol": trade.symbol,
+            "price": trade.price,
+            "quantity": trade.quantity,
+            "executed_at": trade.executed_at,
+        }
@@ -0,0 +1,213 @@
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import select, func, and_
+from sqlalchemy.dialects.postgresql import insert
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from datetime import datetime, timezone
+import asyncio
+import logging
+import os
+
+from app.core.klines import (
+    INTERVALS,
+    Candle,
+    ClosedCandle,
+    KlineAggregator,
+    kline_aggregator,
+    from_epoch,
+    to_epoch,
+    window_start,
+)
+from app.core.symbols import SymbolRegistry, symbol_registry
+from app.db.database import AsyncSessionLocal
+from app.models.kline import Kline, KlineInterval
+from app.models.trade import Trade
+
+logger = logging.getLogger(__name__)
+
+# 마감 캔들 저장 주기
+KLINE_FLUSH_INTERVAL_MS = float(os.getenv("KLINE_FLUSH_INTERVAL_MS", "1000"))
+
+# 다중 행 UPSERT 한 문장에 담을 최대 행 수
+MAX_ROWS_PER_STATEMENT = 1000
+
+klines_table = Kline.__table__
+
+
+class KlineService:
+    """캔들 롤업 서비스"""
+
+    def __init__(self, db: AsyncSession, symbols: SymbolRegistry = symbol_registry):
+        self.db = db
+        self.symbols = symbols
+
+    async def save_candles(self, closed: List[ClosedCandle]) -> None:
+        """마감 캔들 UPSERT (같은 캔들을 다시 저장해도 결과가 같음)"""
+        rows = [self.kline_values(symbol, interval, candle) for symbol, interval, candle in closed]
+        for i in range(0, len(rows), MAX_ROWS_PER_STATEMENT):
+            query = insert(klines_table).values(rows[i:i + MAX_ROWS_PER_STATEMENT])
+            query = query.on_conflict_do_update(
+                index_elements=["symbol", "interval", "open_time"],
+                set_={
+                    name: query.excluded[name]
+                    for name in ("open", "high", "low", "close", "volume", "trade_count")
+                }
+            )
+            await self.db.execute(query)
+        await self.db.commit()
+
+    async def get_klines(
+        self,
+        symbol: str,
+        interval: KlineInterval,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: int = 500
+    ) -> Sequence[Kline]:
+        """마감 캔들 조회 (시각 오름차순, 최근 limit개)"""
+        conditions = [Kline.symbol == symbol, Kline.interval == interval.value]
+        if start_time:
+            conditions.append(Kline.open_time >= start_time)
+        if end_time:
+            conditions.append(Kline.open_time <= end_time)
+
+        query = select(Kline).where(and_(*conditions))
+        query = query.order_by(Kline.open_time.desc()).limit(limit)
+
+        result = await self.db.execute(query)
+        return list(reversed(result.scalars().all()))
+
+    async def restore(self, aggregator: KlineAggregator) -> int:
+        """재시작 시 진행 중 캔들 복원
+
+        마지막으로 저장된 1m 캔들 시각(없으면 오늘 0시) 이후의 체결만 다시 집계하고,
+        상위 주기의 진행 중 캔들은 그 이전에 저장된 1m 롤업으로 채운다.
+        """
+        result = await self.db.execute(
+            select(func.max(Kline.open_time)).where(Kline.interval == KlineInterval.ONE_MINUTE.value)
+        )
+        last_open_time = result.scalar_one_or_none()
+        day_seconds = INTERVALS[-1][1]
+        if last_open_time is not None:
+            since = to_epoch(last_open_time)
+        else:
+            since = window_start(to_epoch(datetime.now(timezone.utc)), day_seconds)
+
+        # 상위 주기 진행 중 캔들 = 해당 창 안에서 이미 마감된 1m 캔들의 합
+        result = await self.db.execute(
+            select(Kline).where(
+                and_(
+                    Kline.interval == KlineInterval.ONE_MINUTE.value,
+                    Kline.open_time >= from_epoch(window_start(since, day_seconds)),
+                    Kline.open_time < from_epoch(since)
+                )
+            ).order_by(Kline.open_time.asc())
+        )
+        for row in result.scalars():
+            candle = self.to_candle(row)
+            for level in range(1, len(INTERVALS)):
+                lower_start = window_start(since, INTERVALS[level - 1][1])
+                if window_start(since, INTERVALS[level][1]) <= candle.open_time < lower_start:
+                    aggregator.get_or_create(row.symbol).seed(level, candle)
+
+        # 마지막 1m 캔들부터는 체결로 다시 집계
+        result = await self.db.stream(
+            select(Trade.symbol, Trade.price, Trade.quantity, Trade.executed_at)
+            .where(Trade.executed_at >= from_epoch(since))
+            .order_by(Trade.executed_at.asc(), Trade.id.asc())
+        )
+        replayed = 0
+        async for symbol, price, quantity, executed_at in result:
+            spec = self.symbols.get(symbol)
+            aggregator.add_trade(symbol, to_epoch(executed_at), spec.to_ticks(price), spec.to_lots(quantity))
+            replayed += 1
+        return replayed
+
+    def to_candle(self, row: Kline) -> Candle:
+        """klines 행 → 캔들"""
+        spec = self.symbols.get(row.symbol)
+        return Candle(
+            open_time=to_epoch(row.open_time),
+            open=spec.to_ticks(row.open),
+            high=spec.to_ticks(row.high),
+            low=spec.to_ticks(row.low),
+            close=spec.to_ticks(row.close),
+            volume=spec.to_lots(row.volume),
+            trade_count=row.trade_count,
+        )
+
+    def kline_values(self, symbol: str, interval: KlineInterval, candle: Candle) -> Dict[str, Any]:
+        """캔들 → klines 행"""
+        spec = self.symbols.get(symbol)
+        return {
+            "symbol": symbol,
+            "interval": interval.value,
+            "open_time": from_epoch(candle.open_time),
+            "open": spec.from_ticks(candle.open),
+            "high": spec.from_ticks(candle.high),
+            "low": spec.from_ticks(candle.low),
+            "close": spec.from_ticks(candle.close),
+            "volume": spec.from_lots(candle.volume),
+            "trade_count": candle.trade_count,
+        }
+
+
+class KlineFlusher:
+    """마감 캔들을 주기적으로 klines 테이블에 저장하는 백그라운드 작업"""
+
+    def __init__(
+        self,
+        aggregator: KlineAggregator = kline_aggregator,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        interval: float = KLINE_FLUSH_INTERVAL_MS / 1000,
+        persist: bool = True,
+    ):
+        self.aggregator = aggregator
+        self.session_factory = session_factory
+        self.interval = interval
+        # False면 저장하지 않고 마감 캔들을 한 주기 동안만 조회용으로 보관 (저장은 엔진 샤드 담당)
+        self.persist = persist
+        self._held = 0
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="kline-flusher")
+
+    async def stop(self) -> None:
+        """남은 마감 캔들을 저장한 뒤 종료"""
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+    async def flush(self) -> None:
+        closed = self.aggregator.take_closed(to_epoch(datetime.now(timezone.utc)))
+        if not self.persist:
+            # 앞쪽은 지난 주기에 보관한 캔들이므로 버리고 새로 마감된 캔들만 남김
+            fresh = closed[self._held:]
+            self.aggregator.requeue(fresh)
+            self._held = len(fresh)
+            return
+        if not closed:
+            return
+        try:
+            async with self.session_factory() as db:
+                await KlineService(db).save_candles(closed)
+        except Exception:
+            logger.exception("캔들 저장 실패 (%d건)", len(closed))
+            self.aggregator.requeue(closed)
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+
+# 애플리케이션 전역 캔들 저장 작업
+kline_flusher = KlineFlusher()
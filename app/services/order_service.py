@@ -1,14 +1,20 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, and_
+from sqlalchemy import Select, select, update, and_, or_
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import selectinload
-from typing import List, Optional, Sequence, cast
+from typing import AsyncIterator, List, Optional, Sequence, cast
 from decimal import Decimal
 from uuid import UUID
 import uuid
 from datetime import datetime
 
 from app.models.order import Order, OrderStatus
-from app.schemas.order import OrderCreate, OrderUpdate
+from app.schemas.order import OrderCreate, OrderUpdate, OrderResponse
+from app.schemas.pagination import Cursor
+from app.services.pagination import STREAM_BATCH_ROWS, keyset_after
+
+# 목록 응답용 컬럼 (OrderResponse 필드 순서, ORM 객체 없이 튜플로 조회)
+ORDER_RESPONSE_COLUMNS = tuple(getattr(Order, name) for name in OrderResponse.model_fields)
 
 
 class OrderService:
@@ -48,11 +54,67 @@ class OrderService:
         user_id: Optional[str] = None,
         status: Optional[OrderStatus] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[Cursor] = None
     ) -> Sequence[Order]:
-        """주문 목록 조회"""
-        query = select(Order)
+        """주문 목록 조회 (cursor가 있으면 offset 대신 키셋 페이징)"""
+        query = self._list_query(select(Order), symbol, user_id, status, limit, offset, cursor)
+        result = await self.db.execute(query)
+        return result.scalars().all()
+    
+    async def get_order_rows(
+        self,
+        symbol: Optional[str] = None,
+        user_id: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[Cursor] = None
+    ) -> Sequence[Row]:
+        """주문 목록을 ORM 객체 없이 응답 컬럼 튜플로 조회 (get_orders와 같은 조건/정렬)"""
+        query = self._list_query(select(*ORDER_RESPONSE_COLUMNS), symbol, user_id, status, limit, offset, cursor)
+        result = await self.db.execute(query)
+        return result.all()
+    
+    async def stream_order_rows(
+        self,
+        symbol: Optional[str] = None,
+        user_id: Optional[str] = None,
+        status: Optional[OrderStatus] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> AsyncIterator[Sequence[Row]]:
+        """조건에 맞는 주문 전체를 서버 측 커서로 묶음 단위 조회 (내보내기용, 순서 보장 없음)"""
+        conditions = []
+        if symbol:
+            conditions.append(Order.symbol == symbol)
+        if user_id:
+            conditions.append(Order.user_id == user_id)
+        if status:
+            conditions.append(Order.status == status)
+        if start_time:
+            conditions.append(Order.created_at >= start_time)
+        if end_time:
+            conditions.append(Order.created_at <= end_time)
         
+        # 정렬하면 첫 행 전에 전체 정렬이 필요하므로 읽는 순서대로 흘려보냄
+        query = select(*ORDER_RESPONSE_COLUMNS)
+        if conditions:
+            query = query.where(and_(*conditions))
+        result = await self.db.stream(query.execution_options(yield_per=STREAM_BATCH_ROWS))
+        async for rows in result.partitions():
+            yield rows
+    
+    @staticmethod
+    def _list_query(
+        query: Select,
+        symbol: Optional[str],
+        user_id: Optional[str],
+        status: Optional[OrderStatus],
+        limit: int,
+        offset: int,
+        cursor: Optional[Cursor]
+    ) -> Select:
         # 필터 조건 추가
         conditions = []
         if symbol:
@@ -61,16 +123,17 @@ class OrderService:
             conditions.append(Order.user_id == user_id)
         if status:
             conditions.append(Order.status == status)
+        if cursor:
+            conditions.append(keyset_after(Order.created_at, Order.id, cursor))
         
         if conditions:
             query = query.where(and_(*conditions))
         
-        # 정렬 및 페이징
-        query = query.order_by(Order.created_at.desc())
-        query = query.offset(offset).limit(limit)
-        
-        result = await self.db.execute(query)
-        return result.scalars().all()
+        # 정렬 및 페이징 (created_at 내림차순, 같은 시각은 id 오름차순)
+        query = query.order_by(Order.created_at.desc(), Order.id.asc())
+        if not cursor:
+            query = query.offset(offset)
+        return query.limit(limit)
     
     async def cancel_order(self, order_id: UUID, user_id: Optional[str] = None) -> Optional[Order]:
         """주문 취소"""
@@ -98,6 +161,21 @@ class OrderService:
         
         return order
     
+    async def cancel_orders(self, order_ids: Sequence[UUID], cancelled_at: datetime) -> List[UUID]:
+        """미체결 주문 일괄 취소 (UPDATE ... WHERE ... RETURNING, 커밋은 호출 측)"""
+        query = update(Order).where(
+            and_(
+                Order.id.in_(order_ids),
+                Order.status.in_([OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED])
+            )
+        ).values(
+            status=OrderStatus.CANCELLED,
+            updated_at=cancelled_at
+        ).returning(Order.id).execution_options(synchronize_session=False)
+        
+        result = await self.db.execute(query)
+        return list(result.scalars().all())
+    
     async def update_order_status(self, order_id: UUID, status: OrderStatus) -> Optional[Order]:
         """주문 상태 업데이트"""
         query = select(Order).where(Order.id == order_id)
@@ -158,4 +236,35 @@ class OrderService:
         ).order_by(Order.created_at.asc())
         
         result = await self.db.execute(query)
-        return result.scalars().all() 
\ No newline at end of file
+        return result.scalars().all()
+    
+    async def get_open_orders(self) -> Sequence[Order]:
+        """전체 심볼의 미체결 주문 조회 (오더북 재구성용, 시간 우선 순서)"""
+        query = select(Order).where(
+            Order.status.in_([OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED])
+        ).order_by(Order.created_at.asc())
+        
+        result = await self.db.execute(query)
+        return result.scalars().all()
+    
+    async def get_orders_updated_since(self, since: datetime) -> Sequence[Order]:
+        """since 이후 바뀐 주문 조회 (스냅샷 이후 변경분 적용용, 시간 우선 순서)"""
+        query = select(Order).where(Order.updated_at >= since).order_by(Order.created_at.asc())
+        
+        result = await self.db.execute(query)
+        return result.scalars().all()
+    
+    async def get_client_orders(self, since: datetime) -> Sequence[Order]:
+        """client_order_id가 있는 대기 주문과 since 이후 종료된 주문 조회 (중복 제출 색인 복원용)"""
+        query = select(Order).where(
+            and_(
+                Order.client_order_id.is_not(None),
+                or_(
+                    Order.status.in_([OrderStatus.OPEN, OrderStatus.PARTIALLY_FILLED]),
+                    Order.updated_at >= since
+                )
+            )
+        )
+        
+        result = await self.db.execute(query)
+        return result.scalars().all()
@@ -0,0 +1,19 @@
+from sqlalchemy import and_, or_
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.schemas.pagination import Cursor
+
+# 내보내기에서 서버 측 커서로 한 번에 가져오는 행 수
+STREAM_BATCH_ROWS = 5000
+
+
+def keyset_after(timestamp_column, id_column, cursor: Cursor) -> ColumnElement:
+    """(시각 내림차순, id 오름차순) 정렬에서 커서 다음 행 조건
+
+    선행 조건 timestamp <= :t 는 (…, 시각 DESC, id) 인덱스의 범위 검색으로 처리된다.
+    """
+    timestamp, row_id = cursor
+    return and_(
+        timestamp_column <= timestamp,
+        or_(timestamp_column < timestamp, id_column > row_id),
+    )
@@ -0,0 +1,426 @@
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import AsyncIterator, Callable, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+from uuid import UUID
+import asyncio
+import logging
+import os
+import time
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from app.db.database import AsyncSessionLocal
+from app.schemas.pagination import Cursor
+
+logger = logging.getLogger(__name__)
+
+# 미리 만들어 둘 일별 파티션 수 (오늘 포함)
+TRADES_PARTITION_PREMAKE_DAYS = int(os.getenv("TRADES_PARTITION_PREMAKE_DAYS", "7"))
+# 파티션 생성/아카이브 확인 주기
+TRADES_PARTITION_CHECK_S = float(os.getenv("TRADES_PARTITION_CHECK_S", "3600"))
+# Parquet 아카이브 디렉터리 (비워 두면 파티션 생성만 하고 아카이브하지 않음)
+TRADES_ARCHIVE_DIR = os.getenv("TRADES_ARCHIVE_DIR", "")
+# 상한이 이 일수보다 오래된 파티션을 아카이브 후 분리/삭제
+TRADES_ARCHIVE_AFTER_DAYS = int(os.getenv("TRADES_ARCHIVE_AFTER_DAYS", "30"))
+
+# 범위 파티션에 속하지 않는 체결을 받는 기본 파티션
+DEFAULT_PARTITION = "trades_default"
+# 내보낼 때 한 번에 가져오는 행 수 (Parquet 행 그룹 단위)
+EXPORT_BATCH_ROWS = 65536
+# 디렉터리 수정 시각이 이보다 최근이면 목록을 캐시하지 않음 (파일 시스템 시각 해상도 여유)
+LISTING_SETTLE_NS = 1_000_000_000
+
+# 범위 파티션 목록과 경계 (MINVALUE 하한은 NULL)
+_PARTITIONS_SQL = r"""
+SELECT c.relname,
+       (regexp_match(pg_get_expr(c.relpartbound, c.oid), 'FROM \(''([^'']+)''\)'))[1]::timestamptz,
+       (regexp_match(pg_get_expr(c.relpartbound, c.oid), 'TO \(''([^'']+)''\)'))[1]::timestamptz
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = 'trades'::regclass
+  AND pg_get_expr(c.relpartbound, c.oid) <> 'DEFAULT'
+ORDER BY 3
+"""
+
+TRADE_SCHEMA = pa.schema([
+    ("id", pa.binary(16)),
+    ("buy_order_id", pa.binary(16)),
+    ("sell_order_id", pa.binary(16)),
+    ("symbol", pa.string()),
+    ("price", pa.decimal128(20, 8)),
+    ("quantity", pa.decimal128(20, 8)),
+    ("executed_at", pa.timestamp("us", tz="UTC")),
+])
+
+
+class ArchivedTrade(NamedTuple):
+    """아카이브에서 읽은 체결 (TradeResponse 필드 순서, 목록 응답 행과 같은 형태)"""
+    id: UUID
+    buy_order_id: UUID
+    sell_order_id: UUID
+    symbol: str
+    price: Decimal
+    quantity: Decimal
+    executed_at: datetime
+
+
+@dataclass
+class TradePartition:
+    """trades 범위 파티션 (lower가 None이면 MINVALUE)"""
+    name: str
+    lower: Optional[datetime]
+    upper: datetime
+
+
+def day_start(moment: datetime) -> datetime:
+    """UTC 기준 그 날 0시"""
+    return moment.astimezone(timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def partition_name(day: datetime) -> str:
+    return f"trades_p{day:%Y%m%d}"
+
+
+class TradeArchive:
+    """분리한 파티션을 파티션마다 Parquet 파일 하나로 보관하는 저장소
+
+    파일 메타데이터에 파티션 범위를 기록해 두고, 조회 시 범위가 겹치는 파일만
+    최신 파일부터 읽는다. 파일은 쓰고 나면 바뀌지 않으므로 범위는 한 번만 읽어 캐시하고,
+    파일 목록은 디렉터리가 바뀐 경우에만 스레드에서 다시 나열한다 (다른 프로세스의 아카이브 포함).
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        self._ranges: Dict[str, Tuple[Optional[datetime], datetime]] = {}
+        self._files: List[Tuple[str, Optional[datetime], datetime]] = []
+        # 목록을 만든 시점의 디렉터리 수정 시각 (None이면 다음 조회 때 다시 나열)
+        self._listed: Optional[int] = None
+
+    async def files(self) -> List[Tuple[str, Optional[datetime], datetime]]:
+        """(경로, 하한, 상한) 목록, 상한 내림차순"""
+        return await asyncio.to_thread(self._refresh)
+
+    async def boundary(self) -> Optional[datetime]:
+        """아카이브된 가장 늦은 시각 (이보다 이른 체결은 DB에 없을 수 있음)"""
+        files = await self.files()
+        return files[0][2] if files else None
+
+    def _refresh(self) -> List[Tuple[str, Optional[datetime], datetime]]:
+        version = os.stat(self.directory).st_mtime_ns
+        if version == self._listed:
+            return self._files
+        names = [name for name in os.listdir(self.directory) if name.endswith(".parquet")]
+        for name in names:
+            if name not in self._ranges:
+                metadata = pq.read_schema(os.path.join(self.directory, name)).metadata
+                lower = metadata[b"vx.lower"].decode()
+                self._ranges[name] = (
+                    datetime.fromisoformat(lower) if lower else None,
+                    datetime.fromisoformat(metadata[b"vx.upper"].decode()),
+                )
+        files = [(os.path.join(self.directory, name), *self._ranges[name]) for name in names]
+        self._files = sorted(files, key=lambda item: item[2], reverse=True)
+        # 수정 시각 해상도 안에서 이어진 변경을 놓치지 않도록 방금 바뀐 디렉터리는 다음에 다시 나열
+        self._listed = version if time.time_ns() - version > LISTING_SETTLE_NS else None
+        return self._files
+
+    async def export(self, db: AsyncSession, partition: TradePartition) -> int:
+        """파티션 행을 심볼/시각 순으로 Parquet 파일에 기록 (임시 파일에 쓴 뒤 이름 변경)"""
+        path = os.path.join(self.directory, f"{partition.name}.parquet")
+        metadata = {
+            b"vx.lower": partition.lower.isoformat().encode() if partition.lower else b"",
+            b"vx.upper": partition.upper.isoformat().encode(),
+        }
+        writer = pq.ParquetWriter(path + ".tmp", TRADE_SCHEMA.with_metadata(metadata), compression="zstd")
+        exported = 0
+        # 서버 측 커서가 열려 있으면 같은 트랜잭션에서 파티션을 삭제할 수 없으므로
+        # (symbol, executed_at DESC, id) 인덱스 순서의 키셋 페이징으로 나눠 읽는다
+        select = (
+            f"SELECT id, buy_order_id, sell_order_id, symbol, price, quantity, executed_at FROM {partition.name} "
+        )
+        order = f" ORDER BY symbol, executed_at DESC, id LIMIT {EXPORT_BATCH_ROWS}"
+        after = (
+            "WHERE symbol > :symbol OR (symbol = :symbol AND "
+            "(executed_at < :executed_at OR (executed_at = :executed_at AND id > :id)))"
+        )
+        try:
+            rows = (await db.execute(text(select + order))).all()
+            while rows:
+                await asyncio.to_thread(writer.write_batch, self._batch(rows))
+                exported += len(rows)
+                last = rows[-1]
+                rows = (await db.execute(
+                    text(select + after + order),
+                    {"symbol": last.symbol, "executed_at": last.executed_at, "id": last.id},
+                )).all()
+        finally:
+            writer.close()
+        os.replace(path + ".tmp", path)
+        self._ranges.pop(os.path.basename(path), None)
+        self._listed = None
+        return exported
+
+    async def read(
+        self,
+        symbol: Optional[str],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        cursor: Optional[Cursor],
+        limit: int,
+    ) -> List[ArchivedTrade]:
+        """조건에 맞는 아카이브 체결을 (시각 내림차순, id 오름차순)으로 최대 limit개 조회"""
+        return await asyncio.to_thread(self._read, symbol, start_time, end_time, cursor, limit)
+
+    def _read(
+        self,
+        symbol: Optional[str],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        cursor: Optional[Cursor],
+        limit: int,
+    ) -> List[ArchivedTrade]:
+        filters = []
+        if symbol:
+            filters.append(("symbol", "=", symbol))
+        if start_time:
+            filters.append(("executed_at", ">=", start_time))
+        if end_time:
+            filters.append(("executed_at", "<=", end_time))
+        if cursor:
+            filters.append(("executed_at", "<=", cursor[0]))
+        # 이보다 하한이 늦은 파일은 건너뜀
+        moments = [moment for moment in (end_time, cursor[0] if cursor else None) if moment]
+        latest = min(moments) if moments else None
+
+        trades: List[ArchivedTrade] = []
+        for path, lower, upper in self._refresh():
+            if start_time and upper <= start_time:
+                break
+            if latest and lower and lower > latest:
+                continue
+            table = pq.read_table(path, filters=filters or None)
+            if cursor:
+                timestamp, row_id = cursor
+                executed_at = table["executed_at"]
+                table = table.filter(pc.or_(
+                    pc.less(executed_at, timestamp),
+                    pc.and_(pc.equal(executed_at, timestamp), pc.greater(table["id"], row_id.bytes)),
+                ))
+            table = table.sort_by([("executed_at", "descending"), ("id", "ascending")]).slice(0, limit - len(trades))
+            trades.extend(self._trade(row) for row in table.to_pylist())
+            # 파일 범위는 겹치지 않으므로 다음(더 오래된) 파일의 행은 모두 뒤에 온다
+            if len(trades) >= limit:
+                break
+        return trades
+
+    async def stream(
+        self,
+        symbol: Optional[str],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        batch_rows: int,
+    ) -> AsyncIterator[List[ArchivedTrade]]:
+        """조건에 맞는 아카이브 체결을 파일(최신 파일부터) 저장 순서대로 묶음 단위 조회 (내보내기용)"""
+        for path, lower, upper in await self.files():
+            if start_time and upper <= start_time:
+                break
+            if end_time and lower and lower > end_time:
+                continue
+            batches = pq.ParquetFile(path).iter_batches(batch_size=batch_rows)
+            while True:
+                trades = await asyncio.to_thread(self._next_batch, batches, symbol, start_time, end_time)
+                if trades is None:
+                    break
+                if trades:
+                    yield trades
+
+    def _next_batch(
+        self,
+        batches: Iterator[pa.RecordBatch],
+        symbol: Optional[str],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+    ) -> Optional[List[ArchivedTrade]]:
+        batch = next(batches, None)
+        if batch is None:
+            return None
+        conditions = []
+        if symbol:
+            conditions.append(pc.equal(batch["symbol"], symbol))
+        if start_time:
+            conditions.append(pc.greater_equal(batch["executed_at"], start_time))
+        if end_time:
+            conditions.append(pc.less_equal(batch["executed_at"], end_time))
+        if conditions:
+            mask = conditions[0]
+            for condition in conditions[1:]:
+                mask = pc.and_(mask, condition)
+            batch = batch.filter(mask)
+        return [self._trade(row) for row in batch.to_pylist()]
+
+    @staticmethod
+    def _batch(rows) -> pa.RecordBatch:
+        columns = list(zip(*rows))
+        return pa.record_batch(
+            [
+                pa.array([value.bytes for value in columns[0]], pa.binary(16)),
+                pa.array([value.bytes for value in columns[1]], pa.binary(16)),
+                pa.array([value.bytes for value in columns[2]], pa.binary(16)),
+                pa.array(columns[3], pa.string()),
+                pa.array(columns[4], pa.decimal128(20, 8)),
+                pa.array(columns[5], pa.decimal128(20, 8)),
+                pa.array(columns[6], pa.timestamp("us", tz="UTC")),
+            ],
+            schema=TRADE_SCHEMA,
+        )
+
+    @staticmethod
+    def _trade(row: dict) -> ArchivedTrade:
+        return ArchivedTrade(
+            id=UUID(bytes=row["id"]),
+            buy_order_id=UUID(bytes=row["buy_order_id"]),
+            sell_order_id=UUID(bytes=row["sell_order_id"]),
+            symbol=row["symbol"],
+            price=row["price"],
+            quantity=row["quantity"],
+            executed_at=row["executed_at"],
+        )
+
+
+class TradePartitionService:
+    """trades 일별 파티션 생성 및 오래된 파티션 아카이브"""
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def is_partitioned(self) -> bool:
+        """trades가 파티션 테이블인지 (마이그레이션 전 일반 테이블이면 False)"""
+        result = await self.db.execute(text("SELECT relkind::text FROM pg_class WHERE oid = to_regclass('trades')"))
+        return result.scalar() == "p"
+
+    async def partitions(self) -> List[TradePartition]:
+        """범위 파티션 목록 (상한 오름차순, 기본 파티션 제외)"""
+        result = await self.db.execute(text(_PARTITIONS_SQL))
+        return [TradePartition(name, lower, upper) for name, lower, upper in result.all()]
+
+    async def ensure_partitions(self, days: int = TRADES_PARTITION_PREMAKE_DAYS, now: Optional[datetime] = None) -> List[str]:
+        """기본 파티션과 오늘부터 days일치 일별 파티션 생성 (만든 파티션 이름 목록)"""
+        await self._execute(f"CREATE TABLE IF NOT EXISTS {DEFAULT_PARTITION} PARTITION OF trades DEFAULT")
+        today = day_start(now or datetime.now(timezone.utc))
+        partitions = await self.partitions()
+        # 마지막 파티션 이후 비어 있는 날짜도 채움 (그 사이 체결은 기본 파티션에서 옮겨짐)
+        day = partitions[-1].upper if partitions else today
+        created = []
+        while day < today + timedelta(days=days):
+            await self._create_partition(partition_name(day), day, day + timedelta(days=1))
+            created.append(partition_name(day))
+            day += timedelta(days=1)
+        await self.db.commit()
+        return created
+
+    async def archive_partitions(self, archive: TradeArchive, before: datetime) -> List[str]:
+        """상한이 before 이전인 파티션을 Parquet로 내보낸 뒤 분리/삭제 (파티션마다 커밋)"""
+        archived = []
+        for partition in await self.partitions():
+            if partition.upper > before:
+                break
+            exported = await archive.export(self.db, partition)
+            await self._execute(f"ALTER TABLE trades DETACH PARTITION {partition.name}")
+            await self._execute(f"DROP TABLE {partition.name}")
+            await self.db.commit()
+            logger.info("체결 파티션 아카이브: %s (%d건)", partition.name, exported)
+            archived.append(partition.name)
+        return archived
+
+    async def _create_partition(self, name: str, lower: datetime, upper: datetime) -> None:
+        # 기본 파티션에 이미 들어온 같은 범위 체결을 옮긴 뒤 붙여야 ATTACH 검증을 통과한다
+        await self._execute(f"CREATE TABLE {name} (LIKE trades INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        await self._execute(
+            f"WITH moved AS (DELETE FROM {DEFAULT_PARTITION} "
+            f"WHERE executed_at >= '{lower.isoformat()}' AND executed_at < '{upper.isoformat()}' RETURNING *) "
+            f"INSERT INTO {name} SELECT * FROM moved"
+        )
+        await self._execute(
+            f"ALTER TABLE trades ATTACH PARTITION {name} "
+            f"FOR VALUES FROM ('{lower.isoformat()}') TO ('{upper.isoformat()}')"
+        )
+
+    async def _execute(self, statement: str) -> None:
+        # 경계 시각 리터럴의 콜론이 바인드 파라미터로 해석되지 않도록 드라이버에 그대로 전달
+        connection = await self.db.connection()
+        await connection.exec_driver_sql(statement)
+
+
+class TradeArchiver:
+    """일별 파티션을 미리 만들고 오래된 파티션을 아카이브하는 백그라운드 작업"""
+
+    def __init__(
+        self,
+        archive: Optional[TradeArchive],
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        interval: float = TRADES_PARTITION_CHECK_S,
+        premake_days: int = TRADES_PARTITION_PREMAKE_DAYS,
+        archive_after_days: int = TRADES_ARCHIVE_AFTER_DAYS,
+    ):
+        self.archive = archive
+        self.session_factory = session_factory
+        self.interval = interval
+        self.premake_days = premake_days
+        self.archive_after_days = archive_after_days
+        self._stopping = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._stopping = asyncio.Event()
+            self._task = asyncio.create_task(self._run(), name="trade-archiver")
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+        self._stopping.set()
+        await self._task
+        self._task = None
+
+    async def ensure(self) -> List[str]:
+        """일별 파티션 생성 (trades가 아직 일반 테이블이면 건너뜀)"""
+        async with self.session_factory() as db:
+            service = TradePartitionService(db)
+            if not await service.is_partitioned():
+                logger.warning("trades가 파티션 테이블이 아니어서 파티션 관리를 건너뜁니다 (alembic upgrade 필요).")
+                return []
+            return await service.ensure_partitions(self.premake_days)
+
+    async def archive_old(self) -> List[str]:
+        """보관 기간이 지난 파티션 아카이브"""
+        if self.archive is None:
+            return []
+        before = day_start(datetime.now(timezone.utc)) - timedelta(days=self.archive_after_days)
+        async with self.session_factory() as db:
+            service = TradePartitionService(db)
+            if not await service.is_partitioned():
+                return []
+            return await service.archive_partitions(self.archive, before)
+
+    async def _run(self) -> None:
+        while not self._stopping.is_set():
+            try:
+                await self.ensure()
+                await self.archive_old()
+            except Exception:
+                logger.exception("체결 파티션 관리 실패")
+            try:
+                await asyncio.wait_for(self._stopping.wait(), self.interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+# 애플리케이션 전역 체결 아카이브 / 파티션 관리 작업
+trade_archive: Optional[TradeArchive] = TradeArchive(TRADES_ARCHIVE_DIR) if TRADES_ARCHIVE_DIR else None
+trade_archiver = TradeArchiver(trade_archive)
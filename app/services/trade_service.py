@@ -1,6 +1,8 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_
-from typing import List, Optional, Sequence
+from sqlalchemy import Select, select, and_, func, true
+from sqlalchemy.orm import aliased
+from sqlalchemy.engine import Row
+from typing import AsyncIterator, List, Optional, Sequence
 from decimal import Decimal
 from uuid import UUID
 import uuid
@@ -8,6 +10,13 @@ from datetime import datetime
 
 from app.models.trade import Trade
 from app.models.order import Order
+from app.schemas.pagination import Cursor
+from app.schemas.trade import TradeResponse
+from app.services.pagination import STREAM_BATCH_ROWS, keyset_after
+from app.services.trade_archive import trade_archive
+
+# 목록 응답용 컬럼 (TradeResponse 필드 순서, ORM 객체 없이 튜플로 조회)
+TRADE_RESPONSE_COLUMNS = tuple(getattr(Trade, name) for name in TradeResponse.model_fields)
 
 
 class TradeService:
@@ -53,12 +62,67 @@ class TradeService:
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
         limit: int = 100,
-        offset: int = 0
+        offset: int = 0,
+        cursor: Optional[Cursor] = None
     ) -> Sequence[Trade]:
-        """체결 목록 조회"""
-        query = select(Trade)
+        """체결 목록 조회 (cursor가 있으면 offset 대신 키셋 페이징, 아카이브된 기간은 Parquet 파일까지 조회)"""
+        return await self._list(select(Trade), True, symbol, start_time, end_time, limit, offset, cursor)
+    
+    async def get_trade_rows(
+        self,
+        symbol: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None,
+        limit: int = 100,
+        offset: int = 0,
+        cursor: Optional[Cursor] = None
+    ) -> Sequence[Row]:
+        """체결 목록을 ORM 객체 없이 응답 컬럼 튜플로 조회 (get_trades와 같은 조건/정렬)"""
+        return await self._list(select(*TRADE_RESPONSE_COLUMNS), False, symbol, start_time, end_time, limit, offset, cursor)
+    
+    async def _list(
+        self,
+        query: Select,
+        scalars: bool,
+        symbol: Optional[str],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        limit: int,
+        offset: int,
+        cursor: Optional[Cursor]
+    ) -> Sequence:
+        boundary = await trade_archive.boundary() if trade_archive is not None else None
+        if boundary is None or (start_time and start_time >= boundary):
+            result = await self.db.execute(self._list_query(query, symbol, start_time, end_time, limit, offset, cursor))
+            return result.scalars().all() if scalars else result.all()
         
-        # 필터 조건 추가
+        # 아카이브 범위가 포함되면 offset 앞쪽까지 양쪽에서 가져와 같은 정렬로 병합
+        need = limit if cursor else offset + limit
+        result = await self.db.execute(self._list_query(query, symbol, start_time, end_time, need, 0, cursor))
+        rows = list(result.scalars().all() if scalars else result.all())
+        # DB 행만으로 페이지가 차고 모두 아카이브 경계 이후면 아카이브는 읽지 않음
+        if len(rows) < need or rows[-1].executed_at < boundary:
+            archived = await trade_archive.read(symbol, start_time, end_time, cursor, need)
+            # 아카이브 직후 분리 전에 실패한 파티션은 양쪽에 있을 수 있음
+            seen = {row.id for row in rows}
+            rows.extend(
+                Trade(**row._asdict()) if scalars else row
+                for row in archived if row.id not in seen
+            )
+            rows.sort(key=lambda row: row.id)
+            rows.sort(key=lambda row: row.executed_at, reverse=True)
+        return rows[need - limit:need]
+    
+    async def stream_trade_rows(
+        self,
+        symbol: Optional[str] = None,
+        start_time: Optional[datetime] = None,
+        end_time: Optional[datetime] = None
+    ) -> AsyncIterator[Sequence]:
+        """조건에 맞는 체결 전체를 서버 측 커서로 묶음 단위 조회 (내보내기용, 순서 보장 없음)
+        
+        DB 행을 모두 보낸 뒤 아카이브된 기간은 Parquet 파일에서 이어서 읽는다.
+        """
         conditions = []
         if symbol:
             conditions.append(Trade.symbol == symbol)
@@ -67,16 +131,71 @@ class TradeService:
         if end_time:
             conditions.append(Trade.executed_at <= end_time)
         
+        # 정렬하면 첫 행 전에 전체 정렬이 필요하므로 읽는 순서대로 흘려보냄
+        query = select(*TRADE_RESPONSE_COLUMNS)
         if conditions:
             query = query.where(and_(*conditions))
+        result = await self.db.stream(query.execution_options(yield_per=STREAM_BATCH_ROWS))
+        async for rows in result.partitions():
+            yield rows
         
-        # 정렬 및 페이징
-        query = query.order_by(Trade.executed_at.desc())
-        query = query.offset(offset).limit(limit)
+        if trade_archive is not None:
+            async for rows in trade_archive.stream(symbol, start_time, end_time, STREAM_BATCH_ROWS):
+                yield rows
+    
+    @staticmethod
+    def _list_query(
+        query: Select,
+        symbol: Optional[str],
+        start_time: Optional[datetime],
+        end_time: Optional[datetime],
+        limit: int,
+        offset: int,
+        cursor: Optional[Cursor]
+    ) -> Select:
+        # 필터 조건 추가
+        conditions = []
+        if symbol:
+            conditions.append(Trade.symbol == symbol)
+        if start_time:
+            conditions.append(Trade.executed_at >= start_time)
+        if end_time:
+            conditions.append(Trade.executed_at <= end_time)
+        if cursor:
+            conditions.append(keyset_after(Trade.executed_at, Trade.id, cursor))
+        
+        if conditions:
+            query = query.where(and_(*conditions))
         
+        # 정렬 및 페이징 (executed_at 내림차순, 같은 시각은 id 오름차순)
+        query = query.order_by(Trade.executed_at.desc(), Trade.id.asc())
+        if not cursor:
+            query = query.offset(offset)
+        return query.limit(limit)
+    
+    async def get_recent_trades(self, limit_per_symbol: int) -> Sequence[Trade]:
+        """심볼별 최근 체결 limit_per_symbol개 조회 (최근 체결 버퍼 복원용, 시간 오름차순)
+
+        심볼 목록은 (symbol, executed_at DESC, id) 인덱스를 건너뛰며 찾고(재귀 CTE),
+        심볼마다 LATERAL 서브쿼리가 같은 인덱스에서 앞쪽 limit_per_symbol개만 읽는다.
+        """
+        symbols = select(func.min(Trade.symbol).label("symbol")).cte("symbols", recursive=True)
+        symbols = symbols.union_all(
+            select(
+                select(func.min(Trade.symbol)).where(Trade.symbol > symbols.c.symbol).scalar_subquery()
+            ).where(symbols.c.symbol.is_not(None))
+        )
+        recent = select(Trade).where(Trade.symbol == symbols.c.symbol).order_by(
+            Trade.executed_at.desc(), Trade.id
+        ).limit(limit_per_symbol).lateral("recent")
+        trade = aliased(Trade, recent)
+        query = select(trade).select_from(symbols).join(recent, true()).order_by(
+            trade.symbol, trade.executed_at.asc()
+        )
+
         result = await self.db.execute(query)
         return result.scalars().all()
-    
+
     async def get_trades_by_order(self, order_id: UUID) -> Sequence[Trade]:
         """특정 주문의 체결 내역 조회"""
         query = select(Trade).where(
@@ -93,4 +212,13 @@ class TradeService:
         query = query.limit(limit)
         
         result = await self.db.execute(query)
-        return result.scalars().all() 
\ No newline at end of file
+        return result.scalars().all()
+    
+    async def get_trade_rows_by_symbol(self, symbol: str, limit: int = 100) -> Sequence[Row]:
+        """특정 심볼의 최근 체결을 응답 컬럼 튜플로 조회"""
+        query = select(*TRADE_RESPONSE_COLUMNS).where(Trade.symbol == symbol)
+        query = query.order_by(Trade.executed_at.desc())
+        query = query.limit(limit)
+        
+        result = await self.db.execute(query)
+        return result.all()
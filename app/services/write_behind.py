@@ -0,0 +1,241 @@
+import asyncio
+import logging
+import os
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Callable, Deque, Dict, List, Optional, Sequence, Tuple
+
+import asyncpg
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.matching_engine import MassCancelReport, MatchingEngine, Report
+from app.core.metrics import order_stage_latency, persist_batch_size, persist_failures, persist_quarantined
+from app.db.database import AsyncSessionLocal
+from app.schemas.encoding import dumps
+from app.services.execution_service import ExecutionService
+
+logger = logging.getLogger(__name__)
+
+# 배치 마감 조건: 건수 또는 첫 항목 이후 경과 시간
+PERSIST_BATCH_SIZE = int(os.getenv("PERSIST_BATCH_SIZE", "500"))
+PERSIST_BATCH_WINDOW_MS = float(os.getenv("PERSIST_BATCH_WINDOW_MS", "2"))
+# 저장 실패 시 재시도 간격 (실패할 때마다 두 배, 상한까지) / 엔진을 멈추기까지의 연속 실패 횟수
+PERSIST_RETRY_BASE_MS = float(os.getenv("PERSIST_RETRY_BASE_MS", "50"))
+PERSIST_RETRY_MAX_MS = float(os.getenv("PERSIST_RETRY_MAX_MS", "5000"))
+PERSIST_HALT_AFTER = int(os.getenv("PERSIST_HALT_AFTER", "5"))
+# 행 내용 때문에 저장할 수 없는 처리 결과를 남길 디렉터리 (비어 있으면 로그에만 남김)
+PERSIST_QUARANTINE_DIR = os.getenv("PERSIST_QUARANTINE_DIR", "")
+QUARANTINE_FILE = "quarantine.ndjson"
+
+# 다시 시도해도 같은 결과인 SQLSTATE 분류 (22: 데이터 예외, 23: 무결성 제약 위반)
+DATA_ERROR_CLASSES = ("22", "23")
+
+Batch = Tuple[List[Report], "asyncio.Future[None]"]
+
+_commit_latency = order_stage_latency.child("commit")
+
+
+class WriteBehindPipeline:
+    """그룹 커밋 기반 write-behind 영속화 파이프라인
+
+    시퀀서가 넘긴 처리 결과를 배치로 모아 배치당 트랜잭션 하나로 저장한다.
+    submit()은 배치 단위 Future를 돌려주며, 해당 배치가 커밋되면 완료된다.
+    배치는 순서대로 하나씩 저장되므로 엔진의 처리 순서가 DB에도 유지된다.
+
+    오더북에 이미 반영된 결과이므로 저장에 실패한 배치는 버리지 않고 저장될 때까지
+    재시도한다. 연속 실패가 길어지면 엔진을 멈춰 새 명령을 거부하고, 저장되면 재개한다.
+    무결성/데이터 오류로 실패한 배치는 재시도해도 같으므로 나눠 저장하고, 끝까지
+    실패하는 처리 결과 하나만 격리해 나머지 저장과 매칭을 멈추지 않는다.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+        max_batch_size: int = PERSIST_BATCH_SIZE,
+        max_delay: float = PERSIST_BATCH_WINDOW_MS / 1000,
+        retry_delay: float = PERSIST_RETRY_BASE_MS / 1000,
+        max_retry_delay: float = PERSIST_RETRY_MAX_MS / 1000,
+        halt_after: int = PERSIST_HALT_AFTER,
+        quarantine_dir: str = PERSIST_QUARANTINE_DIR,
+    ):
+        self.session_factory = session_factory
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.halt_after = halt_after
+        self.quarantine_dir = quarantine_dir
+        # 저장 장애 시 멈출 엔진 (start()에서 지정)
+        self._engine: Optional[MatchingEngine] = None
+        # 이 파이프라인이 엔진을 멈춘 상태
+        self._halting = False
+        self._open: Optional[Batch] = None
+        self._open_deadline = 0.0
+        self._closed: Deque[Batch] = deque()
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def start(self, engine: Optional[MatchingEngine] = None) -> None:
+        """engine을 주면 저장 실패가 halt_after회 이어질 때 엔진을 멈춤"""
+        self._engine = engine
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._stopping = False
+            self._task = asyncio.create_task(self._run(), name="write-behind")
+
+    async def stop(self) -> None:
+        """남은 배치를 모두 저장한 뒤 종료"""
+        if self._task is None:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        await self._task
+        self._task = None
+
+    @property
+    def backlog(self) -> int:
+        """아직 저장되지 않은 처리 결과 수 (저장 중인 배치 제외)"""
+        pending = sum(len(batch) for batch, _ in self._closed)
+        return pending + (len(self._open[0]) if self._open is not None else 0)
+
+    def submit(self, reports: Sequence[Report]) -> "asyncio.Future[None]":
+        """처리 결과 묶음을 현재 배치에 추가하고 배치 커밋 Future 반환
+
+        한 명령(일괄 주문 포함)의 결과는 배치 경계에서 나뉘지 않는다.
+        """
+        if self._open is None:
+            loop = asyncio.get_running_loop()
+            self._open = ([], loop.create_future())
+            self._open_deadline = loop.time() + self.max_delay
+            self._wakeup.set()
+        batch, future = self._open
+        batch.extend(reports)
+        if len(batch) >= self.max_batch_size:
+            self._close_open()
+            self._wakeup.set()
+        return future
+
+    def _close_open(self) -> None:
+        if self._open is not None:
+            self._closed.append(self._open)
+            self._open = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            if not self._closed:
+                if self._open is None:
+                    if self._stopping:
+                        return
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                    continue
+                delay = self._open_deadline - loop.time()
+                if delay > 0 and not self._stopping:
+                    # 시간 창이 끝나거나 건수로 마감될 때까지 대기
+                    self._wakeup.clear()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                self._close_open()
+            await self._flush(*self._closed.popleft())
+
+    async def _flush(self, batch: List[Report], future: "asyncio.Future[None]") -> None:
+        started = time.perf_counter_ns()
+        persist_batch_size.record(len(batch))
+        await self._save(batch)
+        if self._halting:
+            self._halting = False
+            if self._engine is not None:
+                self._engine.resume()
+        _commit_latency.record_since(started)
+        if not future.done():
+            future.set_result(None)
+
+    async def _save(self, batch: List[Report]) -> None:
+        """배치를 트랜잭션 하나로 저장
+
+        배치는 트랜잭션 하나로 저장되므로 실패하면 전부 롤백되어 그대로 다시 시도할 수 있다.
+        연결 장애 등은 저장될 때까지 재시도하고, 행 내용 때문에 실패하면(무결성/데이터 오류)
+        반으로 나눠 순서대로 저장해 실패하는 처리 결과만 격리한다.
+        """
+        failures = 0
+        while True:
+            try:
+                async with self.session_factory() as db:
+                    await ExecutionService(db).save_batch(batch)
+                return
+            except Exception as e:
+                persist_failures.inc()
+                if is_data_error(e):
+                    if len(batch) == 1:
+                        await self._quarantine(batch[0], e)
+                        return
+                    logger.warning("영속화 배치 데이터 오류, 나눠서 저장 (%d건): %s", len(batch), e)
+                    middle = len(batch) // 2
+                    await self._save(batch[:middle])
+                    await self._save(batch[middle:])
+                    return
+                failures += 1
+                logger.exception("영속화 배치 저장 실패 (%d건, %d회째)", len(batch), failures)
+                if failures == self.halt_after and self._engine is not None:
+                    self._halting = True
+                    self._engine.halt(f"영속화 배치 저장 실패: {e}")
+                await asyncio.sleep(min(self.retry_delay * 2 ** min(failures - 1, 16), self.max_retry_delay))
+
+    async def _quarantine(self, report: Report, error: Exception) -> None:
+        """저장할 수 없는 처리 결과를 기록하고 건너뜀 (quarantine_dir가 있으면 NDJSON 파일에 추가)"""
+        persist_quarantined.inc()
+        line = dumps(quarantine_record(report, error)) + b"\n"
+        logger.error("저장할 수 없는 처리 결과 격리: %s", line.decode().rstrip())
+        if self.quarantine_dir:
+            try:
+                await asyncio.to_thread(self._append_quarantine, line)
+            except OSError:
+                logger.exception("격리 파일 기록 실패 (%s)", self.quarantine_dir)
+
+    def _append_quarantine(self, line: bytes) -> None:
+        os.makedirs(self.quarantine_dir, exist_ok=True)
+        with open(os.path.join(self.quarantine_dir, QUARANTINE_FILE), "ab") as f:
+            f.write(line)
+
+
+def is_data_error(error: BaseException) -> bool:
+    """행 내용 때문에 실패해 다시 시도해도 성공할 수 없는 오류인지
+
+    SQLAlchemy가 감싼 예외와 COPY 경로의 asyncpg 예외 모두 SQLSTATE 분류로 판단한다.
+    """
+    seen = set()
+    current: Optional[BaseException] = error
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        sqlstate = getattr(current, "sqlstate", None)
+        if sqlstate:
+            return sqlstate[:2] in DATA_ERROR_CLASSES
+        # asyncpg가 값을 인코딩하다 거부한 경우 (서버 전송 전, SQLSTATE 없음)
+        if isinstance(current, asyncpg.InterfaceError) and isinstance(current, ValueError):
+            return True
+        current = getattr(current, "orig", None) or current.__cause__
+    return False
+
+
+def quarantine_record(report: Report, error: Exception) -> Dict[str, Any]:
+    """격리한 처리 결과 → 다시 반영할 수 있도록 orders/trades 행 형태로"""
+    if isinstance(report, MassCancelReport):
+        orders, trades = report.orders, []
+    else:
+        orders, trades = [report.order, *report.maker_updates], report.trades
+    return {
+        "quarantined_at": datetime.now(timezone.utc),
+        "error": f"{type(error).__name__}: {error}",
+        "orders": [ExecutionService.order_values(state) for state in orders],
+        "trades": [ExecutionService.trade_values(trade) for trade in trades],
+    }
+
+
+# 애플리케이션 전역 영속화 파이프라인
+write_behind_pipeline = WriteBehindPipeline()
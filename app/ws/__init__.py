@@ -0,0 +1,3 @@
+from . import depth, order_entry, trades
+
+__all__ = ["depth", "order_entry", "trades"]
@@ -0,0 +1,29 @@
+import asyncio
+from typing import Awaitable
+
+from fastapi import WebSocket, WebSocketDisconnect
+
+
+async def _wait_disconnect(websocket: WebSocket) -> None:
+    """클라이언트가 연결을 끊을 때까지 수신 메시지를 버림"""
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+
+
+async def run_until_disconnect(websocket: WebSocket, sender: Awaitable[None]) -> None:
+    """송신 코루틴을 실행하다가 클라이언트 연결이 끊기면 취소"""
+    send_task = asyncio.ensure_future(sender)
+    receive_task = asyncio.ensure_future(_wait_disconnect(websocket))
+    try:
+        done, _ = await asyncio.wait({send_task, receive_task}, return_when=asyncio.FIRST_COMPLETED)
+        if send_task in done and not send_task.cancelled():
+            exc = send_task.exception()
+            if exc is not None and not isinstance(exc, WebSocketDisconnect):
+                raise exc
+    finally:
+        for task in (send_task, receive_task):
+            task.cancel()
+        await asyncio.gather(send_task, receive_task, return_exceptions=True)
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+from fastapi import APIRouter, WebSocket
+
+from app.core.matching_engine import Report
+from app.core.orderbook import BookSide, BookUpdate, OrderBook, OrderBookManager, order_book_manager
+from app.ws.connection import run_until_disconnect
+
+# 구독자별로 밀려 있을 수 있는 최대 레벨 수 (초과 시 스냅샷으로 대체)
+DEPTH_MAX_PENDING_LEVELS = int(os.getenv("DEPTH_MAX_PENDING_LEVELS", "1000"))
+
+router = APIRouter()
+
+
+def _level_rows(book: OrderBook, levels: List[Tuple[int, int, int]]) -> List[list]:
+    spec = book.spec
+    return [[str(spec.from_ticks(price)), str(spec.from_lots(quantity)), count] for price, quantity, count in levels]
+
+
+def _side_levels(book_side: BookSide) -> List[Tuple[int, int, int]]:
+    return [(level.price, level.total_quantity, level.order_count) for level in book_side.levels()]
+
+
+class DepthSubscriber:
+    """구독자별 전송 상태
+
+    전송되지 않은 변경분은 가격 레벨 단위로 덮어써서(conflation) 보관하므로
+    느린 클라이언트도 레벨 수 이상으로 메모리를 쓰지 않는다.
+    """
+
+    def __init__(self, websocket: WebSocket, symbol: str):
+        self.websocket = websocket
+        self.symbol = symbol
+        self.bids: Dict[int, Tuple[int, int, int]] = {}
+        self.asks: Dict[int, Tuple[int, int, int]] = {}
+        self.sequence = 0
+        self.sent_sequence = 0
+        self.needs_snapshot = True
+        self.ready = asyncio.Event()
+        self.ready.set()
+
+    def push(self, update: BookUpdate) -> None:
+        """변경분 병합 (엔진 시퀀서에서 호출, 블로킹 없음)"""
+        self.sequence = update.sequence
+        if not self.needs_snapshot:
+            for level in update.bids:
+                self.bids[level[0]] = level
+            for level in update.asks:
+                self.asks[level[0]] = level
+            if len(self.bids) + len(self.asks) > DEPTH_MAX_PENDING_LEVELS:
+                self.bids.clear()
+                self.asks.clear()
+                self.needs_snapshot = True
+        self.ready.set()
+
+    def take_delta(self) -> Optional[dict]:
+        if not self.bids and not self.asks:
+            return None
+        bids, asks = self.bids, self.asks
+        self.bids, self.asks = {}, {}
+        message = {
+            "type": "delta",
+            "symbol": self.symbol,
+            "prev_sequence": self.sent_sequence,
+            "sequence": self.sequence,
+            "bids": list(bids.values()),
+            "asks": list(asks.values()),
+        }
+        self.sent_sequence = self.sequence
+        return message
+
+
+class DepthStreamManager:
+    """실시간 호가 스트림 (스냅샷 + 순서 번호가 붙은 변경분)"""
+
+    def __init__(self, books: OrderBookManager):
+        self.books = books
+        self.subscribers: Dict[str, Set[DepthSubscriber]] = {}
+
+    def on_engine_event(self, symbol: str, reports: List[Report], update: Optional[BookUpdate]) -> None:
+        """매칭 엔진 리스너: 변경분을 구독자별 대기 상태에 병합"""
+        if update is None:
+            return
+        for subscriber in self.subscribers.get(symbol, ()):
+            subscriber.push(update)
+
+    def snapshot(self, subscriber: DepthSubscriber) -> dict:
+        book = self.books.get(subscriber.symbol)
+        sequence = book.sequence if book is not None else 0
+        subscriber.bids.clear()
+        subscriber.asks.clear()
+        subscriber.needs_snapshot = False
+        subscriber.sequence = subscriber.sent_sequence = sequence
+        return {
+            "type": "snapshot",
+            "symbol": subscriber.symbol,
+            "sequence": sequence,
+            "bids": _level_rows(book, _side_levels(book.bids)) if book is not None else [],
+            "asks": _level_rows(book, _side_levels(book.asks)) if book is not None else [],
+        }
+
+    async def stream(self, websocket: WebSocket, symbol: str) -> None:
+        subscriber = DepthSubscriber(websocket, symbol)
+        self.subscribers.setdefault(symbol, set()).add(subscriber)
+        try:
+            while True:
+                await subscriber.ready.wait()
+                subscriber.ready.clear()
+                if subscriber.needs_snapshot:
+                    message = self.snapshot(subscriber)
+                else:
+                    message = subscriber.take_delta()
+                    if message is None:
+                        continue
+                    book = self.books.get(symbol)
+                    message["bids"] = _level_rows(book, message["bids"])
+                    message["asks"] = _level_rows(book, message["asks"])
+                await websocket.send_text(json.dumps(message))
+        finally:
+            subscribers = self.subscribers.get(symbol)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self.subscribers[symbol]
+
+
+# 애플리케이션 전역 호가 스트림
+depth_stream = DepthStreamManager(order_book_manager)
+
+
+@router.websocket("/ws/depth/{symbol}")
+async def depth_websocket(websocket: WebSocket, symbol: str):
+    """실시간 호가 스트림 (최초 스냅샷 후 변경분, 수량 0 = 레벨 삭제)"""
+    await websocket.accept()
+    await run_until_disconnect(websocket, depth_stream.stream(websocket, symbol))
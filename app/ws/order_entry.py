@@ -0,0 +1,393 @@
+import asyncio
+import hmac
+import logging
+import os
+import struct
+import uuid
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Set, Tuple
+from uuid import UUID
+
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect, status
+
+from app.core.matching_engine import (
+    AmendOrderCommand,
+    CancelOrderCommand,
+    Command,
+    ExecutionReport,
+    MatchingEngine,
+    NewOrderCommand,
+    OrderState,
+    Report,
+    TradeEvent,
+    matching_engine,
+)
+from app.core.orderbook import BookUpdate
+from app.models.order import OrderSide, OrderStatus, OrderType
+
+logger = logging.getLogger(__name__)
+
+# 접속 토큰 → 사용자 ID ("token1:user1,token2:user2", 비어 있으면 주문 채널 미사용)
+ORDER_ENTRY_TOKENS = os.getenv("ORDER_ENTRY_TOKENS", "")
+# 1이면 ACK/체결 통보를 저널 fsync(저널 미사용 시 DB 커밋) 이후에 전송, 0이면 매칭 직후 전송
+ORDER_ENTRY_ACK_DURABLE = os.getenv("ORDER_ENTRY_ACK_DURABLE", "1") == "1"
+# 연결별 전송 대기열 크기 (가득 차면 느린 클라이언트로 보고 연결 종료)
+ORDER_ENTRY_QUEUE_SIZE = int(os.getenv("ORDER_ENTRY_QUEUE_SIZE", "4096"))
+
+# 메시지 형식 (리틀 엔디언, 첫 바이트 = 메시지 종류, 한 프레임에 여러 메시지를 이어 붙일 수 있음)
+# 가격은 tick 수, 수량은 lot 수 (심볼 단위 설정 기준), 시각은 UTC epoch 마이크로초
+#   클라이언트 → 서버
+LOGON = struct.Struct("<cB")               # 'L', 토큰 길이, (토큰 바이트)
+NEW_ORDER = struct.Struct("<cQ20sBBqq36s")  # 'N', 요청 ID, 심볼, 방향, 종류, 가격, 수량, 클라이언트 주문 ID(ASCII, 빈 값 = 없음)
+CANCEL = struct.Struct("<cQ16s")           # 'C', 요청 ID, 주문 ID
+AMEND = struct.Struct("<cQ16sqq")          # 'A', 요청 ID, 주문 ID, 새 가격(0 = 유지), 새 수량(0 = 유지)
+#   서버 → 클라이언트
+LOGON_ACK = struct.Struct("<cq")           # 'l', 서버 시각
+ACK = struct.Struct("<cQ16sBqqqqq")        # 'a', 요청 ID, 주문 ID, 상태, 가격, 수량, 체결 수량, 잔량, 시각
+FILL = struct.Struct("<cQ16s16sBqqqq")     # 'f', 요청 ID(메이커 체결은 0), 주문 ID, 체결 ID, 메이커 여부, 가격, 수량, 잔량, 체결 시각
+REJECT = struct.Struct("<cQBH")            # 'r', 요청 ID, 거부 코드, 사유 길이, (사유 UTF-8)
+
+# 방향/주문 종류/상태 코드 (메시지의 정수 ↔ 열거형)
+SIDES = (OrderSide.BUY, OrderSide.SELL)
+ORDER_TYPES = (OrderType.LIMIT, OrderType.MARKET, OrderType.IOC)
+STATUS_CODES = {order_status: code for code, order_status in enumerate(OrderStatus)}
+
+# 거부 코드
+REJECT_MALFORMED = 1
+REJECT_INVALID = 2
+REJECT_UNKNOWN_ORDER = 3
+REJECT_INTERNAL = 4
+REJECT_UNAVAILABLE = 5
+
+_MESSAGES = {b"N": NEW_ORDER, b"C": CANCEL, b"A": AMEND}
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def parse_tokens(raw: str) -> Dict[str, str]:
+    """"token:user,..." → {토큰: 사용자 ID}"""
+    tokens = {}
+    for item in raw.split(","):
+        token, _, user_id = item.strip().partition(":")
+        if token and user_id:
+            tokens[token] = user_id
+    return tokens
+
+
+def _micros(moment: datetime) -> int:
+    delta = moment - _EPOCH
+    return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+
+
+def encode_ack(request_id: int, order: OrderState) -> bytes:
+    return ACK.pack(
+        b"a", request_id, order.id.bytes, STATUS_CODES[order.status],
+        order.price_ticks or 0, order.quantity_lots, order.filled_lots, order.remaining_lots,
+        _micros(order.updated_at),
+    )
+
+
+def encode_fill(request_id: int, order_id: UUID, trade: TradeEvent, maker: bool, remaining: int) -> bytes:
+    return FILL.pack(
+        b"f", request_id, order_id.bytes, trade.id.bytes, maker,
+        trade.price_ticks, trade.quantity_lots, remaining, _micros(trade.executed_at),
+    )
+
+
+def encode_reject(request_id: int, code: int, reason: str) -> bytes:
+    text = reason.encode()[:1024]
+    return REJECT.pack(b"r", request_id, code, len(text)) + text
+
+
+class OrderEntrySession:
+    """인증된 주문 채널 연결 하나
+
+    수신 메시지는 바로 심볼 시퀀서 대기열에 넣고(응답을 기다리지 않으므로 파이프라이닝 가능),
+    응답 프레임은 전송 대기열을 거쳐 별도 태스크가 보낸다. 프레임마다 내구성 대기 Future를
+    달아 두고 순서대로 기다리므로 ACK/체결 통보는 처리 순서대로 나간다.
+    """
+
+    def __init__(self, gateway: "OrderEntryGateway", websocket: WebSocket, user_id: str):
+        self.gateway = gateway
+        self.websocket = websocket
+        self.user_id = user_id
+        self.queue: "asyncio.Queue[Optional[Tuple[bytes, Optional[asyncio.Future]]]]" = asyncio.Queue(
+            maxsize=gateway.queue_size,
+        )
+        self.closed = False
+
+    def offer(self, frame: bytes, gate: Optional["asyncio.Future[Any]"] = None) -> None:
+        """응답 프레임 추가 (가득 차면 대기열을 비우고 종료 신호)"""
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait((frame, gate))
+        except asyncio.QueueFull:
+            self.closed = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+
+    async def send_loop(self) -> None:
+        queue = self.queue
+        # 묶음 전송 중 꺼냈지만 아직 내구성 대기 중이라 다음 차례로 미룬 항목 (최대 1개)
+        held: List[Optional[Tuple[bytes, Optional[asyncio.Future]]]] = []
+        while True:
+            item = held.pop() if held else await queue.get()
+            if item is None:
+                await self.websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="slow consumer")
+                return
+            frame, gate = item
+            frames = [frame]
+            if gate is not None and not gate.done():
+                try:
+                    await asyncio.shield(gate)
+                except Exception:
+                    # 영속화 실패 이후의 응답은 보장할 수 없으므로 연결을 끊는다
+                    await self.websocket.close(code=status.WS_1011_INTERNAL_ERROR, reason="persistence failed")
+                    return
+            # 이미 내구성이 확보된 뒤따르는 프레임은 한 메시지로 묶어 전송
+            while not queue.empty():
+                item = queue.get_nowait()
+                if item is None or (item[1] is not None and not item[1].done()):
+                    held.append(item)
+                    break
+                frames.append(item[0])
+            await self.websocket.send_bytes(frames[0] if len(frames) == 1 else b"".join(frames))
+
+    async def receive_loop(self) -> None:
+        while True:
+            data = await self.websocket.receive_bytes()
+            offset = 0
+            while offset < len(data):
+                message = _MESSAGES.get(data[offset:offset + 1])
+                if message is None or offset + message.size > len(data):
+                    # 경계를 잃은 프레임은 더 읽을 수 없으므로 나머지를 버린다
+                    self.offer(encode_reject(0, REJECT_MALFORMED, "잘못된 메시지입니다."))
+                    break
+                await self.handle(message, message.unpack_from(data, offset))
+                offset += message.size
+
+    async def handle(self, message: struct.Struct, fields: tuple) -> None:
+        request_id = fields[1]
+        try:
+            symbol, command = self.gateway.command(message, fields, self.user_id)
+        except ValueError as e:
+            self.offer(encode_reject(request_id, REJECT_INVALID, str(e)))
+            return
+        except LookupError as e:
+            self.offer(encode_reject(request_id, REJECT_UNKNOWN_ORDER, str(e)))
+            return
+        try:
+            await self.gateway.engine.enqueue(symbol, command, _Completion(self, symbol, request_id))
+        except RuntimeError as e:
+            # 엔진이 멈췄거나 실행 중이 아니면 거부 후 다음 메시지 계속 처리
+            self.offer(encode_reject(request_id, REJECT_UNAVAILABLE, str(e)))
+
+    def on_result(self, symbol: str, request_id: int, result: Optional[ExecutionReport]) -> None:
+        """명령 처리 결과 (시퀀서 태스크에서 동기 호출, 같은 명령의 메이커 체결 통보보다 먼저)"""
+        if result is None:
+            self.offer(encode_reject(request_id, REJECT_UNKNOWN_ORDER, "오더북에 없는 주문입니다."))
+            return
+        gate = self.gateway.gate(symbol)
+        order = result.order
+        self.offer(encode_ack(request_id, order), gate)
+        filled = order.filled_lots - sum(trade.quantity_lots for trade in result.trades)
+        for trade in result.trades:
+            filled += trade.quantity_lots
+            self.offer(encode_fill(request_id, order.id, trade, False, order.quantity_lots - filled), gate)
+
+    def on_reject(self, request_id: int, error: BaseException) -> None:
+        self.offer(encode_reject(
+            request_id,
+            REJECT_INVALID if isinstance(error, ValueError) else REJECT_INTERNAL,
+            str(error) if isinstance(error, ValueError) else "주문 처리 중 오류가 발생했습니다.",
+        ))
+
+
+class _Completion:
+    """시퀀서 결과를 동기로 받는 Future 대용 (ACK가 체결 통보보다 늦지 않도록)"""
+
+    __slots__ = ("session", "symbol", "request_id", "_done")
+
+    def __init__(self, session: OrderEntrySession, symbol: str, request_id: int):
+        self.session = session
+        self.symbol = symbol
+        self.request_id = request_id
+        self._done = False
+
+    def done(self) -> bool:
+        return self._done
+
+    def set_result(self, value: Tuple[Any, Any, Any]) -> None:
+        self._done = True
+        try:
+            self.session.on_result(self.symbol, self.request_id, value[0])
+        except Exception:
+            logger.exception("주문 채널 응답 생성 실패 (%s)", self.session.user_id)
+
+    def set_exception(self, error: BaseException) -> None:
+        self._done = True
+        try:
+            self.session.on_reject(self.request_id, error)
+        except Exception:
+            logger.exception("주문 채널 거부 응답 생성 실패 (%s)", self.session.user_id)
+
+
+class OrderEntryGateway:
+    """바이너리 주문 채널 (WebSocket)
+
+    HTTP/JSON/pydantic 검증을 거치지 않고 tick/lot 정수로 된 고정 길이 메시지를
+    엔진 명령으로 바꿔 시퀀서 대기열에 넣는다. 메이커 체결은 엔진 리스너로 받아
+    해당 사용자의 모든 연결에 통보한다.
+    """
+
+    def __init__(
+        self,
+        engine: MatchingEngine = matching_engine,
+        tokens: Optional[Dict[str, str]] = None,
+        ack_durable: bool = ORDER_ENTRY_ACK_DURABLE,
+        queue_size: int = ORDER_ENTRY_QUEUE_SIZE,
+    ):
+        self.engine = engine
+        self.tokens = parse_tokens(ORDER_ENTRY_TOKENS) if tokens is None else tokens
+        self.ack_durable = ack_durable
+        self.queue_size = queue_size
+        self.sessions: Dict[str, Set[OrderEntrySession]] = {}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.tokens)
+
+    def authenticate(self, token: str) -> Optional[str]:
+        """토큰 → 사용자 ID (모든 토큰과 상수 시간 비교)"""
+        user_id = None
+        for candidate, owner in self.tokens.items():
+            if hmac.compare_digest(candidate.encode(), token.encode()):
+                user_id = owner
+        return user_id
+
+    def gate(self, symbol: str) -> Optional["asyncio.Future[Any]"]:
+        return self.engine.durability(symbol) if self.ack_durable else None
+
+    def command(self, message: struct.Struct, fields: tuple, user_id: str) -> Tuple[str, Command]:
+        """메시지 필드 → (심볼, 엔진 명령)"""
+        if message is NEW_ORDER:
+            _, request_id, raw_symbol, side, order_type, price, quantity, raw_client_order_id = fields
+            symbol = raw_symbol.rstrip(b"\0").decode("ascii")
+            # 요청 ID는 연결 안에서만 의미가 있으므로 중복 제출 판정에는 명시한 클라이언트 주문 ID만 사용
+            client_order_id = raw_client_order_id.rstrip(b"\0").decode("ascii") or None
+            if side >= len(SIDES):
+                raise ValueError(f"알 수 없는 주문 방향입니다: {side}")
+            if order_type >= len(ORDER_TYPES):
+                raise ValueError(f"알 수 없는 주문 종류입니다: {order_type}")
+            order_type = ORDER_TYPES[order_type]
+            if not symbol:
+                raise ValueError("심볼이 비어 있습니다.")
+            if quantity <= 0:
+                raise ValueError("수량은 0보다 커야 합니다.")
+            if order_type != OrderType.MARKET and price <= 0:
+                raise ValueError("Limit/IOC 주문은 가격이 필수입니다.")
+            now = datetime.now(timezone.utc)
+            return symbol, NewOrderCommand(OrderState(
+                id=uuid.uuid4(),
+                symbol=symbol,
+                side=SIDES[side],
+                order_type=order_type,
+                price_ticks=None if order_type == OrderType.MARKET else price,
+                quantity_lots=quantity,
+                filled_lots=0,
+                remaining_lots=quantity,
+                status=OrderStatus.OPEN,
+                created_at=now,
+                updated_at=now,
+                spec=self.engine.books.symbols.require(symbol),
+                user_id=user_id,
+                client_order_id=client_order_id,
+            ))
+
+        order_id = UUID(bytes=fields[2])
+        book = self.engine.books.locate(order_id)
+        if book is None:
+            raise LookupError("오더북에 없는 주문입니다.")
+        if message is CANCEL:
+            return book.symbol, CancelOrderCommand(order_id, user_id)
+        _, _, _, price, quantity = fields
+        if price < 0 or quantity < 0 or (not price and not quantity):
+            raise ValueError("price 또는 quantity 중 하나는 필수입니다.")
+        return book.symbol, AmendOrderCommand(
+            order_id=order_id,
+            user_id=user_id,
+            price=price or None,
+            quantity=quantity or None,
+        )
+
+    def on_engine_event(self, symbol: str, reports: List[Report], update: Optional[BookUpdate]) -> None:
+        """매칭 엔진 리스너: 대기 주문(메이커) 체결을 주문 소유자의 연결에 통보"""
+        if not self.sessions:
+            return
+        gate = None
+        for report in reports:
+            if not isinstance(report, ExecutionReport) or not report.trades:
+                continue
+            # 체결과 메이커 상태는 같은 순서로 하나씩 쌓인다
+            for trade, maker in zip(report.trades, report.maker_updates):
+                sessions = self.sessions.get(maker.user_id) if maker.user_id else None
+                if not sessions:
+                    continue
+                if gate is None:
+                    gate = self.gate(symbol)
+                frame = encode_fill(0, maker.id, trade, True, maker.remaining_lots)
+                for session in sessions:
+                    session.offer(frame, gate)
+
+    async def serve(self, websocket: WebSocket) -> None:
+        """로그온 후 수신/송신 태스크 실행"""
+        try:
+            data = await websocket.receive_bytes()
+            if len(data) < LOGON.size or data[:1] != b"L":
+                raise ValueError
+            _, length = LOGON.unpack_from(data)
+            user_id = self.authenticate(data[LOGON.size:LOGON.size + length].decode())
+        except (ValueError, UnicodeDecodeError):
+            user_id = None
+        if user_id is None:
+            await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="authentication failed")
+            return
+
+        session = OrderEntrySession(self, websocket, user_id)
+        self.sessions.setdefault(user_id, set()).add(session)
+        await websocket.send_bytes(LOGON_ACK.pack(b"l", _micros(datetime.now(timezone.utc))))
+        send_task = asyncio.ensure_future(session.send_loop())
+        receive_task = asyncio.ensure_future(session.receive_loop())
+        try:
+            done, _ = await asyncio.wait({send_task, receive_task}, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if not task.cancelled() and task.exception() is not None \
+                        and not isinstance(task.exception(), WebSocketDisconnect):
+                    logger.warning("주문 채널 연결 종료 (%s): %r", user_id, task.exception())
+        finally:
+            session.closed = True
+            for task in (send_task, receive_task):
+                task.cancel()
+            await asyncio.gather(send_task, receive_task, return_exceptions=True)
+            sessions = self.sessions.get(user_id)
+            if sessions is not None:
+                sessions.discard(session)
+                if not sessions:
+                    del self.sessions[user_id]
+
+
+# 애플리케이션 전역 주문 채널
+order_entry_gateway = OrderEntryGateway()
+
+router = APIRouter()
+
+
+@router.websocket("/ws/order-entry")
+async def order_entry_websocket(websocket: WebSocket):
+    """바이너리 주문 채널 (첫 메시지로 토큰 로그온, 이후 신규/취소/정정 파이프라이닝)"""
+    await websocket.accept()
+    if not order_entry_gateway.enabled:
+        await websocket.close(code=status.WS_1008_POLICY_VIOLATION, reason="order entry disabled")
+        return
+    await order_entry_gateway.serve(websocket)
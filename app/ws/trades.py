@@ -0,0 +1,107 @@
+import asyncio
+import os
+from typing import Dict, List, Optional, Set
+
+from fastapi import APIRouter, WebSocket, status
+
+from app.core.matching_engine import ExecutionReport, Report, TradeEvent
+from app.core.orderbook import BookUpdate
+from app.schemas.encoding import dumps
+from app.ws.connection import run_until_disconnect
+
+# 연결별 전송 대기열 크기 (가득 차면 느린 구독자로 보고 연결 종료)
+TRADE_TAPE_QUEUE_SIZE = int(os.getenv("TRADE_TAPE_QUEUE_SIZE", "256"))
+
+router = APIRouter()
+
+
+def trade_payload(trade: TradeEvent) -> dict:
+    """체결 이벤트 → 전송용 dict"""
+    return {
+        "id": str(trade.id),
+        "buy_order_id": str(trade.buy_order_id),
+        "sell_order_id": str(trade.sell_order_id),
+        "price": str(trade.price),
+        "quantity": str(trade.quantity),
+        "side": trade.taker_side.value,
+        "executed_at": trade.executed_at.isoformat(),
+    }
+
+
+class TradeSubscriber:
+    """구독자별 제한 크기 전송 대기열"""
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.queue: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue(maxsize=queue_size)
+
+    def offer(self, frame: bytes) -> bool:
+        """프레임 추가 (가득 차면 대기열을 비우고 종료 신호를 넣은 뒤 False)"""
+        try:
+            self.queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            return False
+
+
+class TradeTapeManager:
+    """실시간 체결 스트림
+
+    체결 묶음은 엔진 이벤트당 한 번만 JSON 바이트로 직렬화하고 같은 버퍼를
+    모든 구독자에게 바이너리 프레임으로 보낸다 (구독자별 문자열 인코딩 없음).
+    엔진 쪽 작업은 put_nowait뿐이며 실제 전송은 연결별 태스크가 맡는다.
+    """
+
+    def __init__(self, queue_size: int = TRADE_TAPE_QUEUE_SIZE):
+        self.queue_size = queue_size
+        self.subscribers: Dict[str, Set[TradeSubscriber]] = {}
+
+    def on_engine_event(self, symbol: str, reports: List[Report], update: Optional[BookUpdate]) -> None:
+        """매칭 엔진 리스너: 체결 프레임을 구독자에게 분배"""
+        subscribers = self.subscribers.get(symbol)
+        if not subscribers:
+            return
+        trades = [
+            trade_payload(trade)
+            for report in reports
+            if isinstance(report, ExecutionReport)
+            for trade in report.trades
+        ]
+        if not trades:
+            return
+
+        frame = dumps({"type": "trades", "symbol": symbol, "trades": trades})
+        for subscriber in list(subscribers):
+            if not subscriber.offer(frame):
+                subscribers.discard(subscriber)
+
+    async def stream(self, websocket: WebSocket, symbol: str) -> None:
+        subscriber = TradeSubscriber(websocket, self.queue_size)
+        self.subscribers.setdefault(symbol, set()).add(subscriber)
+        try:
+            while True:
+                frame = await subscriber.queue.get()
+                if frame is None:
+                    await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason="slow consumer")
+                    return
+                await websocket.send_bytes(frame)
+        finally:
+            subscribers = self.subscribers.get(symbol)
+            if subscribers is not None:
+                subscribers.discard(subscriber)
+                if not subscribers:
+                    del self.subscribers[symbol]
+
+
+# 애플리케이션 전역 체결 스트림
+trade_tape = TradeTapeManager()
+
+
+@router.websocket("/ws/trades/{symbol}")
+async def trades_websocket(websocket: WebSocket, symbol: str):
+    """실시간 체결 내역 (엔진 이벤트당 체결 묶음 하나)"""
+    await websocket.accept()
+    await run_until_disconnect(websocket, trade_tape.stream(websocket, symbol))
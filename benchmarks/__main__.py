@@ -0,0 +1,53 @@
+import argparse
+import os
+import sys
+from typing import List, Optional
+
+SUITES = ("engine", "persistence", "http")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="매칭 엔진/영속화/HTTP 계층 벤치마크 (처리량과 p50/p99/p999 지연을 JSON으로 출력)",
+    )
+    parser.add_argument("suites", nargs="*", choices=SUITES, default=["engine"],
+                        help="실행할 묶음 (기본: engine, persistence/http는 PostgreSQL 필요)")
+    parser.add_argument("--output", "-o", help="결과 JSON 파일 (생략 시 표준 출력만)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON (차이를 표준 오류로 출력)")
+    parser.add_argument("--seed", type=int, default=0, help="합성 주문 흐름 시드")
+    parser.add_argument("--quick", action="store_true", help="작업량을 1/10로 줄여 빠르게 확인")
+    parser.add_argument("--concurrency", type=int, default=32, help="http 묶음의 동시 요청 수")
+    parser.add_argument("--database-url", help="persistence/http 묶음이 쓸 DB (기본: DATABASE_URL)")
+    args = parser.parse_args(argv)
+
+    # DB 설정은 app 모듈을 처음 가져올 때 읽히므로 그 전에 지정
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+
+    from benchmarks import compare
+    from benchmarks.common import environment, finish_report, write_report
+
+    results = []
+    for suite in dict.fromkeys(args.suites):
+        print(f"▶ {suite} 벤치마크 실행 중...", file=sys.stderr)
+        if suite == "engine":
+            from benchmarks import engine
+            results.extend(engine.run(args.quick, args.seed))
+        elif suite == "persistence":
+            from benchmarks import persistence
+            results.extend(persistence.run(args.quick, args.seed))
+        else:
+            from benchmarks import api
+            results.extend(api.run(args.quick, args.seed, args.concurrency))
+
+    report = finish_report({"environment": environment(args.seed), "quick": args.quick, "results": results})
+    write_report(report, args.output)
+    if args.baseline:
+        baseline = compare.load(args.baseline)
+        print(compare.format_table(compare.compare(baseline, report), baseline, report), file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,292 @@
+import asyncio
+import contextlib
+import gc
+import json
+import sys
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from benchmarks.common import BENCH_SYMBOL_PREFIX, OrderFlow, summarize
+
+SUITE = "http"
+# 요청 종류별 비율 (합계 1)
+REQUEST_MIX = (
+    ("create_order", 0.6),
+    ("cancel_order", 0.1),
+    ("get_order", 0.1),
+    ("orderbook_depth", 0.1),
+    ("recent_trades", 0.1),
+)
+
+
+class ASGIClient:
+    """HTTP 서버 없이 ASGI 앱을 직접 호출하는 최소 클라이언트 (소켓/HTTP 파싱 비용 제외)"""
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def request(self, method: str, path: str, body: Optional[Any] = None,
+                      query: str = "") -> Tuple[int, bytes]:
+        payload = json.dumps(body).encode() if body is not None else b""
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": method,
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [
+                (b"host", b"bench"),
+                (b"content-type", b"application/json"),
+                (b"content-length", str(len(payload)).encode()),
+            ],
+            "client": ("127.0.0.1", 50000),
+            "server": ("bench", 80),
+        }
+        sent = False
+        status = 0
+        chunks: List[bytes] = []
+
+        async def receive() -> Dict[str, Any]:
+            nonlocal sent
+            if not sent:
+                sent = True
+                return {"type": "http.request", "body": payload, "more_body": False}
+            # 응답이 끝날 때까지 연결 유지
+            await asyncio.Event().wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            elif message["type"] == "http.response.body":
+                chunks.append(message.get("body", b""))
+
+        await self.app(scope, receive, send)
+        return status, b"".join(chunks)
+
+
+class ASGIWebSocket:
+    """ASGI 앱에 직접 연결한 WebSocket (바이너리 메시지만)"""
+
+    def __init__(self, app: Any, path: str):
+        self.app = app
+        self.path = path
+        self.inbound: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        self.outbound: "asyncio.Queue[Dict[str, Any]]" = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def connect(self) -> None:
+        scope = {
+            "type": "websocket",
+            "asgi": {"version": "3.0"},
+            "scheme": "ws",
+            "path": self.path,
+            "raw_path": self.path.encode(),
+            "query_string": b"",
+            "root_path": "",
+            "headers": [(b"host", b"bench")],
+            "client": ("127.0.0.1", 50000),
+            "server": ("bench", 80),
+            "subprotocols": [],
+        }
+        self.inbound.put_nowait({"type": "websocket.connect"})
+        self._task = asyncio.ensure_future(self.app(scope, self.inbound.get, self.outbound.put))
+        message = await self.outbound.get()
+        if message["type"] != "websocket.accept":
+            raise RuntimeError(f"WebSocket 연결 실패: {message}")
+
+    def send_bytes(self, data: bytes) -> None:
+        self.inbound.put_nowait({"type": "websocket.receive", "bytes": data})
+
+    async def receive_bytes(self) -> bytes:
+        message = await self.outbound.get()
+        if message["type"] != "websocket.send":
+            raise RuntimeError(f"WebSocket 연결 종료: {message}")
+        return message["bytes"]
+
+    async def close(self) -> None:
+        self.inbound.put_nowait({"type": "websocket.disconnect", "code": 1000})
+        if self._task is not None:
+            await asyncio.gather(self._task, return_exceptions=True)
+
+
+class LoadGenerator:
+    """동시 작업자 concurrency개가 합성 주문 흐름과 조회를 섞어 요청"""
+
+    def __init__(self, client: ASGIClient, symbols: List[str], seed: int):
+        self.client = client
+        self.symbols = symbols
+        self.flows = [OrderFlow(symbol, seed=seed + index) for index, symbol in enumerate(symbols)]
+        self.random = self.flows[0].random
+        self.open_orders: Dict[str, List[Tuple[str, str]]] = {symbol: [] for symbol in symbols}
+        self.latencies: Dict[str, List[int]] = defaultdict(list)
+        self.statuses: Dict[str, Dict[int, int]] = defaultdict(lambda: defaultdict(int))
+
+    def _kind(self) -> str:
+        roll = self.random.random()
+        for kind, ratio in REQUEST_MIX:
+            if roll < ratio:
+                return kind
+            roll -= ratio
+        return REQUEST_MIX[0][0]
+
+    async def step(self) -> None:
+        flow = self.flows[self.random.randrange(len(self.flows))]
+        symbol = flow.symbol
+        open_orders = self.open_orders[symbol]
+        kind = self._kind()
+        if kind in ("cancel_order", "get_order") and not open_orders:
+            kind = "create_order"
+
+        begin = time.perf_counter_ns()
+        if kind == "create_order":
+            status, body = await self.client.request("POST", "/api/v1/orders/", flow.order())
+            if status == 201:
+                order = json.loads(body)
+                if order["status"] in ("open", "partially_filled"):
+                    open_orders.append((order["id"], order["user_id"]))
+        elif kind == "cancel_order":
+            order_id, user_id = flow.choose(open_orders)
+            status, _ = await self.client.request(
+                "DELETE", f"/api/v1/orders/{order_id}", {"order_id": order_id, "user_id": user_id},
+            )
+        elif kind == "get_order":
+            order_id, _ = open_orders[self.random.randrange(len(open_orders))]
+            status, _ = await self.client.request("GET", f"/api/v1/orders/{order_id}")
+        elif kind == "orderbook_depth":
+            status, _ = await self.client.request("GET", f"/api/v1/orderbook/{symbol}/depth", query="depth=20")
+        else:
+            status, _ = await self.client.request("GET", f"/api/v1/trades/symbol/{symbol}", query="limit=50")
+        self.latencies[kind].append(time.perf_counter_ns() - begin)
+        self.statuses[kind][status] += 1
+
+    async def run(self, requests: int, concurrency: int) -> float:
+        remaining = requests
+
+        async def worker() -> None:
+            nonlocal remaining
+            while remaining > 0:
+                remaining -= 1
+                await self.step()
+
+        gc.collect()
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        return time.perf_counter() - started
+
+
+async def bench_order_entry(app: Any, symbol: str, orders: int, pipeline: int = 100) -> List[Dict[str, Any]]:
+    """바이너리 주문 채널: 신규 주문 → ACK 왕복 지연과 파이프라이닝 처리량 (응답은 매칭 직후)"""
+    from app.ws.order_entry import ACK, LOGON, NEW_ORDER, order_entry_gateway
+
+    tokens, ack_durable = order_entry_gateway.tokens, order_entry_gateway.ack_durable
+    order_entry_gateway.tokens, order_entry_gateway.ack_durable = {"bench": "bench-order-entry"}, False
+    websocket = ASGIWebSocket(app, "/ws/order-entry")
+    try:
+        await websocket.connect()
+        websocket.send_bytes(LOGON.pack(b"L", 5) + b"bench")
+        await websocket.receive_bytes()
+        raw_symbol = symbol.encode()
+
+        # 체결되지 않도록 매수/매도 가격대를 떨어뜨려 쌓는다
+        def message(request_id: int) -> bytes:
+            side = request_id & 1
+            price = (1_000 + request_id % 100) if side else (500 - request_id % 100)
+            return NEW_ORDER.pack(b"N", request_id, raw_symbol, side, 0, price, 1, b"")
+
+        latencies = []
+        gc.collect()
+        started = time.perf_counter()
+        for request_id in range(1, orders + 1):
+            begin = time.perf_counter_ns()
+            websocket.send_bytes(message(request_id))
+            await websocket.receive_bytes()
+            latencies.append(time.perf_counter_ns() - begin)
+        results = [summarize(SUITE, "order_entry_round_trip", latencies, time.perf_counter() - started)]
+
+        # 한 프레임에 pipeline개씩 묶어 보내고 ACK를 모두 받을 때까지 대기
+        batches = []
+        request_id = orders
+        started = time.perf_counter()
+        for _ in range(orders // pipeline):
+            begin = time.perf_counter_ns()
+            websocket.send_bytes(b"".join(message(request_id + offset) for offset in range(1, pipeline + 1)))
+            request_id += pipeline
+            received = 0
+            while received < pipeline * ACK.size:
+                received += len(await websocket.receive_bytes())
+            batches.append(time.perf_counter_ns() - begin)
+        results.append(summarize(
+            SUITE, "order_entry_pipelined", batches, time.perf_counter() - started,
+            operations=len(batches) * pipeline, pipeline=pipeline,
+        ))
+        return results
+    finally:
+        await websocket.close()
+        order_entry_gateway.tokens, order_entry_gateway.ack_durable = tokens, ack_durable
+
+
+async def cleanup() -> None:
+    """벤치마크 심볼의 주문/체결/캔들 삭제"""
+    from sqlalchemy import delete
+
+    from app.db.database import AsyncSessionLocal
+    from app.models.kline import Kline
+    from app.models.order import Order
+    from app.models.trade import Trade
+
+    pattern = f"{BENCH_SYMBOL_PREFIX}%"
+    async with AsyncSessionLocal() as db:
+        await db.execute(delete(Trade).where(Trade.symbol.like(pattern)))
+        await db.execute(delete(Order).where(Order.symbol.like(pattern)))
+        await db.execute(delete(Kline).where(Kline.symbol.like(pattern)))
+        await db.commit()
+
+
+async def run_async(quick: bool, seed: int, concurrency: int) -> List[Dict[str, Any]]:
+    from app.core.symbols import SymbolSpec, symbol_registry
+    from app.db.database import engine
+    from app.main import app
+
+    # SQL 로그 출력은 측정을 왜곡하므로 끈다
+    engine.sync_engine.echo = False
+    symbols = [f"{BENCH_SYMBOL_PREFIX}HTTP{index}" for index in range(4)]
+    # 벤치마크 심볼은 설정과 무관하게 거래 심볼로 등록
+    for symbol in [*symbols, f"{BENCH_SYMBOL_PREFIX}OE"]:
+        symbol_registry.register(SymbolSpec(symbol))
+    requests = 2_000 if quick else 20_000
+    try:
+        async with app.router.lifespan_context(app):
+            generator = LoadGenerator(ASGIClient(app), symbols, seed)
+            # 워밍업 (라우트/직렬화 초기화, 오더북 적재)
+            await generator.run(requests // 10, concurrency)
+            generator.latencies.clear()
+            generator.statuses.clear()
+            elapsed = await generator.run(requests, concurrency)
+            order_entry = await bench_order_entry(app, f"{BENCH_SYMBOL_PREFIX}OE", requests)
+    finally:
+        await cleanup()
+
+    every = [latency for latencies in generator.latencies.values() for latency in latencies]
+    results = [summarize(SUITE, "mixed", every, elapsed, concurrency=concurrency)]
+    for kind, _ in REQUEST_MIX:
+        latencies = generator.latencies.get(kind, [])
+        results.append(summarize(
+            SUITE, kind, latencies, elapsed,
+            concurrency=concurrency,
+            statuses={str(status): count for status, count in sorted(generator.statuses[kind].items())},
+        ))
+    results.extend(order_entry)
+    return results
+
+
+def run(quick: bool = False, seed: int = 0, concurrency: int = 32) -> List[Dict[str, Any]]:
+    # 앱 시작/종료 로그는 결과 JSON과 섞이지 않게 표준 오류로
+    with contextlib.redirect_stdout(sys.stderr):
+        return asyncio.run(run_async(quick, seed, concurrency))
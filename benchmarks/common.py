@@ -0,0 +1,134 @@
+import json
+import platform
+import random
+import subprocess
+import sys
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Optional
+
+from app.core.replay import peak_memory_mb, percentile
+
+# 결과에 기록할 지연 백분위 (키 → 백분위)
+PERCENTILES = (("p50", 50.0), ("p99", 99.0), ("p999", 99.9))
+
+# 벤치마크 전용 심볼 접두사 (DB를 쓰는 벤치마크는 끝난 뒤 이 심볼의 행을 지운다)
+BENCH_SYMBOL_PREFIX = "BENCH"
+
+
+def summarize(suite: str, name: str, latencies_ns: List[int], elapsed: float,
+              operations: Optional[int] = None, **extra: Any) -> Dict[str, Any]:
+    """지연 표본(ns)과 경과 시간으로 결과 한 건 생성 (처리량은 operations/elapsed)"""
+    latencies = sorted(latencies_ns)
+    operations = len(latencies) if operations is None else operations
+    return {
+        "suite": suite,
+        "name": name,
+        "operations": operations,
+        "elapsed_seconds": round(elapsed, 6),
+        "throughput_per_second": round(operations / elapsed, 1) if elapsed else 0.0,
+        "latency_us": {
+            **{key: percentile(latencies, q) / 1000 for key, q in PERCENTILES},
+            "mean": round(sum(latencies) / len(latencies) / 1000, 3) if latencies else 0.0,
+            "max": latencies[-1] / 1000 if latencies else 0.0,
+        },
+        **extra,
+    }
+
+
+def git_commit() -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, timeout=5,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def environment(seed: int) -> Dict[str, Any]:
+    """커밋 간 비교를 위한 실행 환경 정보"""
+    return {
+        "commit": git_commit(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "seed": seed,
+    }
+
+
+def write_report(report: Dict[str, Any], output: Optional[str]) -> None:
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if output:
+        with open(output, "w", encoding="utf-8") as f:
+            f.write(text)
+            f.write("\n")
+    sys.stdout.write(text)
+    sys.stdout.write("\n")
+
+
+def finish_report(report: Dict[str, Any]) -> Dict[str, Any]:
+    report["peak_memory_mb"] = round(peak_memory_mb(), 1)
+    return report
+
+
+class OrderFlow:
+    """시드 고정 합성 주문 흐름
+
+    중간 가격 주변에 쌓이는 지정가(대부분), 스프레드를 넘는 지정가, 시장가 주문과
+    취소를 섞어 만든다. 같은 시드는 항상 같은 순서의 주문을 만든다.
+    """
+
+    def __init__(self, symbol: str, seed: int = 0, mid: Decimal = Decimal("100.00"),
+                 tick: Decimal = Decimal("0.01"), depth: int = 50,
+                 aggressive_ratio: float = 0.2, market_ratio: float = 0.05,
+                 cancel_ratio: float = 0.15, users: int = 100):
+        self.symbol = symbol
+        self.random = random.Random(seed)
+        self.mid = mid
+        self.tick = tick
+        self.depth = depth
+        self.aggressive_ratio = aggressive_ratio
+        self.market_ratio = market_ratio
+        self.cancel_ratio = cancel_ratio
+        self.users = users
+        self._count = 0
+
+    def order(self) -> Dict[str, Any]:
+        """OrderCreate 형식의 신규 주문 (JSON 본문으로 그대로 쓸 수 있게 문자열 값)"""
+        rng = self.random
+        self._count += 1
+        side = "buy" if rng.random() < 0.5 else "sell"
+        order = {
+            "symbol": self.symbol,
+            "side": side,
+            "quantity": str(Decimal(rng.randint(1, 100)) / 10),
+            "user_id": f"bench-user-{rng.randrange(self.users)}",
+            "client_order_id": f"bench-{self._count}",
+        }
+        roll = rng.random()
+        if roll < self.market_ratio:
+            order["order_type"] = "market"
+            return order
+        if roll < self.market_ratio + self.aggressive_ratio:
+            # 상대 호가를 넘어 체결되는 가격
+            offset = -rng.randint(1, 5)
+        else:
+            # 자기 쪽에 쌓이는 가격
+            offset = rng.randint(1, self.depth)
+        ticks = offset if side == "sell" else -offset
+        order["order_type"] = "limit"
+        order["price"] = str(self.mid + ticks * self.tick)
+        return order
+
+    def action(self) -> str:
+        """다음 행동 종류 (new / cancel)"""
+        return "cancel" if self.random.random() < self.cancel_ratio else "new"
+
+    def choose(self, candidates: List[Any]) -> Any:
+        """취소 대상 등을 시드 난수로 선택해 목록에서 꺼냄 (순서는 유지하지 않음)"""
+        index = self.random.randrange(len(candidates))
+        candidates[index], candidates[-1] = candidates[-1], candidates[index]
+        return candidates.pop()
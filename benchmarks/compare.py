@@ -0,0 +1,70 @@
+import argparse
+import json
+import sys
+from typing import Any, Dict, List, Optional, Tuple
+
+# 비교할 지표 (결과 키, 높을수록 좋은지)
+METRICS = (
+    ("throughput_per_second", True),
+    ("p50", False),
+    ("p99", False),
+    ("p999", False),
+)
+
+
+def load(path: str) -> Dict[str, Any]:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _metric(result: Dict[str, Any], key: str) -> float:
+    return result[key] if key in result else result["latency_us"][key]
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[Tuple[str, str, float, float, float]]:
+    """같은 (suite, name) 결과끼리 지표별 (이전, 현재, 개선율 %) 계산 (양수 = 개선)"""
+    previous = {(result["suite"], result["name"]): result for result in baseline["results"]}
+    rows = []
+    for result in current["results"]:
+        before = previous.get((result["suite"], result["name"]))
+        if before is None:
+            continue
+        for key, higher_is_better in METRICS:
+            old, new = _metric(before, key), _metric(result, key)
+            if not old:
+                continue
+            change = (new - old) / old * 100
+            if not higher_is_better:
+                change = -change
+            rows.append((f"{result['suite']}.{result['name']}", key, old, new, change + 0.0))
+    return rows
+
+
+def format_table(rows: List[Tuple[str, str, float, float, float]], baseline: Dict[str, Any],
+                 current: Dict[str, Any]) -> str:
+    base_commit = baseline["environment"].get("commit") or "?"
+    current_commit = current["environment"].get("commit") or "?"
+    lines = [f"{'benchmark':<32} {'metric':<22} {base_commit:>14} {current_commit:>14} {'change':>9}"]
+    for name, key, old, new, change in rows:
+        metric = key if key.startswith("throughput") else f"{key} (us)"
+        lines.append(f"{name:<32} {metric:<22} {old:>14,.1f} {new:>14,.1f} {change:>+8.1f}%")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.compare",
+        description="두 벤치마크 결과 JSON 비교 (change 양수 = 개선)",
+    )
+    parser.add_argument("baseline", help="기준 결과 JSON")
+    parser.add_argument("current", help="비교할 결과 JSON")
+    args = parser.parse_args(argv)
+
+    baseline, current = load(args.baseline), load(args.current)
+    sys.stdout.write(format_table(compare(baseline, current), baseline, current))
+    sys.stdout.write("\n")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,173 @@
+import gc
+import random
+import time
+from decimal import Decimal
+from typing import Any, Callable, Dict, List, Optional
+
+from app.core.matching_engine import (
+    CancelOrderCommand,
+    Command,
+    ExecutionReport,
+    NewOrderCommand,
+    SymbolEngine,
+    new_order_state,
+)
+from app.core.orderbook import OrderBookManager
+from app.core.symbols import SymbolRegistry
+from app.schemas.order import OrderCreate
+
+from benchmarks.common import BENCH_SYMBOL_PREFIX, OrderFlow, summarize
+
+SUITE = "engine"
+SYMBOL = f"{BENCH_SYMBOL_PREFIX}ENGINE"
+# 합성 흐름의 가격 단위
+TICK = Decimal("0.01")
+
+
+class EngineHarness:
+    """시퀀서 없이 SymbolEngine을 직접 호출 (명령 생성은 측정 구간 밖)"""
+
+    def __init__(self):
+        self.books = OrderBookManager(SymbolRegistry())
+        self.engine = SymbolEngine(self.books.get_or_create(SYMBOL))
+        self.spec = self.engine.book.spec
+
+    def new_order(self, order: Dict[str, Any]) -> NewOrderCommand:
+        return NewOrderCommand(new_order_state(OrderCreate.model_validate(order), self.spec))
+
+    def limit(self, side: str, price: Decimal, quantity: Decimal = Decimal("1")) -> NewOrderCommand:
+        return self.new_order({
+            "symbol": SYMBOL, "side": side, "order_type": "limit",
+            "price": price, "quantity": quantity, "user_id": "bench",
+        })
+
+    def process(self, command: Command) -> Optional[ExecutionReport]:
+        report = self.engine.process(command)
+        self.engine.book.drain_changes()
+        return report  # type: ignore
+
+    def timed(self, commands: List[Command], on_report: Optional[Callable[[Any], None]] = None) -> Dict[str, Any]:
+        """명령 목록을 차례로 처리하며 명령별 지연(ns) 측정"""
+        latencies = []
+        append = latencies.append
+        engine = self.engine
+        book = engine.book
+        clock = time.perf_counter_ns
+        gc.collect()
+        started = time.perf_counter()
+        for command in commands:
+            begin = clock()
+            report = engine.process(command)
+            book.drain_changes()
+            append(clock() - begin)
+            if on_report is not None:
+                on_report(report)
+        return {"latencies": latencies, "elapsed": time.perf_counter() - started}
+
+
+def bench_insert(count: int, seed: int) -> Dict[str, Any]:
+    """체결되지 않는 지정가 주문 적재 (매수/매도 각 1000개 가격대)"""
+    harness = EngineHarness()
+    rng = random.Random(seed)
+    mid = Decimal("100.00")
+    commands: List[Command] = []
+    for _ in range(count):
+        offset = rng.randint(1, 1000) * TICK
+        if rng.random() < 0.5:
+            commands.append(harness.limit("buy", mid - offset))
+        else:
+            commands.append(harness.limit("sell", mid + offset))
+    run = harness.timed(commands)
+    return summarize(SUITE, "insert", run["latencies"], run["elapsed"], resting_orders=len(harness.engine.book))
+
+
+def bench_cancel(count: int, seed: int) -> Dict[str, Any]:
+    """적재된 주문을 무작위 순서로 전부 취소"""
+    harness = EngineHarness()
+    rng = random.Random(seed)
+    mid = Decimal("100.00")
+    order_ids = []
+    for _ in range(count):
+        side = "buy" if rng.random() < 0.5 else "sell"
+        offset = rng.randint(1, 1000) * TICK
+        command = harness.limit(side, mid - offset if side == "buy" else mid + offset)
+        harness.process(command)
+        order_ids.append(command.order.id)
+    rng.shuffle(order_ids)
+    run = harness.timed([CancelOrderCommand(order_id, None) for order_id in order_ids])
+    return summarize(SUITE, "cancel", run["latencies"], run["elapsed"], resting_orders=len(harness.engine.book))
+
+
+def bench_sweep(levels: int, orders_per_level: int, sweeps: int) -> Dict[str, Any]:
+    """시장가 주문 하나로 매도 호가 levels개를 모두 쓸어가는 비용 (매번 오더북 재적재)"""
+    harness = EngineHarness()
+    mid = Decimal("100.00")
+    size = Decimal(levels * orders_per_level)
+    latencies: List[int] = []
+    elapsed = 0.0
+    for _ in range(sweeps):
+        for level in range(1, levels + 1):
+            for _ in range(orders_per_level):
+                harness.process(harness.limit("sell", mid + level * TICK))
+        sweep = harness.new_order({
+            "symbol": SYMBOL, "side": "buy", "order_type": "market", "quantity": size, "user_id": "bench",
+        })
+        run = harness.timed([sweep])
+        latencies.extend(run["latencies"])
+        elapsed += run["elapsed"]
+    fills = sweeps * levels * orders_per_level
+    return summarize(
+        SUITE, f"sweep_{levels}x{orders_per_level}", latencies, elapsed,
+        levels=levels, orders_per_level=orders_per_level,
+        fills_per_second=round(fills / elapsed, 1) if elapsed else 0.0,
+    )
+
+
+def bench_deep_book(resting: int, count: int, seed: int) -> Dict[str, Any]:
+    """깊은 오더북(resting건 적재) 위에서 신규/체결/취소가 섞인 합성 흐름 처리"""
+    harness = EngineHarness()
+    flow = OrderFlow(SYMBOL, seed=seed, depth=2000)
+    for _ in range(resting):
+        order = flow.order()
+        if order["order_type"] == "limit":
+            # 적재 단계에서는 체결 없이 자기 쪽에만 쌓는다
+            price = Decimal(order["price"])
+            if (order["side"] == "buy") == (price >= flow.mid):
+                order["price"] = str(2 * flow.mid - price)
+            harness.process(harness.new_order(order))
+    open_ids = [order.order_id for order in harness.engine.book.orders()]
+
+    commands: List[Command] = []
+    for _ in range(count):
+        if flow.action() == "cancel" and open_ids:
+            commands.append(CancelOrderCommand(flow.choose(open_ids), None))
+        else:
+            command = harness.new_order(flow.order())
+            commands.append(command)
+            open_ids.append(command.order.id)
+
+    trades = 0
+
+    def count_trades(report: Any) -> None:
+        nonlocal trades
+        if isinstance(report, ExecutionReport):
+            trades += len(report.trades)
+
+    initial = len(harness.engine.book)
+    run = harness.timed(commands, count_trades)
+    return summarize(
+        SUITE, "deep_book_mixed", run["latencies"], run["elapsed"],
+        initial_resting_orders=initial, trades=trades,
+        price_levels=len(harness.engine.book.bids) + len(harness.engine.book.asks),
+    )
+
+
+def run(quick: bool = False, seed: int = 0) -> List[Dict[str, Any]]:
+    scale = 10 if quick else 1
+    return [
+        bench_insert(200_000 // scale, seed),
+        bench_cancel(200_000 // scale, seed),
+        bench_sweep(10, 10, 2000 // scale),
+        bench_sweep(500, 2, 100 // scale),
+        bench_deep_book(500_000 // scale, 200_000 // scale, seed),
+    ]
@@ -0,0 +1,131 @@
+import asyncio
+import gc
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import delete
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.matching_engine import CancelOrderCommand, ExecutionReport, Report
+from app.db.database import DATABASE_URL, Base
+from app.models.order import Order
+from app.models.trade import Trade
+from app.services.execution_service import ExecutionService
+from app.services.write_behind import WriteBehindPipeline
+
+from benchmarks.common import BENCH_SYMBOL_PREFIX, OrderFlow, summarize
+from benchmarks.engine import EngineHarness
+
+SUITE = "persistence"
+SYMBOL = f"{BENCH_SYMBOL_PREFIX}PERSIST"
+
+
+def generate_reports(count: int, seed: int) -> List[Report]:
+    """합성 주문 흐름을 엔진에 통과시켜 실제와 같은 처리 결과(신규/체결/취소) 생성"""
+    harness = EngineHarness()
+    flow = OrderFlow(SYMBOL, seed=seed)
+    open_ids = []
+    reports: List[Report] = []
+    while len(reports) < count:
+        if flow.action() == "cancel" and open_ids:
+            report = harness.process(CancelOrderCommand(flow.choose(open_ids), None))
+        else:
+            command = harness.new_order(flow.order())
+            report = harness.process(command)
+            open_ids.append(command.order.id)
+        if report is not None:
+            reports.append(report)
+    return reports
+
+
+def _row_counts(reports: List[Report]) -> Dict[str, int]:
+    trades = sum(len(report.trades) for report in reports if isinstance(report, ExecutionReport))
+    return {"reports": len(reports), "trades": trades}
+
+
+async def bench_save_batch(session_factory: async_sessionmaker, batch_size: int,
+                           count: int, seed: int) -> Dict[str, Any]:
+    """ExecutionService.save_batch 직접 호출 (배치당 세션/트랜잭션 하나, 지연은 배치 단위)"""
+    reports = generate_reports(count, seed)
+    latencies: List[int] = []
+    gc.collect()
+    started = time.perf_counter()
+    for offset in range(0, len(reports), batch_size):
+        batch = reports[offset:offset + batch_size]
+        begin = time.perf_counter_ns()
+        async with session_factory() as db:
+            await ExecutionService(db).save_batch(batch)
+        latencies.append(time.perf_counter_ns() - begin)
+    elapsed = time.perf_counter() - started
+    return summarize(
+        SUITE, f"save_batch_{batch_size}", latencies, elapsed, operations=len(reports),
+        batch_size=batch_size, batches=len(latencies), latency_unit="batch", **_row_counts(reports),
+    )
+
+
+async def bench_write_behind(session_factory: async_sessionmaker, count: int, seed: int,
+                             max_batch_size: Optional[int] = None) -> Dict[str, Any]:
+    """시퀀서처럼 결과를 하나씩 제출하고 커밋 완료까지의 지연 측정 (그룹 커밋 포함)"""
+    reports = generate_reports(count, seed)
+    pipeline = WriteBehindPipeline(session_factory=session_factory)
+    if max_batch_size is not None:
+        pipeline.max_batch_size = max_batch_size
+    latencies: List[int] = []
+    pending = []
+
+    def committed(submitted: int) -> Any:
+        return lambda future: latencies.append(time.perf_counter_ns() - submitted)
+
+    pipeline.start()
+    gc.collect()
+    started = time.perf_counter()
+    for index, report in enumerate(reports):
+        future = pipeline.submit([report])
+        future.add_done_callback(committed(time.perf_counter_ns()))
+        if not pending or pending[-1] is not future:
+            pending.append(future)
+        if index % 16 == 15:
+            # 명령 도착 사이에 이벤트 루프를 양보 (저장 태스크가 배치를 가져갈 수 있게)
+            await asyncio.sleep(0)
+    await asyncio.gather(*pending)
+    elapsed = time.perf_counter() - started
+    await pipeline.stop()
+    return summarize(
+        SUITE, "write_behind", latencies, elapsed,
+        max_batch_size=pipeline.max_batch_size, batches=len(pending),
+        latency_unit="report", **_row_counts(reports),
+    )
+
+
+async def cleanup(session_factory: async_sessionmaker) -> None:
+    """벤치마크 심볼의 주문/체결 삭제"""
+    async with session_factory() as db:
+        await db.execute(delete(Trade).where(Trade.symbol.like(f"{BENCH_SYMBOL_PREFIX}%")))
+        await db.execute(delete(Order).where(Order.symbol.like(f"{BENCH_SYMBOL_PREFIX}%")))
+        await db.commit()
+
+
+async def run_async(database_url: str, quick: bool, seed: int) -> List[Dict[str, Any]]:
+    engine = create_async_engine(database_url, pool_pre_ping=True)
+    session_factory = async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    count = 2_000 if quick else 20_000
+    results = []
+    try:
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        await cleanup(session_factory)
+        for batch_size in (1, 50, 500):
+            # 배치 1은 커밋 횟수가 많아 건수를 줄인다
+            results.append(await bench_save_batch(
+                session_factory, batch_size, count // 10 if batch_size == 1 else count, seed,
+            ))
+            await cleanup(session_factory)
+        results.append(await bench_write_behind(session_factory, count, seed))
+    finally:
+        await cleanup(session_factory)
+        await engine.dispose()
+    return results
+
+
+def run(quick: bool = False, seed: int = 0) -> List[Dict[str, Any]]:
+    return asyncio.run(run_async(DATABASE_URL, quick, seed))
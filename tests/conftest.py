@@ -0,0 +1,118 @@
+import os
+import uuid
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Tuple
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.matching_engine import NewOrderCommand, OrderState, SymbolEngine, TradeEvent
+from app.core.orderbook import OrderBook
+from app.core.symbols import SymbolSpec
+from app.db.database import Base
+from app.models.order import OrderSide, OrderStatus, OrderType
+from app.services.execution_service import ExecutionService
+from app.services.trade_archive import TradePartitionService
+
+SYMBOL = "TESTUSDT"
+SPEC = SymbolSpec(SYMBOL)
+T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+# PostgreSQL 통합 테스트 DB (미설정 시 해당 테스트 건너뜀, 테스트마다 public 스키마를 새로 만듦)
+TEST_DATABASE_URL = os.getenv("TEST_DATABASE_URL", "")
+
+
+def at(seconds: float) -> datetime:
+    """테스트 기준 시각 + seconds초"""
+    return T0 + timedelta(seconds=seconds)
+
+
+def book_state(book: OrderBook) -> Tuple[list, list]:
+    """오더북 비교용 (가격, [(주문 ID, 수량, 잔량, 사용자, 클라이언트 주문 ID)]) 목록 (최우선 호가부터)"""
+    return tuple(
+        [
+            (level.price, [
+                (o.order_id, o.quantity, o.remaining_quantity, o.user_id, o.client_order_id)
+                for o in level.orders.values()
+            ])
+            for level in book_side.levels()
+        ]
+        for book_side in (book.bids, book.asks)
+    )
+
+
+@pytest.fixture
+def make_order() -> Callable[..., OrderState]:
+    """엔진 신규 주문 상태 생성 (가격: tick 수, 수량: lot 수)"""
+    def make(
+        side: OrderSide,
+        price: Optional[int],
+        quantity: int,
+        order_type: OrderType = OrderType.LIMIT,
+        user_id: Optional[str] = "u1",
+        client_order_id: Optional[str] = None,
+    ) -> OrderState:
+        return OrderState(
+            id=uuid.uuid4(),
+            symbol=SYMBOL,
+            side=side,
+            order_type=order_type,
+            price_ticks=price,
+            quantity_lots=quantity,
+            filled_lots=0,
+            remaining_lots=quantity,
+            status=OrderStatus.OPEN,
+            created_at=T0,
+            updated_at=T0,
+            spec=SPEC,
+            user_id=user_id,
+            client_order_id=client_order_id,
+        )
+    return make
+
+
+@pytest.fixture
+def book() -> OrderBook:
+    return OrderBook(SYMBOL, SPEC)
+
+
+async def reset_schema(engine) -> None:
+    async with engine.begin() as conn:
+        await conn.execute(text("DROP SCHEMA public CASCADE"))
+        await conn.execute(text("CREATE SCHEMA public"))
+
+
+@pytest.fixture
+async def db_engine():
+    """모델 메타데이터로 만든 빈 스키마 (체결 기본/일별 파티션 포함)"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL 미설정")
+    engine = create_async_engine(TEST_DATABASE_URL)
+    await reset_schema(engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    async with async_sessionmaker(engine, class_=AsyncSession)() as db:
+        await TradePartitionService(db).ensure_partitions(1)
+    yield engine
+    await engine.dispose()
+
+
+@pytest.fixture
+def sessions(db_engine) -> async_sessionmaker:
+    return async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+
+
+async def save_trades(sessions, make_order, symbol: str, count: int, start: float = 0) -> List[TradeEvent]:
+    """symbol에서 start초부터 1초 간격으로 count건 체결시켜 저장하고 체결 목록 반환"""
+    spec = SymbolSpec(symbol)
+    engine = SymbolEngine(OrderBook(symbol, spec))
+    reports = []
+    for index in range(count):
+        for side in (OrderSide.SELL, OrderSide.BUY):
+            order = make_order(side, 100, 1)
+            order.symbol, order.spec = symbol, spec
+            reports.append(engine.process(NewOrderCommand(order), at(start + index)))
+    async with sessions() as db:
+        await ExecutionService(db).save_batch(reports)
+    return [trade for report in reports for trade in report.trades]
@@ -0,0 +1,48 @@
+from app.schemas.order import OrderCreate
+from benchmarks import compare, engine
+from benchmarks.common import OrderFlow, summarize
+
+
+def test_summarize_reports_throughput_and_percentiles():
+    result = summarize("engine", "x", [i * 1000 for i in range(1, 1001)], 2.0)
+
+    assert result["operations"] == 1000
+    assert result["throughput_per_second"] == 500.0
+    assert (result["latency_us"]["p50"], result["latency_us"]["p99"], result["latency_us"]["max"]) == (500, 990, 1000)
+
+
+def test_order_flow_is_seeded_and_valid():
+    def orders(seed):
+        flow = OrderFlow("BENCHUSDT", seed=seed)
+        return [flow.order() for _ in range(200)]
+
+    assert orders(1) == orders(1)
+    assert orders(1) != orders(2)
+    for order in orders(1):
+        OrderCreate.model_validate(order)
+
+
+def test_engine_benchmarks_run_small():
+    insert = engine.bench_insert(500, 0)
+    cancel = engine.bench_cancel(500, 0)
+    sweep = engine.bench_sweep(3, 2, 5)
+
+    assert insert["operations"] == 500 and insert["resting_orders"] == 500
+    assert cancel["resting_orders"] == 0
+    assert sweep["operations"] > 0
+
+
+def test_compare_signs_changes_as_improvements():
+    def report(commit, throughput, p50):
+        result = summarize("engine", "insert", [p50 * 1000] * 10, 1.0)
+        result["throughput_per_second"] = throughput
+        return {"environment": {"commit": commit}, "results": [result]}
+
+    baseline, current = report("a", 100, 10), report("b", 150, 5)
+    rows = compare.compare(baseline, current)
+    changes = {key: change for _, key, _, _, change in rows}
+
+    # 처리량은 증가, 지연은 감소가 개선 (양수)
+    assert changes["throughput_per_second"] == 50.0
+    assert changes["p50"] == 50.0
+    assert "engine.insert" in compare.format_table(rows, baseline, current)
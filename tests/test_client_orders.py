@@ -0,0 +1,149 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from sqlalchemy import func, select
+
+from app.core.client_orders import ClientOrderIndex
+from app.core.matching_engine import ExecutionReport, MatchingEngine
+from app.core.orderbook import OrderBookManager
+from app.core.symbols import SymbolRegistry
+from app.models.order import Order, OrderSide, OrderStatus, OrderType
+from app.schemas.order import OrderCreate
+from app.services.execution_service import ExecutionService
+from app.services.order_service import OrderService
+from app.services.write_behind import WriteBehindPipeline
+
+from conftest import SPEC, SYMBOL, at
+
+BUY, SELL = OrderSide.BUY, OrderSide.SELL
+
+
+def order_request(side, price, quantity, client_order_id=None, user_id="u1") -> OrderCreate:
+    return OrderCreate(
+        symbol=SYMBOL,
+        side=side,
+        order_type=OrderType.LIMIT,
+        price=Decimal(price),
+        quantity=Decimal(quantity),
+        user_id=user_id,
+        client_order_id=client_order_id,
+    )
+
+
+def test_index_claim_update_and_expire(make_order):
+    index = ClientOrderIndex(ttl=10)
+    order = make_order(BUY, 100, 1, client_order_id="c-1")
+
+    assert index.claim(order, at(0)) is None
+    assert index.claim(make_order(BUY, 101, 1, client_order_id="c-1"), at(1)) is order
+    # 다른 사용자 / ID 없는 주문은 별개
+    assert index.claim(make_order(BUY, 100, 1, user_id="u2", client_order_id="c-1"), at(1)) is None
+    assert index.claim(make_order(BUY, 100, 1), at(1)) is None
+
+    order.status = OrderStatus.FILLED
+    index.update([order], at(2))
+    assert index.claim(make_order(BUY, 100, 1, client_order_id="c-1"), at(11)) is order
+    # 종료 후 ttl이 지나면 같은 ID 재사용 가능
+    assert index.claim(make_order(BUY, 100, 1, client_order_id="c-1"), at(12)) is None
+
+
+def test_index_restore_keeps_live_and_recently_finished(make_order):
+    index = ClientOrderIndex(ttl=10)
+    live = make_order(BUY, 100, 1, client_order_id="live")
+    finished = make_order(BUY, 100, 1, client_order_id="done")
+    finished.status, finished.updated_at = OrderStatus.CANCELLED, at(5)
+    expired = make_order(BUY, 100, 1, client_order_id="old")
+    expired.status, expired.updated_at = OrderStatus.FILLED, at(-20)
+
+    index.restore([live, finished, expired], at(6))
+
+    assert index.claim(make_order(BUY, 1, 1, client_order_id="done"), at(7)) is finished
+    assert index.claim(make_order(BUY, 1, 1, client_order_id="old"), at(7)) is None
+    # 종료된 주문은 종료 시각 + ttl에 만료, 대기 주문은 계속 유지
+    assert index.claim(make_order(BUY, 1, 1, client_order_id="done"), at(15)) is None
+    assert index.claim(make_order(BUY, 1, 1, client_order_id="live"), at(100)) is live
+
+
+def new_engine() -> MatchingEngine:
+    return MatchingEngine(OrderBookManager(SymbolRegistry({SYMBOL: SPEC})))
+
+
+async def test_duplicate_submission_returns_existing_order():
+    engine = new_engine()
+    engine.start()
+    try:
+        first = await engine.submit_order(order_request(BUY, "1", "2", "c-1"))
+        again = await engine.submit_order(order_request(BUY, "2", "3", "c-1"))
+        outcomes = await engine.submit_batch([
+            order_request(BUY, "1", "1", "c-1"),
+            order_request(BUY, "1", "1", "c-2"),
+        ])
+    finally:
+        await engine.stop()
+
+    assert again.order.id == first.order.id and not again.is_new
+    assert again.order.price == Decimal("1")
+    assert outcomes[0].order.id == first.order.id
+    assert isinstance(outcomes[1], ExecutionReport) and outcomes[1].is_new
+    assert len(engine.books.get(SYMBOL)) == 2
+
+
+async def run_engine(sessions, requests, restore=True):
+    """DB에서 오더북/중복 제출 색인을 복원한 엔진으로 주문을 처리하고 결과 반환"""
+    engine = new_engine()
+    if restore:
+        async with sessions() as db:
+            service = OrderService(db)
+            engine.books.rebuild(await service.get_open_orders())
+            engine.restore_client_orders(await service.get_client_orders(at(0) - timedelta(days=365 * 10)))
+    pipeline = WriteBehindPipeline(session_factory=sessions)
+    pipeline.start(engine)
+    engine.start(persist=pipeline.submit)
+    try:
+        return [await engine.submit_order(request) for request in requests]
+    finally:
+        await engine.stop()
+        await pipeline.stop()
+
+
+async def count_orders(sessions, client_order_id):
+    async with sessions() as db:
+        query = select(func.count()).select_from(Order).where(Order.client_order_id == client_order_id)
+        return (await db.execute(query)).scalar_one()
+
+
+async def test_duplicate_across_restart(sessions):
+    resting, filled = await run_engine(sessions, [
+        order_request(BUY, "1", "2", "c-rest"),
+        order_request(BUY, "3", "1", "c-fill"),
+    ], restore=False)
+    # c-fill 체결용 매도 (다른 사용자)
+    await run_engine(sessions, [order_request(SELL, "3", "1", user_id="u2")])
+
+    again = await run_engine(sessions, [
+        order_request(BUY, "1", "2", "c-rest"),
+        order_request(BUY, "3", "1", "c-fill"),
+    ])
+
+    assert again[0].order.id == resting.order.id and not again[0].is_new
+    # 재시작 전에 종료된 주문도 보관 기간 안이면 기존 주문 상태로 응답
+    assert again[1].order.id == filled.order.id
+    assert again[1].order.status == OrderStatus.FILLED
+    assert await count_orders(sessions, "c-rest") == 1
+    assert await count_orders(sessions, "c-fill") == 1
+
+
+async def test_insert_clears_client_order_id_missed_by_index(sessions, make_order):
+    first = make_order(BUY, 100, 1, client_order_id="c-1")
+    second = make_order(BUY, 101, 1, client_order_id="c-1")
+    async with sessions() as db:
+        await ExecutionService(db).save_batch([ExecutionReport(first)])
+    # 엔진 색인이 모르는 같은 키의 대기 주문도 배치를 실패시키지 않고 저장
+    async with sessions() as db:
+        await ExecutionService(db).save_batch([ExecutionReport(second)])
+
+    async with sessions() as db:
+        stored = {order.id: order for order in (await db.execute(select(Order))).scalars()}
+    assert stored[first.id].client_order_id == "c-1"
+    assert stored[second.id].client_order_id is None
+    assert stored[second.id].status == OrderStatus.OPEN
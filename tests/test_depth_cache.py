@@ -0,0 +1,44 @@
+import uuid
+
+import orjson
+
+from app.core.depth_cache import DepthCache
+from app.core.orderbook import BookOrder, OrderBookManager
+from app.core.symbols import SymbolRegistry
+from app.models.order import OrderSide
+
+from conftest import SPEC, SYMBOL
+
+
+def new_cache():
+    books = OrderBookManager(SymbolRegistry({SYMBOL: SPEC}))
+    return books, DepthCache(books)
+
+
+def test_cached_body_is_reused_until_book_changes():
+    books, cache = new_cache()
+    book = books.get_or_create(SYMBOL)
+    book.add(BookOrder(uuid.uuid4(), OrderSide.BUY, 100, 2, 2))
+
+    first = cache.depth(SYMBOL, 20)
+    assert cache.depth(SYMBOL, 20) is first
+    assert orjson.loads(first)["bids"][0]["quantity"] == str(SPEC.from_lots(2))
+
+    book.add(BookOrder(uuid.uuid4(), OrderSide.SELL, 101, 1, 1))
+    changed = cache.depth(SYMBOL, 20)
+    assert changed is not first
+    assert len(orjson.loads(changed)["asks"]) == 1
+
+
+def test_entries_are_bounded_to_known_books_and_depths():
+    books, cache = new_cache()
+    books.get_or_create(SYMBOL)
+
+    for depth in range(1, 101):
+        cache.orderbook(SYMBOL, depth)
+    for index in range(100):
+        body = orjson.loads(cache.depth(f"UNKNOWN{index}", 20))
+        assert body["bids"] == [] and body["asks"] == []
+
+    assert set(cache._entries) == {(SYMBOL, depth, False) for depth in (5, 10, 20, 50, 100)}
+    assert books.get("UNKNOWN0") is None
@@ -0,0 +1,48 @@
+import orjson
+
+from app.core.matching_engine import ExecutionReport
+from app.models.order import OrderSide, OrderType
+from app.schemas.encoding import list_response
+from app.schemas.order import OrderListResponse, OrderResponse
+from app.schemas.trade import TradeListResponse, TradeResponse
+from app.services.execution_service import ExecutionService
+from app.services.order_service import OrderService
+from app.services.trade_service import TradeService
+
+from conftest import SYMBOL, save_trades
+
+
+async def test_order_rows_serialize_like_pydantic(sessions, make_order):
+    orders = [
+        make_order(OrderSide.BUY, 12_345, 7, client_order_id="c-1"),
+        make_order(OrderSide.SELL, None, 3, order_type=OrderType.MARKET, user_id=None),
+    ]
+    async with sessions() as db:
+        await ExecutionService(db).save_batch([ExecutionReport(order) for order in orders])
+
+    async with sessions() as db:
+        service = OrderService(db)
+        rows = await service.get_order_rows(symbol=SYMBOL)
+        models = await service.get_orders(symbol=SYMBOL)
+
+    expected = OrderListResponse(
+        orders=[OrderResponse.model_validate(order) for order in models], total=2, page=1, size=10, next_cursor="n",
+    )
+    # ORM/스키마를 거치지 않은 응답이 기존 응답 모델과 같은 JSON
+    assert orjson.loads(list_response("orders", rows, page=1, size=10, next_cursor="n")) == orjson.loads(
+        expected.model_dump_json()
+    )
+
+
+async def test_trade_rows_serialize_like_pydantic(sessions, make_order):
+    await save_trades(sessions, make_order, SYMBOL, 2)
+
+    async with sessions() as db:
+        service = TradeService(db)
+        rows = await service.get_trade_rows(symbol=SYMBOL)
+        models = await service.get_trades(symbol=SYMBOL)
+
+    expected = TradeListResponse(
+        trades=[TradeResponse.model_validate(trade) for trade in models], total=2, page=1, size=100,
+    )
+    assert orjson.loads(list_response("trades", rows, page=1, size=100)) == orjson.loads(expected.model_dump_json())
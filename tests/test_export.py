@@ -0,0 +1,108 @@
+import csv
+import io
+
+import httpx
+import orjson
+import pytest
+from fastapi import FastAPI
+
+from app.api import orders as orders_api
+from app.api import trades as trades_api
+from app.core.matching_engine import ExecutionReport
+from app.models.order import OrderSide, OrderType
+from app.schemas.order import OrderResponse
+from app.schemas.trade import TradeResponse
+from app.services import order_service, trade_service
+from app.services.execution_service import ExecutionService
+from app.services.order_service import OrderService
+from app.services.trade_service import TradeService
+
+from conftest import SYMBOL, save_trades
+
+
+@pytest.fixture
+async def client(sessions, monkeypatch):
+    """내보내기가 시험 DB 세션을 쓰고, 두 행씩 묶어 흘려보내도록 설정"""
+    for api in (orders_api, trades_api):
+        monkeypatch.setattr(api, "read_sessions", lambda: sessions)
+    monkeypatch.setattr(order_service, "STREAM_BATCH_ROWS", 2)
+    monkeypatch.setattr(trade_service, "STREAM_BATCH_ROWS", 2)
+    app = FastAPI()
+    app.include_router(orders_api.router, prefix="/api/v1")
+    app.include_router(trades_api.router, prefix="/api/v1")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+async def save_orders(sessions, make_order) -> list:
+    orders = [
+        make_order(OrderSide.BUY, 100 + index, 1, client_order_id=f"c-{index}") for index in range(4)
+    ] + [make_order(OrderSide.SELL, None, 2, order_type=OrderType.MARKET, user_id=None)]
+    async with sessions() as db:
+        await ExecutionService(db).save_batch([ExecutionReport(order) for order in orders])
+    async with sessions() as db:
+        return await OrderService(db).get_orders(symbol=SYMBOL)
+
+
+async def test_stream_order_rows_yields_batches(sessions, make_order, monkeypatch):
+    await save_orders(sessions, make_order)
+    monkeypatch.setattr(order_service, "STREAM_BATCH_ROWS", 2)
+
+    async with sessions() as db:
+        batches = [rows async for rows in OrderService(db).stream_order_rows(symbol=SYMBOL)]
+        filtered = [rows async for rows in OrderService(db).stream_order_rows(user_id="u1")]
+
+    assert [len(rows) for rows in batches] == [2, 2, 1]
+    assert sum(len(rows) for rows in filtered) == 4
+
+
+async def test_order_export_ndjson_matches_response_model(client, sessions, make_order):
+    models = await save_orders(sessions, make_order)
+
+    response = await client.get("/api/v1/orders/export", params={"symbol": SYMBOL})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert 'filename="orders.ndjson"' in response.headers["content-disposition"]
+    exported = sorted((orjson.loads(line) for line in response.text.splitlines()), key=lambda row: row["id"])
+    expected = sorted(
+        (orjson.loads(OrderResponse.model_validate(order).model_dump_json()) for order in models),
+        key=lambda row: row["id"],
+    )
+    assert exported == expected
+
+
+async def test_order_export_csv_has_header_and_json_values(client, sessions, make_order):
+    models = await save_orders(sessions, make_order)
+
+    response = await client.get("/api/v1/orders/export", params={"format": "csv", "user_id": "u1"})
+
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert list(rows[0]) == list(OrderResponse.model_fields)
+    assert len(rows) == 4
+    expected = {
+        str(order.id): orjson.loads(OrderResponse.model_validate(order).model_dump_json())
+        for order in models if order.user_id == "u1"
+    }
+    for row in rows:
+        model = expected[row["id"]]
+        # CSV 셀은 JSON 응답과 같은 문자열 표기 (None은 빈 칸)
+        assert row == {key: "" if value is None else str(value) for key, value in model.items()}
+
+
+async def test_trade_export_streams_all_trades(client, sessions, make_order):
+    await save_trades(sessions, make_order, SYMBOL, 3)
+    async with sessions() as db:
+        models = await TradeService(db).get_trades(symbol=SYMBOL)
+
+    ndjson = await client.get("/api/v1/trades/export", params={"symbol": SYMBOL})
+    csv_response = await client.get("/api/v1/trades/export", params={"format": "csv"})
+    invalid = await client.get("/api/v1/trades/export", params={"format": "xml"})
+
+    exported = {row["id"]: row for row in map(orjson.loads, ndjson.text.splitlines())}
+    assert exported == {
+        str(trade.id): orjson.loads(TradeResponse.model_validate(trade).model_dump_json()) for trade in models
+    }
+    assert len(list(csv.DictReader(io.StringIO(csv_response.text)))) == 3
+    assert invalid.status_code == 422
@@ -0,0 +1,168 @@
+from datetime import timedelta
+
+import pytest
+
+from app.core.journal import RECORD_NEW, RECORD_SIZE, EngineJournal, JournalRecord
+from app.core.matching_engine import (
+    AmendOrderCommand,
+    CancelOrderCommand,
+    MassCancelCommand,
+    NewOrderCommand,
+    SymbolEngine,
+)
+from app.core.orderbook import OrderBookManager
+from app.core.snapshot import decode_snapshot, encode_snapshot
+from app.core.symbols import SymbolRegistry
+from app.models.order import OrderSide, OrderType
+
+from conftest import SPEC, SYMBOL, at, book_state
+
+BUY, SELL = OrderSide.BUY, OrderSide.SELL
+
+
+def new_books() -> OrderBookManager:
+    return OrderBookManager(SymbolRegistry({SYMBOL: SPEC}))
+
+
+@pytest.fixture
+def journal_dir(tmp_path):
+    return tmp_path / "journal"
+
+
+def run_commands(journal_dir, make_order):
+    """명령을 저널에 기록하며 처리하고 (처리한 오더북, 기록한 명령 수) 반환"""
+    books = new_books()
+    engine = SymbolEngine(books.get_or_create(SYMBOL))
+    journal = EngineJournal(str(journal_dir), fsync=False, segment_records=4)
+    symbol_journal = journal.open(SYMBOL)
+
+    resting = make_order(BUY, 100, 5, user_id="u1", client_order_id="c-1")
+    commands = [
+        NewOrderCommand(resting),
+        NewOrderCommand(make_order(BUY, 99, 3, user_id="u2")),
+        NewOrderCommand(make_order(SELL, 101, 4)),
+        NewOrderCommand(make_order(SELL, 100, 2, OrderType.IOC, user_id="u3")),
+        AmendOrderCommand(resting.id, quantity=4),
+        NewOrderCommand(make_order(SELL, None, 1, OrderType.MARKET)),
+        MassCancelCommand(side=SELL),
+        NewOrderCommand(make_order(SELL, 110, 7, user_id="u4")),
+    ]
+    for seconds, command in enumerate(commands):
+        now = at(seconds)
+        symbol_journal.append_command(command, now)
+        engine.process(command, now)
+    # 저널에 기록됐지만 이미 처리할 수 없는 명령 (재생 때도 같은 결과)
+    missing = CancelOrderCommand(make_order(BUY, 1, 1).id)
+    symbol_journal.append_command(missing, at(20))
+    engine.process(missing, at(20))
+    journal.close()
+    return books.get(SYMBOL), len(commands) + 1
+
+
+def recover(journal_dir):
+    books = new_books()
+    replayed, _ = EngineJournal(str(journal_dir), fsync=False).recover(books)
+    return books.get(SYMBOL), replayed
+
+
+def segment_paths(journal_dir):
+    return EngineJournal(str(journal_dir)).open(SYMBOL).segments()
+
+
+def test_record_encode_decode_and_crc():
+    record = JournalRecord(
+        kind=RECORD_NEW,
+        timestamp=at(1.5),
+        order_id=None,
+        side=BUY,
+        order_type=OrderType.LIMIT,
+        price=100,
+        quantity=5,
+        user_id="u1",
+        client_order_id="c-1",
+        sequence=7,
+    )
+    data = record.encode()
+    assert len(data) == RECORD_SIZE
+    assert JournalRecord.decode(data) == record
+
+    corrupted = bytearray(data)
+    corrupted[20] ^= 0xFF
+    assert JournalRecord.decode(bytes(corrupted)) is None
+
+
+def test_recover_replays_journal(journal_dir, make_order):
+    book, written = run_commands(journal_dir, make_order)
+    assert len(segment_paths(journal_dir)) > 1
+
+    recovered, replayed = recover(journal_dir)
+
+    assert replayed == written
+    assert book_state(recovered) == book_state(book)
+    assert [order.order_id for order in recovered.orders()] == [order.order_id for order in book.orders()]
+
+
+def test_recover_truncates_torn_final_record(journal_dir, make_order):
+    book, written = run_commands(journal_dir, make_order)
+    last = segment_paths(journal_dir)[-1]
+    size = last.stat().st_size
+    # 기록 도중 중단된 꼬리
+    with open(last, "ab") as f:
+        f.write(b"\x01" * (RECORD_SIZE // 2))
+
+    recovered, replayed = recover(journal_dir)
+
+    assert replayed == written
+    assert book_state(recovered) == book_state(book)
+    assert last.stat().st_size == size
+
+
+def test_recover_stops_at_corrupted_record(journal_dir, make_order):
+    run_commands(journal_dir, make_order)
+    segments = segment_paths(journal_dir)
+    # 두 번째 세그먼트의 첫 기록을 손상시키면 그 뒤 기록과 세그먼트는 버려짐
+    with open(segments[1], "r+b") as f:
+        f.seek(30)
+        f.write(b"\xff\xff")
+
+    recovered, replayed = recover(journal_dir)
+
+    assert replayed == 4
+    assert segments[1].stat().st_size == 0
+    assert not any(path.exists() for path in segments[2:])
+    # 처음 4개 명령까지만 반영된 오더북
+    bids, asks = book_state(recovered)
+    assert [price for price, _ in bids] == [100, 99]
+    assert [price for price, _ in asks] == [101]
+    assert bids[0][1][0][2] == 3
+
+
+def test_replay_after_snapshot_keeps_trade_times(journal_dir, make_order):
+    """스냅샷 이후만 재생해도 최초 처리와 같은 체결 시각 (체결 ID와 함께 중복 저장 판정 키)"""
+    books = new_books()
+    engine = SymbolEngine(books.get_or_create(SYMBOL))
+    journal = EngineJournal(str(journal_dir), fsync=False)
+    symbol_journal = journal.open(SYMBOL)
+    commands = [
+        (NewOrderCommand(make_order(SELL, 100, 3)), at(0)),
+        (NewOrderCommand(make_order(BUY, 100, 1)), at(1)),
+        # 같은 시각의 다음 체결은 직전 체결 시각 + 1µs
+        (NewOrderCommand(make_order(BUY, 100, 1)), at(1)),
+    ]
+    reports = []
+    for index, (command, now) in enumerate(commands):
+        symbol_journal.append_command(command, now)
+        reports.append(engine.process(command, now))
+        if index == 1:
+            snapshot = encode_snapshot(engine.book, symbol_journal.sequence, now, now)
+    journal.close()
+
+    restored = new_books()
+    book = restored.get_or_create(SYMBOL)
+    decode_snapshot(snapshot, book)
+    _, tail = EngineJournal(str(journal_dir), fsync=False).recover(restored, {SYMBOL: 2})
+
+    original = reports[-1].trades[0]
+    assert original.executed_at == at(1) + timedelta(microseconds=1)
+    assert [(t.id, t.executed_at) for t in tail[0].trades] == [(original.id, original.executed_at)]
+    assert book.last_trade_time == original.executed_at
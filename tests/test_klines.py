@@ -0,0 +1,47 @@
+from app.core.klines import Candle, KlineAggregator, to_epoch
+from app.core.symbols import SymbolRegistry
+from app.models.kline import KlineInterval
+from app.services.kline_service import KlineService
+
+from conftest import SPEC, SYMBOL, T0, save_trades
+
+START = to_epoch(T0)
+
+
+def test_closed_candles_roll_up_to_higher_intervals():
+    aggregator = KlineAggregator(SymbolRegistry({SYMBOL: SPEC}))
+    for seconds, price, quantity in ((0, 100, 1), (30, 120, 2), (70, 90, 1), (310, 110, 4)):
+        aggregator.add_trade(SYMBOL, START + seconds, price, quantity)
+
+    closed = [(interval, candle.open_time - START, candle) for _, interval, candle in aggregator.take_closed(START + 400)]
+    assert [(interval, offset) for interval, offset, _ in closed] == [
+        (KlineInterval.ONE_MINUTE, 0),
+        (KlineInterval.ONE_MINUTE, 60),
+        (KlineInterval.FIVE_MINUTES, 0),
+        (KlineInterval.ONE_MINUTE, 300),
+    ]
+    assert closed[2][2] == Candle(START, 100, 120, 90, 90, 4, 3)
+
+    # 진행 중 1h 캔들 = 마감된 5m 롤업 + 진행 중 5m
+    [hour] = aggregator.recent(SYMBOL, KlineInterval.ONE_HOUR, START + 400)
+    assert hour == Candle(START, 100, 120, 90, 110, 8, 4)
+    assert aggregator.take_closed(START + 400) == []
+
+
+async def test_restore_seeds_rollups_and_replays_trades(sessions, make_order):
+    await save_trades(sessions, make_order, SYMBOL, 3, start=60)
+    async with sessions() as db:
+        # 마지막으로 저장된 1m 캔들(T0+60) 이후 체결만 다시 집계하고, 그 전 1m 캔들은 상위 주기에 반영
+        await KlineService(db).save_candles([
+            (SYMBOL, KlineInterval.ONE_MINUTE, Candle(START, 90, 90, 90, 90, 5, 5)),
+            (SYMBOL, KlineInterval.ONE_MINUTE, Candle(START + 60, 100, 100, 100, 100, 1, 1)),
+        ])
+    aggregator = KlineAggregator(SymbolRegistry({SYMBOL: SPEC}))
+    async with sessions() as db:
+        replayed = await KlineService(db).restore(aggregator)
+
+    assert replayed == 3
+    [minute] = aggregator.recent(SYMBOL, KlineInterval.ONE_MINUTE, START + 90)
+    assert minute == Candle(START + 60, 100, 100, 100, 100, 3, 3)
+    [five] = aggregator.recent(SYMBOL, KlineInterval.FIVE_MINUTES, START + 90)
+    assert five == Candle(START, 90, 100, 90, 100, 8, 8)
@@ -0,0 +1,229 @@
+from decimal import Decimal
+
+import pytest
+
+from app.core.matching_engine import (
+    AmendOrderCommand,
+    CancelOrderCommand,
+    ExecutionReport,
+    MassCancelCommand,
+    MatchingEngine,
+    NewOrderCommand,
+    SymbolEngine,
+)
+from app.core.orderbook import OrderBookManager
+from app.core.symbols import SymbolRegistry, UnknownSymbolError
+from app.models.order import OrderSide, OrderStatus, OrderType
+from app.schemas.order import OrderCreate
+
+from conftest import SPEC, SYMBOL, at
+
+BUY, SELL = OrderSide.BUY, OrderSide.SELL
+
+
+@pytest.fixture
+def engine(book):
+    return SymbolEngine(book)
+
+
+def submit(engine, order, seconds=0):
+    return engine.process(NewOrderCommand(order), at(seconds))
+
+
+def test_limit_order_rests_when_not_crossing(engine, make_order):
+    buy = make_order(BUY, 100, 5)
+    report = submit(engine, buy)
+
+    assert report.trades == []
+    assert report.order.status == OrderStatus.OPEN
+    assert engine.book.best_bid().price == 100
+    assert engine.book.get(buy.id).remaining_quantity == 5
+
+
+def test_price_time_priority(engine, make_order):
+    """가격이 좋은 레벨부터, 같은 가격에서는 먼저 들어온 주문부터 체결"""
+    first = make_order(SELL, 101, 2)
+    second = make_order(SELL, 101, 2)
+    better = make_order(SELL, 100, 1)
+    for seconds, order in enumerate((first, second, better)):
+        submit(engine, order, seconds)
+
+    taker = make_order(BUY, 101, 4, user_id="u2")
+    report = submit(engine, taker, 10)
+
+    assert [(t.sell_order_id, t.price_ticks, t.quantity_lots) for t in report.trades] == [
+        (better.id, 100, 1),
+        (first.id, 101, 2),
+        (second.id, 101, 1),
+    ]
+    assert [(m.id, m.status) for m in report.maker_updates] == [
+        (better.id, OrderStatus.FILLED),
+        (first.id, OrderStatus.FILLED),
+        (second.id, OrderStatus.PARTIALLY_FILLED),
+    ]
+    assert report.order.status == OrderStatus.FILLED
+    assert engine.book.get(second.id).remaining_quantity == 1
+    assert engine.book.get(first.id) is None
+    # 체결 시각은 같은 명령 안에서도 순서대로 증가
+    times = [t.executed_at for t in report.trades]
+    assert times == sorted(times) and len(set(times)) == len(times)
+
+
+def test_partially_filled_limit_rests_remainder(engine, make_order):
+    submit(engine, make_order(SELL, 100, 2))
+    taker = make_order(BUY, 100, 5)
+    report = submit(engine, taker, 1)
+
+    assert report.order.status == OrderStatus.PARTIALLY_FILLED
+    assert (report.order.filled_lots, report.order.remaining_lots) == (2, 3)
+    resting = engine.book.get(taker.id)
+    assert resting.remaining_quantity == 3 and resting.filled_quantity == 2
+    assert engine.book.best_ask() is None
+
+
+def test_ioc_cancels_remainder(engine, make_order):
+    submit(engine, make_order(SELL, 100, 2))
+    submit(engine, make_order(SELL, 102, 2))
+    taker = make_order(BUY, 101, 5, OrderType.IOC)
+    report = submit(engine, taker, 1)
+
+    assert [t.quantity_lots for t in report.trades] == [2]
+    assert report.order.status == OrderStatus.CANCELLED
+    assert report.order.remaining_lots == 3
+    assert taker.id not in engine.book
+    assert engine.book.best_ask().price == 102
+
+
+def test_market_order_sweeps_levels_and_cancels_remainder(engine, make_order):
+    submit(engine, make_order(BUY, 99, 1))
+    submit(engine, make_order(BUY, 97, 1))
+    taker = make_order(SELL, None, 3, OrderType.MARKET)
+    report = submit(engine, taker, 1)
+
+    assert [t.price_ticks for t in report.trades] == [99, 97]
+    assert report.order.status == OrderStatus.CANCELLED
+    assert report.order.filled_lots == 2
+    assert engine.book.best_bid() is None
+    assert taker.id not in engine.book
+
+
+def test_market_order_on_empty_book_is_cancelled(engine, make_order):
+    report = submit(engine, make_order(BUY, None, 1, OrderType.MARKET))
+
+    assert report.trades == []
+    assert report.order.status == OrderStatus.CANCELLED
+
+
+def test_cancel_checks_owner(engine, make_order):
+    order = make_order(BUY, 100, 1, user_id="owner")
+    submit(engine, order)
+
+    assert engine.process(CancelOrderCommand(order.id, "other"), at(1)) is None
+    report = engine.process(CancelOrderCommand(order.id, "owner"), at(2))
+    assert report.order.status == OrderStatus.CANCELLED
+    assert order.id not in engine.book
+    assert engine.book.best_bid() is None
+
+
+def test_amend_reducing_quantity_keeps_queue_position(engine, make_order):
+    first = make_order(BUY, 100, 5)
+    second = make_order(BUY, 100, 5)
+    submit(engine, first)
+    submit(engine, second, 1)
+
+    report = engine.process(AmendOrderCommand(first.id, quantity=3), at(2))
+
+    assert report.order.quantity_lots == 3 and report.order.status == OrderStatus.OPEN
+    level = engine.book.best_bid()
+    assert list(level.orders) == [first.id, second.id]
+    assert level.total_quantity == 8
+
+
+def test_amend_price_loses_priority_and_matches(engine, make_order):
+    maker = make_order(SELL, 105, 2)
+    first = make_order(BUY, 100, 3)
+    second = make_order(BUY, 100, 3)
+    for seconds, order in enumerate((maker, first, second)):
+        submit(engine, order, seconds)
+
+    # 같은 가격에서 수량을 늘리면 대기열 맨 뒤로
+    engine.process(AmendOrderCommand(first.id, quantity=4), at(5))
+    assert list(engine.book.best_bid().orders) == [second.id, first.id]
+
+    # 가격을 올리면 다시 매칭
+    report = engine.process(AmendOrderCommand(second.id, price=105), at(6))
+    assert [(t.sell_order_id, t.quantity_lots) for t in report.trades] == [(maker.id, 2)]
+    assert report.order.status == OrderStatus.PARTIALLY_FILLED
+    assert engine.book.get(second.id).price == 105
+    assert engine.book.get(second.id).remaining_quantity == 1
+
+
+def test_amend_rejects_quantity_at_or_below_filled(engine, make_order):
+    submit(engine, make_order(SELL, 100, 2))
+    taker = make_order(BUY, 100, 5)
+    submit(engine, taker, 1)
+
+    with pytest.raises(ValueError):
+        engine.process(AmendOrderCommand(taker.id, quantity=2), at(2))
+    assert engine.book.get(taker.id).remaining_quantity == 3
+
+
+def test_mass_cancel_filters(engine, make_order):
+    orders = {
+        "bid_u1_100": make_order(BUY, 100, 1, user_id="u1"),
+        "bid_u1_90": make_order(BUY, 90, 1, user_id="u1"),
+        "bid_u2_95": make_order(BUY, 95, 1, user_id="u2"),
+        "ask_u1_110": make_order(SELL, 110, 1, user_id="u1"),
+        "ask_u1_120": make_order(SELL, 120, 1, user_id="u1"),
+    }
+    for seconds, order in enumerate(orders.values()):
+        submit(engine, order, seconds)
+
+    # 사용자 + 가격 범위 (양쪽 호가)
+    report = engine.process(MassCancelCommand(user_id="u1", min_price=95, max_price=115), at(10))
+    assert set(report.order_ids) == {orders["bid_u1_100"].id, orders["ask_u1_110"].id}
+    assert all(o.status == OrderStatus.CANCELLED for o in report.orders)
+
+    # 방향만
+    report = engine.process(MassCancelCommand(side=BUY), at(11))
+    assert set(report.order_ids) == {orders["bid_u1_90"].id, orders["bid_u2_95"].id}
+    assert engine.book.best_bid() is None
+    assert [order.order_id for order in engine.book.orders()] == [orders["ask_u1_120"].id]
+
+    # 해당 없음
+    assert engine.process(MassCancelCommand(user_id="nobody"), at(12)) is None
+
+
+def test_registry_lists_configured_symbols():
+    registry = SymbolRegistry.from_json('{"BTCUSDT": {"tick_size": "0.01"}}', ["ETHUSDT"])
+
+    assert registry.require("BTCUSDT").tick_size == Decimal("0.01")
+    assert registry.require("ETHUSDT").tick_size == SPEC.tick_size
+    with pytest.raises(UnknownSymbolError):
+        registry.require("NOPE")
+    # 조회용 기본 단위는 돌려주지만 거래 심볼로 등록하지 않음
+    assert registry.get("NOPE").symbol == "NOPE"
+    assert "NOPE" not in registry
+
+
+async def test_unknown_symbol_is_rejected_without_engine_state():
+    engine = MatchingEngine(OrderBookManager(SymbolRegistry({SYMBOL: SPEC})))
+    engine.start()
+
+    def order(symbol):
+        return OrderCreate(
+            symbol=symbol, side=BUY, order_type=OrderType.LIMIT, price=Decimal("1"), quantity=Decimal("1"),
+        )
+
+    try:
+        with pytest.raises(UnknownSymbolError):
+            await engine.submit_order(order("NOPE"))
+        outcomes = await engine.submit_batch([order("NOPE2"), order(SYMBOL)])
+        assert await engine.mass_cancel("NOPE3") == []
+    finally:
+        await engine.stop()
+
+    assert isinstance(outcomes[0], UnknownSymbolError)
+    assert isinstance(outcomes[1], ExecutionReport)
+    # 알 수 없는 심볼로는 오더북/시퀀서를 만들지 않음
+    assert list(engine.books.books) == [SYMBOL]
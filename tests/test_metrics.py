@@ -0,0 +1,72 @@
+import random
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api.metrics import OTHER_METHOD, RequestMetricsMiddleware
+from app.core.metrics import (
+    Histogram,
+    HistogramFamily,
+    MetricsRegistry,
+    _Family,
+    bucket_index,
+    bucket_upper,
+    http_request_latency,
+)
+
+
+def test_bucket_relative_error_is_bounded():
+    rng = random.Random(0)
+    for value in [0, 1, 31, 32, 33] + [rng.randrange(1, 1 << 40) for _ in range(2000)]:
+        upper = bucket_upper(bucket_index(value))
+        assert value <= upper <= value + value / 16
+
+
+def test_registry_renders_prometheus_text():
+    registry = MetricsRegistry()
+    latency = registry.histogram("t_seconds", "지연", labels=("stage",), bounds=(1e-6, 1e-3))
+    latency.child("match").record(500)
+    latency.child("match").record(2_000_000)
+    registry.counter("t_total", "건수").child().inc(3)
+    registry.gauge("t_depth", "깊이", lambda: {"B": 2, "A": 1.5}, labels=("symbol",))
+    with pytest.raises(ValueError):
+        registry.counter("t_total", "중복")
+
+    lines = registry.render().splitlines()
+    assert lines[:2] == ["# HELP t_seconds 지연", "# TYPE t_seconds histogram"]
+    assert 't_seconds_bucket{stage="match",le="1e-06"} 1' in lines
+    assert 't_seconds_bucket{stage="match",le="0.001"} 1' in lines
+    assert 't_seconds_bucket{stage="match",le="+Inf"} 2' in lines
+    assert 't_seconds_count{stage="match"} 2' in lines
+    assert "t_total 3" in lines
+    assert lines[-2:] == ['t_depth{symbol="A"} 1.5', 't_depth{symbol="B"} 2']
+
+
+def test_family_requires_render():
+    class Incomplete(_Family):
+        kind = "gauge"
+
+    with pytest.raises(TypeError):
+        Incomplete("x", "x")
+    assert isinstance(HistogramFamily("x", "x").child(), Histogram)
+
+
+async def test_request_latency_uses_route_template_and_known_methods():
+    app = FastAPI()
+
+    @app.api_route("/items/{item_id}", methods=["GET", "BREW"])
+    async def item(item_id: str):
+        return {}
+
+    transport = httpx.ASGITransport(app=RequestMetricsMiddleware(app))
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/items/1")
+        await client.get("/items/2")
+        await client.request("BREW", "/items/3")
+        await client.request("PROPFIND", "/nowhere")
+
+    assert http_request_latency.children[("GET", "/items/{item_id}")].count == 2
+    assert http_request_latency.children[(OTHER_METHOD, "/items/{item_id}")].count == 1
+    assert http_request_latency.children[(OTHER_METHOD, "unmatched")].count == 1
+    assert not any(method in ("BREW", "PROPFIND") for method, _ in http_request_latency.children)
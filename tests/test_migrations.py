@@ -0,0 +1,68 @@
+import asyncio
+from pathlib import Path
+
+import pytest
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import select, text
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from app.core.matching_engine import NewOrderCommand, SymbolEngine
+from app.core.orderbook import OrderBook
+from app.models.order import Order, OrderSide, OrderStatus, OrderType
+from app.services import execution_service as execution_module
+from app.services.execution_service import ExecutionService
+
+from conftest import SPEC, SYMBOL, TEST_DATABASE_URL, at, reset_schema
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+@pytest.fixture
+async def migrated_sessions():
+    """alembic upgrade head로 만든 스키마 (모델 create_all이 아닌 운영 경로)"""
+    if not TEST_DATABASE_URL:
+        pytest.skip("TEST_DATABASE_URL 미설정")
+    engine = create_async_engine(TEST_DATABASE_URL)
+    await reset_schema(engine)
+    # ini 파일 없이 구성해 env.py가 테스트 로깅 설정을 덮어쓰지 않게 함
+    config = Config()
+    config.set_main_option("script_location", str(ROOT / "alembic"))
+    config.set_main_option("sqlalchemy.url", TEST_DATABASE_URL.replace("%", "%%"))
+    # env.py가 자체 이벤트 루프를 돌리므로 별도 스레드에서 실행
+    await asyncio.to_thread(command.upgrade, config, "head")
+    yield async_sessionmaker(engine, class_=AsyncSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+async def test_migrated_enum_labels_match_orm(migrated_sessions):
+    async with migrated_sessions() as db:
+        labels = (await db.execute(text(
+            "SELECT enumlabel FROM pg_enum WHERE enumtypid = 'orderstatus'::regtype ORDER BY enumsortorder"
+        ))).scalars().all()
+    assert labels == [status.name for status in OrderStatus]
+
+
+@pytest.mark.parametrize("copy", [True, False], ids=["copy", "insert"])
+async def test_orders_round_trip_through_migrated_schema(migrated_sessions, make_order, monkeypatch, copy):
+    monkeypatch.setattr(execution_module, "PERSIST_COPY", copy)
+    engine = SymbolEngine(OrderBook(SYMBOL, SPEC))
+    maker = make_order(OrderSide.SELL, 100, 2)
+    taker = make_order(OrderSide.BUY, 100, 1, order_type=OrderType.IOC)
+
+    # 첫 배치에 대기 주문, 다음 배치의 체결로 같은 주문 상태 갱신
+    async with migrated_sessions() as db:
+        await ExecutionService(db).save_batch([engine.process(NewOrderCommand(maker), at(0))])
+    async with migrated_sessions() as db:
+        await ExecutionService(db).save_batch([engine.process(NewOrderCommand(taker), at(1))])
+
+    async with migrated_sessions() as db:
+        orders = {order.id: order for order in (await db.execute(select(Order))).scalars()}
+        count = (await db.execute(text("SELECT count(*) FROM trades"))).scalar_one()
+    assert (orders[maker.id].side, orders[maker.id].order_type, orders[maker.id].status) == (
+        OrderSide.SELL, OrderType.LIMIT, OrderStatus.PARTIALLY_FILLED,
+    )
+    assert (orders[taker.id].side, orders[taker.id].order_type, orders[taker.id].status) == (
+        OrderSide.BUY, OrderType.IOC, OrderStatus.FILLED,
+    )
+    assert count == 1
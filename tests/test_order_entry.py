@@ -0,0 +1,137 @@
+import asyncio
+import uuid
+from typing import List, Optional, Tuple
+
+import pytest
+from fastapi import WebSocketDisconnect, status
+
+from app.core.matching_engine import MatchingEngine
+from app.core.orderbook import OrderBookManager
+from app.core.symbols import SymbolRegistry
+from app.models.order import OrderStatus
+from app.ws.order_entry import (
+    ACK,
+    CANCEL,
+    FILL,
+    LOGON,
+    LOGON_ACK,
+    NEW_ORDER,
+    REJECT,
+    REJECT_MALFORMED,
+    REJECT_UNKNOWN_ORDER,
+    STATUS_CODES,
+    OrderEntryGateway,
+)
+
+from conftest import SPEC, SYMBOL
+
+BUY, SELL, LIMIT = 0, 1, 0
+
+
+class FakeWebSocket:
+    def __init__(self, *frames: bytes):
+        self.inbound: "asyncio.Queue[Optional[bytes]]" = asyncio.Queue()
+        for frame in frames:
+            self.inbound.put_nowait(frame)
+        self.sent: List[bytes] = []
+        self.closed: Optional[int] = None
+
+    async def receive_bytes(self) -> bytes:
+        frame = await self.inbound.get()
+        if frame is None:
+            raise WebSocketDisconnect(1000)
+        return frame
+
+    async def send_bytes(self, data: bytes) -> None:
+        self.sent.append(data)
+
+    async def close(self, code: int, reason: str = "") -> None:
+        self.closed = code
+
+    def messages(self) -> List[Tuple[bytes, tuple]]:
+        """보낸 프레임을 메시지 단위로 분해 (여러 메시지를 이어 붙인 프레임 포함)"""
+        formats = {b"l": LOGON_ACK, b"a": ACK, b"f": FILL, b"r": REJECT}
+        messages = []
+        for frame in self.sent:
+            offset = 0
+            while offset < len(frame):
+                message = formats[frame[offset:offset + 1]]
+                fields = message.unpack_from(frame, offset)
+                offset += message.size
+                if message is REJECT:
+                    fields += (frame[offset:offset + fields[3]].decode(),)
+                    offset += fields[3]
+                messages.append((fields[0], fields))
+        return messages
+
+
+def logon(token: str) -> bytes:
+    return LOGON.pack(b"L", len(token)) + token.encode()
+
+
+def new_order(request_id: int, side: int, price: int, quantity: int, client_order_id: str = "") -> bytes:
+    return NEW_ORDER.pack(b"N", request_id, SYMBOL.encode(), side, LIMIT, price, quantity, client_order_id.encode())
+
+
+@pytest.fixture
+async def gateway():
+    engine = MatchingEngine(OrderBookManager(SymbolRegistry({SYMBOL: SPEC})))
+    gateway = OrderEntryGateway(engine, tokens={"maker-token": "maker", "taker-token": "taker"}, ack_durable=False)
+    engine.add_listener(gateway.on_engine_event)
+    engine.start()
+    yield gateway
+    await engine.stop()
+
+
+async def until(condition, timeout: float = 2.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline
+        await asyncio.sleep(0.001)
+
+
+async def test_taker_and_maker_receive_ack_and_fills(gateway):
+    maker = FakeWebSocket(logon("maker-token"), new_order(1, SELL, 100, 5))
+    taker = FakeWebSocket(logon("taker-token"))
+    tasks = [asyncio.create_task(gateway.serve(socket)) for socket in (maker, taker)]
+    try:
+        await until(lambda: len(maker.messages()) == 2)
+        # 신규 주문과 없는 주문 취소를 한 프레임에 이어서 전송 (파이프라이닝)
+        taker.inbound.put_nowait(new_order(7, BUY, 100, 2) + CANCEL.pack(b"C", 8, uuid.uuid4().bytes))
+        await until(lambda: len(taker.messages()) == 4 and len(maker.messages()) == 3)
+    finally:
+        for socket in (maker, taker):
+            socket.inbound.put_nowait(None)
+        await asyncio.gather(*tasks)
+
+    # 응답은 요청 ID로 대응 (요청 간 순서는 보장하지 않음)
+    responses = {(kind, fields[1]): fields for kind, fields in taker.messages()[1:]}
+    assert set(responses) == {(b"a", 7), (b"f", 7), (b"r", 8)}
+    ack = responses[(b"a", 7)]
+    assert (ack[3], ack[6], ack[7]) == (STATUS_CODES[OrderStatus.FILLED], 2, 0)
+    fill = responses[(b"f", 7)]
+    assert (fill[2], fill[4], fill[5], fill[6]) == (ack[2], False, 100, 2)
+    assert responses[(b"r", 8)][2] == REJECT_UNKNOWN_ORDER
+
+    # 메이커는 자기 주문 ACK 후 체결 통보 (요청 ID 0, 잔량 3)
+    _, maker_ack = maker.messages()[1]
+    _, maker_fill = maker.messages()[2]
+    assert maker_fill[:2] == (b"f", 0)
+    assert maker_fill[2] == maker_ack[2]
+    assert (maker_fill[4], maker_fill[7]) == (True, 3)
+    assert gateway.sessions == {}
+
+
+async def test_malformed_frame_is_rejected_and_bad_token_closed(gateway):
+    client = FakeWebSocket(logon("taker-token"), b"N\x01\x02")
+    task = asyncio.create_task(gateway.serve(client))
+    await until(lambda: len(client.messages()) == 2)
+    client.inbound.put_nowait(None)
+    await task
+    _, reject = client.messages()[1]
+    assert reject[2] == REJECT_MALFORMED
+
+    intruder = FakeWebSocket(logon("wrong"))
+    await gateway.serve(intruder)
+    assert intruder.closed == status.WS_1008_POLICY_VIOLATION
+    assert intruder.sent == []
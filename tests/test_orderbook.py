@@ -0,0 +1,66 @@
+import random
+import uuid
+
+from app.core.orderbook import BookOrder, BookSide, PriceLevel
+from app.models.order import OrderSide
+
+
+def book_order(side, price, quantity=1):
+    return BookOrder(uuid.uuid4(), side, price, quantity, quantity)
+
+
+def test_best_level_per_side(book):
+    for price in (100, 98, 99):
+        book.add(book_order(OrderSide.BUY, price))
+    for price in (103, 101, 102):
+        book.add(book_order(OrderSide.SELL, price))
+
+    assert book.best_bid().price == 100
+    assert book.best_ask().price == 101
+    assert [level.price for level in book.bids.levels()] == [100, 99, 98]
+    assert [level.price for level in book.asks.levels(2)] == [101, 102]
+
+
+def test_cancel_removes_empty_level(book):
+    first = book_order(OrderSide.BUY, 100)
+    second = book_order(OrderSide.BUY, 100)
+    lower = book_order(OrderSide.BUY, 99)
+    for order in (first, second, lower):
+        book.add(order)
+
+    book.cancel(first.order_id)
+    assert book.best_bid().total_quantity == 1
+    book.cancel(second.order_id)
+    assert book.best_bid().price == 99
+    assert len(book.bids) == 1
+    assert book.cancel(first.order_id) is None
+
+
+def test_book_side_matches_sorted_model_under_churn():
+    """지연 삭제된 레벨을 다시 만들거나 오래 쌓아도 정렬 순서와 최우선 호가가 맞고 힙 크기가 제한됨"""
+    for side in OrderSide:
+        book_side = BookSide(side)
+        live = {}
+        rng = random.Random(7)
+        for step in range(20000):
+            price = rng.randint(1, 200)
+            if rng.random() < 0.5:
+                live[price] = book_side.get_or_create(price)
+            elif price in live:
+                book_side.discard(live.pop(price))
+            if step % 101 == 0:
+                expected = sorted(live, reverse=side == OrderSide.BUY)
+                assert [level.price for level in book_side.levels()] == expected
+                assert [level.price for level in book_side.levels(3)] == expected[:3]
+                best = book_side.best()
+                assert (best.price if best is not None else None) == (expected[0] if expected else None)
+                assert len(book_side._heap) <= 2 * len(live) + 65
+
+
+def test_book_side_restore():
+    book_side = BookSide(OrderSide.SELL)
+    book_side.restore([PriceLevel(price) for price in (5, 3, 4)])
+
+    assert [level.price for level in book_side.levels()] == [3, 4, 5]
+    book_side.discard(book_side.best())
+    assert book_side.best().price == 4
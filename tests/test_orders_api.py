@@ -0,0 +1,104 @@
+from decimal import Decimal
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from app.api import orders as orders_api
+from app.core.matching_engine import MatchingEngine
+from app.core.orderbook import OrderBookManager
+from app.core.symbols import SymbolRegistry, SymbolSpec
+
+from conftest import SPEC, SYMBOL
+
+OTHER = "OTHERUSDT"
+
+
+@pytest.fixture
+async def engine(monkeypatch):
+    """API가 쓰는 전역 엔진 대신 시험용 엔진 (영속화 호출은 persisted에 기록)"""
+    engine = MatchingEngine(OrderBookManager(SymbolRegistry({SYMBOL: SPEC, OTHER: SymbolSpec(OTHER)})))
+    engine.persisted = []
+    engine.start(persist=lambda reports: engine.persisted.append(list(reports)))
+    monkeypatch.setattr(orders_api, "matching_engine", engine)
+    yield engine
+    await engine.stop()
+
+
+@pytest.fixture
+async def client(engine):
+    app = FastAPI()
+    app.include_router(orders_api.router, prefix="/api/v1")
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        yield client
+
+
+def order_body(side: str, price: str, quantity: str = "1", **fields) -> dict:
+    body = {"symbol": SYMBOL, "side": side, "order_type": "limit", "price": price, "quantity": quantity}
+    body.update(fields)
+    return body
+
+
+async def test_batch_returns_per_order_results_in_request_order(client, engine):
+    response = await client.post("/api/v1/orders/batch", json={"orders": [
+        order_body("sell", "1.5"),
+        order_body("buy", "1.5", symbol="NOPE"),
+        order_body("buy", "1.5"),
+    ]})
+
+    assert response.status_code == 201
+    body = response.json()
+    assert [result["success"] for result in body["results"]] == [True, False, True]
+    assert [result["index"] for result in body["results"]] == [0, 1, 2]
+    assert (body["accepted"], body["rejected"]) == (2, 1)
+    assert body["results"][2]["order"]["status"] == "filled"
+    # 심볼 하나에 명령 하나: 접수된 주문은 한 번의 영속화 배치로 넘어감
+    assert [len(reports) for reports in engine.persisted] == [2]
+
+
+async def test_batch_rejects_ids_longer_than_journal_fields(client, engine):
+    # 글자 수(20)는 max_length 이내지만 UTF-8로 60바이트
+    response = await client.post("/api/v1/orders/batch", json={"orders": [
+        order_body("buy", "1"),
+        order_body("buy", "1", user_id="가" * 20),
+    ]})
+    assert response.status_code == 422
+    assert response.json()["detail"][0]["loc"][:3] == ["body", "orders", 1]
+
+    response = await client.post("/api/v1/orders/batch", json={"orders": [
+        order_body("buy", "1", client_order_id="x" * 101),
+    ]})
+    assert response.status_code == 422
+    assert engine.persisted == []
+    assert len(engine.books.get(SYMBOL) or ()) == 0
+
+
+async def test_mass_cancel_by_user_across_symbols(client, engine):
+    placed = []
+    for body in (
+        order_body("buy", "1", user_id="u1"),
+        order_body("sell", "3", user_id="u1"),
+        order_body("buy", "1", user_id="u2"),
+        order_body("buy", "2", user_id="u1", symbol=OTHER),
+    ):
+        placed.append((await client.post("/api/v1/orders/", json=body)).json()["id"])
+
+    # 사용자 + 방향 조건은 모든 심볼에 적용
+    response = await client.post("/api/v1/orders/mass-cancel", json={"user_id": "u1", "side": "buy"})
+    assert response.status_code == 200
+    assert sorted(response.json()["cancelled_order_ids"]) == sorted([placed[0], placed[3]])
+
+    # 심볼 + 가격 범위
+    response = await client.post("/api/v1/orders/mass-cancel", json={"symbol": SYMBOL, "min_price": "2"})
+    assert response.json()["cancelled_order_ids"] == [placed[1]]
+    assert [str(order.order_id) for order in engine.books.get(SYMBOL).orders()] == [placed[2]]
+    assert len(engine.books.get(OTHER)) == 0
+
+
+async def test_mass_cancel_requires_symbol_or_user(client):
+    response = await client.post("/api/v1/orders/mass-cancel", json={"side": "buy"})
+    assert response.status_code == 400
+    response = await client.post(
+        "/api/v1/orders/mass-cancel", json={"symbol": SYMBOL, "min_price": "2", "max_price": "1"},
+    )
+    assert response.status_code == 400
@@ -0,0 +1,65 @@
+import uuid
+
+import pytest
+
+from app.core.matching_engine import ExecutionReport
+from app.models.order import OrderSide
+from app.schemas.pagination import decode_cursor, encode_cursor
+from app.services.execution_service import ExecutionService
+from app.services.order_service import OrderService
+from app.services.trade_service import TradeService
+
+from conftest import SYMBOL, T0, save_trades
+
+
+def test_cursor_round_trip():
+    row_id = uuid.uuid4()
+    assert decode_cursor(encode_cursor(T0, row_id)) == (T0, row_id)
+    assert decode_cursor(None) is None
+    with pytest.raises(ValueError):
+        decode_cursor("not-a-cursor")
+
+
+async def walk(fetch, limit):
+    """커서를 이어 가며 모든 페이지를 읽어 행 목록 반환"""
+    rows, cursor = [], None
+    while True:
+        page = await fetch(limit, cursor)
+        rows.extend(page)
+        if len(page) < limit:
+            return rows
+        cursor = decode_cursor(encode_cursor(page[-1][0], page[-1][1]))
+
+
+async def test_order_pages_with_equal_timestamps(sessions, make_order):
+    # 생성 시각이 모두 같아도 id로 이어서 빠짐/중복 없이 페이징
+    orders = [make_order(OrderSide.BUY, 100 - i, 1) for i in range(7)]
+    async with sessions() as db:
+        await ExecutionService(db).save_batch([ExecutionReport(order) for order in orders])
+
+    async with sessions() as db:
+        service = OrderService(db)
+        expected = [order.id for order in await service.get_orders(symbol=SYMBOL)]
+
+        async def fetch(limit, cursor):
+            rows = await service.get_order_rows(symbol=SYMBOL, limit=limit, cursor=cursor)
+            return [(row.created_at, row.id) for row in rows]
+
+        paged = [row_id for _, row_id in await walk(fetch, 3)]
+
+    assert paged == expected == sorted(order.id for order in orders)
+
+
+async def test_trade_pages_newest_first(sessions, make_order):
+    trades = await save_trades(sessions, make_order, SYMBOL, 5)
+
+    async with sessions() as db:
+        service = TradeService(db)
+
+        async def fetch(limit, cursor):
+            rows = await service.get_trade_rows(symbol=SYMBOL, limit=limit, cursor=cursor)
+            return [(row.executed_at, row.id) for row in rows]
+
+        paged = [row_id for _, row_id in await walk(fetch, 2)]
+
+    assert paged == [trade.id for trade in reversed(trades)]
@@ -0,0 +1,64 @@
+import io
+import json
+from decimal import Decimal
+
+from app.core.replay import ReplayRunner, main
+from app.core.symbols import SymbolRegistry
+
+from conftest import SPEC, SYMBOL
+
+
+def event(**fields) -> str:
+    return json.dumps(fields)
+
+
+LINES = [
+    event(symbol=SYMBOL, side="sell", order_type="limit", price="101", quantity="2", client_order_id="s1"),
+    event(symbol=SYMBOL, side="sell", order_type="limit", price="102", quantity="1"),
+    event(symbol=SYMBOL, side="buy", order_type="limit", price="101", quantity="1", timestamp="2026-01-01T00:00:00Z"),
+    event(type="amend", client_order_id="s1", quantity="3"),
+    event(symbol=SYMBOL, side="buy", order_type="market", quantity="3"),
+    event(symbol=SYMBOL, side="buy", order_type="limit", quantity="1"),
+    event(type="cancel", client_order_id="missing"),
+    event(symbol=SYMBOL, side="buy", order_type="limit", price="99", quantity="1", user_id="u1"),
+    event(type="mass_cancel", user_id="u1"),
+]
+
+
+def replay():
+    runner = ReplayRunner(SymbolRegistry({SYMBOL: SPEC}))
+    out = io.StringIO()
+    runner.run(LINES, out)
+    return runner, [json.loads(line) for line in out.getvalue().splitlines()]
+
+
+def test_replay_is_deterministic():
+    runner, trades = replay()
+    again, trades_again = replay()
+
+    assert trades == trades_again
+    assert runner.book_state() == again.book_state()
+    # 101 x1 체결 후 정정으로 잔량 2, 시장가가 101 x2 + 102 x1
+    assert [(Decimal(t["price"]), Decimal(t["quantity"])) for t in trades] == [
+        (101, 1), (101, 2), (102, 1),
+    ]
+    assert trades[0]["executed_at"].startswith("2026-01-01T00:00:00")
+    summary = runner.summary()
+    # 가격 없는 지정가 주문(검증 실패)과 없는 주문 취소는 거부로 집계
+    assert summary["events"] == {"new": 5, "amend": 1, "mass_cancel": 1}
+    assert summary["rejected"] == 2
+    assert summary["resting_orders"] == 0
+
+
+def test_main_writes_trades_book_and_report(tmp_path, capsys):
+    source = tmp_path / "orders.jsonl"
+    source.write_text("\n".join(LINES[:3]) + "\n")
+    paths = {name: tmp_path / f"{name}.json" for name in ("trades", "book", "report")}
+
+    assert main([str(source)] + [arg for name, path in paths.items() for arg in (f"--{name}", str(path))]) == 0
+
+    assert len(paths["trades"].read_text().splitlines()) == 1
+    book = json.loads(paths["book"].read_text())[SYMBOL]
+    assert [(Decimal(level["price"]), Decimal(level["quantity"])) for level in book["asks"]] == [(101, 1), (102, 1)]
+    assert json.loads(paths["report"].read_text())["trades"] == 1
+    assert json.loads(capsys.readouterr().out)["trades"] == 1
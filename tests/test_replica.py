@@ -0,0 +1,75 @@
+import asyncio
+from typing import Any, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.db import database
+from app.db.database import ReplicaRouter
+
+
+class FakeSession:
+    """execute 결과로 고정 값을 돌려주는 세션 (value가 예외면 발생)"""
+
+    def __init__(self, value: Any):
+        self.value = value
+
+    async def __aenter__(self) -> "FakeSession":
+        return self
+
+    async def __aexit__(self, *exc) -> None:
+        return None
+
+    async def execute(self, statement, params=None) -> "FakeSession":
+        if isinstance(self.value, Exception):
+            raise self.value
+        return self
+
+    def scalar_one(self) -> Any:
+        return self.value
+
+
+def factory(value: Any) -> Callable[[], FakeSession]:
+    return lambda: FakeSession(value)
+
+
+async def test_router_follows_replica_lag():
+    primary = factory("0/16B3748")
+    router = ReplicaRouter(factory(0.2), primary, max_lag=1.0)
+    # 측정 전에는 주 DB
+    assert router.sessions() is primary
+
+    await router.check()
+    assert router.available and router.lag == 0.2
+    assert router.sessions() is router.session_factory
+
+    router.session_factory = factory(5.0)
+    await router.check()
+    assert not router.available and router.sessions() is primary
+
+    router.session_factory = factory(ConnectionError("replica down"))
+    await router.check()
+    assert router.lag is None and router.sessions() is primary
+
+
+async def test_router_measures_primary_as_caught_up(sessions, db_engine):
+    # 복구 중이 아닌 서버(주 DB 자신)는 지연 0
+    primary = async_sessionmaker(db_engine, class_=AsyncSession, expire_on_commit=False)
+    router = ReplicaRouter(sessions, primary, interval=0.01)
+    router.start()
+    try:
+        while router.lag is None:
+            await asyncio.sleep(0.01)
+    finally:
+        await router.stop()
+    assert router.lag == 0
+    assert router.sessions() is sessions
+
+
+def test_read_sessions_uses_router(monkeypatch):
+    monkeypatch.setattr(database, "replica_router", None)
+    assert database.read_sessions() is database.AsyncSessionLocal
+
+    router = ReplicaRouter(factory(0), factory("0/0"))
+    router.lag = 0.0
+    monkeypatch.setattr(database, "replica_router", router)
+    assert database.read_sessions() is router.session_factory
@@ -0,0 +1,162 @@
+import asyncio
+import os
+import uuid
+from typing import List
+
+import pytest
+
+from app.core.cluster import _shard_environment
+from app.core.matching_engine import CancelOrderCommand, MatchingEngine, NewOrderCommand
+from app.core.orderbook import OrderBookManager
+from app.core.ring import SharedRing
+from app.core.sharding import ClusterLayout, RingLink, ShardClient, ShardServer, _RingEndpoint, shard_of
+from app.core.symbols import SymbolRegistry, SymbolSpec
+from app.models.order import OrderSide, OrderStatus
+
+from conftest import book_state
+
+BUY, SELL = OrderSide.BUY, OrderSide.SELL
+SHARDS = 2
+
+
+def test_shard_environment_is_per_shard_and_restored(monkeypatch):
+    monkeypatch.delenv("ENGINE_JOURNAL_DIR", raising=False)
+    monkeypatch.delenv("ENGINE_SNAPSHOT_DIR", raising=False)
+
+    with _shard_environment(1, 4, "/var/journal", ""):
+        assert os.environ["ENGINE_JOURNAL_DIR"] == os.path.join("/var/journal", "shard-1-of-4")
+        assert "ENGINE_SNAPSHOT_DIR" not in os.environ
+    assert "ENGINE_JOURNAL_DIR" not in os.environ
+
+
+def test_ring_link_splits_large_messages(tmp_path):
+    path = str(tmp_path / "ring")
+    SharedRing.create(path, 4096).close()
+    writer, reader = SharedRing(path), SharedRing(path)
+    sender = RingLink(writer, SharedRing(path), -1)
+    receiver = RingLink(SharedRing(path), reader, -1)
+    sender._notify = lambda: None
+
+    async def exchange() -> list:
+        messages = [(1, "x" * 3000), (2, "small")]
+        for message in messages:
+            sender.send(message)
+        received, _ = receiver.receive()
+        return received
+
+    # 링 최대 메시지보다 큰 본문은 조각으로 나뉘어도 한 메시지로 복원
+    assert sender.outbound.max_message < 3000
+    assert asyncio.run(exchange()) == [(1, "x" * 3000), (2, "small")]
+
+
+def test_ring_endpoint_requires_handle():
+    class Incomplete(_RingEndpoint):
+        pass
+
+    with pytest.raises(TypeError):
+        Incomplete({}, -1)
+
+
+def symbols_by_shard() -> List[str]:
+    """샤드마다 하나씩 소속 심볼"""
+    found = {}
+    for index in range(100):
+        symbol = f"S{index}USDT"
+        found.setdefault(shard_of(symbol, SHARDS), symbol)
+        if len(found) == SHARDS:
+            return [found[shard] for shard in range(SHARDS)]
+    raise AssertionError("샤드별 심볼을 찾지 못했습니다.")
+
+
+@pytest.fixture
+async def cluster(tmp_path):
+    """워커 1개 + 엔진 샤드 2개를 한 이벤트 루프에서 링으로 연결"""
+    symbols = symbols_by_shard()
+    registry = SymbolRegistry({symbol: SymbolSpec(symbol) for symbol in symbols})
+    layout = ClusterLayout(str(tmp_path), SHARDS, 1)
+    for shard in range(SHARDS):
+        for kind in ("req", "resp"):
+            SharedRing.create(layout.ring_path(0, shard, kind), 1 << 16).close()
+    shard_bells = [os.pipe() for _ in range(SHARDS)]
+    worker_bell = os.pipe()
+
+    servers, held = [], []
+
+    def persist(reports):
+        future = asyncio.get_running_loop().create_future()
+        held.append(future)
+        return future
+
+    for shard in range(SHARDS):
+        engine = MatchingEngine(OrderBookManager(registry))
+        server = ShardServer(engine, layout.shard_links(shard, [worker_bell[1]]), shard_bells[shard][0])
+        engine.start(persist=persist, replicate=server.replicate)
+        server.start()
+        servers.append(server)
+
+    books = OrderBookManager(registry)
+    worker = MatchingEngine(books)
+    client = ShardClient(layout.worker_links(0, [w for _, w in shard_bells]), worker_bell[0], books, worker)
+    worker.events = []
+    worker.add_listener(lambda symbol, reports, update: worker.events.append((symbol, reports)))
+    worker.start(remote=client)
+    await client.connect()
+    yield symbols, servers, worker, held
+
+    await client.stop()
+    for server in servers:
+        await server.stop()
+        await server.engine.stop()
+        server.close()
+    client.close()
+    for fd in [fd for pair in shard_bells + [worker_bell] for fd in pair]:
+        os.close(fd)
+
+
+async def enqueue(engine: MatchingEngine, symbol: str, command) -> object:
+    future = asyncio.get_running_loop().create_future()
+    await engine.enqueue(symbol, command, future)
+    result, _, _ = await asyncio.wait_for(future, 2)
+    return result
+
+
+async def test_worker_routes_to_owning_shard_and_mirrors_book(cluster, make_order):
+    symbols, servers, worker, held = cluster
+    for shard, symbol in enumerate(symbols):
+        order = make_order(SELL, 100, 5)
+        order.symbol = symbol
+        result = await enqueue(worker, symbol, NewOrderCommand(order))
+        assert result.order.status == OrderStatus.OPEN
+        # 소유 샤드에만 주문이 있고, 워커 복제본도 같은 상태
+        assert servers[shard].engine.books.get(symbol).orders()
+        assert not servers[1 - shard].engine.books.get_or_create(symbol).orders()
+        assert book_state(worker.books.get(symbol)) == book_state(servers[shard].engine.books.get(symbol))
+
+    taker = make_order(BUY, 100, 2, user_id="u2")
+    taker.symbol = symbols[0]
+    result = await enqueue(worker, symbols[0], NewOrderCommand(taker))
+    assert [trade.quantity_lots for trade in result.trades] == [2]
+    assert book_state(worker.books.get(symbols[0])) == book_state(servers[0].engine.books.get(symbols[0]))
+    assert [symbol for symbol, _ in worker.events] == [symbols[0], symbols[1], symbols[0]]
+
+    # 샤드 영속화가 끝나야 워커 쪽 영속화 대기도 끝남
+    durable = worker.durability(symbols[0])
+    assert durable is not None and not durable.done()
+    for future in held:
+        future.set_result(None)
+    await asyncio.wait_for(durable, 2)
+    assert worker.durability(symbols[0]) is None
+
+
+async def test_worker_submit_waits_for_shard_persistence(cluster, make_order):
+    symbols, servers, worker, held = cluster
+    order = make_order(BUY, 90, 1)
+    order.symbol = symbols[1]
+    submitted = asyncio.ensure_future(worker.submit(symbols[1], NewOrderCommand(order)))
+    await asyncio.sleep(0.05)
+    assert not submitted.done()
+
+    held[-1].set_result(None)
+    result = await asyncio.wait_for(submitted, 2)
+    assert result.order.id == order.id
+    assert await enqueue(worker, symbols[1], CancelOrderCommand(uuid.uuid4())) is None
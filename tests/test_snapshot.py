@@ -0,0 +1,89 @@
+import uuid
+
+import pytest
+
+from app.core.orderbook import BookOrder, OrderBook, OrderBookManager
+from app.core.snapshot import SnapshotStore, decode_snapshot, encode_snapshot
+from app.core.symbols import SymbolRegistry
+from app.models.order import OrderSide
+
+from conftest import SPEC, SYMBOL, at, book_state
+
+
+def new_books() -> OrderBookManager:
+    return OrderBookManager(SymbolRegistry({SYMBOL: SPEC}))
+
+
+@pytest.fixture
+def filled_book(book):
+    """여러 레벨/FIFO 대기열, 부분 체결, 선택 필드 유무가 섞인 오더북"""
+    rows = [
+        (OrderSide.BUY, 100, 5, 5, "u1", "c-1", at(1)),
+        (OrderSide.BUY, 100, 3, 1, None, None, None),
+        (OrderSide.BUY, 98, 7, 7, "사용자", None, at(2)),
+        (OrderSide.SELL, 105, 2, 2, "u2", "클라이언트-2", at(3)),
+        (OrderSide.SELL, 103, 4, 4, None, "c-3", at(4)),
+    ]
+    for side, price, quantity, remaining, user_id, client_order_id, created_at in rows:
+        book.add(BookOrder(uuid.uuid4(), side, price, quantity, remaining, user_id, client_order_id, created_at))
+    book.drain_changes()
+    return book
+
+
+def test_snapshot_round_trip_through_store(tmp_path, filled_book):
+    filled_book.last_trade_time = at(8.000001)
+    store = SnapshotStore(str(tmp_path))
+    data = encode_snapshot(filled_book, journal_sequence=42, taken_at=at(10), listed_at=at(9))
+    store.save(SYMBOL, data, at(10))
+
+    books = new_books()
+    loaded = store.load(books)
+
+    info = loaded[SYMBOL]
+    assert (info.journal_sequence, info.taken_at, info.listed_at) == (42, at(10), at(9))
+    assert info.book_sequence == filled_book.sequence
+    assert info.orders == len(filled_book)
+    assert info.last_trade_time == at(8.000001)
+    restored = books.get(SYMBOL)
+    # 이후 체결 시각이 스냅샷 이전 체결에서 이어지도록
+    assert restored.last_trade_time == at(8.000001)
+    assert book_state(restored) == book_state(filled_book)
+    assert restored.best_bid().total_quantity == filled_book.best_bid().total_quantity
+    for order in filled_book.orders():
+        copy = restored.get(order.order_id)
+        assert (copy.side, copy.created_at) == (order.side, order.created_at)
+    # 적재한 오더북은 주문 ID 색인으로 바로 취소 가능
+    first = next(iter(filled_book.orders()))
+    assert restored.cancel(first.order_id).order_id == first.order_id
+
+
+def test_store_falls_back_to_previous_snapshot(tmp_path, filled_book):
+    store = SnapshotStore(str(tmp_path), keep=2)
+    store.save(SYMBOL, encode_snapshot(filled_book, 1, at(10), at(10)), at(10))
+    latest = store.save(SYMBOL, encode_snapshot(filled_book, 2, at(20), at(20)), at(20))
+    data = bytearray(latest.read_bytes())
+    data[-10] ^= 0xFF
+    latest.write_bytes(bytes(data))
+
+    loaded = store.load(new_books())
+
+    assert loaded[SYMBOL].journal_sequence == 1
+
+
+def test_decode_rejects_corrupted_snapshot(filled_book):
+    data = bytearray(encode_snapshot(filled_book, 1, at(0), at(0)))
+
+    with pytest.raises(ValueError):
+        decode_snapshot(bytes(data[:-1]), OrderBook(SYMBOL, SPEC))
+    data[0] ^= 0xFF
+    with pytest.raises(ValueError):
+        decode_snapshot(bytes(data), OrderBook(SYMBOL, SPEC))
+
+
+def test_empty_book_round_trip(book):
+    restored = OrderBook(SYMBOL, SPEC)
+    info = decode_snapshot(encode_snapshot(book, 0, at(0), at(0)), restored)
+
+    assert info.orders == 0
+    assert info.last_trade_time is None and restored.last_trade_time is None
+    assert restored.best_bid() is None and restored.best_ask() is None
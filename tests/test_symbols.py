@@ -0,0 +1,51 @@
+from decimal import Decimal
+
+import pytest
+
+from app.core.matching_engine import MatchingEngine
+from app.core.orderbook import OrderBookManager
+from app.core.symbols import SymbolRegistry, SymbolSpec
+from app.models.order import OrderSide, OrderStatus, OrderType
+from app.schemas.order import OrderCreate
+
+BTC = SymbolSpec("BTCUSDT", tick_size=Decimal("0.01"), lot_size=Decimal("0.0001"))
+
+
+def order_request(side: OrderSide, price: str, quantity: str) -> OrderCreate:
+    return OrderCreate(
+        symbol=BTC.symbol, side=side, order_type=OrderType.LIMIT, price=Decimal(price), quantity=Decimal(quantity),
+    )
+
+
+def test_decimal_tick_lot_conversion():
+    assert BTC.to_ticks(Decimal("65000.25")) == 6500025
+    assert BTC.from_ticks(6500025) == Decimal("65000.25")
+    assert BTC.to_lots(Decimal("0.0123")) == 123
+    assert BTC.from_lots(123) == Decimal("0.0123")
+    # 단위의 배수가 아니거나 0 이하인 수량은 거부
+    with pytest.raises(ValueError):
+        BTC.to_ticks(Decimal("65000.255"))
+    with pytest.raises(ValueError):
+        BTC.to_lots(Decimal("0.00005"))
+    with pytest.raises(ValueError):
+        BTC.to_lots(Decimal("0"))
+
+
+async def test_engine_matches_in_ticks_and_reports_exact_decimals():
+    engine = MatchingEngine(OrderBookManager(SymbolRegistry({BTC.symbol: BTC})))
+    engine.start()
+    try:
+        maker = await engine.submit_order(order_request(OrderSide.SELL, "65000.10", "0.3"))
+        taker = await engine.submit_order(order_request(OrderSide.BUY, "65000.20", "0.1"))
+        with pytest.raises(ValueError):
+            await engine.submit_order(order_request(OrderSide.BUY, "65000.001", "0.1"))
+    finally:
+        await engine.stop()
+
+    # 엔진 내부는 정수, 경계에서만 Decimal (부동소수 오차 없음)
+    assert maker.order.price_ticks == 6500010 and maker.order.quantity_lots == 3000
+    [trade] = taker.trades
+    assert (trade.price_ticks, trade.quantity_lots) == (6500010, 1000)
+    assert (trade.price, trade.quantity) == (Decimal("65000.10"), Decimal("0.1"))
+    assert taker.order.status == OrderStatus.FILLED
+    assert engine.books.get(BTC.symbol).get(maker.order.id).remaining_quantity == 2000
@@ -0,0 +1,50 @@
+import os
+from datetime import timedelta
+
+from app.services import trade_archive as archive_module
+from app.services import trade_service as trade_service_module
+from app.services.trade_archive import TradeArchive, TradePartitionService, partition_name
+from app.services.trade_service import TradeService
+
+from conftest import SYMBOL, T0, save_trades
+
+
+async def test_archived_partition_is_listed_and_queried(sessions, make_order, tmp_path, monkeypatch):
+    archive = TradeArchive(str(tmp_path))
+    monkeypatch.setattr(trade_service_module, "trade_archive", archive)
+    assert await archive.boundary() is None
+
+    async with sessions() as db:
+        await TradePartitionService(db)._create_partition(partition_name(T0), T0, T0 + timedelta(days=1))
+        await db.commit()
+    archived = await save_trades(sessions, make_order, SYMBOL, 3)
+    # 아카이브 이후 날짜의 체결 (기본 파티션)
+    recent = await save_trades(sessions, make_order, SYMBOL, 2, start=86400 * 2)
+    async with sessions() as db:
+        names = await TradePartitionService(db).archive_partitions(archive, T0 + timedelta(days=1))
+
+    assert names == [partition_name(T0)]
+    assert await archive.boundary() == T0 + timedelta(days=1)
+    async with sessions() as db:
+        trades = await TradeService(db).get_trades(symbol=SYMBOL)
+    # DB와 아카이브를 이어서 시각 내림차순
+    assert [t.id for t in trades] == [t.id for t in reversed(archived + recent)]
+
+
+async def test_listing_is_cached_until_directory_changes(tmp_path, monkeypatch):
+    archive = TradeArchive(str(tmp_path))
+    monkeypatch.setattr(archive_module, "LISTING_SETTLE_NS", 0)
+    calls = []
+    listdir = os.listdir
+    monkeypatch.setattr(archive_module.os, "listdir", lambda path: calls.append(path) or listdir(path))
+
+    assert await archive.files() == []
+    assert await archive.files() == []
+    assert len(calls) == 1
+
+    # 다른 프로세스가 파일을 추가하면 디렉터리 수정 시각이 바뀌어 다시 나열 (시각 해상도와 무관하게 확인)
+    (tmp_path / "other").mkdir()
+    mtime = os.stat(tmp_path).st_mtime_ns + 1_000_000_000
+    os.utime(tmp_path, ns=(mtime, mtime))
+    await archive.files()
+    assert len(calls) == 2
@@ -0,0 +1,23 @@
+from app.services.trade_service import TradeService
+
+from conftest import SYMBOL, save_trades
+
+OTHER = "OTHERUSDT"
+
+
+async def test_recent_trades_per_symbol(sessions, make_order):
+    ours = await save_trades(sessions, make_order, SYMBOL, 5)
+    others = await save_trades(sessions, make_order, OTHER, 2)
+
+    async with sessions() as db:
+        recent = await TradeService(db).get_recent_trades(3)
+
+    # 심볼별 최근 3건 이하, 심볼 안에서는 시간 오름차순
+    assert [(t.symbol, t.id) for t in recent] == (
+        [(OTHER, t.id) for t in others] + [(SYMBOL, t.id) for t in ours[-3:]]
+    )
+
+
+async def test_recent_trades_on_empty_table(sessions):
+    async with sessions() as db:
+        assert await TradeService(db).get_recent_trades(3) == []
@@ -0,0 +1,177 @@
+import asyncio
+import json
+import uuid
+from decimal import Decimal
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError, OperationalError
+
+from app.core.matching_engine import EngineHaltedError, ExecutionReport, MatchingEngine, TradeEvent
+from app.core.orderbook import OrderBookManager
+from app.core.symbols import SymbolRegistry
+from app.models.order import Order, OrderSide, OrderType
+from app.models.trade import Trade
+from app.schemas.order import OrderCreate
+from app.services.execution_service import ExecutionService
+from app.services.write_behind import QUARANTINE_FILE, WriteBehindPipeline, is_data_error
+
+from conftest import SPEC, SYMBOL, T0
+
+BUY, SELL = OrderSide.BUY, OrderSide.SELL
+
+
+class PgError(Exception):
+    """SQLSTATE를 가진 드라이버 예외"""
+
+    def __init__(self, sqlstate: str):
+        super().__init__(f"sqlstate {sqlstate}")
+        self.sqlstate = sqlstate
+
+
+def db_error(sqlstate: str, wrapper=OperationalError) -> Exception:
+    return wrapper("INSERT ...", {}, PgError(sqlstate))
+
+
+class FakeSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeStore:
+    """save_batch 호출을 기록하고 script에 따라 실패하는 ExecutionService 대역"""
+
+    def __init__(self):
+        self.saved = []
+        self.attempts = 0
+        # 배치 → 던질 예외 (None이면 저장)
+        self.fail = lambda batch: None
+
+    async def save_batch(self, batch):
+        self.attempts += 1
+        error = self.fail(batch)
+        if error is not None:
+            raise error
+        self.saved.extend(batch)
+
+
+@pytest.fixture
+def store(monkeypatch) -> FakeStore:
+    store = FakeStore()
+    monkeypatch.setattr(ExecutionService, "save_batch", lambda service, batch: store.save_batch(batch))
+    return store
+
+
+def new_pipeline(**kwargs) -> WriteBehindPipeline:
+    options = dict(session_factory=FakeSession, retry_delay=0.001, max_retry_delay=0.001, halt_after=3)
+    options.update(kwargs)
+    return WriteBehindPipeline(**options)
+
+
+def new_engine() -> MatchingEngine:
+    return MatchingEngine(OrderBookManager(SymbolRegistry({SYMBOL: SPEC})))
+
+
+def test_error_classification():
+    assert is_data_error(db_error("23505", IntegrityError))
+    assert is_data_error(db_error("22003"))
+    # 연결 장애, 권한/스키마 오류 등은 재시도 대상
+    assert not is_data_error(db_error("08006"))
+    assert not is_data_error(db_error("42P01"))
+    assert not is_data_error(ConnectionResetError())
+
+    try:
+        try:
+            raise PgError("23503")
+        except PgError as e:
+            raise RuntimeError("wrapped") from e
+    except RuntimeError as e:
+        assert is_data_error(e)
+
+
+async def test_transient_failure_is_retried_until_saved(store, make_order):
+    reports = [ExecutionReport(make_order(BUY, 100, 1))]
+    failures = iter([db_error("08006"), db_error("08006")])
+    store.fail = lambda batch: next(failures, None)
+    pipeline = new_pipeline()
+    pipeline.start()
+
+    await pipeline.submit(reports)
+    await pipeline.stop()
+
+    assert store.attempts == 3
+    assert store.saved == reports
+
+
+async def test_engine_halts_after_repeated_failures_and_resumes(store, make_order):
+    engine = new_engine()
+    engine.start()
+    pipeline = new_pipeline(halt_after=2)
+    pipeline.start(engine)
+    down = asyncio.Event()
+    store.fail = lambda batch: None if down.is_set() else db_error("08006")
+
+    saved = pipeline.submit([ExecutionReport(make_order(BUY, 100, 1))])
+    while store.attempts < 2:
+        await asyncio.sleep(0.001)
+    try:
+        assert engine.halted
+        with pytest.raises(EngineHaltedError):
+            await engine.submit_order(OrderCreate(
+                symbol=SYMBOL, side=BUY, order_type=OrderType.LIMIT, price=Decimal("1"), quantity=Decimal("1"),
+            ))
+
+        down.set()
+        await saved
+        assert engine.halted is None
+    finally:
+        down.set()
+        await engine.stop()
+        await pipeline.stop()
+
+
+async def test_data_error_splits_batch_and_quarantines_bad_report(store, make_order, tmp_path):
+    reports = [ExecutionReport(make_order(BUY, 100 + i, 1)) for i in range(5)]
+    bad = reports[3]
+    store.fail = lambda batch: db_error("23503", IntegrityError) if bad in batch else None
+    engine = new_engine()
+    pipeline = new_pipeline(quarantine_dir=str(tmp_path))
+    pipeline.start(engine)
+
+    await pipeline.submit(reports)
+    await pipeline.stop()
+
+    # 나머지는 원래 순서대로 저장되고 엔진은 멈추지 않음
+    assert store.saved == [r for r in reports if r is not bad]
+    assert engine.halted is None
+    lines = (tmp_path / QUARANTINE_FILE).read_text().splitlines()
+    assert len(lines) == 1
+    record = json.loads(lines[0])
+    assert record["orders"][0]["id"] == str(bad.order.id)
+    assert record["error"].startswith("IntegrityError")
+
+
+async def test_integrity_error_from_database_is_quarantined(sessions, make_order, tmp_path):
+    good = ExecutionReport(make_order(BUY, 100, 1))
+    taker = make_order(SELL, 100, 1)
+    # 저장되지 않은 주문을 참조하는 체결 (외래 키 위반)
+    orphan = ExecutionReport(taker, trades=[TradeEvent(
+        uuid.uuid4(), SYMBOL, uuid.uuid4(), taker.id, 100, 1, T0, SELL, SPEC,
+    )])
+    pipeline = WriteBehindPipeline(session_factory=sessions, quarantine_dir=str(tmp_path), halt_after=1)
+    engine = new_engine()
+    pipeline.start(engine)
+
+    await pipeline.submit([good, orphan])
+    await pipeline.stop()
+
+    async with sessions() as db:
+        order_ids = set((await db.execute(select(Order.id))).scalars())
+        trades = (await db.execute(select(Trade.id))).scalars().all()
+    assert order_ids == {good.order.id}
+    assert trades == []
+    assert engine.halted is None
+    assert (tmp_path / QUARANTINE_FILE).exists()
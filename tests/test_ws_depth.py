@@ -0,0 +1,78 @@
+import asyncio
+import json
+
+from app.core.matching_engine import NewOrderCommand, SymbolEngine
+from app.core.orderbook import OrderBookManager
+from app.core.symbols import SymbolRegistry
+from app.models.order import OrderSide
+from app.ws import depth as depth_module
+from app.ws.depth import DepthStreamManager
+
+from conftest import SPEC, SYMBOL, at
+
+BUY, SELL = OrderSide.BUY, OrderSide.SELL
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.messages = []
+
+    async def send_text(self, data: str) -> None:
+        self.messages.append(json.loads(data))
+
+
+def new_stream():
+    books = OrderBookManager(SymbolRegistry({SYMBOL: SPEC}))
+    engine = SymbolEngine(books.get_or_create(SYMBOL))
+    return books, engine, DepthStreamManager(books)
+
+
+def process(engine, stream, order, seconds=0):
+    """엔진 처리 후 시퀀서처럼 변경분을 리스너로 전달"""
+    report = engine.process(NewOrderCommand(order), at(seconds))
+    stream.on_engine_event(SYMBOL, [report], engine.book.drain_changes())
+
+
+async def test_snapshot_then_sequenced_conflated_deltas(make_order):
+    books, engine, stream = new_stream()
+    process(engine, stream, make_order(BUY, 100, 2))
+    socket = FakeWebSocket()
+    task = asyncio.create_task(stream.stream(socket, SYMBOL))
+    await asyncio.sleep(0)
+
+    # 전송 전 같은 레벨의 변경은 마지막 상태 하나로 병합
+    process(engine, stream, make_order(BUY, 100, 3), 1)
+    process(engine, stream, make_order(BUY, 99, 1), 2)
+    process(engine, stream, make_order(SELL, 100, 5), 3)
+    await asyncio.sleep(0)
+    task.cancel()
+
+    snapshot, delta = socket.messages
+    assert snapshot["type"] == "snapshot"
+    assert snapshot["bids"] == [[str(SPEC.from_ticks(100)), str(SPEC.from_lots(2)), 1]]
+    assert delta["type"] == "delta"
+    assert delta["prev_sequence"] == snapshot["sequence"]
+    assert delta["sequence"] == books.get(SYMBOL).sequence
+    # 100 레벨은 전량 체결되어 수량 0 (삭제)
+    assert sorted(delta["bids"]) == sorted([
+        [str(SPEC.from_ticks(100)), str(SPEC.from_lots(0)), 0],
+        [str(SPEC.from_ticks(99)), str(SPEC.from_lots(1)), 1],
+    ])
+
+
+async def test_backlog_over_limit_falls_back_to_snapshot(make_order, monkeypatch):
+    monkeypatch.setattr(depth_module, "DEPTH_MAX_PENDING_LEVELS", 2)
+    books, engine, stream = new_stream()
+    socket = FakeWebSocket()
+    task = asyncio.create_task(stream.stream(socket, SYMBOL))
+    await asyncio.sleep(0)
+
+    for price in range(100, 104):
+        process(engine, stream, make_order(BUY, price, 1), price)
+    await asyncio.sleep(0)
+    task.cancel()
+
+    first, second = socket.messages
+    assert (first["type"], second["type"]) == ("snapshot", "snapshot")
+    assert second["sequence"] == books.get(SYMBOL).sequence
+    assert len(second["bids"]) == 4
@@ -0,0 +1,68 @@
+import asyncio
+
+import orjson
+
+from app.core.matching_engine import NewOrderCommand, SymbolEngine
+from app.models.order import OrderSide
+from app.ws.trades import TradeTapeManager
+
+from conftest import SYMBOL, at
+
+
+class FakeWebSocket:
+    def __init__(self, block: bool = False):
+        self.frames = []
+        self.closed = None
+        # True이면 전송이 끝나지 않는 느린 구독자
+        self.block = block
+
+    async def send_bytes(self, data: bytes) -> None:
+        if self.block:
+            await asyncio.Event().wait()
+        self.frames.append(data)
+
+    async def close(self, code: int, reason: str = "") -> None:
+        self.closed = code
+
+
+def trade_reports(book, make_order, count):
+    engine = SymbolEngine(book)
+    reports = []
+    for index in range(count):
+        engine.process(NewOrderCommand(make_order(OrderSide.SELL, 100, 1)), at(index))
+        reports.append(engine.process(NewOrderCommand(make_order(OrderSide.BUY, 100, 1)), at(index)))
+    return reports
+
+
+async def test_frame_is_serialized_once_and_shared(book, make_order):
+    tape = TradeTapeManager()
+    sockets = [FakeWebSocket(), FakeWebSocket()]
+    tasks = [asyncio.create_task(tape.stream(socket, SYMBOL)) for socket in sockets]
+    await asyncio.sleep(0)
+
+    reports = trade_reports(book, make_order, 2)
+    tape.on_engine_event(SYMBOL, reports, None)
+    tape.on_engine_event("OTHER", reports, None)
+    await asyncio.sleep(0)
+    for task in tasks:
+        task.cancel()
+
+    first, second = (socket.frames for socket in sockets)
+    assert len(first) == 1 and first[0] is second[0]
+    message = orjson.loads(first[0])
+    assert message["type"] == "trades" and message["symbol"] == SYMBOL
+    assert [trade["id"] for trade in message["trades"]] == [str(r.trades[0].id) for r in reports]
+    assert message["trades"][0]["side"] == "buy"
+
+
+async def test_slow_subscriber_is_closed(book, make_order):
+    tape = TradeTapeManager(queue_size=2)
+    slow = FakeWebSocket(block=True)
+    task = asyncio.create_task(tape.stream(slow, SYMBOL))
+    await asyncio.sleep(0)
+
+    for report in trade_reports(book, make_order, 4):
+        tape.on_engine_event(SYMBOL, [report], None)
+    # 대기열이 넘친 구독자는 다음 이벤트부터 분배 대상에서 빠짐
+    assert not tape.subscribers.get(SYMBOL)
+    task.cancel()